@@ -0,0 +1,250 @@
+"""
+Benchmarks für Seitenabruf, Dekodierung, Cache-Aufbau, Suche, Cache-Persistenz und Medien-Transfer.
+
+Alle Netzwerkzugriffe gehen an wowipy.mock_server, die Datenmengen sind über BenchContext.scale skalierbar.
+"""
+import copy
+import math
+import os
+import random
+import shutil
+import tempfile
+from typing import Dict, List
+
+import humps
+
+from benchmarks.harness import Case, benchmark
+from wowipy.mock_server import MockDataset, MockOpenWowiServer
+from wowipy.models import Loan, MediaData
+from wowipy.wowipy import WowiPy
+
+# Vertragsnehmer je Wirtschaftseinheit bei den Default-Einstellungen von MockDataset (ca. 48 Verträge)
+_CONTRACTORS_PER_ECONOMIC_UNIT = 60
+
+DECODE_TYPES = (WowiPy.CACHE_ECONOMIC_UNITS, WowiPy.CACHE_BUILDING_LANDS, WowiPy.CACHE_USE_UNITS,
+                WowiPy.CACHE_LICENSE_AGREEMENTS, WowiPy.CACHE_CONTRACTORS, WowiPy.CACHE_PERSONS,
+                WowiPy.CACHE_CONTRACT_POSITIONS, WowiPy.CACHE_FACILITIES, WowiPy.CACHE_COMPONENTS)
+
+BUILD_METHODS = {
+    WowiPy.CACHE_ECONOMIC_UNITS: "build_economic_unit_cache",
+    WowiPy.CACHE_BUILDING_LANDS: "build_building_land_cache",
+    WowiPy.CACHE_USE_UNITS: "build_use_unit_cache",
+    WowiPy.CACHE_LICENSE_AGREEMENTS: "build_license_agreement_cache",
+    WowiPy.CACHE_CONTRACTORS: "build_contractor_cache",
+    WowiPy.CACHE_PERSONS: "build_person_cache",
+    WowiPy.CACHE_FACILITIES: "build_facility_cache",
+    WowiPy.CACHE_COMPONENTS: "build_component_cache",
+}
+
+
+class BenchContext:
+    """
+    Gemeinsame Ressourcen der Benchmarks: Datensätze, Mock-Server und Clients werden je Konfiguration nur einmal
+    erzeugt
+    :param scale: Faktor für alle Datenmengen
+    :param latency: Latenz je Anfrage des Mock-Servers in Sekunden
+    """
+
+    def __init__(self, scale: float = 1.0, latency: float = 0.0) -> None:
+        self.scale = scale
+        self.latency = latency
+        self.tmp_dir = tempfile.mkdtemp(prefix="wowipy-bench-")
+        self._datasets: Dict = {}
+        self._servers: Dict = {}
+        self._clients: Dict = {}
+        self._offline = None
+
+    def size(self, value: int) -> int:
+        return max(1, int(value * self.scale))
+
+    def dataset(self, **kwargs) -> MockDataset:
+        key = tuple(sorted(kwargs.items()))
+        if key not in self._datasets:
+            self._datasets[key] = MockDataset(**kwargs)
+        return self._datasets[key]
+
+    def server(self, **kwargs) -> MockOpenWowiServer:
+        key = tuple(sorted(kwargs.items()))
+        if key not in self._servers:
+            self._servers[key] = MockOpenWowiServer(dataset=self.dataset(**kwargs), latency=self.latency).start()
+        return self._servers[key]
+
+    def client(self, **kwargs) -> WowiPy:
+        key = tuple(sorted(kwargs.items()))
+        if key not in self._clients:
+            self._clients[key] = self.server(**kwargs).client()
+        return self._clients[key]
+
+    def offline_client(self) -> WowiPy:
+        # Ohne Hostname meldet sich RestAdapter nicht an, die Caches werden direkt befüllt
+        if self._offline is None:
+            self._offline = WowiPy(hostname="", user="", password="", api_key="")
+        return self._offline
+
+    def decoded(self, cache_type: str, **kwargs) -> List:
+        endpoint, _, decoder = self.offline_client()._sync_sources()[cache_type]
+        return [decoder(record) for record in copy.deepcopy(self.dataset(**kwargs).records[endpoint])]
+
+    def populated_client(self, cache_types: List[str], **kwargs) -> WowiPy:
+        wowi = WowiPy(hostname="", user="", password="", api_key="")
+        for cache_type in cache_types:
+            wowi.get_cache(cache_type).replace(self.decoded(cache_type, **kwargs))
+        return wowi
+
+    def close(self) -> None:
+        for server in self._servers.values():
+            server.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+
+@benchmark("fetch_all", params=(1, 5, 20))
+def persons_pages(ctx: BenchContext, pages: int) -> Case:
+    count = ctx.size(pages) * 100
+    wowi = ctx.client(economic_units=0, extra_persons=count, loans=0, tickets=0)
+    return Case(lambda: wowi.get_persons(fetch_all=True), items=count)
+
+
+@benchmark("fetch_all", params=(1, 5, 20))
+def use_units_pages(ctx: BenchContext, pages: int) -> Case:
+    # 24 Nutzungseinheiten je Wirtschaftseinheit
+    economic_units = math.ceil(ctx.size(pages) * 100 / 24)
+    wowi = ctx.client(economic_units=economic_units, agreements_per_use_unit=1, loans=0, tickets=0)
+    count = len(ctx.dataset(economic_units=economic_units, agreements_per_use_unit=1, loans=0,
+                            tickets=0).records["CommercialInventory/UseUnits"])
+    return Case(lambda: wowi.get_use_units(fetch_all=True), items=count)
+
+
+@benchmark("decode", params=DECODE_TYPES)
+def decamelize(ctx: BenchContext, cache_type: str) -> Case:
+    endpoint = ctx.offline_client()._sync_sources()[cache_type][0]
+    records = ctx.dataset(economic_units=ctx.size(10)).records[endpoint]
+    return Case(lambda: [humps.decamelize(record) for record in records], items=len(records))
+
+
+@benchmark("decode", params=DECODE_TYPES)
+def model(ctx: BenchContext, cache_type: str) -> Case:
+    endpoint, _, decoder = ctx.offline_client()._sync_sources()[cache_type]
+    records = ctx.dataset(economic_units=ctx.size(10)).records[endpoint]
+    # Die Decoder verändern die verschachtelten Dicts, daher je Durchlauf eine Kopie
+    return Case(lambda rows: [decoder(record) for record in rows], prepare=lambda: (copy.deepcopy(records),),
+                items=len(records))
+
+
+@benchmark("decode", params=(1000, 10000))
+def loan_model(ctx: BenchContext, count: int) -> Case:
+    records = ctx.dataset(economic_units=0, loans=ctx.size(count), tickets=0).records["Loans/Loan"]
+
+    def prepare():
+        # wie WowiPy.get_loans, gemessen wird nur die Konstruktion (decamelize siehe decode/decamelize)
+        rows = []
+        for entry in copy.deepcopy(records):
+            data = dict(humps.decamelize(entry))
+            data['id_'] = data.pop('id')
+            rows.append(data)
+        return rows,
+
+    return Case(lambda rows: [Loan(**data) for data in rows], prepare=prepare, items=len(records))
+
+
+@benchmark("build_cache", params=tuple(BUILD_METHODS), repeat=3, memory=True)
+def build(ctx: BenchContext, cache_type: str) -> Case:
+    wowi = ctx.client(economic_units=ctx.size(10))
+    build_method = getattr(wowi, BUILD_METHODS[cache_type])
+
+    def run():
+        build_method()
+        return len(wowi.get_cache(cache_type))
+
+    endpoint = ctx.offline_client()._sync_sources()[cache_type][0]
+    return Case(run, items=len(ctx.dataset(economic_units=ctx.size(10)).records[endpoint]))
+
+
+def _search_terms(entries: List, count: int = 50) -> Dict[str, List[str]]:
+    rnd = random.Random(1)
+    sample = rnd.sample(entries, min(count, len(entries)))
+    persons = [getattr(entry, "person", entry) for entry in sample]
+    return {
+        "name": [person.natural_person.last_name for person in persons],
+        "address": [person.addresses[0].street for person in persons],
+        "phone": [person.communications[0].content[-6:] for person in persons if person.communications],
+    }
+
+
+def _search_case(search, entries: List, field: str) -> Case:
+    terms = _search_terms(entries)[field]
+    kwargs_key = f"search_{field}"
+    return Case(lambda: [search(**{kwargs_key: term}) for term in terms], items=len(terms), unit="queries")
+
+
+@benchmark("search", params=("name@1000", "address@1000", "phone@1000", "name@10000", "address@10000",
+                             "phone@10000"))
+def search_person(ctx: BenchContext, param: str) -> Case:
+    field, size = param.split("@")
+    wowi = ctx.populated_client([WowiPy.CACHE_PERSONS], economic_units=0, extra_persons=ctx.size(int(size)),
+                                loans=0, tickets=0)
+    return _search_case(wowi.search_person, wowi.get_cache(WowiPy.CACHE_PERSONS).entries, field)
+
+
+@benchmark("search", params=("name@1000", "address@1000", "phone@1000", "name@10000", "address@10000",
+                             "phone@10000"))
+def search_contractor(ctx: BenchContext, param: str) -> Case:
+    field, size = param.split("@")
+    economic_units = math.ceil(ctx.size(int(size)) / _CONTRACTORS_PER_ECONOMIC_UNIT)
+    wowi = ctx.populated_client([WowiPy.CACHE_CONTRACTORS], economic_units=economic_units, loans=0, tickets=0)
+    return _search_case(wowi.search_contractor, wowi.get_cache(WowiPy.CACHE_CONTRACTORS).entries, field)
+
+
+@benchmark("disk", params=(WowiPy.CACHE_FORMAT_WOWIPY, WowiPy.CACHE_FORMAT_PICKLE), repeat=3)
+def persons_round_trip(ctx: BenchContext, file_format: str) -> Case:
+    wowi = ctx.populated_client([WowiPy.CACHE_PERSONS], economic_units=0, extra_persons=ctx.size(10000),
+                                loans=0, tickets=0)
+    file_name = os.path.join(ctx.tmp_dir, f"persons.{file_format}")
+
+    def run():
+        wowi.cache_to_disk(WowiPy.CACHE_PERSONS, file_name, file_format)
+        wowi.cache_from_disk(WowiPy.CACHE_PERSONS, file_name)
+
+    return Case(run, items=len(wowi.get_cache(WowiPy.CACHE_PERSONS)))
+
+
+@benchmark("disk", params=(WowiPy.CACHE_FORMAT_WOWIPY, WowiPy.CACHE_FORMAT_PICKLE), repeat=3)
+def contractors_round_trip(ctx: BenchContext, file_format: str) -> Case:
+    wowi = ctx.populated_client([WowiPy.CACHE_CONTRACTORS], economic_units=ctx.size(100), loans=0, tickets=0)
+    file_name = os.path.join(ctx.tmp_dir, f"contractors.{file_format}")
+
+    def run():
+        wowi.cache_to_disk(WowiPy.CACHE_CONTRACTORS, file_name, file_format)
+        wowi.cache_from_disk(WowiPy.CACHE_CONTRACTORS, file_name)
+
+    return Case(run, items=len(wowi.get_cache(WowiPy.CACHE_CONTRACTORS)))
+
+
+def _media_file(ctx: BenchContext, size: int) -> str:
+    file_name = os.path.join(ctx.tmp_dir, f"media_{size}.bin")
+    if not os.path.exists(file_name):
+        with open(file_name, "wb") as fp:
+            fp.write(random.Random(size).randbytes(size))
+    return file_name
+
+
+def _media_data(file_name: str) -> MediaData:
+    media = MediaData(file_name=os.path.basename(file_name), creation_date_str="2024-01-01",
+                      entity_type_name="UseUnit", entity_name="UseUnit", entity_id=1)
+    media.picture_type_id = 1
+    return media
+
+
+@benchmark("media", params=(64 * 1024, 1024 * 1024), repeat=3)
+def upload(ctx: BenchContext, size: int) -> Case:
+    wowi = ctx.client(economic_units=1)
+    file_name = _media_file(ctx, ctx.size(size))
+    return Case(lambda: wowi.upload_media(_media_data(file_name), file_name), items=ctx.size(size), unit="bytes")
+
+
+@benchmark("media", params=(64 * 1024, 1024 * 1024), repeat=3)
+def download(ctx: BenchContext, size: int) -> Case:
+    wowi = ctx.client(economic_units=1)
+    file_name = _media_file(ctx, ctx.size(size))
+    file_guid = wowi.upload_media(_media_data(file_name), file_name).data["fileGuid"]
+    return Case(lambda: wowi.download_media("UseUnit", file_guid, ctx.tmp_dir, f"download_{size}.bin"),
+                items=ctx.size(size), unit="bytes")
@@ -0,0 +1,179 @@
+"""
+Kleiner Benchmark-Runner ohne Abhängigkeiten außerhalb der Standardbibliothek.
+
+Ein Benchmark ist eine Fabrikfunktion, die einmalig (außerhalb der Messung) alles vorbereitet und einen Case mit der
+zu messenden Funktion zurückgibt. Gemessen wird die Laufzeit über mehrere Wiederholungen, optional zusätzlich der
+Speicher-Peak (tracemalloc, in einem eigenen Durchlauf, damit die Laufzeit nicht verfälscht wird).
+
+Ergebnisse lassen sich als JSON-Baseline speichern und mit einer früheren Baseline vergleichen.
+"""
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class Case:
+    """
+    Zu messende Funktion eines Benchmarks
+    :param run: Gemessene Funktion
+    :param prepare: (Optional) Wird vor jeder Wiederholung ungemessen aufgerufen, das Ergebnis (Tupel) wird an run
+                    übergeben, z.B. für Kopien von Daten, die run verändert
+    :param items: (Optional) Anzahl verarbeiteter Einheiten je Aufruf, für den Durchsatz
+    :param unit: Einheit von items, z.B. "records", "queries" oder "bytes"
+    """
+
+    def __init__(self, run: Callable, prepare: Callable = None, items: int = None, unit: str = "records") -> None:
+        self.run = run
+        self.prepare = prepare
+        self.items = items
+        self.unit = unit
+
+    def call(self) -> float:
+        args = self.prepare() if self.prepare is not None else ()
+        start = time.perf_counter()
+        self.run(*args)
+        return time.perf_counter() - start
+
+
+class Benchmark:
+    def __init__(self, group: str, name: str, factory: Callable, param=None, repeat: int = 5,
+                 memory: bool = False) -> None:
+        self.group = group
+        self.name = name
+        self.factory = factory
+        self.param = param
+        self.repeat = repeat
+        self.memory = memory
+
+    @property
+    def full_name(self) -> str:
+        if self.param is None:
+            return f"{self.group}/{self.name}"
+        return f"{self.group}/{self.name}[{self.param}]"
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(group: str, params: Iterable = None, repeat: int = 5, memory: bool = False) -> Callable:
+    """
+    Registriert eine Benchmark-Fabrik factory(ctx[, param]) -> Case, bei params je Wert einmal
+    """
+    def decorator(factory: Callable) -> Callable:
+        for param in (params if params is not None else [None]):
+            BENCHMARKS.append(Benchmark(group, factory.__name__, factory, param, repeat, memory))
+        return factory
+    return decorator
+
+
+def run_benchmark(bench: Benchmark, ctx, repeat: int = None) -> Dict:
+    case = bench.factory(ctx) if bench.param is None else bench.factory(ctx, bench.param)
+    # Aufwärmlauf: Verbindungsaufbau, Imports, Caches
+    case.call()
+    times = [case.call() for _ in range(repeat or bench.repeat)]
+    peak = None
+    if bench.memory:
+        tracemalloc.start()
+        try:
+            case.call()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    median = statistics.median(times)
+    return {
+        "group": bench.group,
+        "median": median,
+        "min": min(times),
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "repeat": len(times),
+        "items": case.items,
+        "unit": case.unit,
+        "throughput": case.items / median if case.items and median > 0 else None,
+        "peak_bytes": peak,
+    }
+
+
+def select(groups: List[str] = None, name_filter: str = None) -> List[Benchmark]:
+    res = []
+    for bench in BENCHMARKS:
+        if groups and bench.group not in groups:
+            continue
+        if name_filter and name_filter not in bench.full_name:
+            continue
+        res.append(bench)
+    return res
+
+
+def metadata() -> Dict:
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def save_baseline(file_name: str, results: Dict[str, Dict]) -> None:
+    with open(file_name, "w", encoding="utf-8") as fp:
+        json.dump({"meta": metadata(), "results": results}, fp, indent=2, sort_keys=True)
+
+
+def load_baseline(file_name: str) -> Dict[str, Dict]:
+    with open(file_name, "r", encoding="utf-8") as fp:
+        return json.load(fp)["results"]
+
+
+def _format_time(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:8.1f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:8.2f} ms"
+    return f"{seconds:8.3f} s "
+
+
+def _format_bytes(size: Optional[int]) -> str:
+    if size is None:
+        return ""
+    return f"{size / 1024 / 1024:8.2f} MiB"
+
+
+def format_result(name: str, result: Dict) -> str:
+    line = f"{name:<55} {_format_time(result['median'])}"
+    if result.get("throughput"):
+        line += f"  {result['throughput']:12.1f} {result['unit']}/s"
+    if result.get("peak_bytes") is not None:
+        line += f"  peak {_format_bytes(result['peak_bytes'])}"
+    return line
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float = 0.1) -> List[str]:
+    """
+    Vergleicht die Mediane mit der Baseline und gibt die Namen der langsamer gewordenen Benchmarks zurück
+    :param threshold: Toleranz, 0.1 = Abweichungen bis 10 % gelten als unverändert
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<55} {_format_time(result['median'])}  (neu)")
+            continue
+        ratio = result["median"] / base["median"] if base["median"] > 0 else float("inf")
+        if ratio > 1 + threshold:
+            verdict = "LANGSAMER"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            verdict = "schneller"
+        else:
+            verdict = "unverändert"
+        line = f"{name:<55} {_format_time(base['median'])} -> {_format_time(result['median'])}  x{ratio:5.2f}  " \
+               f"{verdict}"
+        if result.get("peak_bytes") is not None and base.get("peak_bytes"):
+            line += f"  peak {_format_bytes(base['peak_bytes'])} -> {_format_bytes(result['peak_bytes'])}"
+        print(line)
+    return regressions
@@ -0,0 +1,67 @@
+"""
+Führt die Benchmarks aus, speichert eine Baseline oder vergleicht mit einer gespeicherten.
+
+    python -m benchmarks.run --save baseline.json
+    python -m benchmarks.run --compare baseline.json --fail-on-regression
+    python -m benchmarks.run --group search --filter person
+"""
+import argparse
+import sys
+from typing import List
+
+from benchmarks import cases
+from benchmarks.harness import compare, format_result, load_baseline, run_benchmark, save_baseline, select
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="WowiPy-Benchmarks gegen den lokalen OPENWOWI-Mock")
+    parser.add_argument("--group", action="append", help="Nur diese Gruppe(n), z.B. fetch_all, decode, search")
+    parser.add_argument("--filter", help="Nur Benchmarks, deren Name diesen Text enthält")
+    parser.add_argument("--repeat", type=int, help="Wiederholungen je Benchmark (Default: je Benchmark)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Faktor für alle Datenmengen")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latenz je Anfrage des Mock-Servers in s")
+    parser.add_argument("--save", help="Ergebnisse als Baseline (JSON) speichern")
+    parser.add_argument("--compare", help="Mit dieser Baseline (JSON) vergleichen")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Toleranz beim Vergleich, 0.1 = 10 %%")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Exit-Code 1, wenn ein Benchmark langsamer als die Baseline ist")
+    parser.add_argument("--list", action="store_true", help="Benchmarks nur auflisten")
+    args = parser.parse_args(argv)
+
+    benchmarks = select(args.group, args.filter)
+    if args.list:
+        for bench in benchmarks:
+            print(bench.full_name)
+        return 0
+
+    ctx = cases.BenchContext(scale=args.scale, latency=args.latency)
+    results = {}
+    try:
+        for bench in benchmarks:
+            result = run_benchmark(bench, ctx, args.repeat)
+            result["scale"] = args.scale
+            result["latency"] = args.latency
+            results[bench.full_name] = result
+            print(format_result(bench.full_name, result), flush=True)
+    finally:
+        ctx.close()
+
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"Baseline gespeichert: {args.save}")
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        mismatched = [name for name, result in results.items() if name in baseline and
+                      (baseline[name].get("scale"), baseline[name].get("latency")) != (args.scale, args.latency)]
+        if mismatched:
+            print(f"Warnung: {len(mismatched)} Benchmarks mit anderer scale/latency als die Baseline")
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if regressions and args.fail_on_regression:
+            print(f"{len(regressions)} Benchmarks langsamer als die Baseline")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,9 +11,12 @@ setup(
     packages=['wowipy'],
     install_requires=['requests>=2.0',
                       'requests-cache>=1.1.0',
-                      'pyhumps>=3.0',
-                      'jsonmerge>=1.9'
+                      'pyhumps>=3.0'
                       ],
+    extras_require={
+        'fastcache': ['msgpack>=1.0', 'zstandard>=0.20'],
+        'test': ['pytest>=7.0']
+    },
 
     classifiers=[
         'Development Status :: 5 - Production/Stable',
@@ -0,0 +1,57 @@
+import pytest
+
+from wowipy.mock_server import MockDataset, MockOpenWowiServer
+
+
+def mock_dataset() -> MockDataset:
+    return MockDataset(seed=7, economic_units=3, buildings_per_economic_unit=3, use_units_per_building=4,
+                       extra_persons=20, loans=0, tickets=0)
+
+
+@pytest.fixture(scope="session")
+def server():
+    """
+    Mock-Server für Tests, die den Datenbestand nur lesen
+    """
+    with MockOpenWowiServer(mock_dataset()) as mock_server:
+        yield mock_server
+
+
+@pytest.fixture
+def make_server():
+    """
+    Erzeugt Mock-Server mit eigenen Parametern (z.B. Fehlerinjektion), die am Ende des Tests beendet werden
+    """
+    servers = []
+
+    def factory(**kwargs) -> MockOpenWowiServer:
+        mock_server = MockOpenWowiServer(mock_dataset(), **kwargs).start()
+        servers.append(mock_server)
+        return mock_server
+
+    yield factory
+    for mock_server in servers:
+        mock_server.stop()
+
+
+@pytest.fixture
+def fresh_server(make_server):
+    """
+    Eigener Mock-Server je Test, der Datenbestand darf verändert werden
+    """
+    return make_server()
+
+
+@pytest.fixture(scope="session")
+def wowi(server):
+    """
+    Client mit aufgebauten Caches für Personen, Vertragsnehmer, Nutzungsverträge, Gebäude und Nutzungseinheiten
+    """
+    client = server.client()
+    client.build_economic_unit_cache()
+    client.build_building_land_cache()
+    client.build_use_unit_cache()
+    client.build_license_agreement_cache()
+    client.build_contractor_cache()
+    client.build_person_cache()
+    return client
@@ -0,0 +1,95 @@
+"""
+Bulk-Operationen: einzelne Fehler dürfen den Lauf nicht abbrechen, Anlagen dürfen nicht doppelt entstehen
+"""
+from wowipy.bulk import CommunicationOperation, ComponentOperation, FacilityOperation
+from wowipy.mock_server import EP_COMPONENTS, EP_FACILITIES, EP_PERSONS
+
+EMAIL_TYPE_ID = 3
+
+
+def person_with_communications(server) -> dict:
+    return next(person for person in server.dataset.records[EP_PERSONS] if len(person["communications"]) >= 2)
+
+
+def test_bulk_communications_partial_failure(fresh_server):
+    person = person_with_communications(fresh_server)
+    edited, deleted = person["communications"][0], person["communications"][1]
+    missing_person_id = max(entry["id"] for entry in fresh_server.dataset.records[EP_PERSONS]) + 1
+    operations = [
+        CommunicationOperation(CommunicationOperation.EDIT, person["id"], communication_id=edited["id"],
+                               communication_type_id=EMAIL_TYPE_ID, content="neu@example.org"),
+        CommunicationOperation(CommunicationOperation.EDIT, person["id"], communication_id=999999,
+                               communication_type_id=EMAIL_TYPE_ID, content="fehlt@example.org"),
+        CommunicationOperation(CommunicationOperation.CREATE, person["id"], communication_type_id=EMAIL_TYPE_ID,
+                               content="zusatz@example.org"),
+        CommunicationOperation(CommunicationOperation.CREATE, missing_person_id, communication_type_id=EMAIL_TYPE_ID,
+                               content="niemand@example.org"),
+        CommunicationOperation(CommunicationOperation.DELETE, person["id"], communication_id=deleted["id"]),
+    ]
+    results = fresh_server.client().bulk_communications(operations, max_workers=4)
+
+    assert [result.source for result in results] == operations
+    assert [result.success for result in results] == [True, False, True, False, True]
+    assert [result.status_code for result in results] == [200, 404, 200, 404, 200]
+    assert all(result.attempts == 1 for result in results)
+    assert all(result.error is not None for result in results if not result.success)
+    contents = [communication["content"] for communication in person["communications"]]
+    assert "neu@example.org" in contents
+    assert "zusatz@example.org" in contents
+    assert deleted["id"] not in [communication["id"] for communication in person["communications"]]
+
+
+def test_bulk_create_is_not_repeated_after_server_error(make_server):
+    server = make_server(error_rate=1.0, error_status=500)
+    person = person_with_communications(server)
+    operations = [CommunicationOperation(CommunicationOperation.CREATE, person["id"],
+                                         communication_type_id=EMAIL_TYPE_ID, content=f"{no}@example.org")
+                  for no in range(3)]
+    results = server.client().bulk_communications(operations, max_retries=2)
+    assert [(result.success, result.status_code, result.attempts) for result in results] == [(False, 500, 1)] * 3
+    # Jede Anfrage erhält den injizierten Fehler, die Zahl der Fehler ist also die Zahl der gesendeten Anlagen
+    assert server.stats["errors_injected"] == len(operations)
+
+
+def test_bulk_create_is_repeated_when_not_processed(make_server):
+    server = make_server(error_rate=1.0, error_status=503)
+    person = person_with_communications(server)
+    operations = [CommunicationOperation(CommunicationOperation.CREATE, person["id"],
+                                         communication_type_id=EMAIL_TYPE_ID, content="neu@example.org")]
+    results = server.client().bulk_communications(operations, max_retries=1)
+    assert [(result.success, result.status_code, result.attempts) for result in results] == [(False, 503, 2)]
+    assert server.stats["errors_injected"] == 2
+
+
+def test_bulk_facilities_skips_components_of_failed_facility(fresh_server):
+    component = ComponentOperation(ComponentOperation.CREATE, name="Therme", count=1, component_status_id=1,
+                                   component_catalog=1)
+    operations = [
+        FacilityOperation(FacilityOperation.CREATE, "Sauna", 1, "Gibt es nicht", use_unit_id=1,
+                          components=[component]),
+        FacilityOperation(FacilityOperation.CREATE, "Heizung", 1, 1, use_unit_id=1,
+                          components=[ComponentOperation(ComponentOperation.CREATE, name="Therme", count=1,
+                                                         component_status_id=1, component_catalog=1)]),
+    ]
+    facilities_before = len(fresh_server.dataset.records[EP_FACILITIES])
+    components_before = len(fresh_server.dataset.records[EP_COMPONENTS])
+    results = fresh_server.client().bulk_facilities(operations)
+
+    assert [result.success for result in results] == [False, False, True, True]
+    assert results[1].source is component
+    assert results[1].attempts == 0
+    new_facility_id = results[2].data["id"]
+    assert results[3].endpoint.find(str(new_facility_id)) >= 0
+    assert len(fresh_server.dataset.records[EP_FACILITIES]) == facilities_before + 1
+    assert len(fresh_server.dataset.records[EP_COMPONENTS]) == components_before + 1
+
+
+def test_bulk_edit_attempts_count_every_request(make_server):
+    server = make_server(error_rate=1.0, error_status=503)
+    person = person_with_communications(server)
+    operations = [CommunicationOperation(CommunicationOperation.EDIT, person["id"],
+                                         communication_id=person["communications"][0]["id"],
+                                         communication_type_id=EMAIL_TYPE_ID, content="neu@example.org")]
+    results = server.client().bulk_communications(operations, max_retries=2)
+    assert [(result.success, result.status_code, result.attempts) for result in results] == [(False, 503, 3)]
+    assert server.stats["errors_injected"] == 3
@@ -0,0 +1,74 @@
+"""
+Aktualisierungssperre der gemeinsamen Cache-Backends
+"""
+import threading
+
+from wowipy.cache_backends import DirectoryCacheBackend, RedisCacheBackend
+
+
+def test_directory_lock_has_one_holder(tmp_path):
+    workers = 8
+    backends = [DirectoryCacheBackend(str(tmp_path)) for _ in range(workers)]
+    barrier = threading.Barrier(workers)
+    acquired = []
+
+    def worker(backend):
+        barrier.wait()
+        acquired.append(backend.acquire_refresh("persons", ttl=0))
+
+    threads = [threading.Thread(target=worker, args=(backend,)) for backend in backends]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert acquired.count(True) == 1
+
+    for backend in backends:
+        backend.release_refresh("persons")
+    assert backends[0].acquire_refresh("persons", ttl=0)
+    assert not backends[1].acquire_refresh("persons", ttl=0)
+    backends[0].release_refresh("persons")
+    assert backends[1].acquire_refresh("persons", ttl=0)
+    backends[1].release_refresh("persons")
+
+
+class FakeRedis:
+    """
+    Minimaler Redis-Ersatz mit get, set (nx), delete und dem Lua-Skript zum Freigeben der Sperre
+    """
+
+    def __init__(self) -> None:
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        return True
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def eval(self, script, numkeys, key, token):
+        if self.data.get(key) == token.encode():
+            del self.data[key]
+            return 1
+        return 0
+
+
+def test_redis_release_keeps_foreign_lock():
+    client = FakeRedis()
+    first = RedisCacheBackend(client)
+    second = RedisCacheBackend(client)
+    assert first.acquire_refresh("persons", ttl=1)
+    assert not second.acquire_refresh("persons", ttl=1)
+    # Die Sperre von first ist abgelaufen und wurde an second vergeben
+    client.delete("wowipy:persons:lock")
+    assert second.acquire_refresh("persons", ttl=1)
+    first.release_refresh("persons")
+    assert client.get("wowipy:persons:lock") is not None
+    second.release_refresh("persons")
+    assert client.get("wowipy:persons:lock") is None
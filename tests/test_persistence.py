@@ -0,0 +1,94 @@
+"""
+Caches müssen nach Speichern und Laden inhaltlich unverändert sein
+"""
+import os
+
+import pytest
+
+from wowipy.persistence import CODEC_JSON, CODEC_MSGPACK, COMPRESSION_NONE, COMPRESSION_ZLIB, COMPRESSION_ZSTD, \
+    is_cache_file
+from wowipy.wowipy import WowiPy
+
+CACHE_TYPES = [WowiPy.CACHE_PERSONS, WowiPy.CACHE_CONTRACTORS, WowiPy.CACHE_USE_UNITS,
+               WowiPy.CACHE_LICENSE_AGREEMENTS]
+
+
+def as_data(value):
+    """
+    Model-Objekte rekursiv als Dicts, damit geladene und ursprüngliche Einträge vergleichbar sind
+    """
+    if isinstance(value, (list, tuple)):
+        return [as_data(item) for item in value]
+    if isinstance(value, dict):
+        return {key: as_data(item) for key, item in value.items()}
+    if hasattr(value, "__dict__"):
+        return {"__class__": type(value).__name__, **{key: as_data(item) for key, item in vars(value).items()}}
+    return value
+
+
+def assert_same_cache(original: WowiPy, loaded: WowiPy, cache_type: str) -> None:
+    expected = original.get_cache(cache_type)
+    actual = loaded.get_cache(cache_type)
+    assert len(actual) == len(expected)
+    assert actual.built_at == expected.built_at
+    assert as_data(actual.entries) == as_data(expected.entries)
+
+
+@pytest.mark.parametrize("codec", [CODEC_JSON, CODEC_MSGPACK])
+@pytest.mark.parametrize("compression", [COMPRESSION_NONE, COMPRESSION_ZLIB, COMPRESSION_ZSTD])
+def test_caches_round_trip(wowi, server, tmp_path, codec, compression):
+    if codec == CODEC_MSGPACK:
+        pytest.importorskip("msgpack")
+    if compression == COMPRESSION_ZSTD:
+        pytest.importorskip("zstandard")
+    file_name = str(tmp_path / "caches.wowipy")
+    wowi.caches_to_disk(file_name, CACHE_TYPES, codec=codec, compression=compression)
+    assert is_cache_file(file_name)
+    assert os.listdir(str(tmp_path)) == ["caches.wowipy"]
+
+    loaded = server.client()
+    loaded.caches_from_disk(file_name)
+    for cache_type in CACHE_TYPES:
+        assert_same_cache(wowi, loaded, cache_type)
+    assert [entry.id_ for entry in loaded.search_person(search_name="a", max_results=20)] == \
+        [entry.id_ for entry in wowi.search_person(search_name="a", max_results=20)]
+
+
+def test_caches_from_disk_selected_types(wowi, server, tmp_path):
+    file_name = str(tmp_path / "caches.wowipy")
+    wowi.caches_to_disk(file_name, CACHE_TYPES, codec=CODEC_JSON)
+    loaded = server.client()
+    loaded.caches_from_disk(file_name, [WowiPy.CACHE_USE_UNITS])
+    assert_same_cache(wowi, loaded, WowiPy.CACHE_USE_UNITS)
+    assert len(loaded.get_cache(WowiPy.CACHE_PERSONS)) == 0
+
+
+@pytest.mark.parametrize("file_format", [WowiPy.CACHE_FORMAT_WOWIPY, WowiPy.CACHE_FORMAT_PICKLE])
+def test_cache_round_trip(wowi, server, tmp_path, file_format):
+    file_name = str(tmp_path / "contractors.cache")
+    wowi.cache_to_disk(WowiPy.CACHE_CONTRACTORS, file_name, file_format)
+    loaded = server.client()
+    loaded.cache_from_disk(WowiPy.CACHE_CONTRACTORS, file_name)
+    assert_same_cache(wowi, loaded, WowiPy.CACHE_CONTRACTORS)
+
+
+def test_cache_file_is_replaced(wowi, tmp_path):
+    file_name = str(tmp_path / "persons.cache")
+    with open(file_name, "wb") as fp:
+        fp.write(b"old")
+    os.chmod(file_name, 0o600)
+    wowi.cache_to_disk(WowiPy.CACHE_PERSONS, file_name)
+    assert is_cache_file(file_name)
+    assert os.stat(file_name).st_mode & 0o777 == 0o600
+    assert os.listdir(str(tmp_path)) == ["persons.cache"]
+
+
+def test_cache_table_round_trip(wowi, tmp_path):
+    file_name = str(tmp_path / "persons.table")
+    wowi.cache_to_table(WowiPy.CACHE_PERSONS, file_name)
+    persons = wowi.get_cache(WowiPy.CACHE_PERSONS).entries
+    with WowiPy.open_cache_table(file_name) as table:
+        assert len(table) == len(persons)
+        assert table.column("id_") == [person.id_ for person in persons]
+        assert table.column("name") == [person.name for person in persons]
+        assert table.get(persons[5].id_)["id_num"] == persons[5].id_num
@@ -0,0 +1,20 @@
+"""
+Profiling: die Dekodierzeit wird auch für Kataloge und andere Getter je Endpunkt erfasst
+"""
+
+
+def test_decode_time_covers_catalog_getters(server):
+    wowi = server.client()
+    profiler = wowi.enable_profiling()
+    try:
+        facility_catalog = wowi.get_facility_catalog()
+        component_catalog = wowi.get_component_catalog()
+        media_entities = wowi.get_media_entity_catalog()
+        picture_types = wowi.get_picture_type_catalog()
+    finally:
+        wowi.disable_profiling()
+    records = {row["endpoint"]: row["records"] for row in profiler.report()["endpoints"]}
+    assert records["CommercialInventoryCatalog/FacilityCatalog"] == len(facility_catalog)
+    assert records["CommercialInventoryCatalog/ComponentCatalog"] == len(component_catalog)
+    assert records["MediaReadCatalog/MediaEntity"] == len(media_entities)
+    assert records["MediaReadCatalog/EstatePictureType"] == len(picture_types)
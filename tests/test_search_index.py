@@ -0,0 +1,166 @@
+"""
+Indexgestützte Suchen müssen dieselben Treffer liefern wie ein vollständiger Durchlauf über den Cache
+"""
+from datetime import datetime
+
+import pytest
+
+from wowipy.cache import CacheStore
+from wowipy.intervals import is_active_on
+from wowipy.matching import check_person_match
+from wowipy.search_index import PHONE_TYPES, TokenPostings, normalize_phone
+from wowipy.wowipy import WowiPy
+
+ACTIVE_DAYS = [datetime(2010, 1, 1), datetime(2018, 6, 15), datetime(2023, 12, 31), datetime(2030, 1, 1)]
+
+
+def ids(entries) -> list:
+    return [entry.id_ for entry in entries]
+
+
+def idnum_segments(id_num: str) -> tuple:
+    return tuple(int(segment) for segment in id_num.split("."))
+
+
+def person_queries(persons) -> list:
+    queries = []
+    for person in persons[::15]:
+        last_name = person.natural_person.last_name if person.natural_person is not None else person.name
+        address = person.addresses[0]
+        queries.append({"search_name": last_name})
+        queries.append({"search_name": last_name[:3].lower()})
+        queries.append({"search_name": last_name[1:4]})
+        queries.append({"search_address": address.street})
+        queries.append({"search_name": last_name, "search_address": address.town})
+        for comm in person.communications or []:
+            if comm.communication_type.name in PHONE_TYPES:
+                queries.append({"search_phone": comm.content})
+            else:
+                queries.append({"search_email": comm.content.split("@")[0]})
+    return queries
+
+
+def brute_force_persons(persons, search_mode: str, **kwargs) -> list:
+    return [person for person in persons if check_person_match(person, search_mode=search_mode, **kwargs)]
+
+
+@pytest.mark.parametrize("search_mode", [WowiPy.SEARCH_POS_CONTAINS, WowiPy.SEARCH_POS_LEFT])
+def test_search_person_matches_full_scan(wowi, search_mode):
+    persons = wowi.get_cache(WowiPy.CACHE_PERSONS).entries
+    queries = person_queries(persons)
+    assert queries
+    for query in queries:
+        expected = brute_force_persons(persons, search_mode, **query)
+        found = wowi.search_person(max_results=len(persons), search_mode=search_mode, **query)
+        assert ids(found) == ids(expected), query
+
+
+def test_search_contractor_matches_full_scan(wowi):
+    contractors = wowi.get_cache(WowiPy.CACHE_CONTRACTORS).entries
+    for query in person_queries([contractor.person for contractor in contractors]):
+        expected = [contractor for contractor in contractors if check_person_match(contractor.person, **query)]
+        found = wowi.search_contractor(max_results=len(contractors), allow_duplicates=True, **query)
+        assert ids(found) == ids(expected), query
+
+
+def test_search_person_respects_max_results(wowi):
+    persons = wowi.get_cache(WowiPy.CACHE_PERSONS).entries
+    expected = brute_force_persons(persons, WowiPy.SEARCH_POS_CONTAINS, search_name="e")
+    assert len(expected) > 3
+    assert ids(wowi.search_person(search_name="e", max_results=3)) == ids(expected[:3])
+
+
+def test_search_phone_number_matches_full_scan(wowi):
+    persons = wowi.get_cache(WowiPy.CACHE_PERSONS).entries
+    numbers = [comm.content for person in persons for comm in person.communications or []
+               if comm.communication_type.name in PHONE_TYPES]
+    assert numbers
+    for number in numbers[::10]:
+        normalized = normalize_phone(number)
+        expected = [person for person in persons
+                    if any(comm.communication_type.name in PHONE_TYPES and normalize_phone(comm.content) == normalized
+                           for comm in person.communications or [])]
+        assert ids(wowi.search_phone_number(number, match_suffix=False)) == ids(expected)
+
+
+@pytest.mark.parametrize("cache_type, start_attr, end_attr, contractual_use", [
+    (WowiPy.CACHE_LICENSE_AGREEMENTS, "start_contract", "end_of_contract", False),
+    (WowiPy.CACHE_CONTRACTORS, "start_contract", "end_of_contract", False),
+    (WowiPy.CACHE_CONTRACTORS, "contractual_use_valid_from", "contractual_use_valid_to", True),
+])
+def test_get_active_on_matches_full_scan(wowi, cache_type, start_attr, end_attr, contractual_use):
+    entries = wowi.get_cache(cache_type).entries
+    for day in ACTIVE_DAYS:
+        expected = [entry for entry in entries
+                    if is_active_on(getattr(entry, start_attr), getattr(entry, end_attr), day)]
+        assert ids(wowi.get_active_on(cache_type, day, contractual_use=contractual_use)) == ids(expected)
+
+
+def test_get_tenants_active_on(wowi):
+    economic_unit = wowi.get_cache(WowiPy.CACHE_ECONOMIC_UNITS).entries[0]
+    tenants = wowi.get_tenants(economic_unit_id=economic_unit.id_)
+    assert tenants
+    for day in ACTIVE_DAYS:
+        expected = [tenant for tenant in tenants if is_active_on(tenant.start_contract, tenant.end_of_contract, day)]
+        assert ids(wowi.get_tenants(economic_unit_id=economic_unit.id_, active_on=day)) == ids(expected)
+
+
+def test_search_idnum_matches_full_scan(wowi):
+    use_units = wowi.get_cache(WowiPy.CACHE_USE_UNITS).entries
+    for prefix in ("00002", "00001.002", "00003.003.004", "00009"):
+        expected = sorted((entry for entry in use_units
+                           if entry.id_num == prefix or entry.id_num.startswith(prefix + ".")),
+                          key=lambda entry: idnum_segments(entry.id_num))
+        assert ids(wowi.search_idnum(prefix, [WowiPy.CACHE_USE_UNITS])[WowiPy.CACHE_USE_UNITS]) == ids(expected)
+
+
+def test_search_idnum_range_matches_full_scan(wowi):
+    use_units = wowi.get_cache(WowiPy.CACHE_USE_UNITS).entries
+    lower, upper = idnum_segments("00001.002"), idnum_segments("00002.001")
+    expected = sorted((entry for entry in use_units
+                       if lower <= idnum_segments(entry.id_num)
+                       and idnum_segments(entry.id_num)[:len(upper)] <= upper),
+                      key=lambda entry: idnum_segments(entry.id_num))
+    assert expected
+    found = wowi.search_idnum_range(WowiPy.CACHE_USE_UNITS, "00001.002", "00002.001")
+    assert ids(found) == ids(expected)
+
+
+@pytest.mark.parametrize("number", ["+49 351 123456", "+49 (0)351 123456", "+49 (0) 351 123456",
+                                    "0049 (351) 123456", "0351/123456", "(0351) 123456"])
+def test_normalize_phone(number):
+    assert normalize_phone(number) == "49351123456"
+
+
+def test_substring_memo_follows_needle():
+    postings = TokenPostings()
+    for position, token in enumerate(["meier", "meyer", "maier", "schmidt"]):
+        postings.add(token, position)
+    postings.finalize()
+    assert postings.substring("er") == {0, 1, 2}
+    assert postings.substring("ier") == {0, 2}
+    assert postings.substring("y") == {1}
+    assert postings.substring("mi") == {3}
+
+
+class CountingIndex:
+    def __init__(self) -> None:
+        self.builds = 0
+
+    def build(self, entries) -> None:
+        self.builds += 1
+
+
+def test_indexes_are_built_on_first_query():
+    store = CacheStore("test")
+    index = CountingIndex()
+    store.add_index("counting", index)
+    store.replace([])
+    assert index.builds == 0
+    assert store.index("counting") is index
+    store.index("counting")
+    assert index.builds == 1
+    store.replace([])
+    assert index.builds == 1
+    store.index("counting")
+    assert index.builds == 2
@@ -0,0 +1,73 @@
+"""
+Zähler von sync_cache bei Änderungen im Datenbestand des Mock-Servers
+"""
+import copy
+
+from wowipy.mock_server import EP_CONTRACTORS, EP_ECONOMIC_UNITS, EP_FACILITIES, EP_LICENSE_AGREEMENTS, EP_PERSONS
+from wowipy.wowipy import WowiPy
+
+
+def counts(result) -> tuple:
+    return result.fetched, result.inserted, result.updated, result.deleted, result.unchanged
+
+
+def test_sync_counts(fresh_server):
+    records = fresh_server.dataset.records[EP_PERSONS]
+    wowi = fresh_server.client()
+    total = len(records)
+
+    result = wowi.sync_cache(WowiPy.CACHE_PERSONS)
+    assert counts(result) == (total, total, 0, 0, 0)
+    assert len(wowi.get_cache(WowiPy.CACHE_PERSONS)) == total
+
+    result = wowi.sync_cache(WowiPy.CACHE_PERSONS)
+    assert counts(result) == (total, 0, 0, 0, total)
+    assert result.changed == 0
+
+    added = copy.deepcopy(records[0])
+    added["id"] = max(record["id"] for record in records) + 1
+    added["idNum"] = f"{added['id']:07d}"
+    changed = next(record for record in records if record["naturalPerson"] is not None)
+    changed["naturalPerson"]["lastName"] = "Geändert"
+    removed = records.pop(-10)
+    records.append(added)
+
+    result = wowi.sync_cache(WowiPy.CACHE_PERSONS)
+    assert counts(result) == (total, 1, 1, 1, total - 2)
+    store = wowi.get_cache(WowiPy.CACHE_PERSONS)
+    assert len(store) == total
+    assert store.get(changed["id"]).natural_person.last_name == "Geändert"
+    assert removed["id"] not in store
+    assert store.get_by_idnum(added["idNum"]).id_ == added["id"]
+    assert [entry.id_ for entry in wowi.search_person(search_name="geändert")] == [changed["id"]]
+
+
+def test_sync_routes_cache_types(fresh_server):
+    wowi = fresh_server.client()
+    for cache_type, endpoint in ((WowiPy.CACHE_LICENSE_AGREEMENTS, EP_LICENSE_AGREEMENTS),
+                                 (WowiPy.CACHE_ECONOMIC_UNITS, EP_ECONOMIC_UNITS),
+                                 (WowiPy.CACHE_CONTRACTORS, EP_CONTRACTORS)):
+        result = wowi.sync_cache(cache_type)
+        assert result.inserted == len(fresh_server.dataset.records[endpoint])
+        assert fresh_server.stats[f"GET {endpoint}"] >= 1
+
+
+def test_filtered_sync_keeps_other_records(fresh_server):
+    records = fresh_server.dataset.records[EP_FACILITIES]
+    wowi = fresh_server.client()
+    wowi.build_facility_cache()
+    total = len(records)
+    economic_unit_id = records[0]["economicUnitId"]
+    in_filter = len([record for record in records if record["economicUnitId"] == economic_unit_id])
+    assert 0 < in_filter < total
+
+    removed = records.pop(next(position for position, record in enumerate(records)
+                               if record["economicUnitId"] != economic_unit_id))
+    result = wowi.sync_cache(WowiPy.CACHE_FACILITIES, add_args={"economicUnitId": economic_unit_id})
+    assert (result.fetched, result.deleted) == (in_filter, 0)
+    assert len(wowi.get_cache(WowiPy.CACHE_FACILITIES)) == total
+    assert wowi.get_sync_state(WowiPy.CACHE_FACILITIES).last_sync is None
+
+    result = wowi.sync_cache(WowiPy.CACHE_FACILITIES)
+    assert (result.fetched, result.deleted) == (total - 1, 1)
+    assert removed["id"] not in wowi.get_cache(WowiPy.CACHE_FACILITIES)
@@ -0,0 +1,33 @@
+"""
+Tracing: ein Span je Methodenaufruf, keiner je Datensatz, keine Suchbegriffe in den Attributen
+"""
+from wowipy.tracing import InMemorySpanExporter
+
+
+def test_search_creates_one_span_without_search_terms(server):
+    wowi = server.client()
+    wowi.build_person_cache()
+    exporter = InMemorySpanExporter()
+    wowi.enable_tracing(exporter)
+    try:
+        found = wowi.search_person(search_name="e", search_phone="0351", max_results=50)
+    finally:
+        wowi.disable_tracing()
+    assert len(found) > 1
+    assert [span.name for span in exporter.spans] == ["WowiPy.search_person"]
+    attributes = exporter.spans[0].attributes
+    assert attributes["wowi.arg.max_results"] == 50
+    assert attributes["wowi.result_count"] == len(found)
+    assert "wowi.arg.search_name" not in attributes
+    assert "wowi.arg.search_phone" not in attributes
+
+
+def test_text_args_are_recorded_on_request(server):
+    wowi = server.client()
+    exporter = InMemorySpanExporter()
+    wowi.enable_tracing(exporter, record_text_args=True)
+    try:
+        wowi.search_person(search_name="e")
+    finally:
+        wowi.disable_tracing()
+    assert exporter.spans[0].attributes["wowi.arg.search_name"] == "e"
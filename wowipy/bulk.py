@@ -0,0 +1,368 @@
+"""
+Schreibende Massenoperationen über die OPENWOWI-API.
+
+BulkExecutor führt eine Liste von BulkOperation (HTTP-Methode, Endpunkt, Daten) mit begrenzter Parallelität aus.
+Alle Threads senden über eine gemeinsame requests.Session mit Connection-Pool, statt je Anfrage eine neue
+Verbindung aufzubauen. Vorübergehende Fehler werden mit exponentiellem Backoff wiederholt, fachliche Fehler (400,
+404 ...) nicht. Änderungen und Löschungen (PUT, DELETE) werden bei Verbindungsfehlern, Timeouts, 408, 429 und 5xx
+wiederholt. Anlagen (POST) nur, wenn sie den Server nachweislich nicht erreicht haben oder nicht verarbeitet wurden
+(Verbindungsaufbau gescheitert, 429, 503), sonst könnte eine doppelte Anlage entstehen. Jede Operation liefert ein
+BulkResult in der Reihenfolge der Eingabe, ein Fehler bricht den Lauf nicht ab.
+
+Operationen mit derselben Gruppe (z.B. alle Komponenten einer Ausstattung) laufen nacheinander in einem Thread,
+verschiedene Gruppen parallel. Eine Operation mit parent wird erst nach ihrem parent ausgeführt und erhält dessen neue
+Id über den Platzhalter {parent_id} im Endpunkt. Optional begrenzt ein RateLimiter die Anfragen je Sekunde über alle
+Threads.
+
+    results = wowi.bulk_communications([
+        CommunicationOperation(CommunicationOperation.EDIT, person_id=1, communication_id=2, content="a@b.de"),
+        CommunicationOperation(CommunicationOperation.DELETE, person_id=3, communication_id=4),
+    ])
+    failed = [result for result in results if not result.success]
+"""
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Union
+
+import requests
+import requests.adapters
+import urllib3.exceptions
+
+from wowipy.exceptions import WowiPyException
+from wowipy.progress import ProgressTracker
+from wowipy.rest_adapter import RestAdapter
+
+TRANSIENT_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+# Status, bei denen der Server die Anfrage nicht verarbeitet hat
+NOT_PROCESSED_STATUS = frozenset({429, 503})
+
+
+class BulkOperation:
+    """
+    Eine schreibende Anfrage
+    :param method: HTTP-Methode (POST, PUT, DELETE)
+    :param endpoint: Endpunkt relativ zur API-Version, z.B. PersonsWrite/Person/1/Communications
+    :param data: (Optional) JSON-Body
+    :param source: (Optional) Ursprüngliche Operation des Aufrufers, z.B. eine CommunicationOperation
+    :param group: (Optional) Operationen derselben Gruppe laufen nacheinander in der Reihenfolge der Eingabe
+    :param parent: (Optional) Operation derselben Gruppe, deren neue Id ({parent_id}) im Endpunkt verwendet wird
+    """
+
+    def __init__(self, method: str, endpoint: str, data: Dict = None, source=None, group=None,
+                 parent: "BulkOperation" = None) -> None:
+        self.method = method
+        self.endpoint = endpoint
+        self.data = data if data is not None else {}
+        self.source = source
+        self.group = group
+        self.parent = parent
+
+    def __repr__(self):
+        return f"{self.method} {self.endpoint}"
+
+
+class BulkResult:
+    """
+    Ergebnis einer BulkOperation
+    """
+    operation: BulkOperation
+    endpoint: str
+    success: bool
+    status_code: Optional[int]
+    data: object
+    error: Optional[Exception]
+    attempts: int
+    elapsed: float
+
+    def __init__(self, operation: BulkOperation, success: bool, status_code: int = None, data=None,
+                 error: Exception = None, attempts: int = 1, elapsed: float = 0.0, endpoint: str = None) -> None:
+        self.operation = operation
+        # Endpunkt mit eingesetzter {parent_id}
+        self.endpoint = endpoint if endpoint is not None else operation.endpoint
+        self.success = success
+        self.status_code = status_code
+        self.data = data
+        self.error = error
+        self.attempts = attempts
+        self.elapsed = elapsed
+
+    @property
+    def source(self):
+        return self.operation.source
+
+    def __repr__(self):
+        state = "OK" if self.success else f"Fehler {self.error}"
+        # Nicht gesendete Operationen (z.B. unbekannter Katalogeintrag) haben keinen Endpunkt
+        target = f"{self.operation.method} {self.endpoint}" if self.operation.method else repr(self.source)
+        return f"{target}: {self.status_code} {state} ({self.attempts} Versuche)"
+
+
+class CommunicationOperation:
+    """
+    Anlegen, Ändern oder Löschen einer Kommunikation (E-Mail, Telefon ...) einer Person für
+    WowiPy.bulk_communications(). Die Felder entsprechen create_communication() bzw. edit_communication().
+    """
+    CREATE = "create"
+    EDIT = "edit"
+    DELETE = "delete"
+
+    def __init__(self, action: str, person_id: int, communication_id: int = None, communication_type_id: int = None,
+                 related_address_id: int = None, content: str = None, explanation: str = None) -> None:
+        if action not in (self.CREATE, self.EDIT, self.DELETE):
+            raise WowiPyException(f"Unbekannte Aktion {action}")
+        if action != self.CREATE and communication_id is None:
+            raise WowiPyException(f"communication_id fehlt für {action}")
+        self.action = action
+        self.person_id = person_id
+        self.communication_id = communication_id
+        self.communication_type_id = communication_type_id
+        self.related_address_id = related_address_id
+        self.content = content
+        self.explanation = explanation
+
+    def __repr__(self):
+        return f"CommunicationOperation {self.action} Person {self.person_id} ({self.communication_id})"
+
+
+class ComponentOperation:
+    """
+    Anlegen, Ändern oder Löschen einer Komponente für WowiPy.bulk_facilities(). Die Felder entsprechen
+    create_component() bzw. edit_component(), component_catalog ist die Id oder der Name des Katalogeintrags.
+    Innerhalb einer FacilityOperation kann facility_id entfallen.
+    """
+    CREATE = "create"
+    EDIT = "edit"
+    DELETE = "delete"
+
+    def __init__(self, action: str, facility_id: int = None, component_id: int = None, name: str = None,
+                 count: int = None, component_status_id: int = None, component_catalog: Union[int, str] = None,
+                 repair_relevance: bool = None, lease_relevance: bool = None, comment: str = None,
+                 acquisition_date: str = None, warranty_period: str = None, warranty_end: str = None,
+                 warranty_conditions: str = None, position: str = None, valid_from: str = None,
+                 valid_to: str = None, under_component_ids: List[int] = None) -> None:
+        if action not in (self.CREATE, self.EDIT, self.DELETE):
+            raise WowiPyException(f"Unbekannte Aktion {action}")
+        if action != self.CREATE and component_id is None:
+            raise WowiPyException(f"component_id fehlt für {action}")
+        if action != self.DELETE and (name is None or count is None or component_status_id is None or
+                                      component_catalog is None):
+            raise WowiPyException(f"name, count, component_status_id und component_catalog fehlen für {action}")
+        self.action = action
+        self.facility_id = facility_id
+        self.component_id = component_id
+        self.name = name
+        self.count = count
+        self.component_status_id = component_status_id
+        self.component_catalog = component_catalog
+        self.repair_relevance = repair_relevance
+        self.lease_relevance = lease_relevance
+        self.comment = comment
+        self.acquisition_date = acquisition_date
+        self.warranty_period = warranty_period
+        self.warranty_end = warranty_end
+        self.warranty_conditions = warranty_conditions
+        self.position = position
+        self.valid_from = valid_from
+        self.valid_to = valid_to
+        self.under_component_ids = under_component_ids
+
+    def __repr__(self):
+        return f"ComponentOperation {self.action} {self.name} ({self.component_id}, Ausstattung {self.facility_id})"
+
+
+class FacilityOperation:
+    """
+    Anlegen oder Ändern einer Ausstattung für WowiPy.bulk_facilities(). Die Felder entsprechen create_facility()
+    bzw. edit_facility(), facility_catalog ist die Id oder der Name des Katalogeintrags. components werden nach der
+    Ausstattung angelegt bzw. geändert und erhalten deren Id.
+    """
+    CREATE = "create"
+    EDIT = "edit"
+
+    def __init__(self, action: str, name: str, count: int, facility_catalog: Union[int, str],
+                 facility_id: int = None, facility_status_id: int = 3, building_id: int = None,
+                 economic_unit_id: int = None, use_unit_id: int = None, property_id: int = None,
+                 inactive: bool = False, components: List[ComponentOperation] = None) -> None:
+        if action not in (self.CREATE, self.EDIT):
+            raise WowiPyException(f"Unbekannte Aktion {action}")
+        if action == self.EDIT and facility_id is None:
+            raise WowiPyException(f"facility_id fehlt für {action}")
+        components = components or []
+        if action == self.CREATE and any(component.action != ComponentOperation.CREATE for component in components):
+            raise WowiPyException("Zu einer neuen Ausstattung können Komponenten nur angelegt werden")
+        self.action = action
+        self.name = name
+        self.count = count
+        self.facility_catalog = facility_catalog
+        self.facility_id = facility_id
+        self.facility_status_id = facility_status_id
+        self.building_id = building_id
+        self.economic_unit_id = economic_unit_id
+        self.use_unit_id = use_unit_id
+        self.property_id = property_id
+        self.inactive = inactive
+        self.components = components
+
+    def __repr__(self):
+        return f"FacilityOperation {self.action} {self.name} ({self.facility_id})"
+
+
+class RateLimiter:
+    """
+    Begrenzt die Anfragen aller Threads auf rate je Sekunde, indem die Anfragen gleichmäßig verteilt werden
+    :param rate: Anfragen je Sekunde
+    """
+
+    def __init__(self, rate: float) -> None:
+        if rate <= 0:
+            raise WowiPyException("rate muss größer 0 sein")
+        self.interval = 1.0 / rate
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def _not_sent(error: Exception) -> bool:
+    # Nur ein gescheiterter Verbindungsaufbau beweist, dass die Anfrage den Server nicht erreicht hat. Ein Abbruch
+    # oder Timeout danach kann nach der Verarbeitung auf dem Server passiert sein.
+    cause = error.__cause__ if isinstance(error, WowiPyException) else error
+    if isinstance(cause, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(cause, requests.exceptions.ConnectionError) and cause.args:
+        reason = getattr(cause.args[0], 'reason', cause.args[0])
+        return isinstance(reason, (urllib3.exceptions.NewConnectionError, urllib3.exceptions.ConnectTimeoutError))
+    return False
+
+
+def is_transient(error: Exception, method: str = "PUT") -> bool:
+    """
+    True für Fehler, bei denen eine Wiederholung sinnvoll und sicher ist. PUT und DELETE: Verbindungsabbrüche,
+    Timeouts, 408, 429 und 5xx. POST: nur 429, 503 und gescheiterter Verbindungsaufbau.
+    """
+    status_code = getattr(error, 'status_code', None)
+    if method.upper() == "POST":
+        if status_code is not None:
+            return status_code in NOT_PROCESSED_STATUS
+        return _not_sent(error)
+    if status_code is not None:
+        return status_code in TRANSIENT_STATUS
+    cause = error.__cause__ if isinstance(error, WowiPyException) else error
+    return isinstance(cause, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+class BulkExecutor:
+    """
+    Führt BulkOperations parallel über eine gemeinsame Session aus
+    :param rest_adapter: RestAdapter der WowiPy-Instanz (Login, Token-Refresh, Hooks und Tracing)
+    :param max_workers: Anzahl gleichzeitiger Anfragen, zugleich Größe des Connection-Pools
+    :param max_retries: Wiederholungen je Operation bei vorübergehenden Fehlern
+    :param backoff: Wartezeit vor der ersten Wiederholung in Sekunden, verdoppelt sich je Versuch (mit Jitter)
+    :param max_backoff: Obergrenze der Wartezeit in Sekunden
+    :param rate_limit: (Optional) Höchstens so viele Anfragen je Sekunde, inkl. Wiederholungen
+    :param timeout: Timeout je Anfrage in Sekunden, damit eine hängende Verbindung keinen Worker blockiert
+    """
+
+    def __init__(self, rest_adapter: RestAdapter, max_workers: int = 8, max_retries: int = 3, backoff: float = 0.5,
+                 max_backoff: float = 30.0, rate_limit: float = None, timeout: float = 60.0) -> None:
+        if max_workers < 1:
+            raise WowiPyException("max_workers muss mindestens 1 sein")
+        self.rest_adapter = rest_adapter
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.timeout = timeout
+
+    def _session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _delay(self, attempt: int) -> float:
+        return min(self.backoff * 2 ** attempt, self.max_backoff) * random.uniform(0.5, 1.0)
+
+    def execute(self, operation: BulkOperation, session: requests.Session = None,
+                parent_result: BulkResult = None) -> BulkResult:
+        """
+        Führt eine einzelne Operation inkl. Wiederholungen aus, Fehler werden im Ergebnis zurückgegeben
+        :param parent_result: Ergebnis von operation.parent, liefert {parent_id}
+        """
+        start = time.perf_counter()
+        endpoint = operation.endpoint
+        if operation.parent is not None:
+            if parent_result is None or not parent_result.success:
+                return BulkResult(operation, False, error=WowiPyException(
+                    f"Nicht ausgeführt, {operation.parent!r} fehlgeschlagen"), attempts=0)
+            parent_id = parent_result.data.get("id") if isinstance(parent_result.data, dict) else None
+            if parent_id is None or isinstance(parent_id, bool) or not isinstance(parent_id, (int, str)):
+                return BulkResult(operation, False, error=WowiPyException(
+                    f"Nicht ausgeführt, {operation.parent!r} lieferte keine Id: {parent_result.data!r}"), attempts=0)
+            endpoint = endpoint.format(parent_id=parent_id)
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                # Wiederholungen und Wartezeiten steuert allein der Executor, damit attempts jede Anfrage zählt
+                result = self.rest_adapter.request(operation.method, endpoint, data=operation.data, session=session,
+                                                   timeout=self.timeout, retry=False)
+            except Exception as e:
+                if attempt <= self.max_retries and is_transient(e, operation.method):
+                    time.sleep(self._delay(attempt - 1))
+                    continue
+                return BulkResult(operation, False, getattr(e, 'status_code', None), error=e, attempts=attempt,
+                                  elapsed=time.perf_counter() - start, endpoint=endpoint)
+            return BulkResult(operation, True, result.status_code, result.data, attempts=attempt,
+                              elapsed=time.perf_counter() - start, endpoint=endpoint)
+
+    def _execute_group(self, operations: List[BulkOperation], session: requests.Session) -> List[BulkResult]:
+        results = {}
+        for operation in operations:
+            parent_result = results.get(id(operation.parent)) if operation.parent is not None else None
+            try:
+                results[id(operation)] = self.execute(operation, session, parent_result)
+            except Exception as e:
+                # Ein unerwarteter Fehler betrifft nur diese Operation, nicht den ganzen Lauf
+                results[id(operation)] = BulkResult(operation, False, error=e, attempts=0)
+        return [results[id(operation)] for operation in operations]
+
+    def run(self, operations: List[BulkOperation], progress: ProgressTracker = None) -> List[BulkResult]:
+        """
+        Führt alle Operationen aus
+        :param operations: Operationen, nur innerhalb einer Gruppe ist die Reihenfolge der Ausführung garantiert
+        :param progress: (Optional) Tracker, erhält je abgeschlossener Operation eine Zeile
+        :returns: Ein BulkResult je Operation in der Reihenfolge von operations
+        :rtype: List[BulkResult]
+        """
+        groups: Dict[object, List[int]] = {}
+        for index, operation in enumerate(operations):
+            groups.setdefault(operation.group if operation.group is not None else ("index", index), []).append(index)
+        results: List[Optional[BulkResult]] = [None] * len(operations)
+        with self._session() as session, ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # Jede Gruppe läuft im Kontext des Aufrufers, damit HTTP-Spans unter dem aktuellen Span liegen
+            futures = {pool.submit(contextvars.copy_context().run, self._execute_group,
+                                   [operations[index] for index in indexes], session): indexes
+                       for indexes in groups.values()}
+            for future in as_completed(futures):
+                indexes = futures[future]
+                for index, result in zip(indexes, future.result()):
+                    results[index] = result
+                if progress is not None:
+                    progress.update(len(indexes), pages=0)
+        if progress is not None:
+            progress.finish()
+        return results
@@ -0,0 +1,293 @@
+import pickle
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Iterable
+from wowipy.exceptions import WowiPyException
+from wowipy.persistence import FILE_FORMAT_WOWIPY, FILE_FORMAT_PICKLE, is_cache_file, read_cache_file, \
+    write_cache_file
+
+
+class CacheStore:
+    """
+    Cache für einen Entitätstyp (z.B. Nutzungseinheiten) mit Index über id_ und id_num.
+
+    Zusätzliche Indizes können über add_index registriert werden. Ein Index ist ein Objekt mit einer Methode
+    build(entries). Indizes werden erst beim ersten Zugriff über index() aufgebaut und nach Änderungen (replace,
+    upsert, retain) beim nächsten Zugriff neu. Indizes, die nie abgefragt werden, kosten so weder Zeit beim Laden
+    noch Speicher. build_indexes baut alle veralteten Indizes vorab auf (z.B. vor dem Forken von Workern).
+
+    version wird bei jeder Änderung erhöht, sodass abgeleitete Strukturen (z.B. Shards für die parallele Suche)
+    veraltete Stände erkennen.
+    """
+    cache_type: str
+    built_at: Optional[datetime]
+    version: int
+
+    def __init__(self, cache_type: str, entries: List = None) -> None:
+        self.cache_type = cache_type
+        self.built_at = None
+        self.version = 0
+        self._entries = []
+        self._by_id = {}
+        self._by_idnum = {}
+        self._indexes = {}
+        self._dirty_indexes = set()
+        self._index_lock = threading.Lock()
+        if entries is not None:
+            self.replace(entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, id_) -> bool:
+        return id_ in self._by_id
+
+    def __repr__(self):
+        return f"CacheStore {self.cache_type} ({len(self._entries)} entries, built {self.built_at})"
+
+    @property
+    def entries(self) -> List:
+        return self._entries
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+    def ids(self) -> Iterable:
+        return self._by_id.keys()
+
+    def get(self, id_):
+        position = self._by_id.get(id_)
+        if position is None:
+            return None
+        return self._entries[position]
+
+    def get_by_idnum(self, id_num: str):
+        position = self._by_idnum.get(id_num)
+        if position is None:
+            return None
+        return self._entries[position]
+
+    def replace(self, entries: List) -> None:
+        """
+        Ersetzt den kompletten Inhalt (z.B. nach build_*_cache) und setzt den Build-Zeitstempel
+        """
+        self._entries = list(entries)
+        self._reindex()
+        self.built_at = datetime.now()
+
+    def clear(self) -> None:
+        self._entries = []
+        self._reindex()
+        self.built_at = None
+
+    def upsert(self, entry) -> bool:
+        """
+        Fügt einen Eintrag hinzu oder ersetzt den Eintrag mit gleicher id_
+        :return: True, wenn der Eintrag neu ist
+        :rtype: bool
+        """
+        id_ = getattr(entry, 'id_', None)
+        position = self._by_id.get(id_) if id_ is not None else None
+        if position is None:
+            position = len(self._entries)
+            self._entries.append(entry)
+            inserted = True
+        else:
+            old_idnum = getattr(self._entries[position], 'id_num', None)
+            if old_idnum is not None and self._by_idnum.get(old_idnum) == position:
+                del self._by_idnum[old_idnum]
+            self._entries[position] = entry
+            inserted = False
+        if id_ is not None:
+            self._by_id[id_] = position
+        id_num = getattr(entry, 'id_num', None)
+        if id_num is not None:
+            self._by_idnum[id_num] = position
+        self._dirty_indexes.update(self._indexes.keys())
+        self.version += 1
+        return inserted
+
+    def retain(self, keep_ids) -> List:
+        """
+        Entfernt alle Einträge, deren id_ nicht in keep_ids enthalten ist
+        :return: Liste der entfernten Einträge
+        :rtype: List
+        """
+        kept = []
+        removed = []
+        for entry in self._entries:
+            if getattr(entry, 'id_', None) in keep_ids:
+                kept.append(entry)
+            else:
+                removed.append(entry)
+        if removed:
+            self._entries = kept
+            self._reindex()
+        return removed
+
+    def add_index(self, name: str, index) -> None:
+        self._indexes[name] = index
+        self._dirty_indexes.add(name)
+
+    def build_indexes(self) -> None:
+        with self._index_lock:
+            for name in list(self._dirty_indexes):
+                self._indexes[name].build(self._entries)
+            self._dirty_indexes.clear()
+
+    def has_index(self, name: str) -> bool:
+        return name in self._indexes
+
+    def index(self, name: str):
+        index = self._indexes.get(name)
+        if index is None:
+            return None
+        if name in self._dirty_indexes:
+            with self._index_lock:
+                if name in self._dirty_indexes:
+                    index.build(self._entries)
+                    self._dirty_indexes.discard(name)
+        return index
+
+    def _reindex(self) -> None:
+        self.version += 1
+        self._by_id = {}
+        self._by_idnum = {}
+        for position, entry in enumerate(self._entries):
+            id_ = getattr(entry, 'id_', None)
+            if id_ is not None:
+                self._by_id[id_] = position
+            id_num = getattr(entry, 'id_num', None)
+            if id_num is not None:
+                self._by_idnum[id_num] = position
+        self._dirty_indexes.update(self._indexes.keys())
+
+    def to_disk(self, file_name: str, file_format: str = FILE_FORMAT_WOWIPY) -> None:
+        if file_format == FILE_FORMAT_WOWIPY:
+            write_cache_file(file_name, [(self.cache_type, self.built_at, self._entries)])
+            return
+        if file_format != FILE_FORMAT_PICKLE:
+            raise WowiPyException(f"Unknown file format '{file_format}'")
+        payload = {
+            'cache_type': self.cache_type,
+            'built_at': self.built_at,
+            'entries': self._entries
+        }
+        with open(file_name, 'wb') as fp:
+            pickle.dump(payload, fp, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def from_disk(self, file_name: str) -> None:
+        if is_cache_file(file_name):
+            built_at, entries = read_cache_file(file_name, [self.cache_type]).get(self.cache_type)
+            self.replace(entries)
+            self.built_at = built_at
+            return
+        with open(file_name, 'rb') as fp:
+            payload = pickle.load(fp)
+        # Ältere Cache-Dateien enthalten nur die Liste der Einträge
+        if isinstance(payload, list):
+            self.replace(payload)
+            return
+        if payload.get('cache_type') != self.cache_type:
+            raise WowiPyException(f"Cache file contains '{payload.get('cache_type')}', expected '{self.cache_type}'")
+        self.replace(payload.get('entries'))
+        self.built_at = payload.get('built_at')
+
+
+class CacheRegistry:
+    """
+    Sammlung der CacheStores je Entitätstyp. Zuweisen einer Liste (registry[typ] = liste) ersetzt den Inhalt
+    des jeweiligen Stores.
+
+    Ist ein Backend (siehe cache_backends) gesetzt, wird jeder neu zugewiesene Stand veröffentlicht, und beim Zugriff
+    auf einen Store wird (höchstens alle check_interval Sekunden) geprüft, ob ein anderer Prozess einen neueren Stand
+    veröffentlicht hat.
+    """
+
+    def __init__(self, cache_types: List[str] = None, backend=None, check_interval: float = 1.0) -> None:
+        self._stores: Dict[str, CacheStore] = {}
+        self.backend = backend
+        self.check_interval = check_interval
+        self._generations = {}
+        self._last_check = {}
+        if cache_types is not None:
+            for cache_type in cache_types:
+                self.register(cache_type)
+
+    def _pull(self, cache_type: str) -> None:
+        now = time.monotonic()
+        if now - self._last_check.get(cache_type, -self.check_interval) < self.check_interval:
+            return
+        self._last_check[cache_type] = now
+        generation = self.backend.generation(cache_type)
+        if generation is None or generation == self._generations.get(cache_type):
+            return
+        fetched = self.backend.fetch(cache_type)
+        if fetched is None:
+            return
+        built_at, entries, generation = fetched
+        store = self._stores[cache_type]
+        store.replace(entries)
+        store.built_at = built_at
+        self._generations[cache_type] = generation
+
+    def publish(self, cache_type: str) -> None:
+        """
+        Veröffentlicht den aktuellen Stand eines Stores über das Backend (ohne Backend wirkungslos)
+        """
+        if self.backend is None:
+            return
+        store = self[cache_type]
+        self.backend.publish(cache_type, store.built_at, store.entries)
+        self._generations[cache_type] = self.backend.generation(cache_type)
+        self._last_check[cache_type] = time.monotonic()
+
+    def register(self, cache_type: str) -> CacheStore:
+        store = self._stores.get(cache_type)
+        if store is None:
+            store = CacheStore(cache_type)
+            self._stores[cache_type] = store
+        return store
+
+    def __getitem__(self, cache_type: str) -> CacheStore:
+        store = self._stores.get(cache_type)
+        if store is None:
+            raise WowiPyException("Unknown Cache Type")
+        if self.backend is not None:
+            self._pull(cache_type)
+        return store
+
+    def __setitem__(self, cache_type: str, entries: List) -> None:
+        store = self._stores.get(cache_type)
+        if store is None:
+            raise WowiPyException("Unknown Cache Type")
+        store.replace(entries)
+        self.publish(cache_type)
+
+    def __contains__(self, cache_type: str) -> bool:
+        return cache_type in self._stores
+
+    def __iter__(self):
+        return iter(self._stores)
+
+    def get(self, cache_type: str) -> Optional[CacheStore]:
+        if cache_type not in self._stores:
+            return None
+        return self[cache_type]
+
+    def keys(self):
+        return self._stores.keys()
+
+    def items(self):
+        return self._stores.items()
+
+    def built(self) -> List[CacheStore]:
+        """
+        Alle Stores, die bereits befüllt wurden
+        """
+        return [self[cache_type] for cache_type in self._stores.keys() if self[cache_type].built_at is not None]
@@ -0,0 +1,231 @@
+"""
+Backends, über die mehrere Prozesse (z.B. gunicorn-Worker) einen Cache gemeinsam nutzen.
+
+Ein Prozess baut den Cache auf (build_*_cache oder sync_cache) und veröffentlicht ihn über das Backend. Alle
+anderen Prozesse erkennen über eine Generationskennung, dass ein neuer Stand vorliegt, und laden ihn beim nächsten
+Zugriff, statt selbst die API abzufragen. Mit acquire_refresh/release_refresh lässt sich sicherstellen, dass nur
+ein Prozess gleichzeitig aktualisiert.
+
+Einschränkung: Geteilt werden der Abruf und die serialisierten Daten, nicht die Objekte. Jeder Prozess dekodiert den
+veröffentlichten Stand und hält eine eigene Kopie aller Model-Objekte samt Indexen, der Speicherbedarf wächst also
+weiterhin mit der Anzahl Worker. Wer nur lesend auf Felder zugreift, kann stattdessen mit WowiPy.cache_to_table eine
+Spaltentabelle schreiben und sie in allen Workern mit WowiPy.open_cache_table per mmap öffnen; diese liegt nur einmal
+im Page Cache.
+"""
+import os
+import mmap
+import tempfile
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+from wowipy.persistence import dumps_cache, loads_cache
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: Sperre über msvcrt.locking
+    fcntl = None
+    import msvcrt
+
+# Vergleichen und Löschen in einem Schritt, damit keine inzwischen neu vergebene Sperre entfernt wird
+_RELEASE_LOCK_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+
+def _try_lock(fd: int) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class CacheBackend:
+    """
+    Schnittstelle für gemeinsam genutzte Cache-Backends
+    """
+
+    def publish(self, cache_type: str, built_at: Optional[datetime], entries: List) -> None:
+        raise NotImplementedError
+
+    def generation(self, cache_type: str) -> Optional[str]:
+        """
+        Kennung des aktuell veröffentlichten Stands, None wenn noch nichts veröffentlicht wurde
+        """
+        raise NotImplementedError
+
+    def fetch(self, cache_type: str) -> Optional[Tuple[Optional[datetime], List, str]]:
+        """
+        Veröffentlichter Stand als (built_at, entries, generation), None wenn noch nichts veröffentlicht wurde
+        """
+        raise NotImplementedError
+
+    def acquire_refresh(self, cache_type: str, ttl: int = 3600) -> bool:
+        """
+        Versucht, die Aktualisierungssperre für cache_type zu erhalten. Die Sperre verfällt nach ttl Sekunden, falls
+        sie nicht freigegeben wird (bei Backends, deren Sperre nicht ohnehin mit dem Prozess endet).
+        """
+        raise NotImplementedError
+
+    def release_refresh(self, cache_type: str) -> None:
+        raise NotImplementedError
+
+
+class DirectoryCacheBackend(CacheBackend):
+    """
+    Gemeinsamer Cache in einem lokalen Verzeichnis für alle Prozesse auf demselben Host. Jeder Cache-Typ liegt in
+    einer eigenen Datei, die atomar ersetzt wird. Gelesen wird per mmap, die Einträge werden aber in jedem Prozess
+    in eigene Model-Objekte dekodiert (siehe Modul-Docstring, Alternative: cache_to_table/open_cache_table).
+
+    Die Aktualisierungssperre ist eine Betriebssystem-Sperre (flock bzw. msvcrt.locking) auf einer dauerhaft
+    vorhandenen Sperrdatei. Sie wird beim Ende des Prozesses automatisch freigegeben, ttl wird daher nicht benötigt.
+    """
+
+    def __init__(self, directory: str, codec: str = None, compression: str = None) -> None:
+        self.directory = directory
+        self.codec = codec
+        self.compression = compression
+        os.makedirs(directory, exist_ok=True)
+        self._lock_fds = {}
+
+    def _path(self, cache_type: str) -> str:
+        return os.path.join(self.directory, f"{cache_type}.wcache")
+
+    def _lock_path(self, cache_type: str) -> str:
+        return os.path.join(self.directory, f"{cache_type}.lock")
+
+    @staticmethod
+    def _generation_of(stat_result) -> str:
+        return f"{stat_result.st_ino}-{stat_result.st_mtime_ns}-{stat_result.st_size}"
+
+    def publish(self, cache_type: str, built_at: Optional[datetime], entries: List) -> None:
+        raw = dumps_cache([(cache_type, built_at, entries)], codec=self.codec, compression=self.compression)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{cache_type}.", dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(raw)
+            os.replace(tmp_name, self._path(cache_type))
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
+
+    def generation(self, cache_type: str) -> Optional[str]:
+        try:
+            return self._generation_of(os.stat(self._path(cache_type)))
+        except FileNotFoundError:
+            return None
+
+    def fetch(self, cache_type: str) -> Optional[Tuple[Optional[datetime], List, str]]:
+        try:
+            fp = open(self._path(cache_type), 'rb')
+        except FileNotFoundError:
+            return None
+        with fp:
+            generation = self._generation_of(os.fstat(fp.fileno()))
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                built_at, entries = loads_cache(mm, [cache_type]).get(cache_type)
+        return built_at, entries, generation
+
+    def acquire_refresh(self, cache_type: str, ttl: int = 3600) -> bool:
+        if cache_type in self._lock_fds:
+            return False
+        # Die Sperrdatei wird nie gelöscht: sonst könnte ein Prozess die Datei sperren, die ein anderer gerade
+        # entfernt, und beide hielten die Sperre
+        fd = os.open(self._lock_path(cache_type), os.O_CREAT | os.O_RDWR, 0o644)
+        if not _try_lock(fd):
+            os.close(fd)
+            return False
+        self._lock_fds[cache_type] = fd
+        return True
+
+    def release_refresh(self, cache_type: str) -> None:
+        fd = self._lock_fds.pop(cache_type, None)
+        if fd is None:
+            return
+        try:
+            _unlock(fd)
+        finally:
+            os.close(fd)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Gemeinsamer Cache in einem Redis-kompatiblen Key-Value-Store (Redis, Valkey, KeyDB, ...). Erwartet wird ein
+    Client-Objekt mit get, set (inkl. nx/ex) und delete, z.B. redis.Redis. Es besteht keine harte
+    Abhängigkeit zum redis-Paket. Jeder Prozess dekodiert den Stand in eigene Model-Objekte, der Speicher wird also
+    nicht zwischen den Prozessen geteilt.
+
+    release_refresh gibt die Sperre per Lua-Skript (eval) nur frei, wenn sie noch diesem Prozess gehört. Bietet der
+    Client kein eval, wird mit get und delete in zwei Schritten freigegeben: Läuft die Sperre genau dazwischen ab
+    und wird neu vergeben, wird die fremde Sperre gelöscht.
+    """
+
+    def __init__(self, client, prefix: str = "wowipy:", codec: str = None, compression: str = None) -> None:
+        self.client = client
+        self.prefix = prefix
+        self.codec = codec
+        self.compression = compression
+        self._lock_tokens = {}
+
+    def _key(self, cache_type: str, suffix: str) -> str:
+        return f"{self.prefix}{cache_type}:{suffix}"
+
+    @staticmethod
+    def _text(value) -> Optional[str]:
+        if value is None:
+            return None
+        if isinstance(value, bytes):
+            return value.decode('utf-8')
+        return str(value)
+
+    def publish(self, cache_type: str, built_at: Optional[datetime], entries: List) -> None:
+        raw = dumps_cache([(cache_type, built_at, entries)], codec=self.codec, compression=self.compression)
+        # Daten und Generation werden unter einem gemeinsamen Generationsschlüssel abgelegt, damit Leser nie eine
+        # Generation mit den Daten einer anderen erhalten
+        generation = uuid.uuid4().hex
+        self.client.set(self._key(cache_type, f"data:{generation}"), raw)
+        previous = self._text(self.client.get(self._key(cache_type, "gen")))
+        self.client.set(self._key(cache_type, "gen"), generation)
+        if previous is not None:
+            self.client.delete(self._key(cache_type, f"data:{previous}"))
+
+    def generation(self, cache_type: str) -> Optional[str]:
+        return self._text(self.client.get(self._key(cache_type, "gen")))
+
+    def fetch(self, cache_type: str) -> Optional[Tuple[Optional[datetime], List, str]]:
+        generation = self.generation(cache_type)
+        if generation is None:
+            return None
+        raw = self.client.get(self._key(cache_type, f"data:{generation}"))
+        if raw is None:
+            return None
+        built_at, entries = loads_cache(raw, [cache_type]).get(cache_type)
+        return built_at, entries, generation
+
+    def acquire_refresh(self, cache_type: str, ttl: int = 3600) -> bool:
+        token = uuid.uuid4().hex
+        if self.client.set(self._key(cache_type, "lock"), token, nx=True, ex=ttl):
+            self._lock_tokens[cache_type] = token
+            return True
+        return False
+
+    def release_refresh(self, cache_type: str) -> None:
+        token = self._lock_tokens.pop(cache_type, None)
+        if token is None:
+            return
+        lock_key = self._key(cache_type, "lock")
+        if hasattr(self.client, "eval"):
+            self.client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        elif self._text(self.client.get(lock_key)) == token:
+            self.client.delete(lock_key)
@@ -0,0 +1,400 @@
+"""
+Spaltenorientiertes Cache-Format zum direkten Lesen per mmap.
+
+Ein ColumnarTable wird nicht in Python-Objekte zurückverwandelt, sondern direkt im gemappten Speicher abgefragt.
+Mehrere Prozesse, die dieselbe Datei öffnen, teilen sich dadurch eine physische Kopie über den Page Cache, und das
+Öffnen kostet unabhängig von der Größe nur das Lesen des Headers.
+
+Aufbau:
+    MAGIC (8 Byte) | Header-Länge (uint32) | Header (JSON) | Padding | Spalten | ID-Index | String-Heap
+
+Spaltentypen:
+    int   - int64, None wird als INT_NULL gespeichert
+    float - float64, None wird als NaN gespeichert
+    date  - int32 (Tage seit 01.01.0001, 0 = None)
+    str   - je Zeile uint32 Offset und uint32 Länge in den String-Heap (Länge STR_NULL = None)
+
+Der ID-Index ist ein nach id sortiertes int64-Array mit zugehörigem Zeilen-Array und wird per Binärsuche
+durchsucht.
+"""
+import json
+import math
+import mmap
+import struct
+import sys
+from bisect import bisect_left
+from datetime import date, datetime
+from typing import Callable, Dict, List, Tuple, Union
+from wowipy.exceptions import WowiPyException
+from wowipy.persistence import atomic_write
+
+MAGIC = b"WOWIPYT\x00"
+FORMAT_VERSION = 1
+
+KIND_INT = "int"
+KIND_FLOAT = "float"
+KIND_DATE = "date"
+KIND_STR = "str"
+
+INT_NULL = -2 ** 63
+STR_NULL = 0xFFFFFFFF
+
+_HEADER_LEN = struct.Struct("<I")
+_TYPECODES = {
+    KIND_INT: 'q',
+    KIND_FLOAT: 'd',
+    KIND_DATE: 'i'
+}
+
+
+def attr_path(path: str) -> Callable:
+    """
+    Getter für einen Attributpfad wie "natural_person.last_name". Fehlende Zwischenobjekte ergeben None.
+    """
+    parts = path.split('.')
+
+    def getter(entry):
+        value = entry
+        for part in parts:
+            if value is None:
+                return None
+            value = getattr(value, part, None)
+        return value
+    return getter
+
+
+def _first_communication(type_names: Tuple[str, ...]) -> Callable:
+    def getter(person):
+        if person is None or not person.communications:
+            return None
+        for comm in person.communications:
+            if comm.communication_type is not None and comm.communication_type.name in type_names:
+                return comm.content
+        return None
+    return getter
+
+
+def _main_address(field: str) -> Callable:
+    def getter(person):
+        if person is None or not person.addresses:
+            return None
+        main = person.addresses[0]
+        for address in person.addresses:
+            if address.main_address:
+                main = address
+                break
+        return getattr(main, field, None)
+    return getter
+
+
+def _nested(outer: str, getter: Callable) -> Callable:
+    outer_getter = attr_path(outer)
+    return lambda entry: getter(outer_getter(entry))
+
+
+ColumnSpec = Tuple[str, str, Union[str, Callable]]
+
+COLUMNS_PERSONS: List[ColumnSpec] = [
+    ("id_", KIND_INT, "id_"),
+    ("id_num", KIND_STR, "id_num"),
+    ("name", KIND_STR, "name"),
+    ("first_name", KIND_STR, "natural_person.first_name"),
+    ("last_name", KIND_STR, "natural_person.last_name"),
+    ("long_name1", KIND_STR, "legal_person.long_name1"),
+    ("street_complete", KIND_STR, _main_address("street_complete")),
+    ("zip", KIND_STR, _main_address("zip_")),
+    ("town", KIND_STR, _main_address("town")),
+    ("phone", KIND_STR, _first_communication(("Festnetz",))),
+    ("mobile", KIND_STR, _first_communication(("Handynummer",))),
+    ("email", KIND_STR, _first_communication(("E-Mail",))),
+]
+
+COLUMNS_CONTRACTORS: List[ColumnSpec] = [
+    ("id_", KIND_INT, "id_"),
+    ("license_agreement_id", KIND_INT, "license_agreement_id"),
+    ("license_agreement", KIND_STR, "license_agreement"),
+    ("use_unit_id", KIND_INT, "use_unit.id_"),
+    ("use_unit_number", KIND_STR, "use_unit.use_unit_number"),
+    ("contractor_type", KIND_STR, "contractor_type.name"),
+    ("start_contract", KIND_DATE, "start_contract"),
+    ("end_of_contract", KIND_DATE, "end_of_contract"),
+    ("person_id", KIND_INT, "person.id_"),
+    ("person_id_num", KIND_STR, "person.id_num"),
+    ("person_name", KIND_STR, "person.name"),
+    ("street_complete", KIND_STR, _nested("person", _main_address("street_complete"))),
+    ("phone", KIND_STR, _nested("person", _first_communication(("Festnetz",)))),
+    ("mobile", KIND_STR, _nested("person", _first_communication(("Handynummer",)))),
+    ("email", KIND_STR, _nested("person", _first_communication(("E-Mail",)))),
+]
+
+COLUMNS_USE_UNITS: List[ColumnSpec] = [
+    ("id_", KIND_INT, "id_"),
+    ("id_num", KIND_STR, "id_num"),
+    ("building_land_id", KIND_INT, "building_land.id_"),
+    ("economic_unit_id", KIND_INT, "economic_unit.id_"),
+    ("street_complete", KIND_STR, "estate_address.street_complete"),
+    ("zip", KIND_STR, "estate_address.zip_"),
+    ("town", KIND_STR, "estate_address.town"),
+    ("living_space", KIND_FLOAT, "living_space"),
+    ("number_of_rooms", KIND_FLOAT, "number_of_rooms"),
+]
+
+COLUMNS_LICENSE_AGREEMENTS: List[ColumnSpec] = [
+    ("id_", KIND_INT, "id_"),
+    ("id_num", KIND_STR, "id_num"),
+    ("use_unit_id", KIND_INT, "use_unit.id_"),
+    ("use_unit_number", KIND_STR, "use_unit.use_unit_number"),
+    ("status_contract", KIND_STR, "status_contract.name"),
+    ("start_contract", KIND_DATE, "start_contract"),
+    ("end_of_contract", KIND_DATE, "end_of_contract"),
+]
+
+
+def _to_date_ordinal(value) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, datetime):
+        return value.date().toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value[:10]).toordinal()
+        except ValueError:
+            return 0
+    return 0
+
+
+def _pad(length: int) -> int:
+    return (8 - length % 8) % 8
+
+
+def write_table(file_name: str, entries: List, columns: List[ColumnSpec], id_column: str = "id_") -> None:
+    """
+    Schreibt Einträge spaltenweise in eine Datei. Die Datei wird atomar ersetzt, geöffnete ColumnarTables lesen
+    weiter die alte Fassung.
+    :param file_name: Zieldatei
+    :type file_name: str
+    :param entries: Cache-Einträge
+    :type entries: List
+    :param columns: Spaltendefinitionen (name, kind, getter). getter ist ein Attributpfad oder eine Funktion.
+    :type columns: List[ColumnSpec]
+    :param id_column: Name der int-Spalte, über die der ID-Index aufgebaut wird
+    :type id_column: str
+    """
+    from array import array
+
+    getters = []
+    for name, kind, getter in columns:
+        if kind not in (KIND_INT, KIND_FLOAT, KIND_DATE, KIND_STR):
+            raise WowiPyException(f"Unknown column kind '{kind}' for '{name}'")
+        getters.append(attr_path(getter) if isinstance(getter, str) else getter)
+
+    heap = bytearray()
+    blocks = []
+    header_columns = []
+    id_values = None
+    for (name, kind, _), getter in zip(columns, getters):
+        values = [getter(entry) for entry in entries]
+        if kind == KIND_STR:
+            offsets = array('I')
+            lengths = array('I')
+            for value in values:
+                if value is None:
+                    offsets.append(0)
+                    lengths.append(STR_NULL)
+                    continue
+                raw = str(value).encode('utf-8')
+                offsets.append(len(heap))
+                lengths.append(len(raw))
+                heap += raw
+            blocks.append((name, kind, offsets.tobytes() + lengths.tobytes()))
+        elif kind == KIND_INT:
+            data = array('q', [INT_NULL if value is None else int(value) for value in values])
+            if name == id_column:
+                id_values = data
+            blocks.append((name, kind, data.tobytes()))
+        elif kind == KIND_FLOAT:
+            data = array('d', [math.nan if value is None else float(value) for value in values])
+            blocks.append((name, kind, data.tobytes()))
+        else:
+            data = array('i', [_to_date_ordinal(value) for value in values])
+            blocks.append((name, kind, data.tobytes()))
+
+    id_block = b""
+    if id_values is not None:
+        order = sorted(range(len(id_values)), key=id_values.__getitem__)
+        id_block = array('q', [id_values[row] for row in order]).tobytes() + array('q', order).tobytes()
+
+    # Offsets werden relativ zum Datenbeginn gespeichert
+    offset = 0
+    for name, kind, block in blocks:
+        header_columns.append({"name": name, "kind": kind, "offset": offset, "length": len(block)})
+        offset += len(block) + _pad(len(block))
+    id_offset = offset
+    offset += len(id_block)
+    heap_offset = offset
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "rows": len(entries),
+        "columns": header_columns,
+        "id_index": {"column": id_column, "offset": id_offset} if id_values is not None else None,
+        "heap": {"offset": heap_offset, "length": len(heap)}
+    }
+    raw_header = json.dumps(header).encode('utf-8')
+    prefix_len = len(MAGIC) + _HEADER_LEN.size + len(raw_header)
+
+    # Atomar ersetzen: andere Prozesse können die alte Datei per ColumnarTable gemappt haben
+    with atomic_write(file_name) as fp:
+        fp.write(MAGIC)
+        fp.write(_HEADER_LEN.pack(len(raw_header)))
+        fp.write(raw_header)
+        fp.write(b"\x00" * _pad(prefix_len))
+        for name, kind, block in blocks:
+            fp.write(block)
+            fp.write(b"\x00" * _pad(len(block)))
+        fp.write(id_block)
+        fp.write(heap)
+
+
+class ColumnarTable:
+    """
+    Lesezugriff auf eine mit write_table geschriebene Datei. Die Daten bleiben im gemappten Speicher, Werte werden
+    erst beim Zugriff in Python-Objekte umgewandelt.
+    """
+
+    def __init__(self, file_name: str) -> None:
+        self.file_name = file_name
+        self._fp = open(file_name, 'rb')
+        try:
+            self._mm = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._fp.close()
+            raise WowiPyException(f"'{file_name}' is empty")
+        self._view = memoryview(self._mm)
+        if bytes(self._view[:len(MAGIC)]) != MAGIC:
+            self.close()
+            raise WowiPyException(f"'{file_name}' is not a WowiPy table file")
+        header_len = _HEADER_LEN.unpack(self._view[len(MAGIC):len(MAGIC) + _HEADER_LEN.size])[0]
+        header_start = len(MAGIC) + _HEADER_LEN.size
+        header = json.loads(bytes(self._view[header_start:header_start + header_len]))
+        if header.get("format_version", 0) > FORMAT_VERSION:
+            self.close()
+            raise WowiPyException(f"Table file version {header.get('format_version')} is not supported")
+        if header.get("byteorder") != sys.byteorder:
+            self.close()
+            raise WowiPyException("Table file was written on a platform with different byte order")
+        self.rows = header.get("rows")
+        data_start = header_start + header_len
+        data_start += _pad(data_start)
+
+        self._columns: Dict[str, Tuple[str, object, object]] = {}
+        for column in header.get("columns"):
+            start = data_start + column.get("offset")
+            block = self._view[start:start + column.get("length")]
+            kind = column.get("kind")
+            if kind == KIND_STR:
+                half = 4 * self.rows
+                self._columns[column.get("name")] = (kind, block[:half].cast('I'), block[half:].cast('I'))
+            else:
+                self._columns[column.get("name")] = (kind, block.cast(_TYPECODES[kind]), None)
+
+        self._id_keys = None
+        self._id_rows = None
+        id_index = header.get("id_index")
+        if id_index is not None:
+            start = data_start + id_index.get("offset")
+            size = 8 * self.rows
+            self._id_keys = self._view[start:start + size].cast('q')
+            self._id_rows = self._view[start + size:start + 2 * size].cast('q')
+        heap_start = data_start + header.get("heap").get("offset")
+        self._heap = self._view[heap_start:heap_start + header.get("heap").get("length")]
+
+    def __len__(self):
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return f"ColumnarTable {self.file_name} ({self.rows} rows, columns {', '.join(self._columns.keys())})"
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns.keys())
+
+    def close(self) -> None:
+        for kind, first, second in getattr(self, '_columns', {}).values():
+            first.release()
+            if second is not None:
+                second.release()
+        for view_name in ('_id_keys', '_id_rows', '_heap'):
+            view = getattr(self, view_name, None)
+            if view is not None:
+                view.release()
+        if getattr(self, '_view', None) is not None:
+            self._view.release()
+        if getattr(self, '_mm', None) is not None:
+            self._mm.close()
+        self._fp.close()
+
+    def value(self, column: str, row: int):
+        col = self._columns.get(column)
+        if col is None:
+            raise WowiPyException(f"Unknown column '{column}'")
+        kind, data, lengths = col
+        if kind == KIND_STR:
+            length = lengths[row]
+            if length == STR_NULL:
+                return None
+            offset = data[row]
+            return str(self._heap[offset:offset + length], 'utf-8')
+        value = data[row]
+        if kind == KIND_INT:
+            return None if value == INT_NULL else value
+        if kind == KIND_FLOAT:
+            return None if math.isnan(value) else value
+        return date.fromordinal(value) if value else None
+
+    def row(self, row: int, columns: List[str] = None) -> Dict:
+        if row < 0 or row >= self.rows:
+            raise IndexError(row)
+        names = columns if columns is not None else self._columns.keys()
+        return {name: self.value(name, row) for name in names}
+
+    def column(self, column: str) -> List:
+        return [self.value(column, row) for row in range(self.rows)]
+
+    def find_row(self, id_: int) -> int:
+        """
+        Zeilennummer zur id (Binärsuche im ID-Index), -1 wenn nicht vorhanden
+        """
+        if self._id_keys is None:
+            raise WowiPyException("Table has no id index")
+        pos = bisect_left(self._id_keys, id_)
+        if pos < self.rows and self._id_keys[pos] == id_:
+            return self._id_rows[pos]
+        return -1
+
+    def get(self, id_: int, columns: List[str] = None) -> Dict:
+        row = self.find_row(id_)
+        if row < 0:
+            return None
+        return self.row(row, columns)
+
+    def scan(self, column: str, predicate: Callable, max_results: int = None) -> List[int]:
+        """
+        Zeilennummern aller Zeilen, deren Wert in column das Prädikat erfüllt
+        """
+        res = []
+        for row in range(self.rows):
+            if predicate(self.value(column, row)):
+                res.append(row)
+                if max_results is not None and len(res) >= max_results:
+                    break
+        return res
@@ -0,0 +1,84 @@
+"""
+Zentrales Parsen der Datumswerte von OPENWOWI.
+
+OPENWOWI liefert Datumswerte als ISO-8601-Strings, z.B. "2024-01-01", "2024-01-01T10:00:00+01:00" oder
+"2024-01-01T10:00:00.1234567+01:00". Geparst wird mit datetime.fromisoformat, das alle diese Varianten ohne
+Format-Fallunterscheidung versteht und deutlich schneller als strptime ist. Bis Python 3.10 akzeptiert fromisoformat
+nur drei oder sechs Nachkommastellen und Offsets der Form +HH:MM. Alles andere (z.B. ".57", sieben Stellen, "+0200",
+"Z") wird nach einem Fehlschlag normalisiert, sodass dieselben Werte wie früher mit strptime("%Y-%m-%dT%H:%M:%S.%f%z")
+gelesen werden.
+
+Dieselben wenigen tausend Datumswerte kommen in großen Abrufen immer wieder vor, daher werden die Ergebnisse in
+einem begrenzten Cache gehalten. date- und datetime-Objekte sind unveränderlich und können gefahrlos von mehreren
+Model-Objekten geteilt werden.
+"""
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Optional
+
+CACHE_SIZE = 8192
+
+_FRACTION_RE = re.compile(r"(?<=:\d\d)\.(\d+)")
+_OFFSET_RE = re.compile(r"(?<=\d)([+-]\d\d)(\d\d)$")
+
+
+def _normalize(value: str) -> str:
+    # Nachkommastellen auf genau sechs Stellen bringen, Offset mit Doppelpunkt
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    value = _FRACTION_RE.sub(lambda match: "." + (match.group(1) + "000000")[:6], value)
+    return _OFFSET_RE.sub(r"\1:\2", value)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_datetime(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.fromisoformat(_normalize(value))
+
+
+def parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """
+    ISO-Datum oder -Zeitpunkt als datetime, reine Datumswerte ergeben 00:00 Uhr. Leere Werte ergeben None.
+    :param value: z.B. "2024-01-01" oder "2024-01-01T10:00:00.000+01:00"
+    :type value: str
+    :raises ValueError: Kein gültiges ISO-Datum
+    :rtype: datetime
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    return _parse_datetime(value)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return _parse_datetime(value).date()
+
+
+def parse_date(value: Optional[str]) -> Optional[date]:
+    """
+    ISO-Datum als date, bei Zeitpunkten wird der Tag verwendet. Leere Werte ergeben None.
+    :param value: z.B. "2024-01-01"
+    :type value: str
+    :raises ValueError: Kein gültiges ISO-Datum
+    :rtype: date
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return _parse_date(value)
+
+
+def clear_cache() -> None:
+    _parse_datetime.cache_clear()
+    _parse_date.cache_clear()
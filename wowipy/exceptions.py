@@ -1,2 +1,5 @@
 class WowiPyException(Exception):
-    pass
+    def __init__(self, *args, status_code: int = None):
+        super().__init__(*args)
+        # HTTP-Status der fehlgeschlagenen Anfrage, None bei anderen Fehlern
+        self.status_code = status_code
@@ -0,0 +1,102 @@
+"""
+Gemeinsame Instanzen für Katalog-Objekte und häufige Strings.
+
+Viele Model-Objekte enthalten dieselben kleinen Katalogwerte (Lage, Geschoss, Vertragsstatus, Zahlungsintervall,
+Kurzreferenzen wie UseUnitShort ...). Klassen mit dem Decorator @flyweight werden über shared() erzeugt: Objekte
+mit identischen Daten werden nur einmal angelegt und von allen Datensätzen referenziert. Die Registry hält die
+Objekte nur schwach, nicht mehr referenzierte Objekte werden normal freigegeben.
+
+Die gemeinsamen Objekte dürfen nicht verändert werden, die Änderung wäre in allen Datensätzen sichtbar. Über
+disable() lässt sich das Verhalten abschalten, danach erzeugt shared() wieder einzelne Objekte.
+
+Straßen, Orte und Postleitzahlen werden zusätzlich per sys.intern geteilt (INTERNED_FIELDS).
+"""
+import sys
+import weakref
+from typing import Dict
+
+INTERNED_FIELDS = frozenset({"zip_", "town", "street", "street_complete", "country_code"})
+
+_registry = weakref.WeakValueDictionary()
+_enabled = True
+
+
+def flyweight(cls):
+    """
+    Decorator: Objekte der Klasse (und ihrer Unterklassen) werden von shared() geteilt
+    """
+    cls._flyweight = True
+    return cls
+
+
+def is_flyweight(cls) -> bool:
+    return getattr(cls, '_flyweight', False)
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+    _registry.clear()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def size() -> int:
+    """
+    Anzahl aktuell geteilter Objekte
+    """
+    return len(_registry)
+
+
+def _key(cls, items):
+    # Der Typ gehört zum Schlüssel, sonst wären z.B. True und 1 gleich
+    return cls, frozenset((name, value.__class__, value) for name, value in items)
+
+
+def shared(cls, data: Dict):
+    """
+    Liefert ein Objekt cls(**data), bei gleichen Daten immer dasselbe. Daten mit nicht hashbaren Werten (z.B.
+    verschachtelte Dicts) ergeben ein neues Objekt.
+    """
+    if not _enabled:
+        return cls(**data)
+    try:
+        key = _key(cls, data.items())
+        obj = _registry.get(key)
+    except TypeError:
+        return cls(**data)
+    if obj is None:
+        obj = cls(**data)
+        _registry[key] = obj
+    return obj
+
+
+def share(obj):
+    """
+    Gibt für ein bereits erzeugtes Objekt einer Flyweight-Klasse (z.B. aus einer Cache-Datei) die geteilte Instanz
+    mit denselben Attributen zurück
+    """
+    if not _enabled:
+        return obj
+    try:
+        key = ("state",) + _key(type(obj), obj.__dict__.items())
+        existing = _registry.get(key)
+    except TypeError:
+        return obj
+    if existing is not None:
+        return existing
+    _registry[key] = obj
+    return obj
+
+
+def intern_str(value):
+    if value.__class__ is str:
+        return sys.intern(value)
+    return value
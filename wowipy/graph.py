@@ -0,0 +1,179 @@
+"""
+Beziehungsgraph zwischen den Objekten der Caches.
+
+Knoten sind die Cache-Einträge je Entitätstyp (Cache-Typ) und id_, Kanten die Verweise über ids:
+
+    Nutzungsvertrag -> Nutzungseinheit -> Gebäude -> Wirtschaftseinheit
+    Nutzungseinheit -> Wirtschaftseinheit
+    Vertragsnehmer -> Nutzungsvertrag, Vertragsnehmer -> Person
+    Komponente -> Ausstattung -> Nutzungseinheit / Gebäude / Wirtschaftseinheit
+
+Kanten werden in beide Richtungen gespeichert, Navigation ist damit ein Dict-Zugriff. Verweise auf Objekte, die
+nicht im Cache sind, bleiben als ids erhalten.
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+KIND_LICENSE_AGREEMENTS = "license_agreements"
+KIND_CONTRACTORS = "contractors"
+KIND_PERSONS = "persons"
+KIND_ECONOMIC_UNITS = "economic_units"
+KIND_BUILDING_LANDS = "building_lands"
+KIND_USE_UNITS = "use_units"
+KIND_FACILITIES = "facilities"
+KIND_COMPONENTS = "components"
+
+
+def _short_id(attribute: str) -> Callable:
+    def getter(entry):
+        ref = getattr(entry, attribute, None)
+        return getattr(ref, 'id_', None) if ref is not None else None
+    return getter
+
+
+def _plain_id(attribute: str) -> Callable:
+    return lambda entry: getattr(entry, attribute, None)
+
+
+# (Typ, übergeordneter Typ, Funktion entry -> id des übergeordneten Objekts)
+RELATIONS: List[Tuple[str, str, Callable]] = [
+    (KIND_LICENSE_AGREEMENTS, KIND_USE_UNITS, _short_id('use_unit')),
+    (KIND_USE_UNITS, KIND_BUILDING_LANDS, _short_id('building_land')),
+    (KIND_USE_UNITS, KIND_ECONOMIC_UNITS, _short_id('economic_unit')),
+    (KIND_BUILDING_LANDS, KIND_ECONOMIC_UNITS, _short_id('economic_unit')),
+    (KIND_CONTRACTORS, KIND_LICENSE_AGREEMENTS, _plain_id('license_agreement_id')),
+    (KIND_CONTRACTORS, KIND_PERSONS, _short_id('person')),
+    (KIND_COMPONENTS, KIND_FACILITIES, _plain_id('facility_id')),
+    (KIND_FACILITIES, KIND_USE_UNITS, _plain_id('use_unit_id')),
+    (KIND_FACILITIES, KIND_BUILDING_LANDS, _plain_id('building_id')),
+    (KIND_FACILITIES, KIND_ECONOMIC_UNITS, _plain_id('economic_unit_id')),
+]
+
+
+class EntityGraph:
+    """
+    Beziehungsgraph mit Adjazenzlisten über ids. Aufbau mit add_entries je Typ, danach z.B.
+    graph.descendants("economic_units", 42, "contractors") für alle Vertragsnehmer einer Wirtschaftseinheit.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: Dict[str, Dict[object, object]] = {}
+        self._parents: Dict[str, Dict[object, Dict[str, object]]] = {}
+        self._children: Dict[str, Dict[object, Dict[str, List]]] = {}
+        self._reachable: Dict[Tuple[str, str], bool] = {}
+
+    def add_entries(self, kind: str, entries: Iterable) -> None:
+        nodes = self._nodes.setdefault(kind, {})
+        relations = [(parent_kind, getter) for child_kind, parent_kind, getter in RELATIONS if child_kind == kind]
+        parents = self._parents.setdefault(kind, {})
+        for entry in entries:
+            id_ = getattr(entry, 'id_', None)
+            if id_ is None or id_ in nodes:
+                continue
+            nodes[id_] = entry
+            for parent_kind, getter in relations:
+                parent_id = getter(entry)
+                if parent_id is None:
+                    continue
+                parents.setdefault(id_, {})[parent_kind] = parent_id
+                self._children.setdefault(parent_kind, {}).setdefault(parent_id, {}) \
+                    .setdefault(kind, []).append(id_)
+
+    def kinds(self) -> List[str]:
+        return list(self._nodes.keys())
+
+    def nodes(self, kind: str) -> List:
+        return list(self._nodes.get(kind, {}).values())
+
+    def node(self, kind: str, id_) -> Optional[object]:
+        return self._nodes.get(kind, {}).get(id_)
+
+    def parent_id(self, kind: str, id_, parent_kind: str) -> Optional[object]:
+        return self._parents.get(kind, {}).get(id_, {}).get(parent_kind)
+
+    def parent(self, kind: str, id_, parent_kind: str) -> Optional[object]:
+        """
+        Übergeordnetes Objekt, z.B. parent("use_units", 7, "economic_units")
+        """
+        parent_id = self.parent_id(kind, id_, parent_kind)
+        if parent_id is None:
+            return None
+        return self.node(parent_kind, parent_id)
+
+    def child_ids(self, kind: str, id_, child_kind: str) -> List:
+        return self._children.get(kind, {}).get(id_, {}).get(child_kind, [])
+
+    def children(self, kind: str, id_, child_kind: str) -> List:
+        """
+        Direkt untergeordnete Objekte im Cache, z.B. children("license_agreements", 3, "contractors")
+        """
+        nodes = self._nodes.get(child_kind, {})
+        return [nodes[child_id] for child_id in self.child_ids(kind, id_, child_kind) if child_id in nodes]
+
+    def _can_reach(self, kind: str, target_kind: str) -> bool:
+        key = (kind, target_kind)
+        reachable = self._reachable.get(key)
+        if reachable is None:
+            reachable = False
+            pending = [kind]
+            seen = {kind}
+            while pending and not reachable:
+                current = pending.pop()
+                for child_kind, parent_kind, _ in RELATIONS:
+                    if parent_kind != current or child_kind in seen:
+                        continue
+                    if child_kind == target_kind:
+                        reachable = True
+                        break
+                    seen.add(child_kind)
+                    pending.append(child_kind)
+            self._reachable[key] = reachable
+        return reachable
+
+    def descendant_ids(self, kind: str, id_, target_kind: str) -> List:
+        """
+        ids aller (auch indirekt) untergeordneten Objekte vom Typ target_kind, ohne Duplikate
+        """
+        res = []
+        found: Set = set()
+        visited = {(kind, id_)}
+        pending = [(kind, id_)]
+        while pending:
+            current_kind, current_id = pending.pop()
+            for child_kind, child_ids in self._children.get(current_kind, {}).get(current_id, {}).items():
+                if child_kind == target_kind:
+                    for child_id in child_ids:
+                        if child_id not in found:
+                            found.add(child_id)
+                            res.append(child_id)
+                    continue
+                if not self._can_reach(child_kind, target_kind):
+                    continue
+                for child_id in child_ids:
+                    if (child_kind, child_id) not in visited:
+                        visited.add((child_kind, child_id))
+                        pending.append((child_kind, child_id))
+        return res
+
+    def descendants(self, kind: str, id_, target_kind: str) -> List:
+        """
+        Alle (auch indirekt) untergeordneten Objekte im Cache, z.B. descendants("economic_units", 42, "contractors")
+        """
+        nodes = self._nodes.get(target_kind, {})
+        return [nodes[child_id] for child_id in self.descendant_ids(kind, id_, target_kind) if child_id in nodes]
+
+    def ancestor(self, kind: str, id_, target_kind: str) -> Optional[object]:
+        """
+        Übergeordnetes Objekt über mehrere Ebenen, z.B. ancestor("license_agreements", 3, "economic_units")
+        """
+        pending = [(kind, id_)]
+        visited = set()
+        while pending:
+            current_kind, current_id = pending.pop(0)
+            if (current_kind, current_id) in visited:
+                continue
+            visited.add((current_kind, current_id))
+            for parent_kind, parent_id in self._parents.get(current_kind, {}).get(current_id, {}).items():
+                if parent_kind == target_kind:
+                    return self.node(parent_kind, parent_id)
+                pending.append((parent_kind, parent_id))
+        return None
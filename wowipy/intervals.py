@@ -0,0 +1,121 @@
+"""
+Intervallindex (zentrierter Intervallbaum) für Abfragen "aktiv am Tag D" über Verträge, Vertragsnehmer und
+Vertragspositionen.
+
+Die Datumswerte der Modelle liegen je nach Endpunkt als datetime oder als ISO-String vor, beide werden akzeptiert.
+Fehlt der Beginn, gilt das Intervall seit jeher, fehlt das Ende, ist es unbefristet. Beginn und Ende zählen jeweils
+mit (wie bei den *_active_on-Filtern der API).
+"""
+from bisect import bisect_right
+from datetime import date, datetime
+from typing import List, Optional
+
+_OPEN_START = date.min.toordinal()
+_OPEN_END = date.max.toordinal()
+
+
+def to_ordinal(value) -> Optional[int]:
+    """
+    Tagesnummer eines Datums (datetime, date oder ISO-String), None wenn nicht gesetzt
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date().toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    return date.fromisoformat(str(value)[:10]).toordinal()
+
+
+def is_active_on(start, end, day) -> bool:
+    """
+    Prüft, ob day im Intervall start bis end (jeweils einschließlich, None = offen) liegt
+    """
+    day = to_ordinal(day)
+    start = to_ordinal(start)
+    end = to_ordinal(end)
+    return (start is None or start <= day) and (end is None or end >= day)
+
+
+class _Node:
+    __slots__ = ('center', 'starts', 'start_positions', 'ends', 'end_positions', 'left', 'right')
+
+    def __init__(self, center: int, items: List) -> None:
+        self.center = center
+        by_start = sorted((start, position) for start, _, position in items)
+        # Enden absteigend, damit von beiden Seiten mit Abbruch gescannt werden kann
+        by_end = sorted(((end, position) for _, end, position in items), reverse=True)
+        self.starts = [start for start, _ in by_start]
+        self.start_positions = [position for _, position in by_start]
+        self.ends = [end for end, _ in by_end]
+        self.end_positions = [position for _, position in by_end]
+        self.left = None
+        self.right = None
+
+
+def _build(items: List) -> Optional[_Node]:
+    if not items:
+        return None
+    points = sorted(point for start, end, _ in items for point in (start, end))
+    center = points[len(points) // 2]
+    left = []
+    right = []
+    here = []
+    for item in items:
+        if item[1] < center:
+            left.append(item)
+        elif item[0] > center:
+            right.append(item)
+        else:
+            here.append(item)
+    node = _Node(center, here)
+    node.left = _build(left)
+    node.right = _build(right)
+    return node
+
+
+class IntervalIndex:
+    """
+    Index über die Gültigkeitsintervalle eines Caches. Abfragen "aktiv am Tag D" in O(log n + k).
+    :param start_attribute: Attribut mit dem Beginn, z.B. "start_contract"
+    :param end_attribute: Attribut mit dem Ende, z.B. "end_of_contract"
+    """
+
+    def __init__(self, start_attribute: str, end_attribute: str) -> None:
+        self.start_attribute = start_attribute
+        self.end_attribute = end_attribute
+        self._root = None
+
+    def build(self, entries: List) -> None:
+        items = []
+        for position, entry in enumerate(entries):
+            start = to_ordinal(getattr(entry, self.start_attribute, None))
+            end = to_ordinal(getattr(entry, self.end_attribute, None))
+            items.append((_OPEN_START if start is None else start, _OPEN_END if end is None else end, position))
+        self._root = _build(items)
+
+    def active_on(self, day) -> List[int]:
+        """
+        Positionen aller am Tag day aktiven Einträge in Cache-Reihenfolge
+        :param day: datetime, date oder ISO-String
+        """
+        point = to_ordinal(day)
+        res = []
+        node = self._root
+        while node is not None:
+            if point < node.center:
+                # Alle Intervalle des Knotens enden nach point, relevant ist nur der Beginn
+                res.extend(node.start_positions[:bisect_right(node.starts, point)])
+                node = node.left
+            elif point > node.center:
+                # Alle Intervalle des Knotens beginnen vor point, relevant ist nur das Ende
+                for i, end in enumerate(node.ends):
+                    if end < point:
+                        break
+                    res.append(node.end_positions[i])
+                node = node.right
+            else:
+                res.extend(node.start_positions)
+                break
+        res.sort()
+        return res
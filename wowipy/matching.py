@@ -0,0 +1,103 @@
+"""
+Vergleichsfunktionen für die Suche in den Caches.
+
+Die Funktionen sind bewusst modulweit definiert (nicht als Methoden von WowiPy), damit sie in Worker-Prozesse
+übertragen werden können (siehe parallel).
+"""
+from wowipy.models import Person, Address, Communication
+from wowipy.phonetics import phonetic_codes
+from wowipy.search_index import SEARCH_POS_LEFT, SEARCH_POS_CONTAINS, SEARCH_PHONETIC, PHONE_TYPES, \
+    phone_search_key
+
+
+def search_string(haystack: str, needle: str, search_mode: str = SEARCH_POS_CONTAINS) -> bool:
+    if search_mode == SEARCH_PHONETIC:
+        # Jedes Wort von needle muss wie ein Wort von haystack klingen (Kölner Phonetik)
+        needle_codes = phonetic_codes(needle)
+        return len(needle_codes) > 0 and set(needle_codes).issubset(phonetic_codes(haystack))
+    haystack = haystack.lower()
+    needle = needle.lower()
+    if (search_mode == SEARCH_POS_CONTAINS and needle in haystack) or \
+            (search_mode == SEARCH_POS_LEFT and haystack.startswith(needle)):
+        return True
+    else:
+        return False
+
+
+def check_person_match(person_obj: Person,
+                       search_name: str = None,
+                       search_address: str = None,
+                       search_phone: str = None,
+                       search_email: str = None,
+                       search_mode: str = SEARCH_POS_CONTAINS) -> bool:
+    if person_obj is None:
+        return False
+
+    # Phonetisch wird nur der Name verglichen, Adresse, Rufnummer und E-Mail weiterhin als Teilstring
+    field_mode = SEARCH_POS_CONTAINS if search_mode == SEARCH_PHONETIC else search_mode
+
+    if search_name is not None:
+        if person_obj.natural_person is not None:
+            if person_obj.natural_person.last_name is not None:
+                if person_obj.natural_person.first_name is not None:
+                    first_name = person_obj.natural_person.first_name.lower()
+                else:
+                    first_name = ""
+                last_name = person_obj.natural_person.last_name.lower()
+                if search_string(first_name, search_name, search_mode) or \
+                        search_string(last_name, search_name, search_mode) or \
+                        search_string(f"{first_name} {last_name}", search_name, search_mode) or \
+                        search_string(f"{last_name}, {first_name}", search_name, search_mode):
+                    return True
+        if person_obj.legal_person is not None:
+            if person_obj.legal_person.long_name1 is not None:
+                if search_string(person_obj.legal_person.long_name1, search_name, search_mode):
+                    return True
+
+    if search_address is not None:
+        address: Address
+        address_found = False
+        if person_obj.addresses is not None:
+            for address in person_obj.addresses:
+                street = address.street_complete
+                if search_string(street, search_address, field_mode):
+                    address_found = True
+                    break
+        if address_found:
+            return True
+
+    if search_phone is not None:
+        communication: Communication
+        phone_found = False
+        if person_obj.communications is None:
+            return False
+        # Problem: Es gibt diverse gängige Formate für Rufnummern. Es gibt keine Formatvorgabe in
+        # Wowiport, also können wir auch nicht vorhersehen, welches gewählt wurde.
+        # Ländervorwahl und führende Nullen werden daher bei needle und haystack entfernt (phone_search_key).
+        # Für die Rückwärtssuche mit vollständiger Normalisierung siehe search_phone_number.
+        phone_key = phone_search_key(search_phone)
+        for comm in person_obj.communications:
+            if comm.content is None or comm.communication_type is None:
+                continue
+            if comm.communication_type.name in PHONE_TYPES:
+                if search_string(phone_search_key(comm.content), phone_key, field_mode):
+                    phone_found = True
+                    break
+        if phone_found:
+            return True
+
+    if search_email is not None:
+        communication: Communication
+        email_found = False
+        if person_obj.communications is None:
+            return False
+        for comm in person_obj.communications:
+            if comm.communication_type.name == "E-Mail":
+                content = comm.content.strip()
+                if search_string(content, search_email, field_mode):
+                    email_found = True
+                    break
+        if email_found:
+            return True
+
+    return False
@@ -0,0 +1,204 @@
+"""
+Metriken je HTTP-Anfrage des RestAdapters.
+
+RestAdapter ruft nach jeder Anfrage alle registrierten Hooks mit einem RequestInfo auf. RequestMetrics ist ein
+solcher Hook und sammelt Zähler und Latenz-Histogramme je Endpunkt, Methode und Status. Die Werte lassen sich als
+Übersicht (summary, top_endpoints) oder im Prometheus-Textformat ausgeben, z.B. für den Textfile-Collector des
+node_exporters.
+
+Ids und GUIDs in Pfaden werden für die Labels durch Platzhalter ersetzt, damit z.B. Loans/Loan/17/RepaymentPlan und
+Loans/Loan/18/RepaymentPlan zusammen gezählt werden.
+"""
+import os
+import re
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_GUID_RE = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+
+
+def endpoint_label(endpoint: str) -> str:
+    """
+    Endpunkt ohne variable Pfadteile, z.B. "PersonsWrite/Person/{id}/Communications"
+    """
+    parts = []
+    for part in endpoint.strip("/").split("/"):
+        if part.isdigit():
+            parts.append("{id}")
+        elif _GUID_RE.match(part):
+            parts.append("{guid}")
+        else:
+            parts.append(part)
+    return "/".join(parts)
+
+
+class RequestInfo:
+    """
+    Daten einer Anfrage für Hooks. Bei mehreren Versuchen (Token-Refresh nach 401) gelten Status und Bytes für den
+    letzten Versuch, latency für alle Versuche zusammen.
+    """
+    method: str
+    endpoint: str
+    status_code: Optional[int]
+    latency: float
+    request_bytes: int
+    response_bytes: int
+    retries: int
+    from_cache: bool
+    error: Optional[Exception]
+
+    def __init__(self, method: str, endpoint: str, status_code: Optional[int], latency: float,
+                 request_bytes: int = 0, response_bytes: int = 0, retries: int = 0, from_cache: bool = False,
+                 error: Exception = None) -> None:
+        self.method = method
+        self.endpoint = endpoint
+        self.status_code = status_code
+        self.latency = latency
+        self.request_bytes = request_bytes
+        self.response_bytes = response_bytes
+        self.retries = retries
+        self.from_cache = from_cache
+        self.error = error
+
+    @property
+    def is_success(self) -> bool:
+        return self.status_code is not None and 200 <= self.status_code <= 299
+
+    def __repr__(self):
+        return f"{self.method} {self.endpoint} -> {self.status_code} in {self.latency * 1000:.1f} ms"
+
+
+class _Series:
+    __slots__ = ('count', 'errors', 'retries', 'cache_hits', 'latency_sum', 'request_bytes', 'response_bytes',
+                 'buckets', 'statuses')
+
+    def __init__(self, bucket_count: int) -> None:
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.latency_sum = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.buckets = [0] * (bucket_count + 1)
+        self.statuses: Dict[str, int] = {}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class RequestMetrics:
+    """
+    Sammelt Metriken je (Endpunkt, Methode). Als Hook registrieren, z.B. über WowiPy.enable_request_metrics()
+    :param buckets: Obergrenzen der Latenz-Histogramme in Sekunden
+    :param prefix: Präfix der Prometheus-Metriknamen
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, prefix: str = "wowipy") -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, info: RequestInfo) -> None:
+        key = (endpoint_label(info.endpoint), info.method.upper())
+        status = str(info.status_code) if info.status_code is not None else "error"
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = _Series(len(self.buckets))
+                self._series[key] = series
+            series.count += 1
+            if not info.is_success:
+                series.errors += 1
+            series.retries += info.retries
+            if info.from_cache:
+                series.cache_hits += 1
+            series.latency_sum += info.latency
+            series.request_bytes += info.request_bytes
+            series.response_bytes += info.response_bytes
+            series.buckets[bisect_left(self.buckets, info.latency)] += 1
+            series.statuses[status] = series.statuses.get(status, 0) + 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series = {}
+
+    def summary(self) -> List[Dict]:
+        """
+        Eine Zeile je (Endpunkt, Methode), absteigend nach Gesamtlatenz
+        """
+        with self._lock:
+            rows = [{
+                "endpoint": endpoint,
+                "method": method,
+                "requests": series.count,
+                "errors": series.errors,
+                "retries": series.retries,
+                "cache_hits": series.cache_hits,
+                "cache_misses": series.count - series.cache_hits,
+                "latency_total": series.latency_sum,
+                "latency_mean": series.latency_sum / series.count if series.count else 0.0,
+                "request_bytes": series.request_bytes,
+                "response_bytes": series.response_bytes,
+                "statuses": dict(series.statuses),
+            } for (endpoint, method), series in self._series.items()]
+        rows.sort(key=lambda row: row["latency_total"], reverse=True)
+        return rows
+
+    def top_endpoints(self, count: int = 10, by: str = "latency_total") -> List[Dict]:
+        """
+        Die Endpunkte mit dem größten Anteil, z.B. by="latency_total", "requests" oder "response_bytes"
+        """
+        return sorted(self.summary(), key=lambda row: row[by], reverse=True)[:count]
+
+    def to_prometheus(self) -> str:
+        """
+        Alle Metriken im Prometheus-Textformat (Version 0.0.4)
+        """
+        name = self.prefix
+        lines = [
+            f"# HELP {name}_requests_total OPENWOWI requests by endpoint, method and status",
+            f"# TYPE {name}_requests_total counter",
+        ]
+        with self._lock:
+            series_items = sorted(self._series.items())
+            for (endpoint, method), series in series_items:
+                labels = f'endpoint="{_escape(endpoint)}",method="{method}"'
+                for status, count in sorted(series.statuses.items()):
+                    lines.append(f'{name}_requests_total{{{labels},status="{status}"}} {count}')
+            for metric, attribute, help_text in (
+                    ("request_retries_total", "retries", "Additional attempts after token refresh"),
+                    ("cache_hits_total", "cache_hits", "Responses served from the requests cache"),
+                    ("request_bytes_total", "request_bytes", "Request body bytes sent"),
+                    ("response_bytes_total", "response_bytes", "Response body bytes received")):
+                lines.append(f"# HELP {name}_{metric} {help_text}")
+                lines.append(f"# TYPE {name}_{metric} counter")
+                for (endpoint, method), series in series_items:
+                    labels = f'endpoint="{_escape(endpoint)}",method="{method}"'
+                    lines.append(f"{name}_{metric}{{{labels}}} {getattr(series, attribute)}")
+            lines.append(f"# HELP {name}_request_duration_seconds OPENWOWI request latency incl. retries")
+            lines.append(f"# TYPE {name}_request_duration_seconds histogram")
+            for (endpoint, method), series in series_items:
+                labels = f'endpoint="{_escape(endpoint)}",method="{method}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets, series.buckets):
+                    cumulative += count
+                    lines.append(f'{name}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_request_duration_seconds_bucket{{{labels},le="+Inf"}} {series.count}')
+                lines.append(f"{name}_request_duration_seconds_sum{{{labels}}} {series.latency_sum}")
+                lines.append(f"{name}_request_duration_seconds_count{{{labels}}} {series.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, file_name: str) -> None:
+        """
+        Schreibt to_prometheus() atomar in eine Datei (z.B. *.prom für den node_exporter Textfile-Collector)
+        """
+        tmp_name = f"{file_name}.tmp"
+        with open(tmp_name, "w", encoding="utf-8") as fp:
+            fp.write(self.to_prometheus())
+        os.replace(tmp_name, file_name)
@@ -0,0 +1,1149 @@
+"""
+Lokaler OPENWOWI-Mock-Server für Tests und Benchmarks ohne Zugang zu einem Wowiport-Mandanten.
+
+Der Server bildet den OAuth2-Login (/oauth2/token, Passwort- und Refresh-Token-Flow) und die von WowiPy genutzten,
+seitenweise abgerufenen Endpunkte unter /openwowi/v1.2/ ab. Die Daten werden reproduzierbar (Seed) synthetisch
+erzeugt und sind untereinander konsistent: Wirtschaftseinheit -> Gebäude -> Nutzungseinheit -> Nutzungsvertrag ->
+Vertragsnehmer/Person, dazu Vertragspositionen, Ausstattungen, Komponenten, Darlehen, Tickets, Medien sowie die
+Ausstattungs- und Komponentenkataloge.
+Schreibende Aufrufe (Kommunikationen, Ausstattungen, Komponenten, Tickets, Medien-Upload) ändern die Daten des Servers.
+
+Antwortzeiten und Fehler lassen sich für Benchmarks und Fehlertests einstellen:
+
+    with MockOpenWowiServer(dataset=MockDataset(economic_units=20), latency=0.05, error_rate=0.01) as server:
+        wowi = server.client()
+        wowi.build_use_unit_cache()
+
+Eigenständig starten: python -m wowipy.mock_server --port 8080 --economic-units 20
+"""
+import argparse
+import base64
+import copy
+import hashlib
+import json
+import logging
+import random
+import re
+import secrets
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+MOCK_USER = "mock"
+MOCK_PASSWORD = "mock"
+MOCK_API_KEY = "mock"
+
+EP_ECONOMIC_UNITS = "CommercialInventory/EconomicUnits"
+EP_BUILDING_LANDS = "CommercialInventory/BuildingLands"
+EP_USE_UNITS = "CommercialInventory/UseUnits"
+EP_FACILITIES = "CommercialInventory/Facility"
+EP_COMPONENTS = "CommercialInventory/Component"
+EP_PERSONS = "PersonsRead/Persons"
+EP_CONTRACTORS = "RentAccountingPersonDetails/Contractors"
+EP_LICENSE_AGREEMENTS = "RentAccounting/LicenseAgreements"
+EP_CONTRACT_POSITIONS = "RentAccounting/ContractPositions"
+EP_LOANS = "Loans/Loan"
+EP_TICKETS = "CommunicationRead/Ticket"
+EP_MEDIA_ENTITIES = "MediaReadCatalog/MediaEntity"
+EP_PICTURE_TYPES = "MediaReadCatalog/EstatePictureType"
+EP_FACILITY_CATALOG = "CommercialInventoryCatalog/FacilityCatalog"
+EP_COMPONENT_CATALOG = "CommercialInventoryCatalog/ComponentCatalog"
+
+_FIRST_NAMES = ("Anna", "Maria", "Sophie", "Laura", "Julia", "Lena", "Sarah", "Katharina", "Monika", "Ursula",
+                "Peter", "Thomas", "Michael", "Andreas", "Stefan", "Jürgen", "Klaus", "Frank", "Lukas", "Jonas",
+                "Mehmet", "Ayşe", "Olga", "Piotr", "Giuseppe")
+_LAST_NAMES = ("Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Maier", "Wagner", "Becker", "Schulz",
+               "Hoffmann", "Schäfer", "Koch", "Bauer", "Richter", "Klein", "Wolf", "Schröder", "Neumann", "Schwarz",
+               "Zimmermann", "Braun", "Krüger", "Hofmann", "Hartmann", "Lange", "Schmitt", "Werner", "Krause",
+               "Yilmaz", "Kowalski", "Nowak", "Rossi", "Schmitz", "Meier")
+_STREETS = ("Hauptstraße", "Schulstraße", "Gartenstraße", "Bahnhofstraße", "Dorfstraße", "Bergstraße", "Birkenweg",
+            "Lindenstraße", "Kirchstraße", "Waldstraße", "Ringstraße", "Schillerstraße", "Goethestraße",
+            "Am Markt", "Marktplatz", "Rosenweg", "Mühlenweg", "Sankt-Georg-Straße", "Friedrich-Ebert-Platz")
+_TOWNS = (("50667", "Köln"), ("40213", "Düsseldorf"), ("44135", "Dortmund"), ("45127", "Essen"),
+          ("48143", "Münster"), ("53111", "Bonn"), ("33602", "Bielefeld"), ("42103", "Wuppertal"))
+
+_COMPANY_CODE = {"id": 1, "name": "Musterwohnen eG", "code": "01", "argeCode": None}
+_COUNTRY = {"id": 1, "name": "Deutschland", "code": "DE"}
+_GENDERS = ({"id": 1, "name": "männlich"}, {"id": 2, "name": "weiblich"})
+_COMMUNICATION_TYPES = {"Festnetz": {"id": 1, "name": "Festnetz"},
+                        "Handynummer": {"id": 2, "name": "Handynummer"},
+                        "E-Mail": {"id": 3, "name": "E-Mail"}}
+_MEDIA_ENTITIES = [{"id": 1, "name": "EconomicUnit"}, {"id": 2, "name": "BuildingLand"}, {"id": 3, "name": "UseUnit"}]
+_PICTURE_TYPES = [{"id": 1, "name": "Außenansicht"}, {"id": 2, "name": "Grundriss"}, {"id": 3, "name": "Innenansicht"}]
+_FACILITY_CATALOG = ({"id": 1, "name": "Heizung"}, {"id": 2, "name": "Küche"}, {"id": 3, "name": "Bad"},
+                     {"id": 4, "name": "Rauchwarnmelder"})
+_COMPONENT_CATALOG = ({"id": 11, "name": "Therme"}, {"id": 12, "name": "Herd"}, {"id": 13, "name": "Waschtisch"},
+                      {"id": 14, "name": "Melder"})
+_TICKET_PRIORITIES = ({"id": 1, "code": "niedrig"}, {"id": 2, "code": "normal"}, {"id": 3, "code": "hoch"})
+_TICKET_STATUS = ({"id": 1, "code": "offen"}, {"id": 2, "code": "in Bearbeitung"}, {"id": 3, "code": "erledigt"})
+_TICKET_SOURCES = ({"id": 1, "code": "Telefon"}, {"id": 2, "code": "E-Mail"}, {"id": 3, "code": "Portal"})
+_CONTRACT_POSITION_TYPES = (("Grundmiete", "GM", True), ("Betriebskosten", "BK", False),
+                            ("Heizkosten", "HK", False))
+
+_PNG_1PX = base64.b64decode("iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8BQDwAEhQGAhKmMIQAAAABJRU5"
+                            "ErkJggg==")
+
+
+def _iso(day: Optional[date]) -> Optional[str]:
+    return day.isoformat() if day is not None else None
+
+
+def _timestamp(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "+00:00"
+
+
+def _estate_address(street: str, house_number: str, zip_: str, town: str) -> Dict:
+    return {
+        "zip": zip_,
+        "town": town,
+        "street": street,
+        "houseNumber": house_number,
+        "houseNumberAddition": None,
+        "countryId": _COUNTRY["id"],
+        "countryCode": _COUNTRY["code"],
+        "streetComplete": f"{street} {house_number}",
+        "houseNumberComplete": house_number,
+    }
+
+
+def _facility_catalog_entry(catalog: Dict) -> Dict:
+    return {"id": catalog["id"], "name": catalog["name"], "status": {"id": 1, "name": "aktiv"},
+            "availableEconomicUnitLand": False, "availableBuilding": True, "availableUseUnit": True,
+            "repairRelevance": True}
+
+
+def _component_catalog_entry(catalog: Dict, facility_catalog: Dict) -> Dict:
+    # Komponente i gehört zur Ausstattungsart i, wie bei den erzeugten Ausstattungen
+    return {"id": catalog["id"], "name": catalog["name"], "comment": None, "facilityCatalog": dict(facility_catalog),
+            "isMaintenanceRelevant": False, "isRepairRelevant": True, "isLeaseRelevant": False,
+            "isWarrantyRelevant": False, "quantityType": {"id": 1, "name": "Stück", "code": "Stk"},
+            "isMeteringDevice": False, "allowedUnderComponents": []}
+
+
+def _use_unit_short(use_unit: Dict) -> Dict:
+    return {
+        "id": use_unit["id"],
+        "useUnitNumber": use_unit["idNum"],
+        "buildingLandId": use_unit["buildingLand"]["id"],
+        "economicUnitId": use_unit["economicUnit"]["id"],
+        "economicUnit": use_unit["economicUnit"]["idNum"],
+    }
+
+
+class MockDataset:
+    """
+    Synthetischer, reproduzierbarer Datenbestand im JSON-Format der OPENWOWI (camelCase, wie von der API geliefert)
+    :param seed: Startwert des Zufallsgenerators, gleicher Seed ergibt gleiche Daten
+    :param economic_units: Anzahl Wirtschaftseinheiten
+    :param buildings_per_economic_unit: Gebäude je Wirtschaftseinheit
+    :param use_units_per_building: Nutzungseinheiten je Gebäude
+    :param agreements_per_use_unit: Nutzungsverträge je Nutzungseinheit (nacheinander, nur der letzte ist offen)
+    :param extra_persons: Zusätzliche Personen ohne Vertrag
+    :param loans: Anzahl Darlehen
+    :param tickets: Anzahl Tickets
+    :param reference_date: Stichtag, bis zu dem die Vertragshistorie erzeugt wird
+    """
+
+    def __init__(self, seed: int = 1, economic_units: int = 5, buildings_per_economic_unit: int = 4,
+                 use_units_per_building: int = 6, agreements_per_use_unit: int = 2, extra_persons: int = 0,
+                 loans: int = 10, tickets: int = 50, reference_date: date = date(2024, 1, 1)) -> None:
+        self._rnd = random.Random(seed)
+        self.reference_date = reference_date
+        self._next_ids: Dict[str, int] = {}
+        self.records: Dict[str, List[Dict]] = {}
+        for endpoint in (EP_ECONOMIC_UNITS, EP_BUILDING_LANDS, EP_USE_UNITS, EP_FACILITIES, EP_COMPONENTS,
+                         EP_PERSONS, EP_CONTRACTORS, EP_LICENSE_AGREEMENTS, EP_CONTRACT_POSITIONS, EP_LOANS,
+                         EP_TICKETS):
+            self.records[endpoint] = []
+        self.records[EP_MEDIA_ENTITIES] = copy.deepcopy(_MEDIA_ENTITIES)
+        self.records[EP_PICTURE_TYPES] = copy.deepcopy(_PICTURE_TYPES)
+        self.records[EP_FACILITY_CATALOG] = [_facility_catalog_entry(entry) for entry in _FACILITY_CATALOG]
+        self.records[EP_COMPONENT_CATALOG] = [_component_catalog_entry(entry, facility_catalog)
+                                              for entry, facility_catalog in zip(_COMPONENT_CATALOG,
+                                                                                 _FACILITY_CATALOG)]
+        self.media: Dict[str, List[Dict]] = {entity["name"]: [] for entity in _MEDIA_ENTITIES}
+        self.media_content: Dict[str, bytes] = {}
+
+        for eu_no in range(1, economic_units + 1):
+            economic_unit = self._economic_unit(eu_no)
+            zip_, town = self._rnd.choice(_TOWNS)
+            for bl_no in range(1, buildings_per_economic_unit + 1):
+                building_land = self._building_land(economic_unit, bl_no, zip_, town)
+                for uu_no in range(1, use_units_per_building + 1):
+                    use_unit = self._use_unit(economic_unit, building_land, uu_no)
+                    self._agreements(use_unit, agreements_per_use_unit)
+                    self._facilities(use_unit)
+        for _ in range(extra_persons):
+            self._person(self._random_address())
+        for _ in range(loans):
+            self._loan()
+        for _ in range(tickets):
+            self._ticket()
+
+    def next_id(self, kind: str) -> int:
+        self._next_ids[kind] = self._next_ids.get(kind, 0) + 1
+        return self._next_ids[kind]
+
+    def counts(self) -> Dict[str, int]:
+        res = {endpoint: len(records) for endpoint, records in self.records.items()}
+        for entity_name, records in self.media.items():
+            res[f"MediaRead/{entity_name}/MediaData"] = len(records)
+        return res
+
+    def _random_date(self, start: date, end: date) -> date:
+        return start + timedelta(days=self._rnd.randint(0, max(0, (end - start).days)))
+
+    def _random_address(self) -> Tuple[str, str, str, str]:
+        zip_, town = self._rnd.choice(_TOWNS)
+        return self._rnd.choice(_STREETS), str(self._rnd.randint(1, 120)), zip_, town
+
+    def _economic_unit(self, eu_no: int) -> Dict:
+        record = {
+            "id": self.next_id("economic_unit"),
+            "idNum": f"{eu_no:05d}",
+            "name": f"WE {eu_no:05d}",
+            "location": None,
+            "constructionYear": self._rnd.randint(1950, 2020),
+            "info": None,
+            "bindingEndDate": None,
+            "owner": {"id": 1, "ownerNumber": "E0001"},
+            "assetIdentification": {"id": 1, "name": "Anlagevermögen"},
+            "statusInventory": {"id": 1, "name": "Bestand"},
+            "district": None,
+            "monumentalProtectionType": None,
+            "regionalResponsibility": None,
+            "companyCode": dict(_COMPANY_CODE),
+        }
+        self.records[EP_ECONOMIC_UNITS].append(record)
+        self._media("EconomicUnit", record)
+        return record
+
+    def _building_land(self, economic_unit: Dict, bl_no: int, zip_: str, town: str) -> Dict:
+        street = self._rnd.choice(_STREETS)
+        house_number = str(self._rnd.randint(1, 120))
+        economic_unit["location"] = economic_unit["location"] or town
+        record = {
+            "id": self.next_id("building_land"),
+            "idNum": f"{economic_unit['idNum']}.{bl_no:03d}",
+            "buildingLandType": "Gebäude",
+            "entryDate": _iso(date(economic_unit["constructionYear"], 1, 1)),
+            "exitDate": None,
+            "economicUnit": {"id": economic_unit["id"], "idNum": economic_unit["idNum"],
+                             "name": economic_unit["name"], "location": town},
+            "estateAddress": _estate_address(street, house_number, zip_, town),
+            "land": None,
+            "building": {
+                "origin": {"id": 1, "name": "Neubau"},
+                "buildingType": {"id": 1, "name": "Mehrfamilienhaus"},
+                "constructionYear": economic_unit["constructionYear"],
+                "moveInDate": None,
+                "buildingNumberOfStoreys": self._rnd.randint(2, 8),
+                "constructionMethod": None,
+                "district": None,
+                "monumentalProtectionType": None,
+                "changeReason": None,
+            },
+            "exitReason": None,
+            "companyCode": dict(_COMPANY_CODE),
+        }
+        self.records[EP_BUILDING_LANDS].append(record)
+        self._media("BuildingLand", record)
+        return record
+
+    def _use_unit(self, economic_unit: Dict, building_land: Dict, uu_no: int) -> Dict:
+        address = building_land["estateAddress"]
+        living_space = round(self._rnd.uniform(30, 120), 2)
+        entry_date = building_land["entryDate"]
+        use_unit_type = {
+            "id": self.next_id("use_unit_type"),
+            "validFrom": entry_date,
+            "validTo": None,
+            "useUnitUsageType": {"id": 1, "name": "Wohnung", "classificationId": 1, "classificationName": "Wohnraum"},
+        }
+        record = {
+            "id": self.next_id("use_unit"),
+            "idNum": f"{building_land['idNum']}.{uu_no:03d}",
+            "buildingLand": {"id": building_land["id"], "idNum": building_land["idNum"],
+                             "buildingLandType": building_land["buildingLandType"]},
+            "economicUnit": dict(building_land["economicUnit"]),
+            "estateAddress": dict(address),
+            "currentFinancingType": None,
+            "currentUseUnitType": dict(use_unit_type),
+            "usableSpace": living_space,
+            "livingSpace": living_space,
+            "heatingSpace": living_space,
+            "numberOfRooms": self._rnd.randint(1, 5),
+            "numberOfHalfRooms": 0,
+            "descriptionOfPosition": f"{(uu_no - 1) // 2}. OG {'links' if uu_no % 2 else 'rechts'}",
+            "targetRent": None,
+            "managementStart": entry_date,
+            "managementEnd": None,
+            "bindingEndDate": None,
+            "moveInDate": entry_date,
+            "exitDate": None,
+            "entryDate": entry_date,
+            "energyCertificateId": None,
+            "position": None,
+            "floor": {"id": (uu_no - 1) // 2 + 1, "name": f"{(uu_no - 1) // 2}. OG",
+                      "levelToGround": (uu_no - 1) // 2},
+            "residentialAuthorization": None,
+            "entryReason": {"id": 1, "name": "Neubau"},
+            "exitReason": None,
+            "billingUnits": [],
+            "useUnitTypes": [use_unit_type],
+            "companyCode": dict(_COMPANY_CODE),
+        }
+        self.records[EP_USE_UNITS].append(record)
+        self._media("UseUnit", record)
+        return record
+
+    def _agreements(self, use_unit: Dict, count: int) -> None:
+        # Zeitstrahl in count aufeinanderfolgende Verträge teilen, der letzte ist (meist) unbefristet
+        first_start = max(date.fromisoformat(use_unit["entryDate"]), date(2000, 1, 1))
+        starts = sorted(self._random_date(first_start, self.reference_date) for _ in range(count))
+        starts[0] = first_start
+        for no, start in enumerate(starts, start=1):
+            if no < count:
+                end = max(start, starts[no] - timedelta(days=1))
+            elif self._rnd.random() < 0.1:
+                end = self._random_date(start, self.reference_date)
+            else:
+                end = None
+            self._agreement(use_unit, no, start, end)
+
+    def _agreement(self, use_unit: Dict, no: int, start: date, end: Optional[date]) -> None:
+        record = {
+            "id": self.next_id("license_agreement"),
+            "idNum": f"{use_unit['idNum']}.{no:02d}",
+            "useUnit": _use_unit_short(use_unit),
+            "restrictionOfUse": {"id": 1, "nodeId": 1, "name": "Vermietung", "isVacancy": False},
+            "statusContract": {"id": 1 if end is None else 2, "name": "aktiv" if end is None else "beendet"},
+            "lifeOfContract": {"id": 1, "name": "unbefristet"},
+            "paymentInterval": {"id": 1, "name": "monatlich"},
+            "dunningData": {"dunningblock": False, "dunningLevel": None},
+            "differingMaturity": None,
+            "startContract": _iso(start),
+            "endOfContract": _iso(end),
+            "periodOfNotice": {"id": 1, "name": "3 Monate"},
+            "debitEntryType": {"id": 1, "name": "Lastschrift"},
+            "banking": {"id": self.next_id("banking"), "useVirtualIban": False, "virtualIban": None,
+                        "formerVirtualIban": None, "collectiveAccount": None},
+        }
+        self.records[EP_LICENSE_AGREEMENTS].append(record)
+
+        if end is None:
+            street = use_unit["estateAddress"]["street"]
+            house_number = use_unit["estateAddress"]["houseNumber"]
+            address = (street, house_number, use_unit["estateAddress"]["zip"], use_unit["estateAddress"]["town"])
+        else:
+            address = self._random_address()
+        for contractor_no in range(1 if self._rnd.random() < 0.7 else 2):
+            person = self._person(address)
+            contractor = {
+                "id": self.next_id("contractor"),
+                "licenseAgreementId": record["id"],
+                "licenseAgreement": record["idNum"],
+                "startContract": record["startContract"],
+                "endOfContract": record["endOfContract"],
+                "contractualUseValidFrom": record["startContract"],
+                "contractualUseValidTo": record["endOfContract"],
+                "contractorType": {"id": 1, "name": "Hauptmieter"} if contractor_no == 0 else
+                {"id": 2, "name": "Mitmieter"},
+                "useUnit": _use_unit_short(use_unit),
+                "person": self._contractor_person(person),
+                "defaultAddress": copy.deepcopy(person["addresses"][0]),
+            }
+            self.records[EP_CONTRACTORS].append(contractor)
+
+        for name, short_code, net_rent in _CONTRACT_POSITION_TYPES:
+            amount = round(use_unit["livingSpace"] * (self._rnd.uniform(5, 9) if net_rent else
+                                                      self._rnd.uniform(1, 3)), 2)
+            self.records[EP_CONTRACT_POSITIONS].append({
+                "id": self.next_id("contract_position"),
+                "netAmount": amount,
+                "amount": amount,
+                "activeFrom": record["startContract"],
+                "activeTo": record["endOfContract"],
+                "licenseAgreement": {"id": record["id"], "idNum": record["idNum"],
+                                     "useUnit": _use_unit_short(use_unit)},
+                "vatRate": {"id": 1, "code": "0%"},
+                "validContractPosition": {"id": 1, "name": "gültig"},
+                "changeReasonContracts": {"id": 1, "name": "Neuvermietung"},
+                "contractPositionType": {
+                    "id": _CONTRACT_POSITION_TYPES.index((name, short_code, net_rent)) + 1,
+                    "nodeId": 1,
+                    "name": name,
+                    "shortCode": short_code,
+                    "deposit": False,
+                    "wbRelevant": False,
+                    "bgbRelevant": net_rent,
+                    "isPartOfNetRent": net_rent,
+                    "usingCpAsPrepaymentBlock": False,
+                    "assignmentPrepayment": None,
+                    "isGrossRentWithoutHeating": net_rent,
+                    "isPartOfNetRentCensus": net_rent,
+                    "isBasisCalculationReminderChargeInterest": True,
+                    "isPrepaymentHeating": short_code == "HK",
+                    "isPrepaymentRunningCost": short_code == "BK",
+                    "reportAsSinkingFund": False,
+                },
+                "contractPositionTypeSlim": {"id": _CONTRACT_POSITION_TYPES.index((name, short_code, net_rent)) + 1,
+                                             "name": name, "shortCode": short_code},
+            })
+
+    def _person(self, address: Tuple[str, str, str, str]) -> Dict:
+        person_id = self.next_id("person")
+        first_name = self._rnd.choice(_FIRST_NAMES)
+        last_name = self._rnd.choice(_LAST_NAMES)
+        street, house_number, zip_, town = address
+        address_id = self.next_id("address")
+        communications = []
+        if self._rnd.random() < 0.6:
+            communications.append(("Festnetz", f"0{self._rnd.randint(200, 999)} {self._rnd.randint(10000, 999999)}"))
+        if self._rnd.random() < 0.7:
+            communications.append(("Handynummer",
+                                   f"+49 1{self._rnd.randint(50, 79)} {self._rnd.randint(1000000, 99999999)}"))
+        if self._rnd.random() < 0.5:
+            local_part = re.sub(r"[^a-z]", "", f"{first_name}.{last_name}".lower())
+            communications.append(("E-Mail", f"{local_part}{person_id}@example.org"))
+        communication_records = [self._communication(person_id, address_id, street, type_name, content)
+                                 for type_name, content in communications]
+        birth_date = self._random_date(date(1935, 1, 1), date(2004, 12, 31))
+        record = {
+            "id": person_id,
+            "idNum": f"{person_id:07d}",
+            "shortName": f"{last_name}, {first_name}",
+            "name": f"{first_name} {last_name}",
+            "taxNumber": None,
+            "taxIdentificationNumber": None,
+            "validFrom": _iso(date(2000, 1, 1)),
+            "validTo": None,
+            "naturalPerson": {"firstName": first_name, "lastName": last_name, "birthDate": _iso(birth_date),
+                              "gender": dict(self._rnd.choice(_GENDERS)), "title": None, "deathDate": None},
+            "legalPerson": None,
+            "addresses": [{
+                "id": address_id,
+                "zip": zip_,
+                "town": town,
+                "street": street,
+                "houseNumber": house_number,
+                "houseNumberAddition": None,
+                "validFrom": _iso(date(2000, 1, 1)),
+                "validTo": None,
+                "streetComplete": f"{street} {house_number}",
+                "houseNumberComplete": house_number,
+                "mainAddress": True,
+                "addressType": {"id": 1, "name": "Hauptadresse"},
+                "country": dict(_COUNTRY),
+            }],
+            "communications": communication_records,
+            "firstEmailCommunication": self._first_communication(communication_records, "E-Mail"),
+            "firstLandlinePhoneCommunication": self._first_communication(communication_records, "Festnetz"),
+            "firstMobilePhoneCommunication": self._first_communication(communication_records, "Handynummer"),
+            "bankAccounts": [],
+        }
+        self.records[EP_PERSONS].append(record)
+        return record
+
+    @staticmethod
+    def _contractor_person(person: Dict) -> Dict:
+        # Im Vertragsnehmer-Endpunkt heißt das Kürzel "shortname", die Art der Person kommt als isNaturalPerson
+        res = copy.deepcopy(person)
+        res["shortname"] = res.pop("shortName")
+        res["isNaturalPerson"] = res["legalPerson"] is None
+        return res
+
+    def _communication(self, person_id: int, address_id: int, related_address: str, type_name: str,
+                       content: str) -> Dict:
+        return {
+            "id": self.next_id("communication"),
+            "relatedAddressId": address_id,
+            "content": content,
+            "explanation": None,
+            "relatedAddress": related_address,
+            "communicationType": dict(_COMMUNICATION_TYPES[type_name]),
+            "personId": person_id,
+        }
+
+    @staticmethod
+    def _first_communication(communications: List[Dict], type_name: str) -> Optional[Dict]:
+        for communication in communications:
+            if communication["communicationType"]["name"] == type_name:
+                return copy.deepcopy(communication)
+        return None
+
+    def _facilities(self, use_unit: Dict) -> None:
+        for catalog_no in self._rnd.sample(range(len(_FACILITY_CATALOG)), self._rnd.randint(1, 3)):
+            facility = self.add_facility({
+                "Name": _FACILITY_CATALOG[catalog_no]["name"],
+                "Count": 1,
+                "FacilityCatalogId": _FACILITY_CATALOG[catalog_no]["id"],
+                "FacilityStatusId": 3,
+                "UseUnitId": use_unit["id"],
+                "BuildingId": use_unit["buildingLand"]["id"],
+                "EconomicUnitId": use_unit["economicUnit"]["id"],
+            })
+            self.add_component(facility["id"], {
+                "Name": _COMPONENT_CATALOG[catalog_no]["name"],
+                "Count": 1,
+                "ComponentStatusId": 3,
+                "ComponentCatalogId": _COMPONENT_CATALOG[catalog_no]["id"],
+                "AcquisitionDate": use_unit["entryDate"],
+                "ValidFrom": use_unit["entryDate"],
+            })
+
+    def _media(self, entity_name: str, entity: Dict) -> None:
+        file_guid = f"{self.next_id('media'):08d}-0000-4000-8000-{entity['id']:012d}"
+        thumb_guid = f"{self.next_id('media'):08d}-0000-4000-8000-{entity['id']:012d}"
+        picture_type = self._rnd.choice(_PICTURE_TYPES)
+        self.media[entity_name].append({
+            "id": self.next_id("media_data"),
+            "entityName": entity_name,
+            "entityId": entity["id"],
+            "entityIdNum": entity["idNum"],
+            "file": {"fileName": f"{entity['idNum']}.png", "creationDate": _iso(date(2020, 1, 1)),
+                     "fileGuid": file_guid},
+            "thumbnail": {"fileName": f"{entity['idNum']}_thumb.png", "fileGuid": thumb_guid},
+            "estatePictureType": dict(picture_type),
+            "marketingRelease": False,
+            "isForLicenseAgreements": False,
+            "remark": None,
+        })
+        self.media_content[file_guid] = _PNG_1PX
+        self.media_content[thumb_guid] = _PNG_1PX
+
+    def _loan(self) -> None:
+        loan_id = self.next_id("loan")
+        nominal = self._rnd.randint(100, 5000) * 1000
+        contract_date = self._random_date(date(1990, 1, 1), self.reference_date)
+        economic_units = self.records[EP_ECONOMIC_UNITS]
+        economic_unit = self._rnd.choice(economic_units) if economic_units else None
+        self.records[EP_LOANS].append({
+            "id": loan_id,
+            "idNum": f"D{loan_id:05d}",
+            "companyCode": {"id": _COMPANY_CODE["id"], "code": _COMPANY_CODE["code"], "name": _COMPANY_CODE["name"]},
+            "borrower": {"id": 1, "borrowerNumber": "K0001"},
+            "lender": {"id": loan_id % 3 + 1, "lenderNumber": f"G{loan_id % 3 + 1:04d}"},
+            "loanType": {"id": 1, "code": "Annuitätendarlehen", "shortCode": "AD"},
+            "collateralSecurity": {"id": 1, "code": "Grundschuld"},
+            "contractDate": _iso(contract_date),
+            "dateOfFullPayment": None,
+            "hasSpecialRepaymentOption": False,
+            "currentDate": _iso(self.reference_date),
+            "nominalAsPerLandRegister": nominal,
+            "nominalCapital": nominal,
+            "residualDebt": round(nominal * self._rnd.uniform(0.1, 0.9), 2),
+            "calculationCapital": nominal,
+            "minTermFrom": _iso(contract_date),
+            "fileNumber": f"AZ-{loan_id:05d}",
+            "contingentNumber": None,
+            "repaymentBlackoutPeriod": None,
+            "annuityMix": 0,
+            "debtDiscountPercent": 0,
+            "buildingSavingSum": 0,
+            "endOfInterestFixing": _iso(contract_date.replace(year=contract_date.year + 10)
+                                        if contract_date.month != 2 or contract_date.day != 29 else contract_date),
+            "lastEndedInterestEntry": None,
+            "banking": {"id": self.next_id("banking"), "useVirtualIban": False, "virtualIban": None,
+                        "formerVirtualIban": None, "collectiveAccount": None},
+            "ownReference": None,
+            "bankAccount": None,
+            "subsidiesLoan": None,
+            "cancellationPossibility": None,
+            "followerLoan": None,
+            "precursorLoan": None,
+            "conditions": [],
+            "annuityHeader": [],
+            "objectAssignments": [] if economic_unit is None else [{
+                "id": self.next_id("object_assignment"),
+                "nominalAmount": nominal,
+                "economicUnit": {"id": economic_unit["id"], "idNum": economic_unit["idNum"],
+                                 "name": economic_unit["name"]},
+                "objectAllocationType": {"id": 1, "name": "Wirtschaftseinheit"},
+            }],
+            "repaymentPlan": [],
+            "additionalFields": [],
+        })
+
+    def _ticket(self) -> None:
+        ticket_id = self.next_id("ticket")
+        received = datetime.combine(self._random_date(date(2022, 1, 1), self.reference_date), datetime.min.time(),
+                                    tzinfo=timezone.utc) + timedelta(minutes=self._rnd.randint(420, 1080))
+        use_units = self.records[EP_USE_UNITS]
+        use_unit = self._rnd.choice(use_units) if use_units else None
+        self.records[EP_TICKETS].append({
+            "id": ticket_id,
+            "idNum": f"T{ticket_id:06d}",
+            "timeReceived": _timestamp(received),
+            "subject": self._rnd.choice(("Heizung defekt", "Wasserschaden", "Schlüsselverlust", "Mietbescheinigung",
+                                         "Lärmbelästigung")),
+            "content": "Synthetisches Ticket",
+            "department": {"id": 1, "name": "Technik"},
+            "userId": 1,
+            "priority": dict(self._rnd.choice(_TICKET_PRIORITIES)),
+            "status": dict(self._rnd.choice(_TICKET_STATUS)),
+            "source": dict(self._rnd.choice(_TICKET_SOURCES)),
+            "comments": [{"id": self.next_id("ticket_comment"), "createdAt": _timestamp(received),
+                          "content": "Ticket angelegt", "userName": "mock", "userId": 1, "commentFromApi": True}],
+            "mainAssignment": None if use_unit is None else {
+                "id": self.next_id("ticket_assignment"),
+                "assignmentEntity": {"id": 3, "code": "UseUnit"},
+                "entityId": use_unit["id"],
+            },
+            "assignment": [],
+        })
+
+    def add_facility(self, data: Dict, facility_id: int = None) -> Dict:
+        """
+        Legt eine Ausstattung aus den Daten eines ManageFacilityAndComponents-Aufrufs an oder ersetzt sie
+        """
+        catalog = next((entry for entry in _FACILITY_CATALOG if entry["id"] == data.get("FacilityCatalogId")),
+                       {"id": data.get("FacilityCatalogId"), "name": None})
+        record = {
+            "id": facility_id if facility_id is not None else self.next_id("facility"),
+            "name": data.get("Name"),
+            "status": {"id": data.get("FacilityStatusId"), "name": None},
+            "count": data.get("Count"),
+            "inactive": bool(data.get("Inactive", False)),
+            "facilityCatalog": dict(catalog),
+            "buildingId": data.get("BuildingId"),
+            "propertyId": data.get("PropertyId"),
+            "useUnitId": data.get("UseUnitId"),
+            "economicUnitId": data.get("EconomicUnitId"),
+        }
+        records = self.records[EP_FACILITIES]
+        position = next((i for i, entry in enumerate(records) if entry["id"] == record["id"]), None)
+        if position is None:
+            records.append(record)
+        else:
+            records[position] = record
+        return record
+
+    def add_component(self, facility_id: int, data: Dict, component_id: int = None) -> Optional[Dict]:
+        """
+        Legt eine Komponente zu einer Ausstattung an oder ersetzt sie, None wenn die Ausstattung nicht existiert
+        """
+        facility = next((entry for entry in self.records[EP_FACILITIES] if entry["id"] == facility_id), None)
+        if facility is None:
+            return None
+        record = {
+            "id": component_id if component_id is not None else self.next_id("component"),
+            "name": data.get("Name"),
+            "count": data.get("Count"),
+            "facilityIsInactive": facility["inactive"],
+            "repairRelevance": data.get("RepairRelevance"),
+            "leaseRelevance": data.get("LeaseRelevance"),
+            "comment": data.get("Comment"),
+            "acquisitionDate": data.get("AcquisitionDate"),
+            "status": {"id": data.get("ComponentStatusId"), "name": None},
+            "validFrom": data.get("ValidFrom"),
+            "validTo": data.get("ValidTo"),
+            "componentCatalog": {"id": data.get("ComponentCatalogId")},
+            "facilityId": facility_id,
+            "buildingId": facility["buildingId"],
+            "economicUnitId": facility["economicUnitId"],
+            "useUnitId": facility["useUnitId"],
+            "underComponents": [{"id": under_id, "name": None} for under_id in data.get("UnderComponentIds") or []],
+        }
+        records = self.records[EP_COMPONENTS]
+        position = next((i for i, entry in enumerate(records) if entry["id"] == record["id"]), None)
+        if position is None:
+            records.append(record)
+        else:
+            records[position] = record
+        return record
+
+
+def _field(*path: str) -> Callable:
+    def getter(record):
+        for key in path:
+            if record is None:
+                return None
+            record = record.get(key)
+        return record
+    return getter
+
+
+# Filter je Endpunkt: Parametername (klein geschrieben, die API ignoriert die Schreibweise) -> Feld des Datensatzes
+_FILTERS = {
+    EP_ECONOMIC_UNITS: {"economicunitid": _field("id"), "economicunitidnum": _field("idNum"),
+                        "ownernumber": _field("owner", "ownerNumber")},
+    EP_BUILDING_LANDS: {"buildinglandidnum": _field("idNum"), "economicidnum": _field("economicUnit", "idNum")},
+    EP_USE_UNITS: {"useunitid": _field("id"), "useunitnumber": _field("idNum"),
+                   "buildinglandidnum": _field("buildingLand", "idNum"),
+                   "economicunitidnum": _field("economicUnit", "idNum")},
+    EP_FACILITIES: {"useunitid": _field("useUnitId"), "buildingid": _field("buildingId"),
+                    "economicunitid": _field("economicUnitId"), "propertyid": _field("propertyId")},
+    EP_COMPONENTS: {"useunitid": _field("useUnitId"), "buildingid": _field("buildingId"),
+                    "economicunitid": _field("economicUnitId"), "facilityid": _field("facilityId"),
+                    "componentid": _field("id")},
+    EP_PERSONS: {"personid": _field("id")},
+    EP_CONTRACTORS: {"licenseagreementid": _field("licenseAgreementId"), "personid": _field("person", "id")},
+    EP_LICENSE_AGREEMENTS: {"licenseagreementidnum": _field("idNum"),
+                            "useunitnumber": _field("useUnit", "useUnitNumber"),
+                            "economicunitidnum": _field("useUnit", "economicUnit")},
+    EP_CONTRACT_POSITIONS: {"licenseagreementid": _field("licenseAgreement", "id"),
+                            "licenseagreementidnum": _field("licenseAgreement", "idNum")},
+    EP_LOANS: {"loanid": _field("id"), "loanidnum": _field("idNum"), "lenderid": _field("lender", "id"),
+               "lendernumber": _field("lender", "lenderNumber"), "borrowerid": _field("borrower", "id"),
+               "borrowernumber": _field("borrower", "borrowerNumber"), "loantypeid": _field("loanType", "id")},
+    EP_TICKETS: {"ticketid": _field("id"), "ticketidnum": _field("idNum"), "ticketpriorityid": _field("priority", "id"),
+                 "ticketstatusid": _field("status", "id"), "ticketsourceid": _field("source", "id")},
+}
+_MEDIA_FILTERS = {"entityid": _field("entityId"), "fileguid": _field("file", "fileGuid"), "mediaid": _field("id")}
+
+# Stichtagsfilter je Endpunkt: Parametername -> (Feld Beginn, Feld Ende)
+_ACTIVE_ON_FILTERS = {
+    EP_LICENSE_AGREEMENTS: {"licenseagreementactiveon": ("startContract", "endOfContract")},
+    EP_CONTRACTORS: {"licenseagreementactiveon": ("startContract", "endOfContract"),
+                     "contractualuseactiveon": ("contractualUseValidFrom", "contractualUseValidTo")},
+    EP_CONTRACT_POSITIONS: {"contractpositionsactiveon": ("activeFrom", "activeTo")},
+}
+
+_WRITE_ROUTES = [
+    ("POST", re.compile(r"^PersonsWrite/Person/(\d+)/Communications$"), "_create_communication"),
+    ("PUT", re.compile(r"^PersonsWrite/Person/(\d+)/Communications/(\d+)$"), "_edit_communication"),
+    ("DELETE", re.compile(r"^PersonsWrite/Person/(\d+)/Communications/(\d+)$"), "_delete_communication"),
+    ("POST", re.compile(r"^ManageFacilityAndComponents/Facility$"), "_create_facility"),
+    ("PUT", re.compile(r"^ManageFacilityAndComponents/Facility/(\d+)$"), "_edit_facility"),
+    ("POST", re.compile(r"^ManageFacilityAndComponents/Facility/(\d+)/Component$"), "_create_component"),
+    ("PUT", re.compile(r"^ManageFacilityAndComponents/Facility/(\d+)/Component/(\d+)$"), "_edit_component"),
+    ("DELETE", re.compile(r"^ManageFacilityAndComponents/Facility/(\d+)/Component/(\d+)$"), "_delete_component"),
+    ("POST", re.compile(r"^CommunicationEdit/Ticket$"), "_create_ticket"),
+    ("POST", re.compile(r"^CommunicationEdit/Ticket/AddComment$"), "_create_ticket_comment"),
+    ("POST", re.compile(r"^MediaEdit/(\w+)/Media$"), "_create_media"),
+]
+_MEDIA_DATA_RE = re.compile(r"^MediaRead/(\w+)/MediaData$")
+_MEDIA_CONTENT_RE = re.compile(r"^MediaRead/(\w+)/Media(?:Thumbnail)?Content/([\w-]+)$")
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "WowiPyMock/1.0"
+
+    def do_GET(self):
+        self.server.mock.handle(self, "GET")
+
+    def do_POST(self):
+        self.server.mock.handle(self, "POST")
+
+    def do_PUT(self):
+        self.server.mock.handle(self, "PUT")
+
+    def do_DELETE(self):
+        self.server.mock.handle(self, "DELETE")
+
+    def log_message(self, format, *args):
+        self.server.mock.logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, mock) -> None:
+        self.mock = mock
+        super().__init__(address, _RequestHandler)
+
+
+class MockOpenWowiServer:
+    """
+    OPENWOWI-Mock-Server auf Basis von http.server, läuft nach start() in einem Hintergrund-Thread
+    :param dataset: (Optional) Datenbestand, Default: MockDataset()
+    :param host: Adresse, an die der Server gebunden wird
+    :param port: Port, 0 wählt einen freien Port
+    :param user: Benutzername für den Login
+    :param password: Passwort für den Login
+    :param api_key: Erwarteter apiKey-Parameter
+    :param version: OPENWOWI-Version im Pfad
+    :param latency: Feste Verzögerung je Anfrage in Sekunden
+    :param latency_jitter: Zusätzliche zufällige Verzögerung (0 bis latency_jitter Sekunden)
+    :param error_rate: Anteil der API-Anfragen (0..1), die mit error_status beantwortet werden
+    :param error_status: HTTP-Status der injizierten Fehler, z.B. 500, 503 oder 429
+    :param token_ttl: Gültigkeit eines Access-Tokens in Sekunden
+    :param seed: Startwert für Latenz-Jitter und Fehlerinjektion
+    """
+
+    def __init__(self, dataset: MockDataset = None, host: str = "127.0.0.1", port: int = 0,
+                 user: str = MOCK_USER, password: str = MOCK_PASSWORD, api_key: str = MOCK_API_KEY,
+                 version: str = "v1.2", latency: float = 0.0, latency_jitter: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, token_ttl: int = 3600, seed: int = 1,
+                 logger: logging.Logger = None) -> None:
+        self.dataset = dataset if dataset is not None else MockDataset()
+        self.user = user
+        self.password = password
+        self.api_key = api_key
+        self.version = version
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.token_ttl = token_ttl
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats: Dict[str, int] = {}
+        self._rnd = random.Random(seed)
+        self._lock = threading.RLock()
+        self._access_tokens: Dict[str, float] = {}
+        self._refresh_tokens: Dict[str, bool] = {}
+        self._server = _HTTPServer((host, port), self)
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def hostname(self) -> str:
+        """
+        Wert für den hostname-Parameter von WowiPy bzw. RestAdapter
+        """
+        return f"http://{self._server.server_address[0]}:{self.port}"
+
+    def start(self) -> "MockOpenWowiServer":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="wowipy-mock-server",
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def client(self, **kwargs):
+        """
+        WowiPy-Instanz mit den Zugangsdaten dieses Servers
+        :param kwargs: Weitere Parameter für WowiPy, z.B. cache_backend
+        """
+        from wowipy.wowipy import WowiPy
+        return WowiPy(hostname=self.hostname, user=self.user, password=self.password, api_key=self.api_key,
+                      version=self.version, **kwargs)
+
+    def expire_tokens(self) -> None:
+        """
+        Macht alle Access-Tokens ungültig, die nächste Anfrage erhält 401 (Test des Refresh-Flows)
+        """
+        with self._lock:
+            self._access_tokens.clear()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats = {}
+
+    def _count(self, key: str, value: int = 1) -> None:
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + value
+
+    def handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        url = urlsplit(handler.path)
+        params = {key.lower(): values[-1] for key, values in parse_qs(url.query).items()}
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        self._count("requests")
+        try:
+            if url.path == "/oauth2/token" and method == "POST":
+                status, payload = self._token(body)
+            else:
+                prefix = f"/openwowi/{self.version}/"
+                if not url.path.startswith(prefix):
+                    raise _HTTPError(404, f"Unknown path {url.path}")
+                status, payload = self._api(handler, method, url.path[len(prefix):], params, body)
+        except _HTTPError as e:
+            status, payload = e.status, {"message": e.message}
+        self._send(handler, status, payload)
+
+    def _send(self, handler: BaseHTTPRequestHandler, status: int, payload) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json; charset=utf-8")
+        handler.send_header("Content-Length", str(len(data)))
+        if status == 429:
+            handler.send_header("Retry-After", "1")
+        handler.end_headers()
+        handler.wfile.write(data)
+        self._count("bytes_sent", len(data))
+        self._count(f"status_{status}")
+
+    def _token(self, body: bytes) -> Tuple[int, Dict]:
+        form = {key: values[-1] for key, values in parse_qs(body.decode("utf-8")).items()}
+        grant_type = form.get("grant_type")
+        with self._lock:
+            if grant_type == "password":
+                if form.get("username") != self.user or form.get("password") != self.password:
+                    return 400, {"error": "invalid_grant"}
+            elif grant_type == "refresh_token":
+                if not self._refresh_tokens.pop(form.get("refresh_token"), False):
+                    return 400, {"error": "invalid_grant"}
+            else:
+                return 400, {"error": "unsupported_grant_type"}
+            access_token = secrets.token_hex(16)
+            refresh_token = secrets.token_hex(16)
+            self._access_tokens[access_token] = time.monotonic() + self.token_ttl
+            self._refresh_tokens[refresh_token] = True
+        self._count("tokens_issued")
+        return 200, {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer",
+                     "expires_in": self.token_ttl}
+
+    def _check_auth(self, handler: BaseHTTPRequestHandler, params: Dict) -> None:
+        authorization = handler.headers.get("Authorization") or ""
+        token = authorization[7:] if authorization.startswith("Bearer ") else None
+        with self._lock:
+            expires = self._access_tokens.get(token)
+            if expires is not None and expires < time.monotonic():
+                del self._access_tokens[token]
+                expires = None
+        if expires is None:
+            raise _HTTPError(401, "Authorization has been denied for this request.")
+        if params.get("apikey") != self.api_key:
+            raise _HTTPError(403, "Invalid apiKey")
+
+    def _delay_and_fail(self) -> None:
+        with self._lock:
+            delay = self.latency + (self._rnd.uniform(0, self.latency_jitter) if self.latency_jitter else 0)
+            fail = self.error_rate > 0 and self._rnd.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            self._count("errors_injected")
+            raise _HTTPError(self.error_status, "Injected error")
+
+    def _api(self, handler: BaseHTTPRequestHandler, method: str, endpoint: str, params: Dict,
+             body: bytes) -> Tuple[int, object]:
+        self._check_auth(handler, params)
+        self._delay_and_fail()
+        self._count(f"{method} {endpoint}")
+        if method == "GET":
+            return 200, self._read(endpoint, params)
+        data = json.loads(body.decode("utf-8")) if body else {}
+        for route_method, pattern, action in _WRITE_ROUTES:
+            match = pattern.match(endpoint)
+            if route_method == method and match:
+                with self._lock:
+                    args = (int(group) if group.isdigit() else group for group in match.groups())
+                    return getattr(self, action)(data, *args)
+        raise _HTTPError(404, f"No {method} route for {endpoint}")
+
+    def _read(self, endpoint: str, params: Dict) -> object:
+        offset = int(params.get("offset") or 0)
+        limit = int(params.get("limit") or 100)
+        if limit < 1 or limit > 100:
+            raise _HTTPError(400, "limit must be between 1 and 100")
+        match = _MEDIA_CONTENT_RE.match(endpoint)
+        if match:
+            content = self.dataset.media_content.get(match.group(2))
+            if content is None:
+                raise _HTTPError(404, "Unknown file")
+            return base64.b64encode(content).decode("ascii")
+        match = _MEDIA_DATA_RE.match(endpoint)
+        if match:
+            records = self.dataset.media.get(match.group(1))
+            filters = _MEDIA_FILTERS
+        else:
+            records = self.dataset.records.get(endpoint)
+            filters = _FILTERS.get(endpoint, {})
+        if records is None:
+            raise _HTTPError(404, f"Unknown endpoint {endpoint}")
+
+        selected = [(getter, str(params[name])) for name, getter in filters.items() if name in params]
+        active_on = [(start_key, end_key, params[name][:10])
+                     for name, (start_key, end_key) in _ACTIVE_ON_FILTERS.get(endpoint, {}).items()
+                     if name in params]
+        with self._lock:
+            if selected or active_on:
+                records = [record for record in records
+                           if all(str(getter(record)) == value for getter, value in selected) and
+                           all((record[start_key] or "") <= day and (record[end_key] or "9999") >= day
+                               for start_key, end_key, day in active_on)]
+            # Kopie, damit parallele Schreibzugriffe die Serialisierung nicht stören
+            return copy.deepcopy(records[offset:offset + limit])
+
+    def _person(self, person_id: int) -> Dict:
+        person = next((entry for entry in self.dataset.records[EP_PERSONS] if entry["id"] == person_id), None)
+        if person is None:
+            raise _HTTPError(404, f"Person {person_id} not found")
+        return person
+
+    def _communication_fields(self, data: Dict, communication: Dict) -> None:
+        if "CommunicationTypeId" in data:
+            communication["communicationType"] = next(
+                (dict(entry) for entry in _COMMUNICATION_TYPES.values() if entry["id"] == data["CommunicationTypeId"]),
+                {"id": data["CommunicationTypeId"], "name": None})
+        if "RelatedAddressId" in data:
+            communication["relatedAddressId"] = data["RelatedAddressId"]
+        if "Content" in data:
+            communication["content"] = data["Content"]
+        if "Explanation" in data:
+            communication["explanation"] = data["Explanation"]
+
+    def _create_communication(self, data: Dict, person_id: int) -> Tuple[int, Dict]:
+        person = self._person(person_id)
+        address_id = person["addresses"][0]["id"] if person["addresses"] else None
+        communication = {"id": self.dataset.next_id("communication"), "relatedAddressId": address_id,
+                         "content": None, "explanation": None, "relatedAddress": None,
+                         "communicationType": dict(_COMMUNICATION_TYPES["E-Mail"]), "personId": person_id}
+        self._communication_fields(data, communication)
+        person["communications"].append(communication)
+        return 200, {"id": communication["id"]}
+
+    def _edit_communication(self, data: Dict, person_id: int, communication_id: int) -> Tuple[int, Dict]:
+        person = self._person(person_id)
+        for communication in person["communications"]:
+            if communication["id"] == communication_id:
+                self._communication_fields(data, communication)
+                return 200, {"id": communication_id}
+        raise _HTTPError(404, f"Communication {communication_id} not found")
+
+    def _delete_communication(self, data: Dict, person_id: int, communication_id: int) -> Tuple[int, Dict]:
+        person = self._person(person_id)
+        remaining = [entry for entry in person["communications"] if entry["id"] != communication_id]
+        if len(remaining) == len(person["communications"]):
+            raise _HTTPError(404, f"Communication {communication_id} not found")
+        person["communications"] = remaining
+        return 200, {"id": communication_id}
+
+    def _create_facility(self, data: Dict) -> Tuple[int, Dict]:
+        return 200, {"id": self.dataset.add_facility(data)["id"]}
+
+    def _edit_facility(self, data: Dict, facility_id: int) -> Tuple[int, Dict]:
+        if not any(entry["id"] == facility_id for entry in self.dataset.records[EP_FACILITIES]):
+            raise _HTTPError(404, f"Facility {facility_id} not found")
+        return 200, {"id": self.dataset.add_facility(data, facility_id)["id"]}
+
+    def _create_component(self, data: Dict, facility_id: int) -> Tuple[int, Dict]:
+        component = self.dataset.add_component(facility_id, data)
+        if component is None:
+            raise _HTTPError(404, f"Facility {facility_id} not found")
+        return 200, {"id": component["id"]}
+
+    def _edit_component(self, data: Dict, facility_id: int, component_id: int) -> Tuple[int, Dict]:
+        if not any(entry["id"] == component_id and entry["facilityId"] == facility_id
+                   for entry in self.dataset.records[EP_COMPONENTS]):
+            raise _HTTPError(404, f"Component {component_id} not found")
+        return 200, {"id": self.dataset.add_component(facility_id, data, component_id)["id"]}
+
+    def _delete_component(self, data: Dict, facility_id: int, component_id: int) -> Tuple[int, Dict]:
+        records = self.dataset.records[EP_COMPONENTS]
+        remaining = [entry for entry in records
+                     if not (entry["id"] == component_id and entry["facilityId"] == facility_id)]
+        if len(remaining) == len(records):
+            raise _HTTPError(404, f"Component {component_id} not found")
+        self.dataset.records[EP_COMPONENTS] = remaining
+        return 200, {"id": component_id}
+
+    def _create_ticket(self, data: Dict) -> Tuple[int, Dict]:
+        ticket_id = self.dataset.next_id("ticket")
+        self.dataset.records[EP_TICKETS].append({
+            "id": ticket_id,
+            "idNum": f"T{ticket_id:06d}",
+            "timeReceived": _timestamp(datetime.now(timezone.utc)),
+            "subject": data.get("Subject"),
+            "content": data.get("Content"),
+            "department": None,
+            "userId": 1,
+            "priority": {"id": data.get("TicketPriorityId"), "code": None},
+            "status": {"id": data.get("TicketStatusId"), "code": None},
+            "source": {"id": data.get("TicketSourceId"), "code": None},
+            "comments": [],
+            "mainAssignment": None,
+            "assignment": [],
+        })
+        return 200, {"id": ticket_id}
+
+    def _create_ticket_comment(self, data: Dict) -> Tuple[int, Dict]:
+        ticket = next((entry for entry in self.dataset.records[EP_TICKETS] if entry["id"] == data.get("TicketId")),
+                      None)
+        if ticket is None:
+            raise _HTTPError(404, f"Ticket {data.get('TicketId')} not found")
+        comment_id = self.dataset.next_id("ticket_comment")
+        ticket["comments"].append({"id": comment_id, "createdAt": _timestamp(datetime.now(timezone.utc)),
+                                   "content": data.get("Content"), "userName": "mock", "userId": 1,
+                                   "commentFromApi": True})
+        return 200, {"id": comment_id}
+
+    def _create_media(self, data: Dict, entity_name: str) -> Tuple[int, Dict]:
+        if entity_name not in self.dataset.media:
+            raise _HTTPError(404, f"Unknown media entity {entity_name}")
+        content = base64.b64decode(data.get("Contents") or "")
+        if data.get("Sha1Hash") and hashlib.sha1(content).hexdigest() != data["Sha1Hash"]:
+            raise _HTTPError(400, "Sha1Hash does not match Contents")
+        media_id = self.dataset.next_id("media_data")
+        file_guid = f"{self.dataset.next_id('media'):08d}-0000-4000-8000-{media_id:012d}"
+        picture_type = next((dict(entry) for entry in _PICTURE_TYPES if entry["id"] == data.get("EstatePictureTypeId")),
+                            None)
+        self.dataset.media[entity_name].append({
+            "id": media_id,
+            "entityName": entity_name,
+            "entityId": data.get("EntityId"),
+            "entityIdNum": None,
+            "file": {"fileName": data.get("Filename"), "creationDate": data.get("CreationDate"),
+                     "fileGuid": file_guid},
+            "thumbnail": {"fileName": data.get("Filename"), "fileGuid": file_guid},
+            "estatePictureType": picture_type,
+            "marketingRelease": bool(data.get("MarketingRelease")),
+            "isForLicenseAgreements": bool(data.get("IsForLicenseAgreements")),
+            "remark": data.get("Remark"),
+        })
+        self.dataset.media_content[file_guid] = content
+        return 200, {"id": media_id, "fileGuid": file_guid}
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Lokaler OPENWOWI-Mock-Server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--economic-units", type=int, default=5)
+    parser.add_argument("--buildings-per-economic-unit", type=int, default=4)
+    parser.add_argument("--use-units-per-building", type=int, default=6)
+    parser.add_argument("--agreements-per-use-unit", type=int, default=2)
+    parser.add_argument("--extra-persons", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--token-ttl", type=int, default=3600)
+    args = parser.parse_args(argv)
+
+    dataset = MockDataset(seed=args.seed, economic_units=args.economic_units,
+                          buildings_per_economic_unit=args.buildings_per_economic_unit,
+                          use_units_per_building=args.use_units_per_building,
+                          agreements_per_use_unit=args.agreements_per_use_unit, extra_persons=args.extra_persons)
+    server = MockOpenWowiServer(dataset=dataset, host=args.host, port=args.port, latency=args.latency,
+                                latency_jitter=args.latency_jitter, error_rate=args.error_rate,
+                                error_status=args.error_status, token_ttl=args.token_ttl, seed=args.seed)
+    for endpoint, count in sorted(dataset.counts().items()):
+        print(f"{endpoint}: {count}")
+    print(f"OPENWOWI-Mock unter {server.hostname} (user={server.user}, password={server.password}, "
+          f"api_key={server.api_key})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
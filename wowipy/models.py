@@ -1,17 +1,19 @@
+import logging
 from typing import List, Dict, Optional
 from decimal import Decimal
 from datetime import datetime
 from datetime import date
+from wowipy.dates import parse_date, parse_datetime
+from wowipy.flyweight import flyweight, shared, intern_str
+
+logger = logging.getLogger(__name__)
 
 
 def convert_to_date(date_str):
     try:
-        return datetime.strptime(date_str, "%Y-%m-%d").date()
+        return parse_date(date_str)
     except ValueError:
-        try:
-            return datetime.fromisoformat(date_str).date()
-        except ValueError:
-            return None
+        return None
 
 
 class Result:
@@ -23,6 +25,7 @@ class Result:
         self.data = data if data else []
 
 
+@flyweight
 class CraftActivity:
     id_: int
     code: str
@@ -34,6 +37,7 @@ class CraftActivity:
         self.code = code
 
 
+@flyweight
 class PaymentFileStatus:
     id_: int
     code: str
@@ -45,6 +49,7 @@ class PaymentFileStatus:
         self.code = code
 
 
+@flyweight
 class SalesTax:
     id_: int
     code: str
@@ -56,6 +61,7 @@ class SalesTax:
         self.code = code
 
 
+@flyweight
 class CommissionType:
     id_: int
     code: str
@@ -67,6 +73,7 @@ class CommissionType:
         self.code = code
 
 
+@flyweight
 class CommissionStatus:
     id_: int
     code: str
@@ -106,41 +113,18 @@ class Commission:
         self.id_ = id_
         self.id_num = id_num
         self.code = code
-        self.recording_date = datetime.strptime(recording_date, "%Y-%m-%d")
-        if '.' in release_date:
-            self.release_date = datetime.strptime(release_date, "%Y-%m-%dT%H:%M:%S.%f%z")
-        elif ':' in release_date:
-            self.release_date = datetime.strptime(release_date, "%Y-%m-%dT%H:%M:%S%z")
-        else:
-            self.release_date = datetime.strptime(release_date, "%Y-%m-%d")
-        if placing_date is not None:
-            if '.' in placing_date:
-                self.placing_date = datetime.strptime(placing_date, "%Y-%m-%dT%H:%M:%S.%f%z")
-            elif ':' in placing_date:
-                self.placing_date = datetime.strptime(placing_date, "%Y-%m-%dT%H:%M:%S%z")
-            else:
-                self.placing_date = datetime.strptime(placing_date, "%Y-%m-%d")
-        else:
-            self.placing_date = None
-        if acceptance_date is not None:
-            self.acceptance_date = datetime.strptime(acceptance_date, "%Y-%m-%dT%H:%M:%S.%f%z")
-        else:
-            self.acceptance_date = None
-        if completion_date is not None:
-            if '.' in completion_date:
-                self.completion_date = datetime.strptime(completion_date, "%Y-%m-%dT%H:%M:%S.%f%z")
-            elif ':' in completion_date:
-                self.completion_date = datetime.strptime(completion_date, "%Y-%m-%dT%H:%M:%S%z")
-            else:
-                self.completion_date = datetime.strptime(completion_date, "%Y-%m-%d")
-        else:
-            self.completion_date = None
+        self.recording_date = parse_datetime(recording_date)
+        self.release_date = parse_datetime(release_date)
+        self.placing_date = parse_datetime(placing_date)
+        self.acceptance_date = parse_datetime(acceptance_date)
+        self.completion_date = parse_datetime(completion_date)
         commission_type["id_"] = commission_type.pop("id")
-        self.commission_type = CommissionType(**commission_type)
+        self.commission_type = shared(CommissionType, commission_type)
         commission_status["id_"] = commission_status.pop("id")
-        self.commission_status = CommissionStatus(**commission_status)
+        self.commission_status = shared(CommissionStatus, commission_status)
 
 
+@flyweight
 class Component:
     id_: int
     name: str
@@ -152,6 +136,7 @@ class Component:
         self.name = name
 
 
+@flyweight
 class Facility:
     id_: int
     name: str
@@ -163,6 +148,7 @@ class Facility:
         self.name = name
 
 
+@flyweight
 class IdNameCombination:
     id_: int
     name: str
@@ -389,6 +375,7 @@ class MediaData:
         self.thumb_guid = thumb_guid
 
 
+@flyweight
 class ContractPositionType:
     id_: int
     node_id: int
@@ -432,6 +419,7 @@ class ContractPositionType:
         self.report_as_sinking_fund = report_as_sinking_fund
 
 
+@flyweight
 class ContractPositionTypeSlim:
     id_: int
     name: str
@@ -445,6 +433,7 @@ class ContractPositionTypeSlim:
         self.short_code = short_code
 
 
+@flyweight
 class Country:
     id_: int
     name: str
@@ -458,6 +447,7 @@ class Country:
         self.code = code
 
 
+@flyweight
 class DunningLevel:
     id_: int
     code: str
@@ -519,11 +509,12 @@ class DunningData:
         self.dunningblock = dunningblock
         if dunning_level is not None:
             dunning_level["id_"] = dunning_level.pop("id")
-            self.dunning_level = DunningLevel(**dunning_level)
+            self.dunning_level = shared(DunningLevel, dunning_level)
         else:
             self.dunning_level = None
 
 
+@flyweight
 class RestrictionOfUse:
     id_: int
     node_id: int
@@ -539,6 +530,7 @@ class RestrictionOfUse:
         self.is_vacancy = is_vacancy
 
 
+@flyweight
 class FinancingTypeClass:
     id_: int
     name: str
@@ -554,6 +546,7 @@ class FinancingTypeClass:
         self.classification_name = classification_name
 
 
+@flyweight
 class UseUnitUsageType:
     id_: int
     name: str
@@ -597,9 +590,10 @@ class UseUnitType:
         self.valid_from = valid_from
         self.valid_to = valid_to
         use_unit_usage_type["id_"] = use_unit_usage_type.pop("id")
-        self.use_unit_usage_type = UseUnitUsageType(**use_unit_usage_type)
+        self.use_unit_usage_type = shared(UseUnitUsageType, use_unit_usage_type)
 
 
+@flyweight
 class UseUnitShort:
     id_: int
     use_unit_number: str
@@ -654,6 +648,7 @@ class Banking:
             self.collective_account = None
 
 
+@flyweight
 class CompanyCode:
     id_: int
     name: str
@@ -669,6 +664,7 @@ class CompanyCode:
         self.arge_code = arge_code
 
 
+@flyweight
 class QuantityType:
     id_: int
     name: str
@@ -697,7 +693,7 @@ class ServiceCatalogue:
         self.id_num = id_num
         self.description = description
         if quantity_type is not None:
-            self.quantity_type = QuantityType(**quantity_type)
+            self.quantity_type = shared(QuantityType, quantity_type)
         else:
             self.quantity_type = None
 
@@ -761,24 +757,24 @@ class CommissionItem:
         else:
             self.budget_data = None
         sales_tax["id_"] = sales_tax.pop("id")
-        self.sales_tax = SalesTax(**sales_tax)
+        self.sales_tax = shared(SalesTax, sales_tax)
         service_catalogue["id_"] = service_catalogue.pop("id")
         self.service_catalogue = ServiceCatalogue(**service_catalogue)
         craft_activity["id_"] = craft_activity.pop("id")
-        self.craft_activity = CraftActivity(**craft_activity)
+        self.craft_activity = shared(CraftActivity, craft_activity)
         if quantity_type is not None:
             quantity_type["id_"] = quantity_type.pop("id")
-            self.quantity_type = QuantityType(**quantity_type)
+            self.quantity_type = shared(QuantityType, quantity_type)
         else:
             self.quantity_type = None
         if component is not None:
             component["id_"] = component.pop("id")
-            self.component = Component(**component)
+            self.component = shared(Component, component)
         else:
             self.component = None
         if facility is not None:
             facility["id_"] = facility.pop("id")
-            self.facility = Facility(**facility)
+            self.facility = shared(Facility, facility)
         else:
             self.facility = None
         self.approved_net_amount = approved_net_amount
@@ -801,10 +797,10 @@ class PaymentOrderElement:
         if kwargs:
             pass
         self.payment_order_number = payment_order_number
-        self.maturity = datetime.strptime(maturity, "%Y-%m-%d")
-        self.transfer_date = datetime.strptime(transfer_date, "%Y-%m-%d")
+        self.maturity = parse_datetime(maturity)
+        self.transfer_date = parse_datetime(transfer_date)
         payment_file_status["id_"] = payment_file_status.pop("id")
-        self.payment_file_status = PaymentFileStatus(**payment_file_status)
+        self.payment_file_status = shared(PaymentFileStatus, payment_file_status)
 
 
 class TaxSubtotal:
@@ -887,19 +883,9 @@ class InvoiceReceipt:
         self.id_ = id_
         self.number = number
         company_code["id_"] = company_code.pop("id")
-        self.company_code = CompanyCode(**company_code)
-        if '.' in invoice_date:
-            self.invoice_date = datetime.strptime(invoice_date, "%Y-%m-%dT%H:%M:%S.%f%z")
-        elif ':' in invoice_date:
-            self.invoice_date = datetime.strptime(invoice_date, "%Y-%m-%dT%H:%M:%S%z")
-        else:
-            self.invoice_date = datetime.strptime(invoice_date, "%Y-%m-%d")
-        if '.' in maturity_date:
-            self.maturity_date = datetime.strptime(maturity_date, "%Y-%m-%dT%H:%M:%S.%f%z")
-        elif ':' in maturity_date:
-            self.maturity_date = datetime.strptime(maturity_date, "%Y-%m-%dT%H:%M:%S%z")
-        else:
-            self.maturity_date = datetime.strptime(maturity_date, "%Y-%m-%d")
+        self.company_code = shared(CompanyCode, company_code)
+        self.invoice_date = parse_datetime(invoice_date)
+        self.maturity_date = parse_datetime(maturity_date)
         self.monetary_total = MonetaryTotal(**monetary_total)
         self.tax_total = TaxTotal(**tax_total)
         tpayment_orders = []
@@ -945,30 +931,31 @@ class Address:
         if kwargs:
             pass
         self.id_ = id_
-        self.zip_ = zip_
-        self.town = town
-        self.street = street
+        self.zip_ = intern_str(zip_)
+        self.town = intern_str(town)
+        self.street = intern_str(street)
         self.house_number = house_number
         self.house_number_addition = house_number_addition
         self.valid_from = valid_from
         self.valid_to = valid_to
-        self.street_complete = street_complete
+        self.street_complete = intern_str(street_complete)
         self.house_number_complete = house_number_complete
         self.main_address = main_address
         if address_type is not None:
             if "id" in address_type.keys():
                 address_type["id_"] = address_type.pop("id")
-            self.address_type = AddressType(**address_type)
+            self.address_type = shared(AddressType, address_type)
         else:
             self.address_type = None
         if country is not None:
             if "id" in country.keys():
                 country["id_"] = country.pop("id")
-            self.country = Country(**country)
+            self.country = shared(Country, country)
         else:
             self.country = None
 
 
+@flyweight
 class BankAccountType:
     id_: int
     code: str
@@ -980,6 +967,7 @@ class BankAccountType:
         self.code = code
 
 
+@flyweight
 class BankAccountUsageType:
     id_: int
     code: str
@@ -1016,11 +1004,11 @@ class BankAccount:
         self.valid_to = valid_to
         if "id" in bank_account_type.keys():
             bank_account_type["id_"] = bank_account_type.pop("id")
-        self.bank_account_type = BankAccountType(**bank_account_type)
+        self.bank_account_type = shared(BankAccountType, bank_account_type)
         if bank_account_usage_type is not None:
             if "id" in bank_account_usage_type.keys():
                 bank_account_usage_type["id_"] = bank_account_usage_type.pop("id")
-            self.bank_account_usage_type = BankAccountUsageType(**bank_account_usage_type)
+            self.bank_account_usage_type = shared(BankAccountUsageType, bank_account_usage_type)
 
 
 class Communication:
@@ -1040,7 +1028,7 @@ class Communication:
         self.content = content
         self.explanation = explanation
         self.related_address = related_address
-        self.communication_type = CommunicationType(**communication_type)
+        self.communication_type = shared(CommunicationType, communication_type)
 
 
 class LegalPerson:
@@ -1077,7 +1065,7 @@ class NaturalPerson:
         self.birth_date = birth_date
         self.title = kwargs.get("title")
         if gender is not None:
-            self.gender = Gender(**gender)
+            self.gender = shared(Gender, gender)
         else:
             self.gender = None
         if kwargs.get("death_date"):
@@ -1214,6 +1202,7 @@ class Management:
         self.__dict__.update(kwargs)
 
 
+@flyweight
 class OwnerShort:
     id_: int
     owner_number: str
@@ -1225,6 +1214,7 @@ class OwnerShort:
         self.owner_number = owner_number
 
 
+@flyweight
 class EconomicUnitShort:
     id_: int
     id_num: str
@@ -1269,35 +1259,35 @@ class EconomicUnit:
         self.info = info
         self.binding_end_date = binding_end_date
         owner["id_"] = owner.pop("id")
-        self.owner = OwnerShort(**owner)
+        self.owner = shared(OwnerShort, owner)
         if asset_identification is not None:
             asset_identification["id_"] = asset_identification.pop("id")
-            self.asset_identification = AssetIdentification(**asset_identification)
+            self.asset_identification = shared(AssetIdentification, asset_identification)
         else:
             self.asset_identification = None
         if status_inventory is not None:
             status_inventory["id_"] = status_inventory.pop("id")
-            self.status_inventory = StatusInventory(**status_inventory)
+            self.status_inventory = shared(StatusInventory, status_inventory)
         else:
             self.status_inventory = None
         if district is not None:
             district["id_"] = district.pop("id")
-            self.district = District(**district)
+            self.district = shared(District, district)
         else:
             self.district = None
         if monumental_protection_type is not None:
             monumental_protection_type["id_"] = monumental_protection_type.pop("id")
-            self.monumental_protection_type = MonumentalProtectionType(**monumental_protection_type)
+            self.monumental_protection_type = shared(MonumentalProtectionType, monumental_protection_type)
         else:
             self.monumental_protection_type = None
         if regional_responsibility is not None:
             regional_responsibility["id_"] = regional_responsibility.pop("id")
-            self.regional_responsibility = RegionalResponsibility(**regional_responsibility)
+            self.regional_responsibility = shared(RegionalResponsibility, regional_responsibility)
         else:
             self.regional_responsibility = None
         if company_code is not None:
             company_code["id_"] = company_code.pop("id")
-            self.company_code = CompanyCode(**company_code)
+            self.company_code = shared(CompanyCode, company_code)
         else:
             self.company_code = None
         self.__dict__.update(kwargs)
@@ -1326,26 +1316,27 @@ class Building:
         self.building_number_of_storeys = building_number_of_storeys
         if construction_method is not None:
             construction_method["id_"] = construction_method.pop("id")
-            self.construction_method = ConstructionMethod(**construction_method)
+            self.construction_method = shared(ConstructionMethod, construction_method)
         else:
             self.construction_method = None
-        self.building_type = BuildingType(**building_type)
+        self.building_type = shared(BuildingType, building_type)
         if district is not None:
             district["id_"] = district.pop("id")
-            self.district = District(**district)
+            self.district = shared(District, district)
         else:
             self.district = None
         if monumental_protection_type is not None:
-            self.monumental_protection_type = MonumentalProtectionType(**monumental_protection_type)
+            self.monumental_protection_type = shared(MonumentalProtectionType, monumental_protection_type)
         else:
             self.monumental_protection_type = None
-        self.origin = Origin(**origin)
+        self.origin = shared(Origin, origin)
         if change_reason is not None:
-            self.change_reason = ChangeReason(**change_reason)
+            self.change_reason = shared(ChangeReason, change_reason)
         else:
             self.change_reason = None
 
 
+@flyweight
 class Floor:
     id_: int
     name: str
@@ -1375,14 +1366,14 @@ class EstateAddress:
                  house_number_addition: str = None, **kwargs) -> None:
         if kwargs:
             pass
-        self.zip_ = zip_
-        self.town = town
-        self.street = street
+        self.zip_ = intern_str(zip_)
+        self.town = intern_str(town)
+        self.street = intern_str(street)
         self.house_number = house_number
         self.house_number_addition = house_number_addition
         self.country_id = country_id
-        self.country_code = country_code
-        self.street_complete = street_complete
+        self.country_code = intern_str(country_code)
+        self.street_complete = intern_str(street_complete)
         self.house_number_complete = house_number_complete
 
 
@@ -1419,7 +1410,7 @@ class BuildingLand:
         self.entry_date = entry_date
         self.exit_date = exit_date
         economic_unit['id_'] = economic_unit.pop('id')
-        self.economic_unit = EconomicUnitShort(**economic_unit)
+        self.economic_unit = shared(EconomicUnitShort, economic_unit)
         self.estate_address = EstateAddress(**estate_address)
         if land is not None:
             self.land = Land(**land)
@@ -1427,17 +1418,18 @@ class BuildingLand:
             self.land = None
         self.building = Building(**building)
         if exit_reason is not None:
-            self.exit_reason = ExitReason(**exit_reason)
+            self.exit_reason = shared(ExitReason, exit_reason)
         else:
             self.exit_reason = None
         if company_code is not None:
             company_code['id_'] = company_code.pop('id')
-            self.company_code = CompanyCode(**company_code)
+            self.company_code = shared(CompanyCode, company_code)
         else:
             self.company_code = None
         self.__dict__.update(kwargs)
 
 
+@flyweight
 class BuildingLandShort:
     id_: int
     id_num: str
@@ -1481,7 +1473,7 @@ class Owner:
         tcodes = []
         if company_codes is not None and len(company_codes) > 0:
             for entry in company_codes:
-                tcode = CompanyCode(**entry)
+                tcode = shared(CompanyCode, entry)
                 tcodes.append(tcode)
 
         self.company_codes = tcodes
@@ -1511,7 +1503,7 @@ class BillingUnit:
         self.is_base_component_cold_water = is_base_component_cold_water
         self.is_base_component_heating = is_base_component_heating
         self.is_base_component_warm_water = is_base_component_warm_water
-        self.quantity_type = CompanyCode(**quantity_type)
+        self.quantity_type = shared(CompanyCode, quantity_type)
 
 
 class UseUnit:
@@ -1564,14 +1556,15 @@ class UseUnit:
         self.id_ = id_
         self.id_num = id_num
         building_land["id_"] = building_land.pop("id")
-        self.building_land = BuildingLandShort(**building_land)
+        self.building_land = shared(BuildingLandShort, building_land)
         economic_unit["id_"] = economic_unit.pop("id")
-        self.economic_unit = EconomicUnitShort(**economic_unit)
+        self.economic_unit = shared(EconomicUnitShort, economic_unit)
         self.estate_address = EstateAddress(**estate_address)
         if kwargs["current_financing_type"] and kwargs["current_financing_type"]["financing_type_catalog"]:
             kwargs["current_financing_type"]["financing_type_catalog"]["id_"] = (
                 kwargs["current_financing_type"]["financing_type_catalog"].pop("id"))
-            self.financing_type = FinancingTypeClass(**kwargs["current_financing_type"]["financing_type_catalog"])
+            self.financing_type = shared(FinancingTypeClass,
+                                         kwargs["current_financing_type"]["financing_type_catalog"])
         else:
             self.financing_type = None
         current_use_unit_type["id_"] = current_use_unit_type.pop("id")
@@ -1592,30 +1585,30 @@ class UseUnit:
         self.energy_certificate_id = energy_certificate_id
         if position is not None:
             position["id_"] = position.pop("id")
-            self.position = Position(**position)
+            self.position = shared(Position, position)
         else:
             self.position = None
         if floor is not None:
-            self.floor = Floor(**floor)
+            self.floor = shared(Floor, floor)
         else:
             self.floor = None
         if residential_authorization is not None:
-            self.residential_authorization = ResidentalAuthorization(**residential_authorization)
+            self.residential_authorization = shared(ResidentalAuthorization, residential_authorization)
         else:
             self.residential_authorization = None
         if entry_reason is not None:
-            self.entry_reason = EntryReason(**entry_reason)
+            self.entry_reason = shared(EntryReason, entry_reason)
         else:
             self.entry_reason = None
         if exit_reason is not None:
-            self.exit_reason = ExitReason(**exit_reason)
+            self.exit_reason = shared(ExitReason, exit_reason)
         else:
             self.exit_reason = None
         self.billing_units = billing_units
         self.use_unit_types = use_unit_types
         if company_code is not None:
             company_code['id_'] = company_code.pop('id')
-            self.company_code = CompanyCode(**company_code)
+            self.company_code = shared(CompanyCode, company_code)
         else:
             self.company_code = None
         self.__dict__.update(kwargs)
@@ -1648,9 +1641,9 @@ class Contractor:
         self.end_of_contract = end_of_contract
         self.contractual_use_valid_from = contractual_use_valid_from
         self.contractual_use_valid_to = contractual_use_valid_to
-        self.contractor_type = ContractorType(**contractor_type)
+        self.contractor_type = shared(ContractorType, contractor_type)
         use_unit["id_"] = use_unit.pop("id")
-        self.use_unit = UseUnitShort(**use_unit)
+        self.use_unit = shared(UseUnitShort, use_unit)
         person["id_"] = person.pop("id")
         self.person = Person(**person)
         default_address["id_"] = default_address.pop("id")
@@ -1669,9 +1662,10 @@ class LicenseAgreementShort:
         self.id_ = id_
         self.id_num = id_num
         use_unit["id_"] = use_unit.pop("id")
-        self.use_unit = UseUnitShort(**use_unit)
+        self.use_unit = shared(UseUnitShort, use_unit)
 
 
+@flyweight
 class VatRate:
     id_: int
     code: str
@@ -1702,10 +1696,10 @@ class PaymentMode:
         self.id_ = id_
         if active_from:
             if isinstance(active_from, str):
-                active_from = datetime.strptime(active_from, "%Y-%m-%d")
+                active_from = parse_datetime(active_from)
         if active_to:
             if isinstance(active_to, str):
-                active_to = datetime.strptime(active_to, "%Y-%m-%d")
+                active_to = parse_datetime(active_to)
         self.active_from = active_from
         self.active_to = active_to
         license_agreement["id_"] = license_agreement.pop("id")
@@ -1767,29 +1761,26 @@ class LicenseAgreement:
         self.id_ = id_
         self.id_num = id_num
         use_unit["id_"] = use_unit.pop("id")
-        self.use_unit = UseUnitShort(**use_unit)
+        self.use_unit = shared(UseUnitShort, use_unit)
         restriction_of_use["id_"] = restriction_of_use.pop("id")
-        self.restriction_of_use = RestrictionOfUse(**restriction_of_use)
+        self.restriction_of_use = shared(RestrictionOfUse, restriction_of_use)
         status_contract["id_"] = status_contract.pop("id")
-        self.status_contract = StatusContract(**status_contract)
+        self.status_contract = shared(StatusContract, status_contract)
         life_of_contract["id_"] = life_of_contract.pop("id")
-        self.life_of_contract = LifeOfContract(**life_of_contract)
+        self.life_of_contract = shared(LifeOfContract, life_of_contract)
         payment_interval["id_"] = payment_interval.pop("id")
-        self.payment_interval = PaymentInterval(**payment_interval)
+        self.payment_interval = shared(PaymentInterval, payment_interval)
         self.dunning_data = DunningData(**dunning_data)
         self.differing_maturity = differing_maturity
-        self.start_contract = datetime.strptime(start_contract, "%Y-%m-%d")
-        if end_of_contract is not None:
-            self.end_of_contract = datetime.strptime(end_of_contract, "%Y-%m-%d")
-        else:
-            self.end_of_contract = None
+        self.start_contract = parse_datetime(start_contract)
+        self.end_of_contract = parse_datetime(end_of_contract)
         if period_of_notice is not None:
             period_of_notice["id_"] = period_of_notice.pop("id")
-            self.period_of_notice = PeriodOfNotice(**period_of_notice)
+            self.period_of_notice = shared(PeriodOfNotice, period_of_notice)
         else:
             self.period_of_notice = None
         if debit_entry_type is not None:
-            self.debit_entry_type = DebitEntryType(**debit_entry_type)
+            self.debit_entry_type = shared(DebitEntryType, debit_entry_type)
         else:
             self.debit_entry_type = None
         self.contractors = contractors
@@ -1832,16 +1823,16 @@ class ContractPosition:
         license_agreement["id_"] = license_agreement.pop("id")
         self.license_agreement = LicenseAgreementShort(**license_agreement)
         vat_rate["id_"] = vat_rate.pop("id")
-        self.vat_rate = VatRate(**vat_rate)
+        self.vat_rate = shared(VatRate, vat_rate)
         valid_contract_position["id_"] = valid_contract_position.pop("id")
-        self.valid_contract_position = ValidContractPosition(**valid_contract_position)
+        self.valid_contract_position = shared(ValidContractPosition, valid_contract_position)
         change_reason_contracts["id_"] = change_reason_contracts.pop("id")
-        self.change_reason_contracts = ChangeReasonContracts(**change_reason_contracts)
+        self.change_reason_contracts = shared(ChangeReasonContracts, change_reason_contracts)
         contract_position_type["id_"] = contract_position_type.pop("id")
-        self.contract_position_type = ContractPositionType(**contract_position_type)
+        self.contract_position_type = shared(ContractPositionType, contract_position_type)
         if contract_position_type_slim is not None:
             contract_position_type_slim["id_"] = contract_position_type_slim.pop("id")
-            self.contract_position_type_slim = ContractPositionTypeSlim(**contract_position_type_slim)
+            self.contract_position_type_slim = shared(ContractPositionTypeSlim, contract_position_type_slim)
         else:
             self.contract_position_type_slim = None
 
@@ -1859,7 +1850,7 @@ class TicketComment:
         if kwargs:
             pass
         self.id_ = id_
-        self.created_at = datetime.strptime(created_at, "%Y-%m-%dT%H:%M:%S.%f%z")
+        self.created_at = parse_datetime(created_at)
         self.content = content
         self.user_name = user_name
         self.user_id = user_id
@@ -2015,8 +2006,8 @@ class OnlineRepaymentPlanEntry:
                  **kwargs):
         if kwargs:
             pass
-        self.calculation_date = datetime.strptime(calculation_date, "%Y-%m-%d")
-        self.maturity = datetime.strptime(maturity, "%Y-%m-%d")
+        self.calculation_date = parse_datetime(calculation_date)
+        self.maturity = parse_datetime(maturity)
         self.rest_debt = rest_debt
         self.calculation_capital = calculation_capital
         self.interest = interest
@@ -2067,7 +2058,7 @@ class RepaymentPlanEntry:
         if kwargs:
             pass
         self.id_ = id_
-        self.maturity = datetime.strptime(maturity, "%Y-%m-%d")
+        self.maturity = parse_datetime(maturity)
         self.rest_debt = rest_debt
         self.calculation_capital = calculation_capital
         self.annuity_amount = annuity_amount
@@ -2096,7 +2087,7 @@ class ObjectAssignmentEntry:
         self.nominal_amount = nominal_amount
         if economic_unit is not None:
             economic_unit["id_"] = economic_unit.pop("id")
-            self.economic_unit = EconomicUnitShort(**economic_unit)
+            self.economic_unit = shared(EconomicUnitShort, economic_unit)
         else:
             self.economic_unit = None
         if object_allocation_type:
@@ -2156,29 +2147,14 @@ class Condition:
         if kwargs:
             pass
         self.id_ = id_
-        self.term_from = datetime.strptime(term_from, "%Y-%m-%d")
-        if term_to:
-            self.term_to = datetime.strptime(term_to, "%Y-%m-%d")
-        else:
-            self.term_to = None
+        self.term_from = parse_datetime(term_from)
+        self.term_to = parse_datetime(term_to)
         self.amount = amount
         self.percentage = percentage
-        if first_maturity:
-            self.first_maturity = datetime.strptime(first_maturity, "%Y-%m-%d")
-        else:
-            self.first_maturity = None
-        if next_maturity:
-            self.next_maturity = datetime.strptime(next_maturity, "%Y-%m-%d")
-        else:
-            self.next_maturity = None
-        if fixed_maturity:
-            self.fixed_maturity = datetime.strptime(fixed_maturity, "%Y-%m-%d")
-        else:
-            self.fixed_maturity = None
-        if amortization_setting_off:
-            self.amortization_setting_off = datetime.strptime(amortization_setting_off, "%Y-%m-%d")
-        else:
-            self.amortization_setting_off = None
+        self.first_maturity = parse_datetime(first_maturity)
+        self.next_maturity = parse_datetime(next_maturity)
+        self.fixed_maturity = parse_datetime(fixed_maturity)
+        self.amortization_setting_off = parse_datetime(amortization_setting_off)
         self.loan_terms_type_id = loan_terms_type.get("id")
         self.loan_term_type = loan_terms_type.get("code")
         self.maturity_date_type_id = maturity_date_type.get("id")
@@ -2231,11 +2207,8 @@ class AnnuityHeaderItem:
             pass
         self.id_ = id_
         self.annuity_per_maturity = annuity_per_maturity
-        self.term_from = datetime.strptime(term_from, "%Y-%m-%d")
-        if term_to:
-            self.term_to = datetime.strptime(term_to, "%Y-%m-%d")
-        else:
-            self.term_to = None
+        self.term_from = parse_datetime(term_from)
+        self.term_to = parse_datetime(term_to)
         self.conditions = []
         if conditions:
             for condition_entry in conditions:
@@ -2349,38 +2322,23 @@ class Loan:
         self.loan_type_short_code = loan_type.get("short_code")
         self.collateral_security_id = collateral_security.get("id")
         self.collateral_security = collateral_security.get("code")
-        if contract_date:
-            self.contract_date = datetime.strptime(contract_date, "%Y-%m-%d")
-        else:
-            self.contract_date = None
-        if date_of_full_payment:
-            self.date_of_full_payment = datetime.strptime(date_of_full_payment, "%Y-%m-%d")
-        else:
-            self.date_of_full_payment = None
+        self.contract_date = parse_datetime(contract_date)
+        self.date_of_full_payment = parse_datetime(date_of_full_payment)
         self.has_special_repayment_option = has_special_repayment_option
-        self.current_date = datetime.strptime(current_date, "%Y-%m-%d")
+        self.current_date = parse_datetime(current_date)
         self.nominal_as_per_land_register = nominal_as_per_land_register
         self.nominal_capital = nominal_capital
         self.residual_debt = residual_debt
         self.calculation_capital = calculation_capital
-        self.min_term_from = datetime.strptime(min_term_from, "%Y-%m-%d")
+        self.min_term_from = parse_datetime(min_term_from)
         self.file_number = file_number
         self.contingent_number = contingent_number
-        if repayment_blackout_period:
-            self.repayment_blackout_period = datetime.strptime(repayment_blackout_period, "%Y-%m-%d")
-        else:
-            self.repayment_blackout_period = None
+        self.repayment_blackout_period = parse_datetime(repayment_blackout_period)
         self.annuity_mix = annuity_mix
         self.debt_discount_percent = debt_discount_percent
         self.building_saving_sum = building_saving_sum
-        if end_of_interest_fixing:
-            self.end_of_interest_fixing = datetime.strptime(end_of_interest_fixing, "%Y-%m-%d")
-        else:
-            self.end_of_interest_fixing = None
-        if last_ended_interest_entry:
-            self.last_ended_interest_entry = datetime.strptime(last_ended_interest_entry, "%Y-%m-%d")
-        else:
-            self.last_ended_interest_entry = None
+        self.end_of_interest_fixing = parse_datetime(end_of_interest_fixing)
+        self.last_ended_interest_entry = parse_datetime(last_ended_interest_entry)
         banking["id_"] = banking.pop("id")
         self.banking = Banking(**banking)
         self.own_reference = own_reference
@@ -2478,10 +2436,7 @@ class Ticket:
             pass
         self.id_ = id_
         self.id_num = id_num
-        try:
-            self.time_received = datetime.strptime(time_received, "%Y-%m-%dT%H:%M:%S.%f%z")
-        except ValueError:
-            self.time_received = datetime.strptime(time_received, "%Y-%m-%dT%H:%M:%S%z")
+        self.time_received = parse_datetime(time_received)
         self.subject = subject
         self.content = content
         if department is not None:
@@ -2510,7 +2465,7 @@ class Ticket:
                                              comment_from_api=tentry["comment_from_api"])
                     self.comments.append(tcomment)
                 except KeyError as e:
-                    print(f"Key error: {e.args}")
+                    logger.warning(f"Key error: {e.args}")
                     continue
 
         if main_assignment is not None:
@@ -2521,7 +2476,7 @@ class Ticket:
                                                entity_id=main_assignment["entity_id"])
                 self.main_assignment = tassignment
             except KeyError as e:
-                print(f"Key error: {e.args}")
+                logger.warning(f"Key error: {e.args}")
         else:
             self.main_assignment = None
 
@@ -2537,7 +2492,7 @@ class Ticket:
                                                    entity_id=tentry["entity_id"])
                     self.assignments.append(tassignment)
                 except KeyError as e:
-                    print(f"Key error: {e.args}")
+                    logger.warning(f"Key error: {e.args}")
 
 
 class CommunicationCatalog:
@@ -2605,7 +2560,7 @@ class ResponsibleOfficial:
                 tperson = Person(**person)
                 self.person = tperson
             except KeyError as e:
-                print(f"Key error: {e.args}")
+                logger.warning(f"Key error: {e.args}")
         else:
             self.person = None
 
@@ -2657,7 +2612,7 @@ class Department:
                                                      )
                     self.responsible_officials.append(tresp)
                 except KeyError as e:
-                    print(f"Key error: {e.args}")
+                    logger.warning(f"Key error: {e.args}")
 
     def __repr__(self):
         return f"Department {self.name} with {len(self.responsible_officials)} members."
@@ -2704,7 +2659,7 @@ class UseUnitJurisdiction:
         if kwargs:
             pass
         use_unit["id_"] = use_unit.pop("id")
-        self.use_unit = UseUnitShort(**use_unit)
+        self.use_unit = shared(UseUnitShort, use_unit)
         self.use_unit_universal_responsibility = use_unit_universal_responsibility
         if use_unit_universal_responsible_official is not None:
             use_unit_universal_responsible_official["id_"] = use_unit_universal_responsible_official.pop("id")
@@ -2740,7 +2695,7 @@ class EconomicUnitJurisdiction:
         if kwargs:
             pass
         economic_unit["id_"] = economic_unit.pop("id")
-        self.economic_unit = EconomicUnitShort(**economic_unit)
+        self.economic_unit = shared(EconomicUnitShort, economic_unit)
         self.economic_unit_universal_responsibility = economic_unit_universal_responsibility
         if economic_unit_universal_responsible_official is not None:
             economic_unit_universal_responsible_official["id_"] = economic_unit_universal_responsible_official.pop("id")
@@ -2781,11 +2736,11 @@ class CooperativeMembership:
     def __init__(self, **kwargs):
         self.id_ = kwargs.get("id")
         self.id_num = kwargs.get("id_num")
-        self.creation_date = datetime.strptime(kwargs.get("creation_date"), "%Y-%m-%d")
-        self.valid_from = datetime.strptime(kwargs.get("valid_from"), "%Y-%m-%d")
+        self.creation_date = parse_datetime(kwargs.get("creation_date"))
+        self.valid_from = parse_datetime(kwargs.get("valid_from"))
         t_valid_to = kwargs.get("valid_to")
         if t_valid_to:
-            t_valid_to = datetime.strptime(t_valid_to, "%Y-%m-%d")
+            t_valid_to = parse_datetime(t_valid_to)
         self.valid_to = t_valid_to
         self.is_payout_block_account = kwargs.get("is_payout_block_account")
         self.cooperative_account_clearing_lock = kwargs.get("cooperative_account_clearing_lock")
@@ -0,0 +1,149 @@
+"""
+Parallele Suche über in Shards aufgeteilte Caches.
+
+Für Suchen mit vielen Kandidaten (der Index grenzt kaum oder gar nicht ein, z.B. häufige Namensbestandteile oder
+Teilstrings über alle Felder) wird ein Cache in zusammenhängende Shards aufgeteilt und die Prüffunktion in einem
+Prozesspool auf alle Shards gleichzeitig angewendet. Die Worker erhalten die Shards einmalig beim Start (unter Linux
+per fork ohne Kopie), je Suche werden nur die Suchparameter, die Positionen der Kandidaten im jeweiligen Shard und die
+Positionen der Treffer übertragen. Ändert sich ein Cache, wird der Pool mit den neuen Shards neu gestartet.
+
+Die Prüffunktion muss modulweit definiert sein (z.B. matching.check_person_match).
+"""
+import multiprocessing
+import os
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+_worker_shards: Dict[str, List[Tuple[int, List]]] = {}
+
+
+def _init_worker(shards: Dict[str, List[Tuple[int, List]]]) -> None:
+    global _worker_shards
+    _worker_shards = shards
+
+
+def _search_shard(cache_type: str, shard_no: int, predicate: Callable, kwargs: Dict, max_results: int,
+                  attribute: str = None, distinct_attribute: str = None,
+                  positions: List[int] = None) -> List[Tuple[int, object]]:
+    offset, entries = _worker_shards[cache_type][shard_no]
+    if positions is None:
+        selected = enumerate(entries, offset)
+    else:
+        selected = ((position, entries[position - offset]) for position in positions)
+    res = []
+    seen = set()
+    for position, entry in selected:
+        obj = getattr(entry, attribute) if attribute is not None else entry
+        key = None
+        if distinct_attribute is not None:
+            key = getattr(obj, distinct_attribute, None)
+            if key in seen:
+                continue
+        if predicate(obj, **kwargs):
+            res.append((position, key))
+            seen.add(key)
+            if len(res) >= max_results:
+                break
+    return res
+
+
+class ShardedSearchExecutor:
+    """
+    Prozesspool für die parallele Suche in CacheStores
+    :param workers: Anzahl Worker-Prozesse (und Shards je Cache), Default: Anzahl CPU-Kerne
+    :param min_entries: Suchen mit weniger Kandidaten werden im aufrufenden Prozess ausgeführt
+    :param mp_context: (Optional) multiprocessing-Kontext, Default: fork, falls verfügbar
+    """
+
+    def __init__(self, workers: int = None, min_entries: int = 20000, mp_context=None) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.min_entries = min_entries
+        self._mp_context = mp_context
+        self._pool = None
+        self._shards: Dict[str, List[Tuple[int, List]]] = {}
+        self._versions = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    def _context(self):
+        if self._mp_context is not None:
+            return self._mp_context
+        if "fork" in multiprocessing.get_all_start_methods():
+            return multiprocessing.get_context("fork")
+        return multiprocessing.get_context()
+
+    def applies_to(self, store, candidates: int = None) -> bool:
+        """
+        True, wenn sich die parallele Suche lohnt
+        :param candidates: (Optional) Anzahl Kandidaten nach Eingrenzung durch einen Index, Default: ganzer Store
+        """
+        return (len(store) if candidates is None else candidates) >= self.min_entries
+
+    def load(self, store) -> None:
+        """
+        Teilt den Store in Shards auf, sofern sich sein Inhalt seit dem letzten Aufruf geändert hat
+        """
+        version = (id(store), store.version)
+        if self._versions.get(store.cache_type) == version and self._pool is not None:
+            return
+        entries = store.entries
+        shard_size = max(1, -(-len(entries) // self.workers))
+        self._shards[store.cache_type] = [(offset, entries[offset:offset + shard_size])
+                                          for offset in range(0, len(entries), shard_size)]
+        self._versions[store.cache_type] = version
+        self.shutdown()
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=self._context(),
+                                         initializer=_init_worker, initargs=(self._shards,))
+
+    def search(self, store, predicate: Callable, kwargs: Dict, max_results: int = 10, attribute: str = None,
+               distinct_attribute: str = None, positions: List[int] = None) -> List[int]:
+        """
+        Positionen der ersten max_results Einträge (in Cache-Reihenfolge), für die predicate(entry, **kwargs)
+        zutrifft
+        :param attribute: (Optional) predicate auf dieses Attribut des Eintrags anwenden, z.B. "person"
+        :param distinct_attribute: (Optional) Je Wert dieses Attributs nur den ersten Treffer liefern, z.B. "id_"
+        :param positions: (Optional) Aufsteigend sortierte Positionen der Kandidaten, Default: alle Einträge
+        """
+        self.load(store)
+        shards = self._shards[store.cache_type]
+        if positions is None:
+            tasks = [(shard_no, None) for shard_no in range(len(shards))]
+        else:
+            # Jeder Worker erhält nur die Kandidaten seines Shards, Shards ohne Kandidaten entfallen
+            tasks = []
+            for shard_no, (offset, entries) in enumerate(shards):
+                start = bisect_left(positions, offset)
+                end = bisect_left(positions, offset + len(entries))
+                if start < end:
+                    tasks.append((shard_no, positions[start:end]))
+        futures = [self._pool.submit(_search_shard, store.cache_type, shard_no, predicate, kwargs, max_results,
+                                     attribute, distinct_attribute, shard_positions)
+                   for shard_no, shard_positions in tasks]
+        # Jeder Shard liefert seine ersten max_results Treffer. Da die Shards zusammenhängend sind, ergibt das
+        # Aneinanderhängen in Shard-Reihenfolge die Cache-Reihenfolge.
+        res = []
+        seen = set()
+        for future in futures:
+            for position, key in future.result():
+                if distinct_attribute is not None:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                res.append(position)
+                if len(res) >= max_results:
+                    break
+            if len(res) >= max_results:
+                for remaining in futures:
+                    remaining.cancel()
+                break
+        return res
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
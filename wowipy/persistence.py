@@ -0,0 +1,305 @@
+"""
+Versioniertes Dateiformat für Caches.
+
+Aufbau einer Cache-Datei:
+    MAGIC (8 Byte) | Header-Länge (uint32, little endian) | Header (JSON) | Sektion 1 | Sektion 2 | ...
+
+Der Header enthält Formatversion, Codec, Kompression und je Entitätstyp Offset und Länge der Sektion. Dadurch
+können einzelne Entitätstypen geladen werden, ohne den Rest der Datei zu dekodieren. Die Datei wird per mmap
+gelesen, die Sektionen werden direkt aus dem Mapping dekomprimiert.
+
+Model-Objekte werden als Attribut-Dicts mit Klassennamen gespeichert und beim Laden ohne Aufruf von __init__
+wiederhergestellt. Attribute, die in models.py neu hinzugekommen sind, werden mit None belegt, entfallene
+Attribute bleiben erhalten. Unbekannte Klassen werden als SimpleNamespace geladen. Katalog-Objekte (@flyweight)
+und Adress-Strings werden beim Laden wie bei der Dekodierung geteilt.
+
+msgpack und zstandard werden verwendet, wenn sie installiert sind. Ansonsten wird auf json und zlib
+zurückgegriffen.
+"""
+import json
+import mmap
+import os
+import stat
+import struct
+import tempfile
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, date
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+from wowipy.exceptions import WowiPyException
+from wowipy import models
+from wowipy.flyweight import INTERNED_FIELDS, intern_str, is_flyweight, share
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b"WOWIPYC\x00"
+FORMAT_VERSION = 1
+
+FILE_FORMAT_WOWIPY = "wowipy"
+FILE_FORMAT_PICKLE = "pickle"
+
+CODEC_MSGPACK = "msgpack"
+CODEC_JSON = "json"
+
+COMPRESSION_ZSTD = "zstd"
+COMPRESSION_ZLIB = "zlib"
+COMPRESSION_NONE = "none"
+
+_HEADER_LEN = struct.Struct("<I")
+_class_fields = {}
+
+
+def default_codec() -> str:
+    return CODEC_MSGPACK if msgpack is not None else CODEC_JSON
+
+
+def default_compression() -> str:
+    return COMPRESSION_ZSTD if zstandard is not None else COMPRESSION_ZLIB
+
+
+def is_cache_file(file_name: str) -> bool:
+    with open(file_name, 'rb') as fp:
+        return fp.read(len(MAGIC)) == MAGIC
+
+
+def _encode_default(obj):
+    if isinstance(obj, datetime):
+        return {"__t": "dt", "v": obj.isoformat()}
+    if isinstance(obj, date):
+        return {"__t": "d", "v": obj.isoformat()}
+    if isinstance(obj, Decimal):
+        return {"__t": "dec", "v": str(obj)}
+    if isinstance(obj, (set, tuple)):
+        return list(obj)
+    if hasattr(obj, '__dict__'):
+        data = dict(obj.__dict__)
+        data["__c"] = type(obj).__name__
+        return data
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+
+def _fields_of(cls) -> Tuple[str, ...]:
+    fields = _class_fields.get(cls)
+    if fields is None:
+        names = []
+        for klass in reversed(cls.__mro__):
+            for name in getattr(klass, '__annotations__', {}).keys():
+                if name not in names:
+                    names.append(name)
+        fields = tuple(names)
+        _class_fields[cls] = fields
+    return fields
+
+
+def _object_hook(data: Dict):
+    cls_name = data.pop("__c", None)
+    if cls_name is not None:
+        cls = getattr(models, cls_name, None)
+        if not isinstance(cls, type):
+            return SimpleNamespace(**data)
+        obj = cls.__new__(cls)
+        for name in _fields_of(cls):
+            if name not in data:
+                data[name] = None
+        for name in INTERNED_FIELDS.intersection(data):
+            data[name] = intern_str(data[name])
+        obj.__dict__.update(data)
+        if is_flyweight(cls):
+            return share(obj)
+        return obj
+    tag = data.get("__t")
+    if tag is None:
+        return data
+    if tag == "dt":
+        return datetime.fromisoformat(data["v"])
+    if tag == "d":
+        return date.fromisoformat(data["v"])
+    if tag == "dec":
+        return Decimal(data["v"])
+    return data
+
+
+def _encode(payload, codec: str) -> bytes:
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise WowiPyException("msgpack is not installed")
+        return msgpack.packb(payload, default=_encode_default, use_bin_type=True)
+    if codec == CODEC_JSON:
+        return json.dumps(payload, default=_encode_default, separators=(',', ':')).encode('utf-8')
+    raise WowiPyException(f"Unknown codec '{codec}'")
+
+
+def _decode(raw, codec: str):
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise WowiPyException("Cache file uses msgpack, but msgpack is not installed")
+        return msgpack.unpackb(raw, object_hook=_object_hook, raw=False, strict_map_key=False)
+    if codec == CODEC_JSON:
+        return json.loads(bytes(raw), object_hook=_object_hook)
+    raise WowiPyException(f"Unknown codec '{codec}'")
+
+
+def _compress(raw: bytes, compression: str) -> bytes:
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise WowiPyException("zstandard is not installed")
+        return zstandard.ZstdCompressor(level=3).compress(raw)
+    if compression == COMPRESSION_ZLIB:
+        return zlib.compress(raw, 6)
+    if compression == COMPRESSION_NONE:
+        return raw
+    raise WowiPyException(f"Unknown compression '{compression}'")
+
+
+def _decompress(raw, compression: str):
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise WowiPyException("Cache file uses zstd, but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(raw)
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompress(raw)
+    if compression == COMPRESSION_NONE:
+        return raw
+    raise WowiPyException(f"Unknown compression '{compression}'")
+
+
+def dumps_cache(sections: List[Tuple[str, Optional[datetime], List]],
+                codec: str = None, compression: str = None) -> bytes:
+    """
+    Serialisiert eine oder mehrere Caches in das Cache-Dateiformat
+    :param sections: Liste aus (cache_type, built_at, entries)
+    :type sections: List[Tuple[str, datetime, List]]
+    :param codec: CODEC_MSGPACK oder CODEC_JSON. Default: msgpack, falls installiert
+    :type codec: str
+    :param compression: COMPRESSION_ZSTD, COMPRESSION_ZLIB oder COMPRESSION_NONE. Default: zstd, falls installiert
+    :type compression: str
+    :rtype: bytes
+    """
+    codec = codec or default_codec()
+    compression = compression or default_compression()
+    blobs = []
+    header_sections = {}
+    offset = 0
+    for cache_type, built_at, entries in sections:
+        blob = _compress(_encode(list(entries), codec), compression)
+        header_sections[cache_type] = {
+            "offset": offset,
+            "length": len(blob),
+            "count": len(entries),
+            "built_at": built_at.isoformat() if built_at is not None else None
+        }
+        offset += len(blob)
+        blobs.append(blob)
+
+    header = json.dumps({
+        "format_version": FORMAT_VERSION,
+        "codec": codec,
+        "compression": compression,
+        "sections": header_sections
+    }).encode('utf-8')
+    return b"".join([MAGIC, _HEADER_LEN.pack(len(header)), header] + blobs)
+
+
+def _parse_header(buffer) -> Dict:
+    if bytes(buffer[:len(MAGIC)]) != MAGIC:
+        raise WowiPyException("Not a WowiPy cache file")
+    header_start = len(MAGIC) + _HEADER_LEN.size
+    header_len = _HEADER_LEN.unpack(buffer[len(MAGIC):header_start])[0]
+    header = json.loads(bytes(buffer[header_start:header_start + header_len]))
+    if header.get("format_version", 0) > FORMAT_VERSION:
+        raise WowiPyException(f"Cache file version {header.get('format_version')} is not supported")
+    header["data_start"] = header_start + header_len
+    return header
+
+
+def loads_cache(buffer, cache_types: List[str] = None) -> Dict[str, Tuple[Optional[datetime], List]]:
+    """
+    Liest Caches aus einem Puffer (bytes, memoryview oder mmap). Ist cache_types angegeben, werden nur diese
+    Sektionen dekodiert.
+    :return: Dict cache_type -> (built_at, entries)
+    :rtype: Dict[str, Tuple[datetime, List]]
+    """
+    view = memoryview(buffer)
+    try:
+        header = _parse_header(view)
+        sections = header.get("sections")
+        wanted = list(sections.keys()) if cache_types is None else cache_types
+        missing = [cache_type for cache_type in wanted if cache_type not in sections]
+        if missing:
+            raise WowiPyException(f"Cache file does not contain {', '.join(missing)}")
+
+        ret = {}
+        for cache_type in wanted:
+            section = sections.get(cache_type)
+            start = header["data_start"] + section.get("offset")
+            raw = _decompress(view[start:start + section.get("length")], header.get("compression"))
+            entries = _decode(raw, header.get("codec"))
+            del raw
+            built_at = section.get("built_at")
+            ret[cache_type] = (datetime.fromisoformat(built_at) if built_at else None, entries)
+        return ret
+    finally:
+        view.release()
+
+
+@contextmanager
+def atomic_write(file_name: str):
+    """
+    Schreibt in eine temporäre Datei im Zielverzeichnis und ersetzt file_name erst danach (fsync, os.replace).
+    Prozesse, die die alte Datei per mmap lesen, behalten deren Inhalt. Nach einem Abbruch bleibt die alte Datei
+    unverändert.
+    """
+    directory = os.path.dirname(os.path.abspath(file_name))
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{os.path.basename(file_name)}.", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            yield fp
+            fp.flush()
+            os.fsync(fp.fileno())
+        # mkstemp legt die Datei nur für den Eigentümer lesbar an
+        mode = stat.S_IMODE(os.stat(file_name).st_mode) if os.path.exists(file_name) else 0o644
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, file_name)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+
+def write_cache_file(file_name: str, sections: List[Tuple[str, Optional[datetime], List]],
+                     codec: str = None, compression: str = None) -> None:
+    """
+    Schreibt eine oder mehrere Caches in eine Datei (siehe dumps_cache). Die Datei wird atomar ersetzt, da andere
+    Prozesse sie per mmap lesen können.
+    """
+    raw = dumps_cache(sections, codec=codec, compression=compression)
+    with atomic_write(file_name) as fp:
+        fp.write(raw)
+
+
+def read_cache_header(file_name: str) -> Dict:
+    with open(file_name, 'rb') as fp:
+        prefix = fp.read(len(MAGIC) + _HEADER_LEN.size)
+        if prefix[:len(MAGIC)] != MAGIC:
+            raise WowiPyException(f"'{file_name}' is not a WowiPy cache file")
+        header_len = _HEADER_LEN.unpack(prefix[len(MAGIC):])[0]
+        return _parse_header(prefix + fp.read(header_len))
+
+
+def read_cache_file(file_name: str, cache_types: List[str] = None) -> Dict[str, Tuple[Optional[datetime], List]]:
+    """
+    Liest Caches aus einer Datei per mmap (siehe loads_cache)
+    """
+    with open(file_name, 'rb') as fp:
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return loads_cache(mm, cache_types)
@@ -0,0 +1,71 @@
+"""
+Kölner Phonetik (Postel, 1969) für die phonetische Namenssuche.
+
+Gleich klingende deutsche Namen erhalten denselben Code, z.B. Meyer, Maier und Mayr -> "67".
+"""
+import re
+from functools import lru_cache
+from typing import List
+
+_UMLAUTS = str.maketrans({'Ä': 'A', 'Ö': 'O', 'Ü': 'U', 'ß': 'S'})
+_NON_LETTER_RE = re.compile(r"[^A-Z]+")
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+_CODES = {}
+for _letters, _code in (("AEIJOUY", "0"), ("B", "1"), ("FVW", "3"), ("GKQ", "4"), ("L", "5"), ("MN", "6"),
+                        ("R", "7"), ("SZ", "8")):
+    for _letter in _letters:
+        _CODES[_letter] = _code
+
+
+def _letter_code(word: str, i: int) -> str:
+    letter = word[i]
+    prev_letter = word[i - 1] if i > 0 else ""
+    next_letter = word[i + 1] if i + 1 < len(word) else ""
+    if letter == "H":
+        return ""
+    if letter == "P":
+        return "3" if next_letter == "H" else "1"
+    if letter in "DT":
+        return "8" if next_letter and next_letter in "CSZ" else "2"
+    if letter == "C":
+        if i == 0:
+            return "4" if next_letter and next_letter in "AHKLOQRUX" else "8"
+        if prev_letter in "SZ":
+            return "8"
+        return "4" if next_letter and next_letter in "AHKOQUX" else "8"
+    if letter == "X":
+        return "8" if prev_letter and prev_letter in "CKQ" else "48"
+    return _CODES.get(letter, "")
+
+
+@lru_cache(maxsize=65536)
+def cologne_phonetic(word: str) -> str:
+    """
+    Kölner Phonetik eines einzelnen Worts. Nicht-Buchstaben werden ignoriert; für Wörter ohne Buchstaben wird ein
+    leerer String geliefert.
+    """
+    word = _NON_LETTER_RE.sub("", word.upper().translate(_UMLAUTS))
+    if not word:
+        return ""
+    raw = "".join(_letter_code(word, i) for i in range(len(word)))
+    res = []
+    for digit in raw:
+        if res and res[-1] == digit:
+            continue
+        res.append(digit)
+    return res[0] + "".join(digit for digit in res[1:] if digit != "0") if res else ""
+
+
+def phonetic_codes(text: str) -> List[str]:
+    """
+    Kölner Phonetik aller Wörter eines Texts. Bindestriche trennen Wörter, z.B. bei Doppelnamen.
+    """
+    if not text:
+        return []
+    codes = []
+    for word in _WORD_RE.findall(text):
+        code = cologne_phonetic(word)
+        if code:
+            codes.append(code)
+    return codes
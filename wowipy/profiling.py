@@ -0,0 +1,284 @@
+"""
+Profiling der Model-Konstruktion ohne externen Profiler.
+
+ModelProfiler ersetzt während des Profilings die __init__-Methoden aller Klassen in wowipy.models sowie die
+Datums-Parser, die models.py verwendet, durch messende Wrapper. Erfasst werden:
+
+    models     Anzahl und Zeit je Model-Klasse, gesamt und ohne verschachtelte Models (self)
+    endpoints  Dekodierzeit je Endpunkt (ohne HTTP-Anfragen, die während des Dekodierens laufen)
+    fields     Anzahl und Zeit der Datums-Parser je Model-Klasse und Feld
+
+Die Wrapper sind prozessweit aktiv, solange ein Profiler läuft. Ohne Profiling bleiben die Models unverändert.
+"""
+import linecache
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+from wowipy import models
+from wowipy.metrics import RequestInfo
+
+_ASSIGNMENT_RE = re.compile(r"^\s*(?:self\.)?(\w+)\s*=")
+
+# Datums-Parser in wowipy.models, die für die Feld-Statistik ersetzt werden
+PARSE_FUNCTIONS = ("convert_to_date", "parse_date", "parse_datetime")
+PARSE_METHODS = ("strptime", "fromisoformat")
+
+
+class _Stats:
+    __slots__ = ('count', 'total', 'own')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.own = 0.0
+
+
+class _Frame:
+    __slots__ = ('key', 'target', 'start', 'children')
+
+    def __init__(self, key, target, start: float) -> None:
+        self.key = key
+        self.target = target
+        self.start = start
+        self.children = 0.0
+
+
+class _DatetimeProxy:
+    """
+    Ersetzt datetime in wowipy.models, misst strptime/fromisoformat und reicht alles andere durch
+    """
+
+    def __init__(self, profiler: "ModelProfiler", original) -> None:
+        self._profiler = profiler
+        self._original = original
+        for name in PARSE_METHODS:
+            setattr(self, name, profiler._parse_wrapper(getattr(original, name), f"datetime.{name}"))
+
+    def __getattr__(self, name):
+        return getattr(self._original, name)
+
+    def __call__(self, *args, **kwargs):
+        return self._original(*args, **kwargs)
+
+
+class ModelProfiler:
+    """
+    Sammelt Konstruktions-, Dekodier- und Parse-Zeiten. Über WowiPy.enable_profiling() aktivieren, die Ergebnisse
+    liefern report() und format_report().
+    """
+    _active = None
+    _active_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._models: Dict[str, _Stats] = {}
+        self._endpoints: Dict[str, _Stats] = {}
+        self._records: Dict[str, int] = {}
+        self._fields: Dict[Tuple[str, str], _Stats] = {}
+        self._field_names: Dict[Tuple, str] = {}
+        self._patched_inits: Dict[type, object] = {}
+        self._patched_functions: Dict[str, object] = {}
+
+    # Aktivierung
+
+    def start(self) -> "ModelProfiler":
+        with ModelProfiler._active_lock:
+            if ModelProfiler._active is self:
+                return self
+            if ModelProfiler._active is not None:
+                ModelProfiler._active.stop()
+            for cls in vars(models).values():
+                if isinstance(cls, type) and cls.__module__ == models.__name__ and '__init__' in cls.__dict__:
+                    self._patched_inits[cls] = cls.__dict__['__init__']
+                    cls.__init__ = self._init_wrapper(cls.__dict__['__init__'])
+            for name in PARSE_FUNCTIONS:
+                self._patched_functions[name] = getattr(models, name)
+                setattr(models, name, self._parse_wrapper(getattr(models, name), name))
+            self._patched_functions['datetime'] = models.datetime
+            models.datetime = _DatetimeProxy(self, models.datetime)
+            ModelProfiler._active = self
+        return self
+
+    def stop(self) -> None:
+        with ModelProfiler._active_lock:
+            if ModelProfiler._active is not self:
+                return
+            for cls, init in self._patched_inits.items():
+                cls.__init__ = init
+            for name, function in self._patched_functions.items():
+                setattr(models, name, function)
+            self._patched_inits = {}
+            self._patched_functions = {}
+            ModelProfiler._active = None
+
+    @property
+    def running(self) -> bool:
+        return ModelProfiler._active is self
+
+    def reset(self) -> None:
+        with self._lock:
+            self._models = {}
+            self._endpoints = {}
+            self._records = {}
+            self._fields = {}
+
+    # Messung
+
+    def _stack(self) -> List[_Frame]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = []
+            self._local.stack = stack
+        return stack
+
+    def _record(self, table: Dict, key, frame: _Frame, elapsed: float) -> None:
+        with self._lock:
+            stats = table.get(key)
+            if stats is None:
+                stats = _Stats()
+                table[key] = stats
+            stats.count += 1
+            stats.total += elapsed
+            stats.own += elapsed - frame.children
+
+    def _init_wrapper(self, init):
+        profiler = self
+
+        def __init__(obj, *args, **kwargs):
+            stack = profiler._stack()
+            # super().__init__ desselben Objekts wird nicht getrennt gezählt
+            if stack and stack[-1].target is obj:
+                return init(obj, *args, **kwargs)
+            frame = _Frame(type(obj).__name__, obj, time.perf_counter())
+            stack.append(frame)
+            try:
+                return init(obj, *args, **kwargs)
+            finally:
+                stack.pop()
+                elapsed = time.perf_counter() - frame.start
+                if stack:
+                    stack[-1].children += elapsed
+                profiler._record(profiler._models, frame.key, frame, elapsed)
+
+        __init__.__wrapped__ = init
+        return __init__
+
+    def _field_name(self, caller) -> str:
+        key = (caller.f_code, caller.f_lineno)
+        name = self._field_names.get(key)
+        if name is None:
+            match = _ASSIGNMENT_RE.match(linecache.getline(caller.f_code.co_filename, caller.f_lineno))
+            name = match.group(1) if match else f"{caller.f_code.co_name}:{caller.f_lineno}"
+            self._field_names[key] = name
+        return name
+
+    def _parse_wrapper(self, function, label: str):
+        profiler = self
+
+        def wrapper(*args, **kwargs):
+            local = profiler._local
+            # Verschachtelte Parser (convert_to_date -> parse_date) zählen beim äußeren Aufruf
+            if getattr(local, 'parsing', False):
+                return function(*args, **kwargs)
+            stack = profiler._stack()
+            model = stack[-1].key if stack else "-"
+            field = profiler._field_name(sys._getframe(1))
+            local.parsing = True
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                local.parsing = False
+                profiler._record(profiler._fields, (model, field, label), _Frame(None, None, start), elapsed)
+
+        wrapper.__wrapped__ = function
+        return wrapper
+
+    @contextmanager
+    def decode(self, endpoint: str, records: int):
+        """
+        Misst die Dekodierung einer Antwort. HTTP-Anfragen und verschachtelte Dekodierungen innerhalb des Blocks
+        (z.B. Vertragsnehmer bei add_contractors) werden abgezogen.
+        """
+        stack = self._local.__dict__.setdefault('decode_stack', [])
+        frame = _Frame(endpoint, None, time.perf_counter())
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            elapsed = time.perf_counter() - frame.start
+            if stack:
+                stack[-1].children += elapsed
+            self._record(self._endpoints, endpoint, frame, elapsed)
+            with self._lock:
+                self._records[endpoint] = self._records.get(endpoint, 0) + records
+
+    def __call__(self, info: RequestInfo) -> None:
+        # Als Request-Hook registriert: Wartezeit auf Anfragen während des Dekodierens nicht mitzählen
+        stack = getattr(self._local, 'decode_stack', None)
+        if stack:
+            stack[-1].children += info.latency
+
+    # Auswertung
+
+    def report(self) -> Dict[str, List[Dict]]:
+        """
+        Ergebnisse je Bereich, jeweils absteigend nach Zeit:
+        models (model, count, total, self, mean), endpoints (endpoint, calls, records, time, per_record) und
+        fields (model, field, parser, count, total, mean)
+        """
+        with self._lock:
+            model_rows = [{
+                "model": model,
+                "count": stats.count,
+                "total": stats.total,
+                "self": stats.own,
+                "mean": stats.total / stats.count,
+            } for model, stats in self._models.items()]
+            endpoint_rows = [{
+                "endpoint": endpoint,
+                "calls": stats.count,
+                "records": self._records.get(endpoint, 0),
+                "time": stats.own,
+                "per_record": stats.own / self._records[endpoint] if self._records.get(endpoint) else 0.0,
+            } for endpoint, stats in self._endpoints.items()]
+            field_rows = [{
+                "model": model,
+                "field": field,
+                "parser": parser,
+                "count": stats.count,
+                "total": stats.total,
+                "mean": stats.total / stats.count,
+            } for (model, field, parser), stats in self._fields.items()]
+        model_rows.sort(key=lambda row: row["self"], reverse=True)
+        endpoint_rows.sort(key=lambda row: row["time"], reverse=True)
+        field_rows.sort(key=lambda row: row["total"], reverse=True)
+        return {"models": model_rows, "endpoints": endpoint_rows, "fields": field_rows}
+
+    def format_report(self, top: int = 20) -> str:
+        """
+        report() als Text, je Bereich die top Zeilen
+        """
+        report = self.report()
+        lines = [f"{'Model':<40} {'Anzahl':>10} {'gesamt s':>10} {'self s':>10} {'us/Objekt':>10}"]
+        for row in report["models"][:top]:
+            lines.append(f"{row['model']:<40} {row['count']:>10} {row['total']:>10.3f} {row['self']:>10.3f} "
+                         f"{row['mean'] * 1e6:>10.1f}")
+        lines.append("")
+        lines.append(f"{'Endpunkt':<50} {'Aufrufe':>8} {'Datensätze':>10} {'Zeit s':>10} {'us/Datensatz':>12}")
+        for row in report["endpoints"][:top]:
+            lines.append(f"{row['endpoint']:<50} {row['calls']:>8} {row['records']:>10} {row['time']:>10.3f} "
+                         f"{row['per_record'] * 1e6:>12.1f}")
+        lines.append("")
+        lines.append(f"{'Model.Feld':<50} {'Parser':<22} {'Anzahl':>10} {'gesamt s':>10} {'us/Aufruf':>10}")
+        for row in report["fields"][:top]:
+            lines.append(f"{row['model'] + '.' + row['field']:<50} {row['parser']:<22} {row['count']:>10} "
+                         f"{row['total']:>10.3f} {row['mean'] * 1e6:>10.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,131 @@
+"""
+Fortschritt von seitenweisen Abrufen (fetch_all, build_*_cache, sync_cache).
+
+Je abgerufener Seite wird ein ProgressInfo an alle registrierten Observer gegeben. Ohne Observer wird nur bei
+aktiviertem DEBUG-Level des Loggers "wowipy.progress" geloggt, sonst entsteht kein Aufwand.
+Die Gesamtzahl wird aus dem letzten vollständigen Abruf derselben Abfrage geschätzt, da OPENWOWI keine Gesamtzahl
+liefert.
+"""
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressInfo:
+    """
+    Stand eines seitenweisen Abrufs
+    """
+    task: str
+    pages: int
+    rows: int
+    estimated_total: Optional[int]
+    elapsed: float
+    finished: bool
+
+    def __init__(self, task: str, pages: int, rows: int, estimated_total: Optional[int], elapsed: float,
+                 finished: bool = False) -> None:
+        self.task = task
+        self.pages = pages
+        self.rows = rows
+        self.estimated_total = estimated_total
+        self.elapsed = elapsed
+        self.finished = finished
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """
+        Geschätzte Restdauer in Sekunden, None ohne Schätzung der Gesamtzahl
+        """
+        if self.finished:
+            return 0.0
+        if self.estimated_total is None or self.rows_per_second <= 0:
+            return None
+        return max(self.estimated_total - self.rows, 0) / self.rows_per_second
+
+    def __repr__(self):
+        total = f"/{self.estimated_total}" if self.estimated_total is not None else ""
+        eta = f", ETA {self.eta:.1f} s" if self.eta is not None and not self.finished else ""
+        state = " fertig" if self.finished else ""
+        return f"{self.task}: {self.rows}{total} in {self.pages} Seiten, {self.rows_per_second:.0f}/s{eta}{state}"
+
+
+ProgressObserver = Callable[[ProgressInfo], None]
+
+
+class LoggingProgressObserver:
+    """
+    Observer, der den Fortschritt höchstens alle interval Sekunden (und am Ende) loggt
+    :param log: (Optional) Logger, Default: "wowipy.progress"
+    :param level: Log-Level
+    :param interval: Mindestabstand zwischen zwei Meldungen je Abruf in Sekunden
+    """
+
+    def __init__(self, log: logging.Logger = None, level: int = logging.INFO, interval: float = 5.0) -> None:
+        self.log = log or logger
+        self.level = level
+        self.interval = interval
+        self._last: Dict[str, float] = {}
+
+    def __call__(self, info: ProgressInfo) -> None:
+        now = time.monotonic()
+        if not info.finished and now - self._last.get(info.task, 0.0) < self.interval:
+            return
+        self._last[info.task] = now
+        if info.finished:
+            self._last.pop(info.task, None)
+        self.log.log(self.level, "%r", info)
+
+
+class ProgressTracker:
+    """
+    Zählt Seiten und Datensätze eines Abrufs und benachrichtigt die Observer
+    :param task: Name des Abrufs, z.B. der Endpunkt
+    :param observers: Observer, wird nicht kopiert
+    :param estimated_total: (Optional) Erwartete Anzahl Datensätze
+    :param on_finish: (Optional) Wird mit der Anzahl Datensätze aufgerufen, wenn der Abruf vollständig war
+    """
+
+    def __init__(self, task: str, observers: List[ProgressObserver], estimated_total: int = None,
+                 on_finish: Callable[[int], None] = None) -> None:
+        self.task = task
+        self.observers = observers
+        self.estimated_total = estimated_total
+        self.on_finish = on_finish
+        self.pages = 0
+        self.rows = 0
+        self.start = time.perf_counter()
+
+    def _info(self, finished: bool = False) -> ProgressInfo:
+        total = self.estimated_total
+        if total is not None and (finished or self.rows > total):
+            total = self.rows
+        return ProgressInfo(self.task, self.pages, self.rows, total, time.perf_counter() - self.start, finished)
+
+    def _notify(self, finished: bool) -> None:
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if not self.observers and not debug:
+            return
+        info = self._info(finished)
+        if debug:
+            logger.debug("%r", info)
+        for observer in self.observers:
+            try:
+                observer(info)
+            except Exception as e:
+                logger.warning(f"Progress observer {observer!r} failed: {e}")
+
+    def update(self, rows: int, pages: int = 1) -> None:
+        self.pages += pages
+        self.rows += rows
+        self._notify(False)
+
+    def finish(self) -> None:
+        if self.on_finish is not None:
+            self.on_finish(self.rows)
+        self._notify(True)
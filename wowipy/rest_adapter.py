@@ -1,23 +1,30 @@
 import logging
+import threading
+import time
 
 import requests
 import requests.packages
 import requests.utils
 import requests_cache
-from typing import Dict
+from typing import Callable, Dict
 from wowipy.exceptions import WowiPyException
+from wowipy.metrics import RequestInfo, endpoint_label
 from wowipy.models import Result
 from json import JSONDecodeError
 
+# Methods that may be re-sent after an error response without changing the result
+IDEMPOTENT_METHODS = frozenset({"GET", "PUT", "DELETE"})
+
 
 class RestAdapter:
     logger = logging.getLogger(__name__)
 
     def __init__(self, hostname: str, user: str, password: str, api_key: str, version: str = 'v1.2',
-                 logger: logging.Logger = None, user_agent: str = None):
+                 logger: logging.Logger = None, user_agent: str = None, timeout: float = None):
         """
         Constructor for RestAdapter
-        :param hostname: OPENWOWI-Hostname without trailing slash, e.g. customer.wowiport.de
+        :param hostname: OPENWOWI-Hostname without trailing slash, e.g. customer.wowiport.de. A base URL with scheme
+                         (e.g. http://127.0.0.1:8080 for wowipy.mock_server) is used as given
         :type hostname: str
         :param user: Wowiport username (does not need any permissions)
         :type user: str
@@ -29,6 +36,8 @@ class RestAdapter:
         :type version: str
         :param logger: Logger Object
         :type logger: Logger
+        :param timeout: (Optional) Connect and read timeout in seconds for API requests. Default: no timeout
+        :type timeout: float
         """
         requests_cache.install_cache(backend='memory', expire_after=10800)
         if user_agent is None:
@@ -36,23 +45,28 @@ class RestAdapter:
         else:
             self.user_agent = user_agent
         self._logger = logger or logging.getLogger(__name__)
-        self.host_base = hostname
-        self.url = f"https://{hostname}/openwowi/{version}/"
+        self.host_base = hostname if "://" in hostname else f"https://{hostname}"
+        self.url = f"{self.host_base}/openwowi/{version}/"
         self.user = user
         self.password = password
         self.api_key = api_key
+        self.timeout = timeout
+        self._hooks = []
+        self._token_lock = threading.Lock()
+        # wowipy.tracing.Tracer, set via WowiPy.enable_tracing()
+        self.tracer = None
         if len(hostname) > 0:
             self.access_token, self.refresh_token = self._create_token()
 
     def _create_token(self, refresh_token: str = None):
-        full_url = f"https://{self.host_base}/oauth2/token"
+        full_url = f"{self.host_base}/oauth2/token"
         if not refresh_token:
-            print(f"_create_token: Logging in")
+            self._logger.info("Logging in")
             payload = f"grant_type=password&" \
                       f"username={self.user}&" \
                       f"password={self.password}"
         else:
-            print(f"_create_token: Refreshing token")
+            self._logger.info("Refreshing token")
             payload = f"grant_type=refresh_token&" \
                       f"refresh_token={refresh_token}"
         headers = {
@@ -69,22 +83,95 @@ class RestAdapter:
         response_json = response.json()
         return response_json["access_token"], response_json["refresh_token"]
 
+    def add_hook(self, hook: Callable[[RequestInfo], None]) -> None:
+        """
+        Registers a callable that is called with a RequestInfo after every request (e.g. metrics.RequestMetrics)
+        :param hook: Callable taking a RequestInfo
+        """
+        if hook not in self._hooks:
+            self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[RequestInfo], None]) -> None:
+        if hook in self._hooks:
+            self._hooks.remove(hook)
+
+    def _notify(self, http_method: str, endpoint: str, response, latency: float, retries: int,
+                error: Exception = None) -> None:
+        if not self._hooks:
+            return
+        request_bytes = 0
+        response_bytes = 0
+        status_code = None
+        from_cache = False
+        if response is not None:
+            status_code = response.status_code
+            body = response.request.body if response.request is not None else None
+            request_bytes = len(body) if body else 0
+            response_bytes = len(response.content or b"")
+            from_cache = bool(getattr(response, 'from_cache', False))
+        info = RequestInfo(method=http_method.upper(), endpoint=endpoint, status_code=status_code, latency=latency,
+                           request_bytes=request_bytes, response_bytes=response_bytes, retries=retries,
+                           from_cache=from_cache, error=error)
+        for hook in self._hooks:
+            try:
+                hook(info)
+            except Exception as e:
+                self._logger.warning(f"Request hook {hook!r} failed: {e}")
+
+    def _refresh_access_token(self, expired_token: str) -> None:
+        # Parallel requests (bulk writes) share the token. The refresh token is single-use, so only the first
+        # request that sees the expired token refreshes it.
+        with self._token_lock:
+            if self.access_token == expired_token:
+                self.access_token, self.refresh_token = self._create_token(refresh_token=self.refresh_token)
+
     def get(self, endpoint: str, ep_params: Dict = None, force_refresh: bool = True) -> Result:
         return self._do(http_method='GET', endpoint=endpoint, ep_params=ep_params, force_refresh=force_refresh)
 
-    def post(self, endpoint: str, ep_params: Dict = None, data: Dict = None) -> Result:
-        return self._do(http_method='POST', endpoint=endpoint, ep_params=ep_params, data=data)
+    def post(self, endpoint: str, ep_params: Dict = None, data: Dict = None,
+             session: requests.Session = None) -> Result:
+        return self._do(http_method='POST', endpoint=endpoint, ep_params=ep_params, data=data, session=session)
 
-    def put(self, endpoint: str, ep_params: Dict = None, data: Dict = None) -> Result:
-        return self._do(http_method='PUT', endpoint=endpoint, ep_params=ep_params, data=data)
+    def put(self, endpoint: str, ep_params: Dict = None, data: Dict = None,
+            session: requests.Session = None) -> Result:
+        return self._do(http_method='PUT', endpoint=endpoint, ep_params=ep_params, data=data, session=session)
 
-    def delete(self, endpoint: str, ep_params: Dict = None, data: Dict = None) -> Result:
-        return self._do(http_method='DELETE', endpoint=endpoint, ep_params=ep_params, data=data)
+    def delete(self, endpoint: str, ep_params: Dict = None, data: Dict = None,
+               session: requests.Session = None) -> Result:
+        return self._do(http_method='DELETE', endpoint=endpoint, ep_params=ep_params, data=data, session=session)
+
+    def request(self, http_method: str, endpoint: str, ep_params: Dict = None, data: Dict = None,
+                session: requests.Session = None, timeout: float = None, retry: bool = True) -> Result:
+        """
+        Generic request, e.g. for bulk operations that carry the HTTP method as data
+        :param session: (Optional) Pooled session to send the request with (keep-alive). Default: a new connection
+                        per request
+        :param timeout: (Optional) Timeout in seconds for this request. Default: timeout of the adapter
+        :param retry: Resend a failed idempotent request once. Pass False if the caller handles retries and backoff
+                      itself. An expired access token is refreshed and the request resent either way.
+        """
+        return self._do(http_method=http_method, endpoint=endpoint, ep_params=ep_params, data=data, session=session,
+                        timeout=timeout, retry=retry)
 
     def _do(self, http_method: str, endpoint: str, ep_params: Dict = None, data: Dict = None,
-            force_refresh: bool = False) -> Result:
+            force_refresh: bool = False, session: requests.Session = None, timeout: float = None,
+            retry: bool = True) -> Result:
+        if self.tracer is None:
+            return self._request(http_method, endpoint, ep_params, data, force_refresh, session=session,
+                                 timeout=timeout, retry=retry)
+        with self.tracer.span(f"HTTP {http_method.upper()}", **{"http.method": http_method.upper(),
+                                                                 "http.route": endpoint_label(endpoint),
+                                                                 "wowi.endpoint": endpoint}) as span:
+            return self._request(http_method, endpoint, ep_params, data, force_refresh, span, session, timeout,
+                                 retry)
+
+    def _request(self, http_method: str, endpoint: str, ep_params: Dict = None, data: Dict = None,
+                 force_refresh: bool = False, span=None, session: requests.Session = None,
+                 timeout: float = None, retry: bool = True) -> Result:
         if ep_params is None:
             ep_params = {}
+        if timeout is None:
+            timeout = self.timeout
 
         if http_method.upper() == "GET":
             if "limit" not in ep_params.keys():
@@ -95,42 +182,67 @@ class RestAdapter:
         ep_params["apiKey"] = self.api_key
 
         full_url = self.url + endpoint
+        access_token = self.access_token
         headers = {
             'User-Agent': self.user_agent,
             'Accept': 'text/plain',
-            'Authorization': f'Bearer {self.access_token}'
+            'Authorization': f'Bearer {access_token}'
         }
+        if span is not None:
+            headers['traceparent'] = span.traceparent
         log_line_pre = f"method={http_method}, url={full_url}"
-        log_line_post = ', '.join((log_line_pre, "success={}, status_code={}, message={}, text={}"))
         response = None
-        for _ in range(2):
+        retries = 0
+        start = time.perf_counter()
+        for attempt in range(2):
+            retries = attempt
             try:
                 self._logger.debug(msg=log_line_pre)
-                if force_refresh:
+                if session is not None:
+                    response = session.request(method=http_method, url=full_url, headers=headers, params=ep_params,
+                                               json=data, timeout=timeout)
+                elif force_refresh:
                     with requests_cache.disabled():
                         response = requests.request(method=http_method, url=full_url, headers=headers, params=ep_params,
-                                                    json=data)
+                                                    json=data, timeout=timeout)
                 else:
                     response = requests.request(method=http_method, url=full_url, headers=headers, params=ep_params,
-                                                json=data)
+                                                json=data, timeout=timeout)
             except requests.exceptions.RequestException as e:
+                self._notify(http_method, endpoint, None, time.perf_counter() - start, retries, e)
                 raise WowiPyException("Request failed") from e
 
             if 200 <= response.status_code < 300:
                 break
             elif response.status_code == 401:
-                self.acces_token, self.refresh_token = self._create_token(refresh_token=self.refresh_token)
-                headers['Authorization'] = f'Bearer {self.access_token}'
+                self._refresh_access_token(access_token)
+                access_token = self.access_token
+                headers['Authorization'] = f'Bearer {access_token}'
                 continue
+            elif not retry:
+                break
+            elif http_method.upper() not in IDEMPOTENT_METHODS:
+                # A failed create may still have been processed by the server, sending it again could duplicate it
+                break
+        latency = time.perf_counter() - start
+        if span is not None:
+            span.set_attribute("http.status_code", response.status_code)
+            span.set_attribute("http.retries", retries)
+            span.set_attribute("http.response_bytes", len(response.content or b""))
+            span.set_attribute("http.from_cache", bool(getattr(response, 'from_cache', False)))
 
         try:
             data_out = response.json()
         except (ValueError, JSONDecodeError) as e:
-            raise WowiPyException("Bad JSON in response") from e
+            self._notify(http_method, endpoint, response, latency, retries, e)
+            raise WowiPyException("Bad JSON in response", status_code=response.status_code) from e
 
         is_success = 200 <= response.status_code <= 299
-        log_line = log_line_post.format(is_success, response.status_code, response.reason, response.text)
+        self._notify(http_method, endpoint, response, latency, retries)
         if is_success:
-            self._logger.debug(msg=log_line)
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug(msg=f"{log_line_pre}, success=True, status_code={response.status_code}, "
+                                       f"message={response.reason}, text={response.text}")
             return Result(response.status_code, message=response.reason, data=data_out)
-        raise WowiPyException(f"{response.status_code}: {response.reason} -> {response.text}")
+        raise WowiPyException(f"{response.status_code}: {response.reason} -> {response.text}",
+                              status_code=response.status_code)
@@ -0,0 +1,735 @@
+"""
+Indizes für die Suche in den Caches.
+
+PersonTokenIndex liefert Kandidaten (Positionen im Cache), die anschließend mit check_person_match geprüft werden.
+Die Kandidatenmenge ist immer eine Obermenge der Treffer, sodass die Suche per Index dieselben Ergebnisse in
+derselben Reihenfolge liefert wie der vollständige Durchlauf.
+
+IdNumIndex ordnet die hierarchischen Objektnummern (Wirtschaftseinheit.Gebäude.Nutzungseinheit.Vertrag) für
+Präfix- und Bereichsabfragen.
+
+SearchTextIndex ist der gemeinsame Index für die globale Suche (search_cache) über Objektnummern und Texte.
+
+TrigramIndex dient der unscharfen Suche (Tippfehler, Schreibvarianten, Abkürzungen) und liefert nach Ähnlichkeit
+sortierte Treffer.
+"""
+import heapq
+import re
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from wowipy.phonetics import phonetic_codes
+
+FIELD_NAME = "name"
+FIELD_ADDRESS = "address"
+FIELD_PHONE = "phone"
+FIELD_EMAIL = "email"
+FIELD_NAME_PHONETIC = "name_phonetic"
+
+SEARCH_POS_LEFT = "begins"
+SEARCH_POS_CONTAINS = "contains"
+SEARCH_PHONETIC = "phonetic"
+
+PHONE_TYPES = ("Festnetz", "Handynummer")
+DEFAULT_COUNTRY_CODE = "49"
+
+_WORD_RE = re.compile(r"\w+")
+_NON_WORD_RE = re.compile(r"[\W_]+")
+_STREET_ABBR_RE = re.compile(r"(str|strasse)\.?(?=\s|\d|$)")
+_SQUARE_ABBR_RE = re.compile(r"(?<=[a-z])pl(?=\s|\d|$)")
+_UMLAUTS = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss'})
+_NON_DIGIT_RE = re.compile(r"\D+")
+_TRUNK_PREFIX_RE = re.compile(r"\(\s*0\s*\)")
+_ABBREVIATIONS = {'pl': 'platz', 'prof': 'professor', 'dr': 'doktor', 'st': 'sankt'}
+_ABBR_RE = re.compile(r"\b(" + "|".join(_ABBREVIATIONS.keys()) + r")\b")
+_HOUSE_NUMBER_RE = re.compile(r"^(?P<street>.*?)\s*(?P<number>\d+)\s*(?P<suffix>[a-z]?)(?:\s+\d+\s*[a-z]?)?$")
+
+
+def tokenize(text: str) -> List[str]:
+    if not text:
+        return []
+    return _WORD_RE.findall(text.lower())
+
+
+@lru_cache(maxsize=65536)
+def phone_search_key(number: str) -> str:
+    """
+    Vereinheitlicht eine Rufnummer für den Vergleich: Ländervorwahl (+xx / 0049) und führende Nullen werden
+    entfernt, Leerzeichen gelöscht.
+    """
+    number = number.strip()
+    if number.startswith('+'):
+        number = number[3:]
+    if number.startswith('0049'):
+        number = number[4:]
+    return number.lstrip('0').replace(' ', '')
+
+
+def normalize_phone(number: str, country_code: str = DEFAULT_COUNTRY_CODE) -> str:
+    """
+    Bringt eine Rufnummer in eine E.164-ähnliche Form (nur Ziffern, mit Ländervorwahl, ohne +):
+    "+49 351 123456", "+49 (0)351 123456", "0049 (351) 123456" und "0351/123456" ergeben "49351123456". Die
+    eingeklammerte Verkehrsausscheidungsziffer "(0)" wird entfernt. Nummern ohne führende 0 und ohne Ländervorwahl
+    (z.B. ohne Ortsvorwahl erfasst) bleiben unverändert.
+    """
+    if not number:
+        return ""
+    number = _TRUNK_PREFIX_RE.sub('', number.strip())
+    international = number.startswith('+')
+    digits = _NON_DIGIT_RE.sub('', number)
+    if international:
+        return digits
+    if digits.startswith('00'):
+        return digits[2:]
+    if digits.startswith('0'):
+        return country_code + digits.lstrip('0')
+    return digits
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalisiert Text für den unscharfen Vergleich: Kleinschreibung, Umlaute und ß ausgeschrieben,
+    "str." / "str" am Wortende zu "strasse", gängige Abkürzungen (Pl., Prof., Dr., St.) ausgeschrieben,
+    Satzzeichen entfernt.
+    """
+    if not text:
+        return ""
+    text = text.lower().translate(_UMLAUTS)
+    text = _NON_WORD_RE.sub(' ', text.replace('.', '. ')).strip()
+    text = _ABBR_RE.sub(lambda match: _ABBREVIATIONS[match.group(1)], text)
+    text = _SQUARE_ABBR_RE.sub('platz', text)
+    return _STREET_ABBR_RE.sub('strasse', text)
+
+
+def street_key(street: str) -> str:
+    """
+    Vergleichsschlüssel einer Straße: normalisiert und ohne Leerzeichen, z.B. "Haupt-Str." -> "hauptstrasse"
+    """
+    return normalize_text(street).replace(' ', '')
+
+
+def parse_address(address: str) -> Tuple[str, Optional[int], str]:
+    """
+    Zerlegt "Straße Hausnummer[Zusatz]" in (Straßenschlüssel, Hausnummer, Zusatz),
+    z.B. "Hauptstr. 12 a" -> ("hauptstrasse", 12, "a"). Ohne Hausnummer ist diese None.
+    """
+    text = normalize_text(address)
+    match = _HOUSE_NUMBER_RE.match(text)
+    if match is None or not match.group('street'):
+        return text.replace(' ', ''), None, ""
+    return match.group('street').replace(' ', ''), int(match.group('number')), match.group('suffix')
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Trigramme eines normalisierten Texts. Jedes Wort wird vorne mit zwei und hinten mit einem Leerzeichen
+    aufgefüllt, sodass auch kurze Wörter und Wortanfänge berücksichtigt werden.
+    """
+    res = set()
+    for word in text.split():
+        padded = f"  {word} "
+        for i in range(len(padded) - 2):
+            res.add(padded[i:i + 3])
+    return res
+
+
+class SearchHit:
+    """
+    Suchtreffer mit Bewertung (1.0 = exakt)
+    """
+    cache_type: str
+    entry: object
+    score: float
+    field: str
+
+    def __init__(self, cache_type: str, entry, score: float, field: str = None) -> None:
+        self.cache_type = cache_type
+        self.entry = entry
+        self.score = score
+        self.field = field
+
+    def __repr__(self):
+        return f"SearchHit {self.cache_type} {getattr(self.entry, 'id_', None)} ({self.score:.2f})"
+
+
+class TokenPostings:
+    """
+    Zuordnung Token -> Positionen mit sortiertem Vokabular für Präfix- und Teilstringsuche
+    """
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, Set[int]] = {}
+        self.vocabulary: List[str] = []
+        self._last_substring = None
+
+    def add(self, token: str, position: int) -> None:
+        positions = self.postings.get(token)
+        if positions is None:
+            positions = set()
+            self.postings[token] = positions
+        positions.add(position)
+
+    def finalize(self) -> None:
+        self.vocabulary = sorted(self.postings.keys())
+        self._last_substring = None
+
+    def exact(self, token: str) -> Set[int]:
+        return self.postings.get(token, set())
+
+    def prefix(self, prefix: str) -> Set[int]:
+        res = set()
+        start = bisect_left(self.vocabulary, prefix)
+        for token in self.vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            res.update(self.postings[token])
+        return res
+
+    def substring(self, needle: str) -> Set[int]:
+        # Bei Eingabe Zeichen für Zeichen verlängert sich needle meist nur. Dann genügt es, die Tokens des
+        # vorherigen Treffers zu prüfen statt des gesamten Vokabulars.
+        # Der Memo wird nur einmal gelesen: bei parallelen Aufrufen kann ein anderer Thread ihn zwischendurch
+        # ersetzen, das Paar (needle, matching) bleibt so aber in sich konsistent.
+        tokens = self.vocabulary
+        last = self._last_substring
+        if last is not None and needle.startswith(last[0]):
+            tokens = last[1]
+        matching = [token for token in tokens if needle in token]
+        self._last_substring = (needle, matching)
+        res = set()
+        for token in matching:
+            res.update(self.postings[token])
+        return res
+
+
+class PersonTokenIndex:
+    """
+    Token- und Präfixindex über Namen, Firmennamen, Straßen, Rufnummern und E-Mail-Adressen sowie Index der
+    Kölner Phonetik über die Namen.
+    :param person_getter: Liefert zu einem Cache-Eintrag die Person (z.B. Contractor -> Contractor.person)
+    """
+
+    def __init__(self, person_getter: Callable = None) -> None:
+        self.person_getter = person_getter
+        self.fields: Dict[str, TokenPostings] = {}
+
+    def build(self, entries: List) -> None:
+        fields = {
+            FIELD_NAME: TokenPostings(),
+            FIELD_ADDRESS: TokenPostings(),
+            FIELD_PHONE: TokenPostings(),
+            FIELD_EMAIL: TokenPostings(),
+            FIELD_NAME_PHONETIC: TokenPostings()
+        }
+        for position, entry in enumerate(entries):
+            person = self.person_getter(entry) if self.person_getter is not None else entry
+            if person is None:
+                continue
+            if person.natural_person is not None:
+                for token in tokenize(person.natural_person.first_name):
+                    fields[FIELD_NAME].add(token, position)
+                for token in tokenize(person.natural_person.last_name):
+                    fields[FIELD_NAME].add(token, position)
+            if person.legal_person is not None:
+                for token in tokenize(person.legal_person.long_name1):
+                    fields[FIELD_NAME].add(token, position)
+            for name in person_name_texts(person):
+                for code in phonetic_codes(name):
+                    fields[FIELD_NAME_PHONETIC].add(code, position)
+            if person.addresses is not None:
+                for address in person.addresses:
+                    for token in tokenize(address.street_complete):
+                        fields[FIELD_ADDRESS].add(token, position)
+            if person.communications is not None:
+                for comm in person.communications:
+                    if comm.content is None or comm.communication_type is None:
+                        continue
+                    type_name = comm.communication_type.name
+                    if type_name == "Festnetz" or type_name == "Handynummer":
+                        fields[FIELD_PHONE].add(phone_search_key(comm.content), position)
+                    elif type_name == "E-Mail":
+                        fields[FIELD_EMAIL].add(comm.content.strip().lower(), position)
+        for postings in fields.values():
+            postings.finalize()
+        self.fields = fields
+
+    def candidates(self, field: str, needle: str, search_mode: str = SEARCH_POS_CONTAINS) -> Optional[Set[int]]:
+        """
+        Kandidatenpositionen für needle in field. None, wenn der Index die Anfrage nicht eingrenzen kann und alle
+        Einträge geprüft werden müssen.
+        """
+        if search_mode == SEARCH_PHONETIC:
+            if field != FIELD_NAME:
+                search_mode = SEARCH_POS_CONTAINS
+            else:
+                # Jedes Wort von needle muss phonetisch einem Wort des Namens entsprechen
+                codes = phonetic_codes(needle)
+                if not codes:
+                    # Ohne Buchstaben kann kein Name phonetisch passen
+                    return set()
+                postings = self.fields.get(FIELD_NAME_PHONETIC)
+                res = None
+                for code in set(codes):
+                    res = set(postings.exact(code)) if res is None else res & postings.exact(code)
+                return res
+
+        postings = self.fields.get(field)
+        if postings is None:
+            return None
+        if field == FIELD_PHONE:
+            key = phone_search_key(needle)
+        elif field == FIELD_EMAIL:
+            key = needle.strip().lower()
+        else:
+            tokens = tokenize(needle)
+            if not tokens:
+                return None
+            if search_mode == SEARCH_POS_LEFT:
+                # Nur eingrenzbar, wenn needle mit einem Wortzeichen beginnt
+                if not needle.lower().startswith(tokens[0]):
+                    return None
+                return postings.prefix(tokens[0])
+            # Jeder Wortteil von needle muss in einem einzelnen Token des Feldes vorkommen
+            return postings.substring(max(tokens, key=len))
+        if not key:
+            return None
+        if search_mode == SEARCH_POS_LEFT:
+            return postings.prefix(key)
+        return postings.substring(key)
+
+
+def person_name_texts(person) -> List[str]:
+    texts = []
+    if person is None:
+        return texts
+    if person.natural_person is not None:
+        first_name = person.natural_person.first_name or ""
+        last_name = person.natural_person.last_name or ""
+        texts.append(f"{first_name} {last_name}")
+    if person.legal_person is not None and person.legal_person.long_name1:
+        texts.append(person.legal_person.long_name1)
+    return texts
+
+
+def person_address_texts(person) -> List[str]:
+    if person is None or person.addresses is None:
+        return []
+    return [address.street_complete for address in person.addresses if address.street_complete]
+
+
+def estate_address_texts(entry) -> List[str]:
+    estate_address = getattr(entry, 'estate_address', None)
+    if estate_address is None or not estate_address.street_complete:
+        return []
+    return [estate_address.street_complete]
+
+
+def person_search_texts(person) -> List[str]:
+    return person_name_texts(person) + person_address_texts(person)
+
+
+def license_agreement_texts(entry) -> List[str]:
+    texts = []
+    if entry.use_unit is not None and entry.use_unit.use_unit_number:
+        texts.append(entry.use_unit.use_unit_number)
+    if entry.contractors is not None:
+        for contractor in entry.contractors:
+            texts.extend(person_name_texts(contractor.person))
+    return texts
+
+
+def economic_unit_texts(entry) -> List[str]:
+    return [text for text in (entry.name, entry.location) if text]
+
+
+class TrigramIndex:
+    """
+    Trigrammindex für die unscharfe Suche. Je Feld liefert eine Funktion die Texte eines Cache-Eintrags; die
+    Ähnlichkeit ist der Jaccard-Koeffizient der Trigrammmengen, je Eintrag zählt der beste Text.
+    :param fields: Feldname -> Funktion(entry) -> List[str]
+    """
+
+    def __init__(self, fields: Dict[str, Callable]) -> None:
+        self.field_getters = fields
+        self._postings: Dict[str, Dict[str, List[int]]] = {}
+        self._doc_positions: Dict[str, List[int]] = {}
+        self._doc_sizes: Dict[str, List[int]] = {}
+
+    def build(self, entries: List) -> None:
+        postings = {}
+        doc_positions = {}
+        doc_sizes = {}
+        for field, getter in self.field_getters.items():
+            field_postings = {}
+            positions = []
+            sizes = []
+            for position, entry in enumerate(entries):
+                for text in getter(entry):
+                    grams = trigrams(normalize_text(text))
+                    if not grams:
+                        continue
+                    doc = len(positions)
+                    positions.append(position)
+                    sizes.append(len(grams))
+                    for gram in grams:
+                        doc_list = field_postings.get(gram)
+                        if doc_list is None:
+                            field_postings[gram] = [doc]
+                        else:
+                            doc_list.append(doc)
+            postings[field] = field_postings
+            doc_positions[field] = positions
+            doc_sizes[field] = sizes
+        self._postings = postings
+        self._doc_positions = doc_positions
+        self._doc_sizes = doc_sizes
+
+    def search(self, field: str, text: str, max_results: Optional[int] = 10, min_similarity: float = 0.2) -> List:
+        """
+        Die max_results ähnlichsten Einträge als Liste aus (score, position), absteigend sortiert.
+        Mit max_results=None werden alle Einträge ab min_similarity geliefert.
+        """
+        field_postings = self._postings.get(field)
+        if field_postings is None:
+            return []
+        query = trigrams(normalize_text(text))
+        if not query:
+            return []
+        counts = Counter()
+        for gram in query:
+            doc_list = field_postings.get(gram)
+            if doc_list is not None:
+                counts.update(doc_list)
+
+        query_size = len(query)
+        positions = self._doc_positions[field]
+        sizes = self._doc_sizes[field]
+        best = {}
+        for doc, overlap in counts.items():
+            score = overlap / (query_size + sizes[doc] - overlap)
+            if score < min_similarity:
+                continue
+            position = positions[doc]
+            if score > best.get(position, 0.0):
+                best[position] = score
+        if max_results is None:
+            return [(score, position) for position, score in best.items()]
+        # Bei gleicher Bewertung gewinnt der frühere Cache-Eintrag
+        top = heapq.nsmallest(max_results, best.items(), key=lambda item: (-item[1], item[0]))
+        return [(score, position) for position, score in top]
+
+
+class PhoneIndex:
+    """
+    Index der normalisierten Rufnummern (Festnetz, Handynummer) für die Rückwärtssuche, z.B. bei eingehenden
+    Anrufen. Neben der exakten Suche werden Nummern gefunden, die ohne Vorwahl erfasst wurden (gespeicherte Nummer
+    ist Endstück der gesuchten), sowie Nummern, die auf eine unvollständige Eingabe enden.
+    :param person_getter: Liefert zu einem Cache-Eintrag die Person (z.B. Contractor -> Contractor.person)
+    :param min_suffix: Mindestlänge für den Vergleich über Endstücke
+    """
+
+    def __init__(self, person_getter: Callable = None, country_code: str = DEFAULT_COUNTRY_CODE,
+                 min_suffix: int = 6) -> None:
+        self.person_getter = person_getter
+        self.country_code = country_code
+        self.min_suffix = min_suffix
+        self._exact: Dict[str, List[int]] = {}
+        self._reversed: List[str] = []
+
+    def build(self, entries: List) -> None:
+        exact = {}
+        for position, entry in enumerate(entries):
+            person = self.person_getter(entry) if self.person_getter is not None else entry
+            if person is None or person.communications is None:
+                continue
+            for comm in person.communications:
+                if comm.content is None or comm.communication_type is None or \
+                        comm.communication_type.name not in PHONE_TYPES:
+                    continue
+                key = normalize_phone(comm.content, self.country_code)
+                if not key:
+                    continue
+                positions = exact.get(key)
+                if positions is None:
+                    exact[key] = [position]
+                elif positions[-1] != position:
+                    positions.append(position)
+        self._exact = exact
+        self._reversed = sorted(key[::-1] for key in exact.keys())
+
+    def exact(self, number: str) -> List[int]:
+        return self._exact.get(normalize_phone(number, self.country_code), [])
+
+    def ending_with(self, digits: str) -> Set[int]:
+        """
+        Positionen aller Einträge, deren Nummer auf digits endet
+        """
+        digits = _NON_DIGIT_RE.sub('', digits)
+        if len(digits) < self.min_suffix:
+            return set()
+        needle = digits[::-1]
+        res = set()
+        start = bisect_left(self._reversed, needle)
+        for key in self._reversed[start:]:
+            if not key.startswith(needle):
+                break
+            res.update(self._exact[key[::-1]])
+        return res
+
+    def suffixes_of(self, number: str) -> Set[int]:
+        """
+        Positionen aller Einträge, deren Nummer ein Endstück von number ist (z.B. ohne Vorwahl erfasst)
+        """
+        key = normalize_phone(number, self.country_code)
+        res = set()
+        for start in range(1, len(key) - self.min_suffix + 1):
+            res.update(self._exact.get(key[start:], []))
+        return res
+
+    def lookup(self, number: str, match_suffix: bool = True) -> List[int]:
+        """
+        Positionen zu number in Cache-Reihenfolge. Ohne exakten Treffer wird (bei match_suffix) über Endstücke
+        gesucht.
+        """
+        positions = self.exact(number)
+        if positions or not match_suffix:
+            return list(positions)
+        national = normalize_phone(number, self.country_code)
+        if national.startswith(self.country_code):
+            national = national[len(self.country_code):]
+        return sorted(self.suffixes_of(number) | self.ending_with(national))
+
+
+class SearchTextIndex:
+    """
+    Index für die globale Suche über Objektnummer (id_num) und Anzeigetexte (Namen, Adressen) eines Caches.
+    :param text_getter: Funktion(entry) -> List[str] mit den durchsuchbaren Texten
+    :param idnum_getter: Funktion(entry) -> str, Default: entry.id_num
+    """
+    SCORE_IDNUM_EXACT = 1.0
+    SCORE_IDNUM_PREFIX = 0.9
+    SCORE_IDNUM_CONTAINS = 0.7
+    SCORE_TEXT_EXACT = 0.6
+    SCORE_TEXT_PREFIX = 0.5
+    SCORE_TEXT_CONTAINS = 0.4
+
+    def __init__(self, text_getter: Callable = None, idnum_getter: Callable = None) -> None:
+        self.text_getter = text_getter
+        self.idnum_getter = idnum_getter
+        self._idnums = TokenPostings()
+        self._tokens = TokenPostings()
+
+    def build(self, entries: List) -> None:
+        idnums = TokenPostings()
+        tokens = TokenPostings()
+        for position, entry in enumerate(entries):
+            id_num = self.idnum_getter(entry) if self.idnum_getter is not None else getattr(entry, 'id_num', None)
+            if id_num:
+                idnums.add(id_num.lower(), position)
+            if self.text_getter is not None:
+                for text in self.text_getter(entry):
+                    for token in tokenize(text):
+                        tokens.add(token, position)
+        idnums.finalize()
+        tokens.finalize()
+        self._idnums = idnums
+        self._tokens = tokens
+
+    def search(self, search_str: str, search_mode: str = SEARCH_POS_CONTAINS) -> Dict[int, float]:
+        """
+        Bewertete Treffer als Dict Position -> Score. Treffer in der Objektnummer zählen mehr als in Texten,
+        exakte Treffer mehr als Präfix- und Teilstringtreffer.
+        """
+        scores = {}
+        needle = search_str.strip().lower()
+        if not needle:
+            return scores
+
+        def rate(positions, score):
+            for position in positions:
+                if score > scores.get(position, 0.0):
+                    scores[position] = score
+
+        if search_mode == SEARCH_POS_CONTAINS:
+            rate(self._idnums.substring(needle), self.SCORE_IDNUM_CONTAINS)
+        rate(self._idnums.prefix(needle), self.SCORE_IDNUM_PREFIX)
+        rate(self._idnums.exact(needle), self.SCORE_IDNUM_EXACT)
+
+        # Texte: jedes Wort der Suche muss in einem Wort des Eintrags vorkommen
+        needle_tokens = tokenize(needle)
+        if not needle_tokens:
+            return scores
+        lookups = [(self._tokens.prefix, self.SCORE_TEXT_PREFIX), (self._tokens.exact, self.SCORE_TEXT_EXACT)]
+        if search_mode == SEARCH_POS_CONTAINS:
+            lookups.insert(0, (self._tokens.substring, self.SCORE_TEXT_CONTAINS))
+        for lookup, score in lookups:
+            positions = None
+            for token in needle_tokens:
+                positions = set(lookup(token)) if positions is None else positions & lookup(token)
+                if not positions:
+                    break
+            rate(positions, score)
+        return scores
+
+
+def idnum_key(id_num: str) -> Tuple:
+    """
+    Sortierschlüssel einer Objektnummer: je Segment (0, Zahl) oder (1, Text), sodass "00123.004" und "123.4"
+    gleich behandelt werden und Segmente numerisch sortiert werden
+    """
+    key = []
+    for segment in id_num.strip().split('.'):
+        if segment.isdigit():
+            key.append((0, int(segment)))
+        else:
+            key.append((1, segment))
+    return tuple(key)
+
+
+# Größer als jedes Segment, schließt beim Bereichsende alle untergeordneten Nummern ein
+_KEY_MAX = (2,)
+
+
+class IdNumIndex:
+    """
+    Sortierter Index über die Segmente der Objektnummer (id_num) für Präfixabfragen ("alles unter 00123.004") und
+    Bereichsabfragen in O(log n + k)
+    """
+
+    def __init__(self, idnum_getter: Callable = None) -> None:
+        self.idnum_getter = idnum_getter
+        self._keys: List[Tuple] = []
+        self._positions: List[int] = []
+        self._last_segments: List[Optional[int]] = []
+
+    def build(self, entries: List) -> None:
+        keyed = []
+        last_segments = []
+        for position, entry in enumerate(entries):
+            id_num = self.idnum_getter(entry) if self.idnum_getter is not None else getattr(entry, 'id_num', None)
+            if not id_num:
+                last_segments.append(None)
+                continue
+            key = idnum_key(id_num)
+            keyed.append((key, position))
+            last_segments.append(key[-1][1] if key[-1][0] == 0 else None)
+        keyed.sort()
+        self._keys = [key for key, _ in keyed]
+        self._positions = [position for _, position in keyed]
+        self._last_segments = last_segments
+
+    def last_segment(self, position: int) -> Optional[int]:
+        """
+        Letztes Segment der Objektnummer als Zahl (z.B. die Gebäudenummer), None wenn nicht numerisch
+        """
+        return self._last_segments[position]
+
+    def prefix(self, id_num_prefix: str) -> List[int]:
+        """
+        Positionen der Einträge, deren Objektnummer mit den Segmenten von id_num_prefix beginnt, sortiert nach
+        Objektnummer
+        """
+        prefix_key = idnum_key(id_num_prefix)
+        start = bisect_left(self._keys, prefix_key)
+        end = bisect_left(self._keys, prefix_key + (_KEY_MAX,))
+        return self._positions[start:end]
+
+    def range(self, id_num_from: str = None, id_num_to: str = None) -> List[int]:
+        """
+        Positionen der Einträge von id_num_from bis einschließlich id_num_to (inkl. untergeordneter Nummern),
+        sortiert nach Objektnummer
+        """
+        start = 0 if id_num_from is None else bisect_left(self._keys, idnum_key(id_num_from))
+        end = len(self._keys) if id_num_to is None else bisect_right(self._keys, idnum_key(id_num_to) + (_KEY_MAX,))
+        return self._positions[start:end]
+
+
+class AddressIndex:
+    """
+    Index über die Objektadressen (EstateAddress) von Gebäuden und Nutzungseinheiten. Straßen werden beim Aufbau
+    normalisiert (Abkürzungen, Umlaute), Hausnummern in Nummer und Zusatz zerlegt. Indiziert wird nach Straße,
+    Straße + Hausnummer und PLZ + Straße sowie über die zusammengezogene Adresse für die Teilstringsuche.
+    """
+
+    def __init__(self) -> None:
+        self._by_street: Dict[str, List[int]] = {}
+        self._by_number: Dict[Tuple[str, int], List[int]] = {}
+        self._by_zip: Dict[Tuple[str, str], List[int]] = {}
+        self._compact = TokenPostings()
+        self._addresses: List[Optional[Tuple[str, Optional[int], str, Optional[str]]]] = []
+
+    @staticmethod
+    def _parse_estate_address(estate_address) -> Optional[Tuple[str, Optional[int], str]]:
+        if estate_address is None:
+            return None
+        if estate_address.street and estate_address.house_number:
+            number_match = re.match(r"\s*(\d+)\s*([a-zA-Z]?)", estate_address.house_number)
+            if number_match is not None:
+                suffix = estate_address.house_number_addition or number_match.group(2) or ""
+                return street_key(estate_address.street), int(number_match.group(1)), suffix.strip().lower()
+        if estate_address.street_complete:
+            return parse_address(estate_address.street_complete)
+        if estate_address.street:
+            return street_key(estate_address.street), None, ""
+        return None
+
+    def build(self, entries: List) -> None:
+        by_street = {}
+        by_number = {}
+        by_zip = {}
+        compact = TokenPostings()
+        addresses = []
+        for position, entry in enumerate(entries):
+            estate_address = getattr(entry, 'estate_address', None)
+            parsed = self._parse_estate_address(estate_address)
+            if parsed is None:
+                addresses.append(None)
+                continue
+            key, number, suffix = parsed
+            zip_ = estate_address.zip_
+            addresses.append((key, number, suffix, zip_))
+            by_street.setdefault(key, []).append(position)
+            if number is not None:
+                by_number.setdefault((key, number), []).append(position)
+            if zip_:
+                by_zip.setdefault((zip_.strip(), key), []).append(position)
+            if estate_address.street_complete:
+                compact.add(street_key(estate_address.street_complete), position)
+        compact.finalize()
+        self._by_street = by_street
+        self._by_number = by_number
+        self._by_zip = by_zip
+        self._compact = compact
+        self._addresses = addresses
+
+    def resolve(self, address: str, zip_: str = None) -> List[int]:
+        """
+        Positionen der Einträge zur Adresse "Straße Hausnummer[Zusatz]" in Cache-Reihenfolge. Gibt es zur
+        Hausnummer keinen Eintrag mit passendem Zusatz, werden alle Einträge der Hausnummer geliefert, ohne
+        Hausnummer alle Einträge der Straße.
+        """
+        key, number, suffix = parse_address(address)
+        if number is None:
+            positions = self._by_street.get(key, [])
+        else:
+            positions = self._by_number.get((key, number), [])
+            with_suffix = [position for position in positions if self._addresses[position][2] == suffix]
+            if with_suffix:
+                positions = with_suffix
+        if zip_:
+            in_zip = set(self._by_zip.get((zip_.strip(), key), []))
+            positions = [position for position in positions if position in in_zip]
+        return list(positions)
+
+    def candidates(self, search_address: str, search_mode: str = SEARCH_POS_CONTAINS) -> Set[int]:
+        """
+        Positionen, deren zusammengezogene Adresse (normalisiert, ohne Leerzeichen) search_address enthält bzw.
+        damit beginnt
+        """
+        needle = street_key(search_address)
+        if not needle:
+            return set(range(len(self._addresses)))
+        if search_mode == SEARCH_POS_LEFT:
+            return self._compact.prefix(needle)
+        return self._compact.substring(needle)
@@ -0,0 +1,66 @@
+import hashlib
+import json
+from datetime import datetime
+from typing import Dict, Optional
+
+
+def record_hash(entry: Dict) -> str:
+    """
+    Erzeugt einen stabilen Hash über einen Rohdatensatz der API (vor humps/Model-Konvertierung)
+    :param entry: Datensatz, wie er von OPENWOWI geliefert wird
+    :type entry: Dict
+    :return: Hex-Digest
+    :rtype: str
+    """
+    raw = json.dumps(entry, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class SyncState:
+    """
+    Watermark eines Caches: Zeitpunkt der letzten Synchronisierung und Hashes der bekannten Datensätze
+    """
+    cache_type: str
+    last_sync: Optional[datetime]
+    last_full_sync: Optional[datetime]
+    record_hashes: Dict[int, str]
+
+    def __init__(self, cache_type: str, last_sync: datetime = None, last_full_sync: datetime = None,
+                 record_hashes: Dict[int, str] = None) -> None:
+        self.cache_type = cache_type
+        self.last_sync = last_sync
+        self.last_full_sync = last_full_sync
+        self.record_hashes = record_hashes if record_hashes is not None else {}
+
+    def __repr__(self):
+        return f"SyncState {self.cache_type} (last sync {self.last_sync}, {len(self.record_hashes)} records)"
+
+
+class SyncResult:
+    """
+    Ergebnis eines Sync-Laufs
+    """
+    cache_type: str
+    fetched: int
+    inserted: int
+    updated: int
+    deleted: int
+    unchanged: int
+    watermark: datetime
+
+    def __init__(self, cache_type: str, watermark: datetime) -> None:
+        self.cache_type = cache_type
+        self.watermark = watermark
+        self.fetched = 0
+        self.inserted = 0
+        self.updated = 0
+        self.deleted = 0
+        self.unchanged = 0
+
+    @property
+    def changed(self) -> int:
+        return self.inserted + self.updated + self.deleted
+
+    def __repr__(self):
+        return f"SyncResult {self.cache_type}: fetched {self.fetched}, inserted {self.inserted}, " \
+               f"updated {self.updated}, deleted {self.deleted}, unchanged {self.unchanged}"
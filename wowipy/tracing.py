@@ -0,0 +1,273 @@
+"""
+Optionales Tracing nach dem Vorbild von OpenTelemetry.
+
+Ein Tracer erzeugt verschachtelte Spans (öffentliche WowiPy-Methode -> Seite -> HTTP-Anfrage, dazu Dekodierung).
+Der aktuelle Span wird über contextvars weitergegeben, verschachtelte Aufrufe werden dadurch automatisch Kinder.
+Beendete Spans gehen an einen Exporter:
+
+    InMemorySpanExporter   Spans in einer Liste, z.B. für Tests
+    FileSpanExporter       eine JSON-Zeile je Span
+    OTLPHttpSpanExporter   OTLP/HTTP (JSON) an einen lokalen Collector, z.B. http://localhost:4318/v1/traces
+
+Ohne aktiviertes Tracing entstehen keine Spans und kein Overhead in den Hot Loops.
+"""
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import requests
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("wowipy_current_span", default=None)
+
+STATUS_UNSET = "UNSET"
+STATUS_OK = "OK"
+STATUS_ERROR = "ERROR"
+
+
+class Span:
+    """
+    Ein Zeitabschnitt mit Name, Attributen und Bezug zum übergeordneten Span
+    """
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'start_ns', 'end_ns', 'attributes', 'status',
+                 'status_message')
+
+    def __init__(self, name: str, trace_id: str, span_id: str, parent_id: str = None,
+                 attributes: Dict = None) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = dict(attributes) if attributes else {}
+        self.status = STATUS_UNSET
+        self.status_message = None
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.status = STATUS_ERROR
+        self.status_message = f"{type(exception).__name__}: {exception}"
+
+    @property
+    def duration(self) -> Optional[float]:
+        """
+        Dauer in Sekunden, None solange der Span läuft
+        """
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e9
+
+    @property
+    def traceparent(self) -> str:
+        """
+        W3C-traceparent-Header für die Weitergabe an den Server
+        """
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "status": self.status,
+            "status_message": self.status_message,
+        }
+
+    def __repr__(self):
+        return f"Span {self.name} ({self.span_id}, parent {self.parent_id})"
+
+
+class SpanExporter:
+    """
+    Basisklasse der Exporter. export() wird je beendetem Span aufgerufen, shutdown() beim Beenden des Tracers.
+    """
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        self.flush()
+
+
+class InMemorySpanExporter(SpanExporter):
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans = []
+
+
+class FileSpanExporter(SpanExporter):
+    """
+    Schreibt je Span eine JSON-Zeile (Span.to_dict) in eine Datei
+    :param file_name: Zieldatei, wird fortgeschrieben
+    """
+
+    def __init__(self, file_name: str) -> None:
+        self.file_name = file_name
+        self._lock = threading.Lock()
+        self._fp = open(file_name, "a", encoding="utf-8")
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._fp.write(line + "\n")
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._fp.closed:
+                self._fp.flush()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if not self._fp.closed:
+                self._fp.close()
+
+
+def _otlp_value(value) -> Dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OTLPHttpSpanExporter(SpanExporter):
+    """
+    Sendet Spans gesammelt im OTLP/HTTP-JSON-Format an einen Collector (z.B. OpenTelemetry Collector, Jaeger)
+    :param endpoint: URL des Collectors
+    :param service_name: Wert für service.name
+    :param batch_size: Anzahl Spans je Sendung
+    :param timeout: Timeout je Sendung in Sekunden
+    """
+
+    def __init__(self, endpoint: str = "http://localhost:4318/v1/traces", service_name: str = "wowipy",
+                 batch_size: int = 512, timeout: float = 10.0) -> None:
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._pending: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._pending.append(span)
+            if len(self._pending) < self.batch_size:
+                return
+            batch = self._pending
+            self._pending = []
+        self._send(batch)
+
+    def flush(self) -> None:
+        with self._lock:
+            batch = self._pending
+            self._pending = []
+        if batch:
+            self._send(batch)
+
+    def _payload(self, spans: List[Span]) -> Dict:
+        return {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+            "scopeSpans": [{
+                "scope": {"name": "wowipy"},
+                "spans": [{
+                    "traceId": span.trace_id,
+                    "spanId": span.span_id,
+                    "parentSpanId": span.parent_id or "",
+                    "name": span.name,
+                    "kind": 3 if span.name.startswith("HTTP ") else 1,
+                    "startTimeUnixNano": str(span.start_ns),
+                    "endTimeUnixNano": str(span.end_ns),
+                    "attributes": [{"key": key, "value": _otlp_value(value)}
+                                   for key, value in span.attributes.items() if value is not None],
+                    "status": {"code": {STATUS_UNSET: 0, STATUS_OK: 1, STATUS_ERROR: 2}[span.status],
+                               "message": span.status_message or ""},
+                } for span in spans],
+            }],
+        }]}
+
+    def _send(self, spans: List[Span]) -> None:
+        # Tracing darf den eigentlichen Job nicht abbrechen, Fehler beim Senden werden verworfen
+        try:
+            with requests.Session() as session:
+                session.post(self.endpoint, json=self._payload(spans), timeout=self.timeout)
+        except requests.exceptions.RequestException:
+            pass
+
+
+class Tracer:
+    """
+    Erzeugt Spans und gibt beendete Spans an den Exporter
+    :param exporter: (Optional) Exporter, Default: InMemorySpanExporter
+    :param sample_rate: Anteil der Traces (0..1), die aufgezeichnet werden. Entschieden wird je Wurzel-Span.
+    """
+
+    def __init__(self, exporter: SpanExporter = None, sample_rate: float = 1.0) -> None:
+        self.exporter = exporter if exporter is not None else InMemorySpanExporter()
+        self.sample_rate = sample_rate
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        span = _current_span.get()
+        return span if span is not False else None
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """
+        Kontextmanager für einen Span, verschachtelte Spans werden Kinder des aktuellen Spans.
+        Liefert None, wenn der Trace nicht aufgezeichnet wird.
+        """
+        parent = _current_span.get()
+        if parent is False or (parent is None and self.sample_rate < 1.0 and random.random() >= self.sample_rate):
+            # Nicht aufgezeichneter Trace: auch Kinder verwerfen (False markiert den Trace)
+            token = _current_span.set(False)
+            try:
+                yield None
+            finally:
+                _current_span.reset(token)
+            return
+        trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        span = Span(name, trace_id, os.urandom(8).hex(), parent.span_id if parent is not None else None,
+                    attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            if span.status == STATUS_UNSET:
+                span.status = STATUS_OK
+            self.exporter.export(span)
+
+    def flush(self) -> None:
+        self.exporter.flush()
+
+    def shutdown(self) -> None:
+        self.exporter.shutdown()
@@ -5,10 +5,33 @@ import pickle
 import base64
 import hashlib
 import os
-from jsonmerge import Merger
+import heapq
+import functools
+import inspect
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Union
 from wowipy.rest_adapter import RestAdapter
 from wowipy.exceptions import WowiPyException
 from wowipy.models import *
+from wowipy.sync import SyncState, SyncResult, record_hash
+from wowipy.cache import CacheRegistry, CacheStore
+from wowipy.cache_backends import CacheBackend
+from wowipy.search_index import PersonTokenIndex, TrigramIndex, PhoneIndex, SearchHit, FIELD_NAME, FIELD_ADDRESS, \
+    FIELD_PHONE, FIELD_EMAIL, person_name_texts, person_address_texts, estate_address_texts, SearchTextIndex, \
+    person_search_texts, license_agreement_texts, economic_unit_texts, IdNumIndex, AddressIndex
+from wowipy.matching import search_string, check_person_match
+from wowipy.parallel import ShardedSearchExecutor
+from wowipy.graph import EntityGraph
+from wowipy.intervals import IntervalIndex, is_active_on
+from wowipy.metrics import RequestInfo, RequestMetrics, endpoint_label
+from wowipy.tracing import Tracer, SpanExporter
+from wowipy.progress import ProgressTracker, ProgressObserver
+from wowipy.profiling import ModelProfiler
+from wowipy.bulk import BulkExecutor, BulkOperation, BulkResult, CommunicationOperation, ComponentOperation, \
+    FacilityOperation
+from wowipy.persistence import FILE_FORMAT_WOWIPY, FILE_FORMAT_PICKLE, read_cache_file, write_cache_file
+from wowipy.columnar import ColumnarTable, write_table, COLUMNS_PERSONS, COLUMNS_CONTRACTORS, COLUMNS_USE_UNITS, \
+    COLUMNS_LICENSE_AGREEMENTS
 
 
 def file_to_base64(file_path):
@@ -32,48 +55,400 @@ class WowiPy:
     CACHE_LICENSE_AGREEMENTS = "license_agreements"
     CACHE_CONTRACTORS = "contractors"
     CACHE_PERSONS = "persons"
-    CACHE_ECONOMIC_UNITS = "license_agreements"
+    CACHE_ECONOMIC_UNITS = "economic_units"
     CACHE_BUILDING_LANDS = "building_lands"
     CACHE_USE_UNITS = "use_units"
     CACHE_CONTRACT_POSITIONS = "contract_positions"
+    CACHE_FACILITIES = "facilities"
+    CACHE_COMPONENTS = "components"
+
+    CACHE_FORMAT_WOWIPY = FILE_FORMAT_WOWIPY
+    CACHE_FORMAT_PICKLE = FILE_FORMAT_PICKLE
 
     SEARCH_POS_LEFT = "begins"
     SEARCH_POS_CONTAINS = "contains"
+    SEARCH_PHONETIC = "phonetic"
+
+    INDEX_PERSON_TOKENS = "person_tokens"
+    INDEX_TRIGRAMS = "trigrams"
+    INDEX_PHONES = "phones"
+    INDEX_SEARCH = "search"
+    INDEX_IDNUM = "idnum"
+    INDEX_ADDRESS = "address"
+    INDEX_ACTIVE = "active"
+    INDEX_CONTRACTUAL_USE_ACTIVE = "contractual_use_active"
+
+    # Caches mit hierarchischer Objektnummer (Wirtschaftseinheit.Gebäude.Nutzungseinheit.Vertrag)
+    IDNUM_CACHE_TYPES = (CACHE_ECONOMIC_UNITS, CACHE_BUILDING_LANDS, CACHE_USE_UNITS, CACHE_LICENSE_AGREEMENTS)
+
+    # Ohne eigenen Span: Steuerung des Tracings, Zugriffe auf den Zustand und Prüfungen, die je Datensatz laufen
+    UNTRACED_METHODS = frozenset({"enable_tracing", "disable_tracing", "get_tracer", "get_cache", "get_sync_state",
+                                  "get_request_metrics", "get_profiler", "check_person_match", "search_string"})
+    # Textparameter, die als Span-Attribut erfasst werden. Suchbegriffe, Namen, Rufnummern, E-Mail-Adressen usw.
+    # sind personenbezogen und werden nur mit enable_tracing(record_text_args=True) erfasst.
+    TRACED_TEXT_ARGS = frozenset({"cache_type", "search_mode", "file_format", "codec", "compression", "entity_name",
+                                  "modified_since_param"})
 
     def __init__(self, hostname: str, user: str, password: str, api_key: str, version: str = 'v1.2',
-                 logger: logging.Logger = None, user_agent: str = "WowiPy/1.1"):
+                 logger: logging.Logger = None, user_agent: str = "WowiPy/1.1", cache_backend: CacheBackend = None):
+        """
+        :param cache_backend: (Optional) Backend, über das mehrere Prozesse die Caches gemeinsam nutzen,
+                              z.B. DirectoryCacheBackend oder RedisCacheBackend
+        :type cache_backend: CacheBackend
+        """
         self._rest_adapter = RestAdapter(hostname, user, password, api_key, version, logger, user_agent)
-        self._cache = {
-            self.CACHE_LICENSE_AGREEMENTS: [],
-            self.CACHE_CONTRACTORS: [],
-            self.CACHE_PERSONS: [],
-            self.CACHE_USE_UNITS: [],
-            self.CACHE_BUILDING_LANDS: [],
-            self.CACHE_ECONOMIC_UNITS: []
-        }
-
-    def cache_to_disk(self, cache_type: str, file_name: str):
+        self._cache = CacheRegistry(backend=cache_backend, cache_types=[
+            self.CACHE_LICENSE_AGREEMENTS,
+            self.CACHE_CONTRACTORS,
+            self.CACHE_PERSONS,
+            self.CACHE_USE_UNITS,
+            self.CACHE_BUILDING_LANDS,
+            self.CACHE_ECONOMIC_UNITS,
+            self.CACHE_CONTRACT_POSITIONS,
+            self.CACHE_FACILITIES,
+            self.CACHE_COMPONENTS
+        ])
+        self._cache.register(self.CACHE_PERSONS).add_index(self.INDEX_PERSON_TOKENS, PersonTokenIndex())
+        self._cache.register(self.CACHE_CONTRACTORS).add_index(self.INDEX_PERSON_TOKENS,
+                                                               PersonTokenIndex(lambda entry: entry.person))
+        for cache_type, search_index in (
+                (self.CACHE_LICENSE_AGREEMENTS, SearchTextIndex(license_agreement_texts)),
+                (self.CACHE_USE_UNITS, SearchTextIndex(estate_address_texts)),
+                (self.CACHE_BUILDING_LANDS, SearchTextIndex(estate_address_texts)),
+                (self.CACHE_ECONOMIC_UNITS, SearchTextIndex(economic_unit_texts)),
+                (self.CACHE_PERSONS, SearchTextIndex(person_search_texts)),
+                (self.CACHE_CONTRACTORS, SearchTextIndex(lambda entry: person_search_texts(entry.person),
+                                                         lambda entry: entry.license_agreement))):
+            self._cache.register(cache_type).add_index(self.INDEX_SEARCH, search_index)
+        for cache_type in self.IDNUM_CACHE_TYPES:
+            self._cache.register(cache_type).add_index(self.INDEX_IDNUM, IdNumIndex())
+        for cache_type in (self.CACHE_BUILDING_LANDS, self.CACHE_USE_UNITS):
+            self._cache.register(cache_type).add_index(self.INDEX_ADDRESS, AddressIndex())
+        self._cache.register(self.CACHE_LICENSE_AGREEMENTS).add_index(
+            self.INDEX_ACTIVE, IntervalIndex('start_contract', 'end_of_contract'))
+        self._cache.register(self.CACHE_CONTRACTORS).add_index(
+            self.INDEX_ACTIVE, IntervalIndex('start_contract', 'end_of_contract'))
+        self._cache.register(self.CACHE_CONTRACTORS).add_index(
+            self.INDEX_CONTRACTUAL_USE_ACTIVE, IntervalIndex('contractual_use_valid_from', 'contractual_use_valid_to'))
+        self._cache.register(self.CACHE_CONTRACT_POSITIONS).add_index(
+            self.INDEX_ACTIVE, IntervalIndex('active_from', 'active_to'))
+        self._cache.register(self.CACHE_PERSONS).add_index(self.INDEX_PHONES, PhoneIndex())
+        self._cache.register(self.CACHE_CONTRACTORS).add_index(self.INDEX_PHONES,
+                                                               PhoneIndex(lambda entry: entry.person))
+        self._cache.register(self.CACHE_PERSONS).add_index(self.INDEX_TRIGRAMS, TrigramIndex({
+            FIELD_NAME: person_name_texts,
+            FIELD_ADDRESS: person_address_texts
+        }))
+        self._cache.register(self.CACHE_CONTRACTORS).add_index(self.INDEX_TRIGRAMS, TrigramIndex({
+            FIELD_NAME: lambda entry: person_name_texts(entry.person),
+            FIELD_ADDRESS: lambda entry: person_address_texts(entry.person)
+        }))
+        self._cache.register(self.CACHE_BUILDING_LANDS).add_index(self.INDEX_TRIGRAMS, TrigramIndex({
+            FIELD_ADDRESS: estate_address_texts
+        }))
+        self._cache.register(self.CACHE_USE_UNITS).add_index(self.INDEX_TRIGRAMS, TrigramIndex({
+            FIELD_ADDRESS: estate_address_texts
+        }))
+        self._sync_state = {}
+        self._search_executor = None
+        self._graph = None
+        self._graph_versions = None
+        self._request_metrics = None
+        self._tracer = None
+        self._traced_methods = []
+        self._progress_observers = []
+        self._row_counts = {}
+        self._profiler = None
+
+    def cache_to_disk(self, cache_type: str, file_name: str, file_format: str = CACHE_FORMAT_WOWIPY):
+        """
+        Speichert einen Cache auf der Festplatte
+        :param cache_type: Cache-Typ, z.B. WowiPy.CACHE_USE_UNITS
+        :type cache_type: str
+        :param file_name: Zieldatei
+        :type file_name: str
+        :param file_format: CACHE_FORMAT_WOWIPY (versioniert, robust gegen Änderungen an models.py) oder
+                            CACHE_FORMAT_PICKLE
+        :type file_format: str
+        """
         if cache_type not in self._cache.keys():
             raise WowiPyException("Unknown Cache Type")
 
-        with open(file_name, 'wb') as fp:
-            pickle.dump(self._cache.get(cache_type), fp)
+        self._cache[cache_type].to_disk(file_name, file_format)
 
     def cache_from_disk(self, cache_type: str, file_name: str):
+        """
+        Lädt einen Cache von der Festplatte. Das Dateiformat wird automatisch erkannt.
+        """
+        if cache_type not in self._cache.keys():
+            raise WowiPyException("Unknown Cache Type")
+
+        self._cache[cache_type].from_disk(file_name)
+
+    def caches_to_disk(self, file_name: str, cache_types: List[str] = None, codec: str = None,
+                       compression: str = None):
+        """
+        Speichert mehrere Caches in einer Datei (CACHE_FORMAT_WOWIPY)
+        :param file_name: Zieldatei
+        :type file_name: str
+        :param cache_types: (Optional) Zu speichernde Cache-Typen. Default: alle befüllten Caches
+        :type cache_types: List[str]
+        :param codec: (Optional) "msgpack" oder "json". Default: msgpack, falls installiert
+        :type codec: str
+        :param compression: (Optional) "zstd", "zlib" oder "none". Default: zstd, falls installiert
+        :type compression: str
+        """
+        if cache_types is None:
+            stores = self._cache.built()
+        else:
+            stores = [self._cache[cache_type] for cache_type in cache_types]
+        write_cache_file(file_name, [(store.cache_type, store.built_at, store.entries) for store in stores],
+                         codec=codec, compression=compression)
+
+    def caches_from_disk(self, file_name: str, cache_types: List[str] = None):
+        """
+        Lädt Caches aus einer mit caches_to_disk geschriebenen Datei. Ist cache_types angegeben, werden nur diese
+        Caches gelesen.
+        """
+        if cache_types is not None:
+            for cache_type in cache_types:
+                if cache_type not in self._cache.keys():
+                    raise WowiPyException("Unknown Cache Type")
+        for cache_type, (built_at, entries) in read_cache_file(file_name, cache_types).items():
+            store = self._cache.register(cache_type)
+            store.replace(entries)
+            store.built_at = built_at
+
+    def cache_to_table(self, cache_type: str, file_name: str, columns: List = None):
+        """
+        Schreibt einen Cache spaltenorientiert, sodass er mit open_cache_table per mmap ohne Deserialisierung
+        gelesen werden kann. Mehrere Prozesse teilen sich dabei eine Kopie im Page Cache.
+        :param cache_type: Cache-Typ, z.B. WowiPy.CACHE_PERSONS
+        :type cache_type: str
+        :param file_name: Zieldatei
+        :type file_name: str
+        :param columns: (Optional) Spaltendefinitionen (name, kind, getter). Für Personen, Vertragsnehmer,
+                        Nutzungseinheiten und Nutzungsverträge gibt es Standardspalten.
+        :type columns: List
+        """
         if cache_type not in self._cache.keys():
             raise WowiPyException("Unknown Cache Type")
+        if columns is None:
+            default_columns = {
+                self.CACHE_PERSONS: COLUMNS_PERSONS,
+                self.CACHE_CONTRACTORS: COLUMNS_CONTRACTORS,
+                self.CACHE_USE_UNITS: COLUMNS_USE_UNITS,
+                self.CACHE_LICENSE_AGREEMENTS: COLUMNS_LICENSE_AGREEMENTS
+            }
+            columns = default_columns.get(cache_type)
+            if columns is None:
+                raise WowiPyException(f"No default columns for '{cache_type}', please pass columns")
+        write_table(file_name, self._cache[cache_type].entries, columns)
+
+    @staticmethod
+    def open_cache_table(file_name: str) -> ColumnarTable:
+        return ColumnarTable(file_name)
+
+    def acquire_cache_refresh(self, cache_type: str, ttl: int = 3600) -> bool:
+        """
+        Versucht, die Aktualisierungssperre des gemeinsamen Cache-Backends zu erhalten. Nur der Prozess, der die
+        Sperre erhält, sollte den Cache neu aufbauen; alle anderen übernehmen den veröffentlichten Stand.
+        Ohne Backend wird immer True zurückgegeben.
+        :param cache_type: Cache-Typ, z.B. WowiPy.CACHE_CONTRACTORS
+        :type cache_type: str
+        :param ttl: Sekunden, nach denen eine nicht freigegebene Sperre verfällt
+        :type ttl: int
+        :rtype: bool
+        """
+        if self._cache.backend is None:
+            return True
+        return self._cache.backend.acquire_refresh(cache_type, ttl)
+
+    def release_cache_refresh(self, cache_type: str):
+        if self._cache.backend is not None:
+            self._cache.backend.release_refresh(cache_type)
+
+    def get_cache(self, cache_type: str) -> CacheStore:
+        """
+        Gibt den Cache eines Entitätstyps zurück (Einträge, Größe, Build-Zeitstempel, Lookup über id_ / id_num)
+        :param cache_type: Cache-Typ, z.B. WowiPy.CACHE_USE_UNITS
+        :type cache_type: str
+        :rtype: CacheStore
+        """
+        return self._cache[cache_type]
+
+    def _sync_sources(self) -> Dict:
+        """
+        Endpunkt, Standardparameter und Decoder je Cache-Typ für sync_cache.
+        Die Standardparameter entsprechen denen der jeweiligen get_*-Methode.
+        """
+        return {
+            self.CACHE_LICENSE_AGREEMENTS: ('RentAccounting/LicenseAgreements',
+                                            {'showNullValues': 'true', 'includeBanking': 'true'},
+                                            self._decode_license_agreement),
+            self.CACHE_ECONOMIC_UNITS: ('CommercialInventory/EconomicUnits',
+                                        {'includeCompanyCode': 'true'},
+                                        self._decode_economic_unit),
+            self.CACHE_BUILDING_LANDS: ('CommercialInventory/BuildingLands',
+                                        {'includeCompanyCode': 'true', 'showNullValues': 'true'},
+                                        self._decode_building_land),
+            self.CACHE_USE_UNITS: ('CommercialInventory/UseUnits',
+                                   {'includeUseUnitTypes': 'true', 'includeBillingUnits': 'true',
+                                    'includeMarketingTags': 'false', 'showNullValues': 'true'},
+                                   self._decode_use_unit),
+            self.CACHE_CONTRACTORS: ('RentAccountingPersonDetails/Contractors',
+                                     {'includeMainAddress': 'true', 'includeMainCommunication': 'true',
+                                      'includePersonAddresses': 'true', 'includePersonCommunications': 'true',
+                                      'includePersonBankAccounts': 'true', 'showNullValues': 'true'},
+                                     self._decode_contractor),
+            self.CACHE_PERSONS: ('PersonsRead/Persons',
+                                 {'includeAddress': 'true', 'includeCommunication': 'true',
+                                  'includeBankccount': 'true', 'showNullValues': 'true'},
+                                 self._decode_person),
+            self.CACHE_CONTRACT_POSITIONS: ('RentAccounting/ContractPositions',
+                                            {'includeContractPositionTypeDetails': 'true', 'showNullValues': 'true'},
+                                            self._decode_contract_position),
+            self.CACHE_FACILITIES: ('CommercialInventory/Facility',
+                                    {'showNullValues': 'true'},
+                                    self._decode_facility),
+            self.CACHE_COMPONENTS: ('CommercialInventory/Component',
+                                    {'showNullValues': 'true'},
+                                    self._decode_component),
+        }
+
+    def _iter_pages(self, endpoint: str, filter_params: Dict, force_refresh: bool = True, page_size: int = 100):
+        """
+        Liefert die Rohdaten (Liste von Dicts) eines Endpunkts seitenweise
+        """
+        progress = self._progress(endpoint, filter_params)
+        filter_params['offset'] = 0
+        filter_params['limit'] = page_size
+        response_count = page_size
+        while response_count == page_size:
+            with self._page_span(endpoint, filter_params) as span:
+                part_result = self._rest_adapter.get(endpoint=endpoint, ep_params=filter_params,
+                                                     force_refresh=force_refresh)
+                if span is not None:
+                    span.set_attribute("wowi.records", len(part_result.data))
+            filter_params['offset'] += page_size
+            response_count = len(part_result.data)
+            progress.update(response_count)
+            yield part_result.data
+        progress.finish()
+
+    def _fetch_all(self, endpoint: str, filter_params: Dict, force_refresh: bool = True) -> List[Dict]:
+        """
+        Alle Seiten eines Endpunkts als eine Liste von Dicts
+        """
+        data = []
+        for page in self._iter_pages(endpoint, filter_params, force_refresh):
+            data.extend(page)
+        return data
+
+    def _progress(self, task: str, filter_params: Dict = None) -> ProgressTracker:
+        """
+        Fortschritt eines seitenweisen Abrufs. Die Gesamtzahl wird aus dem letzten vollständigen Abruf mit denselben
+        Filtern geschätzt.
+        """
+        key = task
+        if filter_params:
+            key += repr(sorted((name, str(value)) for name, value in filter_params.items()
+                               if name not in ('offset', 'limit', 'apiKey')))
+        return ProgressTracker(task, self._progress_observers, self._row_counts.get(key),
+                               on_finish=functools.partial(self._row_counts.__setitem__, key))
 
+    def get_sync_state(self, cache_type: str) -> Optional[SyncState]:
+        return self._sync_state.get(cache_type)
+
+    def sync_state_to_disk(self, file_name: str):
+        with open(file_name, 'wb') as fp:
+            pickle.dump(self._sync_state, fp)
+
+    def sync_state_from_disk(self, file_name: str):
         with open(file_name, 'rb') as fp:
-            self._cache[cache_type] = pickle.load(fp)
+            self._sync_state = pickle.load(fp)
+
+    def sync_cache(self, cache_type: str,
+                   modified_since_param: str = None,
+                   modified_since_format: str = "%Y-%m-%dT%H:%M:%S",
+                   add_args: Dict = None) -> SyncResult:
+        """
+        Aktualisiert einen Cache inkrementell statt ihn komplett neu aufzubauen.
+
+        Ist modified_since_param angegeben (Name eines Änderungsdatum-Filters des Endpunkts), werden nur Datensätze
+        abgerufen, die sich seit der letzten Synchronisierung geändert haben. Gelöschte Datensätze können in diesem
+        Modus nicht erkannt werden.
+        Ohne modified_since_param werden alle Seiten abgerufen, aber nur Datensätze, deren Inhalt sich laut Hash
+        geändert hat, werden in Model-Objekte umgewandelt und in den Cache übernommen. Nicht mehr gelieferte
+        Datensätze werden aus dem Cache entfernt, außer der Abruf ist über add_args eingeschränkt: dann fehlen im
+        Ergebnis auch Datensätze, die weiterhin existieren, und es wird nichts gelöscht. Ein eingeschränkter Abruf
+        verschiebt auch den Watermark nicht, damit ein späterer Abruf ohne add_args keine Änderungen verpasst.
+        :param cache_type: Cache-Typ, z.B. WowiPy.CACHE_USE_UNITS
+        :type cache_type: str
+        :param modified_since_param: (Optional) GET-Parameter für "geändert seit"
+        :type modified_since_param: str
+        :param modified_since_format: Format des Watermarks für modified_since_param
+        :type modified_since_format: str
+        :param add_args: Zusätzliche Parameter die per GET an die URL angehängt werden, z.B. ein Filter auf eine
+                         Wirtschaftseinheit
+        :type add_args: Dict
+        :return: Statistik des Sync-Laufs
+        :rtype: SyncResult
+        """
+        sources = self._sync_sources()
+        if cache_type not in sources.keys():
+            raise WowiPyException("Unknown Cache Type")
+        endpoint, default_params, decoder = sources.get(cache_type)
+
+        state = self._sync_state.get(cache_type)
+        if state is None:
+            state = SyncState(cache_type)
+        watermark = datetime.now()
+        result = SyncResult(cache_type, watermark)
+
+        filter_params = dict(default_params)
+        incremental = modified_since_param is not None and state.last_sync is not None
+        if incremental:
+            filter_params[modified_since_param] = state.last_sync.strftime(modified_since_format)
+        if add_args is not None:
+            filter_params.update(add_args)
+
+        store = self._cache[cache_type]
+        seen_ids = set()
+        for page in self._iter_pages(endpoint, filter_params):
+            with self._decode_scope(endpoint, cache_type, len(page)):
+                for raw_entry in page:
+                    result.fetched += 1
+                    entry_id = raw_entry.get('id')
+                    seen_ids.add(entry_id)
+                    entry_hash = record_hash(raw_entry)
+                    if state.record_hashes.get(entry_id) == entry_hash and entry_id in store:
+                        result.unchanged += 1
+                        continue
+                    state.record_hashes[entry_id] = entry_hash
+                    if store.upsert(decoder(raw_entry)):
+                        result.inserted += 1
+                    else:
+                        result.updated += 1
+
+        # Gelöscht werden kann nur, wenn der Abruf den gesamten Bestand geliefert hat
+        if not incremental and not add_args:
+            for entry in store.retain(seen_ids):
+                state.record_hashes.pop(entry.id_, None)
+                result.deleted += 1
+            state.last_full_sync = watermark
+
+        if not add_args:
+            state.last_sync = watermark
+        if store.built_at is None:
+            store.built_at = watermark
+        self._sync_state[cache_type] = state
+        if result.changed > 0:
+            self._cache.publish(cache_type)
+        return result
 
     def search_string(self, haystack: str, needle: str, search_mode: str = SEARCH_POS_CONTAINS) -> bool:
-        haystack = haystack.lower()
-        needle = needle.lower()
-        if (search_mode == self.SEARCH_POS_CONTAINS and needle in haystack) or \
-                (search_mode == self.SEARCH_POS_LEFT and haystack.startswith(needle)):
-            return True
-        else:
-            return False
+        return search_string(haystack, needle, search_mode)
 
     def check_person_match(self, person_obj: Person,
                            search_name: str = None,
@@ -81,201 +456,511 @@ class WowiPy:
                            search_phone: str = None,
                            search_email: str = None,
                            search_mode: str = SEARCH_POS_CONTAINS) -> bool:
-        if person_obj is None:
-            return False
-
-        if search_name is not None:
-            if person_obj.natural_person is not None:
-                if person_obj.natural_person.last_name is not None:
-                    if person_obj.natural_person.first_name is not None:
-                        first_name = person_obj.natural_person.first_name.lower()
-                    else:
-                        first_name = ""
-                    last_name = person_obj.natural_person.last_name.lower()
-                    if self.search_string(first_name, search_name, search_mode) or \
-                            self.search_string(last_name, search_name, search_mode) or \
-                            self.search_string(f"{first_name} {last_name}", search_name, search_mode) or \
-                            self.search_string(f"{last_name}, {first_name}", search_name, search_mode):
-                        return True
-            if person_obj.legal_person is not None:
-                if person_obj.legal_person.long_name1 is not None:
-                    if self.search_string(person_obj.legal_person.long_name1, search_name, search_mode):
-                        return True
+        return check_person_match(person_obj, search_name=search_name, search_address=search_address,
+                                  search_phone=search_phone, search_email=search_email, search_mode=search_mode)
+
+    def _person_candidate_positions(self, store: CacheStore,
+                                    search_name: str = None,
+                                    search_address: str = None,
+                                    search_phone: str = None,
+                                    search_email: str = None,
+                                    search_mode: str = SEARCH_POS_CONTAINS) -> Optional[List[int]]:
+        """
+        Positionen der Kandidaten für search_person/search_contractor aus dem Token-Index, aufsteigend sortiert.
+        None, wenn der Index die Suche nicht eingrenzen kann (alle Einträge sind Kandidaten).
+        """
+        index = store.index(self.INDEX_PERSON_TOKENS)
+        if index is None:
+            return None
+        positions = set()
+        for field, needle in ((FIELD_NAME, search_name), (FIELD_ADDRESS, search_address),
+                              (FIELD_PHONE, search_phone), (FIELD_EMAIL, search_email)):
+            if needle is None:
+                continue
+            field_positions = index.candidates(field, needle, search_mode)
+            if field_positions is None:
+                return None
+            positions.update(field_positions)
+        return sorted(positions)
+
+    @staticmethod
+    def _candidate_entries(store: CacheStore, positions: Optional[List[int]]) -> List:
+        if positions is None:
+            return store.entries
+        entries = store.entries
+        return [entries[position] for position in positions]
+
+    def search_phone_number(self, phone_number: str, cache_type: str = CACHE_PERSONS,
+                            match_suffix: bool = True) -> List:
+        """
+        Rückwärtssuche über eine Rufnummer, z.B. für eingehende Anrufe. Rufnummern werden beim Aufbau des Caches
+        einheitlich normalisiert ("+49 351 123456", "0351/123456" usw.), die Suche ist ein Nachschlagen im Index.
+        :param phone_number: Rufnummer in beliebiger Schreibweise
+        :type phone_number: str
+        :param cache_type: WowiPy.CACHE_PERSONS oder WowiPy.CACHE_CONTRACTORS
+        :type cache_type: str
+        :param match_suffix: Ohne exakten Treffer auch Nummern finden, die ohne Vorwahl erfasst wurden oder auf die
+                             (unvollständige) Eingabe enden
+        :type match_suffix: bool
+        :return: Einträge in Cache-Reihenfolge
+        :rtype: List
+        """
+        store = self._cache[cache_type]
+        index = store.index(self.INDEX_PHONES)
+        if index is None:
+            raise WowiPyException(f"Cache {cache_type} has no phone index")
+        entries = store.entries
+        return [entries[position] for position in index.lookup(phone_number, match_suffix)]
+
+    def add_request_hook(self, hook: Callable[[RequestInfo], None]) -> None:
+        """
+        Registriert eine Funktion, die nach jeder HTTP-Anfrage mit einem RequestInfo (Endpunkt, Methode, Status,
+        Latenz, Bytes, Wiederholungen, Cache-Treffer) aufgerufen wird
+        :param hook: Funktion mit einem Parameter vom Typ RequestInfo
+        """
+        self._rest_adapter.add_hook(hook)
 
-        if search_address is not None:
-            address: Address
-            address_found = False
-            if person_obj.addresses is not None:
-                for address in person_obj.addresses:
-                    street = address.street_complete
-                    if self.search_string(street, search_address, search_mode):
-                        address_found = True
-                        break
-            if address_found:
-                return True
-
-        if search_phone is not None:
-            communication: Communication
-            phone_found = False
-            if person_obj.communications is None:
-                return False
-            for comm in person_obj.communications:
-                if comm.communication_type.name == "Festnetz" or comm.communication_type.name == "Handynummer":
-                    content = comm.content.strip()
-                    search_phone = search_phone.strip()
-                    # Problem: Es gibt diverse gängige Formate für Rufnummern. Es gibt keine Formatvorgabe in
-                    # Wowiport, also können wir auch nicht vorhersehen, welches gewählt wurde.
-                    # Wenn ein + gefunden wurde, werden die ersten drei Zeichen von needle und haystack entfernt.
-                    # Ansonsten werden alle führenden Nullen entfernt
-                    if content.startswith('+'):
-                        content = content[3:]
-                    if search_phone.startswith('+'):
-                        search_phone = search_phone[3:]
-                    if search_phone.startswith('0049'):
-                        search_phone = search_phone[4:]
-                    if content.startswith('0049'):
-                        content = content[4:]
-
-                    content = content.lstrip('0')
-                    search_phone = search_phone.lstrip('0')
-
-                    content = content.replace(' ', '')
-                    search_phone = search_phone.replace(' ', '')
-
-                    if self.search_string(content, search_phone, search_mode):
-                        phone_found = True
-                        break
-            if phone_found:
-                return True
-
-        if search_email is not None:
-            communication: Communication
-            email_found = False
-            if person_obj.communications is None:
-                return False
-            for comm in person_obj.communications:
-                if comm.communication_type.name == "E-Mail":
-                    content = comm.content.strip()
-                    if self.search_string(content, search_email, search_mode):
-                        email_found = True
-                        break
-            if email_found:
-                return True
-
-        return False
+    def remove_request_hook(self, hook: Callable[[RequestInfo], None]) -> None:
+        self._rest_adapter.remove_hook(hook)
+
+    def enable_request_metrics(self, metrics: RequestMetrics = None) -> RequestMetrics:
+        """
+        Aktiviert das Sammeln von Metriken je Endpunkt, z.B. für wowi.get_request_metrics().top_endpoints() oder
+        den Export mit to_prometheus() / write_prometheus()
+        :param metrics: (Optional) Bestehender Collector, z.B. um mehrere WowiPy-Instanzen gemeinsam zu messen
+        :type metrics: RequestMetrics
+        :rtype: RequestMetrics
+        """
+        self.disable_request_metrics()
+        self._request_metrics = metrics if metrics is not None else RequestMetrics()
+        self.add_request_hook(self._request_metrics)
+        return self._request_metrics
+
+    def disable_request_metrics(self) -> None:
+        if self._request_metrics is not None:
+            self.remove_request_hook(self._request_metrics)
+            self._request_metrics = None
+
+    def get_request_metrics(self) -> Optional[RequestMetrics]:
+        return self._request_metrics
+
+    def add_progress_observer(self, observer: ProgressObserver) -> None:
+        """
+        Registriert eine Funktion, die je abgerufener Seite von fetch_all, build_*_cache und sync_cache mit einem
+        ProgressInfo (Seiten, Datensätze, geschätzte Gesamtzahl, Datensätze/s, ETA) aufgerufen wird, z.B.
+        progress.LoggingProgressObserver
+        :param observer: Funktion mit einem Parameter vom Typ ProgressInfo
+        """
+        if observer not in self._progress_observers:
+            self._progress_observers.append(observer)
+
+    def remove_progress_observer(self, observer: ProgressObserver) -> None:
+        if observer in self._progress_observers:
+            self._progress_observers.remove(observer)
+
+    def enable_profiling(self, profiler: ModelProfiler = None) -> ModelProfiler:
+        """
+        Aktiviert das Profiling der Model-Konstruktion: Anzahl und Zeit je Model-Klasse, Dekodierzeit je Endpunkt und
+        Zeit der Datums-Parser je Feld. Auswertung über get_profiler().report() bzw. format_report().
+        Die Dekodierzeit wird für alle lesenden get_*-Methoden (einschließlich Kataloge), build_*_cache und sync_cache
+        erfasst.
+        Die Model-Klassen werden prozessweit instrumentiert, es ist immer nur ein Profiler aktiv.
+        :param profiler: (Optional) Bestehender Profiler, um Ergebnisse mehrerer Läufe zu sammeln
+        :type profiler: ModelProfiler
+        :rtype: ModelProfiler
+        """
+        self.disable_profiling()
+        self._profiler = (profiler if profiler is not None else ModelProfiler()).start()
+        self.add_request_hook(self._profiler)
+        return self._profiler
+
+    def disable_profiling(self) -> None:
+        if self._profiler is not None:
+            self.remove_request_hook(self._profiler)
+            self._profiler.stop()
+            self._profiler = None
+
+    def get_profiler(self) -> Optional[ModelProfiler]:
+        return self._profiler
+
+    def enable_tracing(self, exporter: SpanExporter = None, tracer: Tracer = None,
+                       record_text_args: bool = False) -> Tracer:
+        """
+        Aktiviert das Tracing: ein Span je Aufruf einer öffentlichen Methode, darunter Spans je Seite, je HTTP-Anfrage
+        und für die Dekodierung in Model-Objekte. Hilfsmethoden, die je Datensatz aufgerufen werden
+        (UNTRACED_METHODS), erhalten keinen Span. Zahlen und Wahrheitswerte unter den Parametern werden als
+        Attribute wowi.arg.* erfasst, Texte nur, wenn sie in TRACED_TEXT_ARGS stehen.
+        :param exporter: (Optional) Ziel der Spans, z.B. tracing.FileSpanExporter oder tracing.OTLPHttpSpanExporter.
+                         Default: tracing.InMemorySpanExporter
+        :type exporter: SpanExporter
+        :param tracer: (Optional) Bestehender Tracer, z.B. um mehrere WowiPy-Instanzen in einen Trace zu schreiben
+        :type tracer: Tracer
+        :param record_text_args: Alle Textparameter erfassen, auch Suchbegriffe und andere personenbezogene Angaben
+        :type record_text_args: bool
+        :rtype: Tracer
+        """
+        self.disable_tracing()
+        self._tracer = tracer if tracer is not None else Tracer(exporter)
+        self._rest_adapter.tracer = self._tracer
+        # Die Methoden werden nur an dieser Instanz ersetzt, ohne Tracing bleibt der Aufruf unverändert
+        for name in dir(type(self)):
+            if name.startswith("_") or name in self.UNTRACED_METHODS:
+                continue
+            if not inspect.isfunction(getattr(type(self), name)):
+                continue
+            setattr(self, name, self._traced_method(name, getattr(self, name), record_text_args))
+            self._traced_methods.append(name)
+        return self._tracer
+
+    def disable_tracing(self) -> None:
+        if self._tracer is None:
+            return
+        for name in self._traced_methods:
+            delattr(self, name)
+        self._traced_methods = []
+        self._rest_adapter.tracer = None
+        self._tracer.flush()
+        self._tracer = None
+
+    def get_tracer(self) -> Optional[Tracer]:
+        return self._tracer
+
+    def _traced_method(self, name: str, method: Callable, record_text_args: bool = False) -> Callable:
+        tracer = self._tracer
+        text_args = self.TRACED_TEXT_ARGS
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            attributes = {f"wowi.arg.{key}": value for key, value in kwargs.items()
+                          if isinstance(value, (int, float, bool)) or
+                          (isinstance(value, str) and (record_text_args or key in text_args))}
+            with tracer.span(f"WowiPy.{name}", **attributes) as span:
+                result = method(*args, **kwargs)
+                if span is not None and isinstance(result, list):
+                    span.set_attribute("wowi.result_count", len(result))
+                return result
+
+        return wrapper
+
+    def _span(self, name: str, **attributes):
+        """
+        Span des aktiven Tracers, ohne Tracing ein leerer Kontextmanager
+        """
+        if self._tracer is None:
+            return nullcontext()
+        return self._tracer.span(name, **attributes)
+
+    @contextmanager
+    def _decode_scope(self, endpoint: str, model: str, records: int):
+        """
+        Umschließt die Umwandlung einer Antwort in Model-Objekte: Tracing-Span und Dekodierzeit je Endpunkt
+        """
+        with self._span("decode", **{"wowi.endpoint": endpoint, "wowi.model": model, "wowi.records": records}):
+            if self._profiler is None:
+                yield
+            else:
+                with self._profiler.decode(endpoint_label(endpoint), records):
+                    yield
+
+    def _page_span(self, endpoint: str, filter_params: Dict):
+        return self._span("page", **{"wowi.endpoint": endpoint, "wowi.offset": filter_params.get('offset')})
+
+    def enable_parallel_search(self, workers: int = None, min_entries: int = 20000) -> None:
+        """
+        Aktiviert die parallele Suche für search_person und search_contractor. Bleiben nach der Eingrenzung durch den
+        Index mindestens min_entries Kandidaten, werden diese auf die Shards des Caches in einem Prozesspool verteilt.
+        :param workers: Anzahl Worker-Prozesse, Default: Anzahl CPU-Kerne
+        :type workers: int
+        :param min_entries: Suchen mit weniger Kandidaten laufen weiterhin im aufrufenden Prozess
+        :type min_entries: int
+        """
+        self.disable_parallel_search()
+        self._search_executor = ShardedSearchExecutor(workers=workers, min_entries=min_entries)
+
+    def disable_parallel_search(self) -> None:
+        if self._search_executor is not None:
+            self._search_executor.shutdown()
+            self._search_executor = None
+
+    def _parallel_person_search(self, store: CacheStore, positions: Optional[List[int]], max_results: int,
+                                person_kwargs: Dict, attribute: str = None, distinct: bool = False) -> Optional[List]:
+        # Nur bei genügend Kandidaten, sonst überwiegt der Aufwand für die Übertragung an die Worker
+        if self._search_executor is None or \
+                not self._search_executor.applies_to(store, None if positions is None else len(positions)):
+            return None
+        hits = self._search_executor.search(store, check_person_match, person_kwargs, max_results,
+                                            attribute=attribute, distinct_attribute="id_" if distinct else None,
+                                            positions=positions)
+        return [store.entries[position] for position in hits]
 
     def search_contractor(self, search_name: str = None, search_address: str = None, search_phone: str = None,
                           search_email: str = None, max_results: int = 10,
                           search_mode: str = SEARCH_POS_CONTAINS, allow_duplicates: bool = False) -> List:
-        person_ids = []
+        store = self._cache[self.CACHE_CONTRACTORS]
+        person_kwargs = dict(search_name=search_name, search_address=search_address, search_phone=search_phone,
+                             search_email=search_email, search_mode=search_mode)
+        positions = self._person_candidate_positions(store, **person_kwargs)
+        res = self._parallel_person_search(store, positions, max_results, person_kwargs,
+                                           attribute="person", distinct=not allow_duplicates)
+        if res is not None:
+            return res
+        candidates = self._candidate_entries(store, positions)
+
+        person_ids = set()
         res = []
         entry: Contractor
-        for entry in self._cache.get(self.CACHE_CONTRACTORS):
+        for entry in candidates:
             if len(res) >= max_results:
                 break
 
             if entry.person.id_ in person_ids and not allow_duplicates:
                 continue
 
-            if self.check_person_match(person_obj=entry.person,
-                                       search_name=search_name,
-                                       search_address=search_address,
-                                       search_phone=search_phone,
-                                       search_email=search_email,
-                                       search_mode=search_mode):
+            if check_person_match(person_obj=entry.person,
+                                  search_name=search_name,
+                                  search_address=search_address,
+                                  search_phone=search_phone,
+                                  search_email=search_email,
+                                  search_mode=search_mode):
                 res.append(entry)
-                person_ids.append(entry.person.id_)
+                person_ids.add(entry.person.id_)
 
         return res
 
     def search_person(self, search_name: str = None, search_address: str = None, search_phone: str = None,
                       search_email: str = None, max_results: int = 10,
                       search_mode: str = SEARCH_POS_CONTAINS) -> List:
+        store = self._cache[self.CACHE_PERSONS]
+        person_kwargs = dict(search_name=search_name, search_address=search_address, search_phone=search_phone,
+                             search_email=search_email, search_mode=search_mode)
+        positions = self._person_candidate_positions(store, **person_kwargs)
+        res = self._parallel_person_search(store, positions, max_results, person_kwargs)
+        if res is not None:
+            return res
+        candidates = self._candidate_entries(store, positions)
+
         res = []
         entry: Person
-        for entry in self._cache.get(self.CACHE_PERSONS):
+        for entry in candidates:
             if len(res) >= max_results:
                 break
 
-            if self.check_person_match(person_obj=entry,
-                                       search_name=search_name,
-                                       search_address=search_address,
-                                       search_phone=search_phone,
-                                       search_email=search_email,
-                                       search_mode=search_mode):
+            if check_person_match(person_obj=entry,
+                                  search_name=search_name,
+                                  search_address=search_address,
+                                  search_phone=search_phone,
+                                  search_email=search_email,
+                                  search_mode=search_mode):
                 res.append(entry)
 
         return res
 
-    def search_cache(self, search_str: str, cache_types: Dict = None, max_results: int = 10,
-                     find_pos: str = SEARCH_POS_CONTAINS) -> Dict:
+    def _fuzzy_hits(self, cache_type: str, queries: Dict[str, str], max_results: int,
+                    min_similarity: float) -> List[SearchHit]:
+        store = self._cache[cache_type]
+        index = store.index(self.INDEX_TRIGRAMS)
+        queries = {field: text for field, text in queries.items() if text}
+        if index is None or not queries:
+            return []
+        if len(queries) == 1:
+            field, text = next(iter(queries.items()))
+            return [SearchHit(cache_type, store.entries[position], score, field)
+                    for score, position in index.search(field, text, max_results, min_similarity)]
+
+        # Mehrere Felder: Mittelwert der Einzelbewertungen, fehlende Felder zählen mit 0
+        totals = {}
+        for field, text in queries.items():
+            for score, position in index.search(field, text, None, 0.0):
+                totals[position] = totals.get(position, 0.0) + score
+        top = heapq.nsmallest(max_results,
+                              ((-total / len(queries), position) for position, total in totals.items()
+                               if total / len(queries) >= min_similarity))
+        return [SearchHit(cache_type, store.entries[position], -neg_score)
+                for neg_score, position in top]
+
+    def fuzzy_search_person(self, search_name: str = None, search_address: str = None, max_results: int = 10,
+                            min_similarity: float = 0.2) -> List[SearchHit]:
+        """
+        Unscharfe Suche im Personen-Cache über Namen und Adressen (Tippfehler, Umlaute, "str." / "straße").
+        :param search_name: Name (Vor- und/oder Nachname, Firmenname)
+        :type search_name: str
+        :param search_address: Straße und Hausnummer
+        :type search_address: str
+        :param max_results: Maximale Anzahl Treffer
+        :type max_results: int
+        :param min_similarity: Mindestähnlichkeit zwischen 0 und 1
+        :type min_similarity: float
+        :return: Treffer absteigend nach Ähnlichkeit
+        :rtype: List[SearchHit]
+        """
+        return self._fuzzy_hits(self.CACHE_PERSONS, {FIELD_NAME: search_name, FIELD_ADDRESS: search_address},
+                                max_results, min_similarity)
+
+    def fuzzy_search_contractor(self, search_name: str = None, search_address: str = None, max_results: int = 10,
+                                min_similarity: float = 0.2) -> List[SearchHit]:
+        """
+        Unscharfe Suche im Vertragsnehmer-Cache, siehe fuzzy_search_person
+        :rtype: List[SearchHit]
+        """
+        return self._fuzzy_hits(self.CACHE_CONTRACTORS, {FIELD_NAME: search_name, FIELD_ADDRESS: search_address},
+                                max_results, min_similarity)
+
+    def fuzzy_search_address(self, search_address: str, cache_types: List[str] = None, max_results: int = 10,
+                             min_similarity: float = 0.2) -> List[SearchHit]:
+        """
+        Unscharfe Suche über die Objektadressen (EstateAddress) von Gebäuden und Nutzungseinheiten
+        :param search_address: Straße und Hausnummer
+        :type search_address: str
+        :param cache_types: Default: [WowiPy.CACHE_BUILDING_LANDS, WowiPy.CACHE_USE_UNITS]
+        :type cache_types: List[str]
+        :param max_results: Maximale Anzahl Treffer über alle Caches
+        :type max_results: int
+        :param min_similarity: Mindestähnlichkeit zwischen 0 und 1
+        :type min_similarity: float
+        :rtype: List[SearchHit]
+        """
+        if cache_types is None:
+            cache_types = [self.CACHE_BUILDING_LANDS, self.CACHE_USE_UNITS]
+        hits = []
+        for cache_type in cache_types:
+            hits.extend(self._fuzzy_hits(cache_type, {FIELD_ADDRESS: search_address}, max_results, min_similarity))
+        return heapq.nlargest(max_results, hits, key=lambda hit: hit.score)
+
+    def search_cache(self, search_str: str, cache_types: List[str] = None, max_results: int = 10,
+                     find_pos: str = SEARCH_POS_CONTAINS) -> List[SearchHit]:
+        """
+        Globale Suche über alle aufgebauten Caches (Nutzungsverträge, Nutzungseinheiten, Gebäude,
+        Wirtschaftseinheiten, Personen, Vertragsnehmer) nach Objektnummer, Namen und Adressen.
+        :param search_str: Suchbegriff, z.B. "1.2.3", "Müller" oder "Hauptstr"
+        :type search_str: str
+        :param cache_types: (Optional) Zu durchsuchende Caches, Default: alle aufgebauten
+        :type cache_types: List[str]
+        :param max_results: Maximale Anzahl Treffer über alle Caches
+        :type max_results: int
+        :param find_pos: WowiPy.SEARCH_POS_CONTAINS oder WowiPy.SEARCH_POS_LEFT
+        :type find_pos: str
+        :return: Treffer absteigend nach Score; die Einträge sind die Cache-Objekte selbst (keine Kopien)
+        :rtype: List[SearchHit]
+        """
         if cache_types is None:
-            scope = self._cache
+            stores = self._cache.built()
         else:
-            scope = {}
-            for ttype in self._cache.keys():
-                scope[ttype] = self._cache.get(ttype)
+            stores = [self._cache[cache_type] for cache_type in cache_types]
 
-        res = {}
-        res_count = 0
-        for tkey in scope.keys():
-            if res_count >= max_results:
-                break
-            res[tkey] = []
-            for entry in self._cache.get(tkey):
-                if res_count >= max_results:
-                    break
-                if tkey == self.CACHE_LICENSE_AGREEMENTS:
-                    sobj = entry
-                    # haystack = {
-                    #     sobj.id_num
-                    # }
-                    if (find_pos == self.SEARCH_POS_CONTAINS and search_str in sobj.id_num) or \
-                            (find_pos == self.SEARCH_POS_LEFT and sobj.id_num.startswith(search_str)):
-                        if res.get(tkey) is None:
-                            res[tkey] = copy.deepcopy(sobj)
-                        else:
-                            res[tkey].append(copy.deepcopy(sobj))
-                        res_count += 1
+        ranked = []
+        for store_rank, store in enumerate(stores):
+            index = store.index(self.INDEX_SEARCH)
+            if index is None:
+                continue
+            for position, score in index.search(search_str, find_pos).items():
+                ranked.append((-score, store_rank, position))
+        # Bei gleichem Score: Reihenfolge der Caches, dann Cache-Reihenfolge
+        return [SearchHit(stores[store_rank].cache_type, stores[store_rank].entries[position], -neg_score)
+                for neg_score, store_rank, position in heapq.nsmallest(max_results, ranked)]
 
+    def search_idnum(self, id_num_prefix: str, cache_types: List[str] = None) -> Dict[str, List]:
+        """
+        Alle Einträge unterhalb einer Objektnummer, z.B. "00123.004" für das Gebäude 004 der Wirtschaftseinheit
+        00123 mit allen Nutzungseinheiten und Nutzungsverträgen. Segmente werden numerisch verglichen.
+        :param id_num_prefix: Objektnummer bzw. deren erste Segmente
+        :type id_num_prefix: str
+        :param cache_types: (Optional) Default: alle aufgebauten Caches mit Objektnummer
+        :type cache_types: List[str]
+        :return: Dict Cache-Typ -> Einträge, sortiert nach Objektnummer
+        :rtype: Dict[str, List]
+        """
+        res = {}
+        for store in self._idnum_stores(cache_types):
+            entries = store.entries
+            res[store.cache_type] = [entries[position] for position in
+                                     store.index(self.INDEX_IDNUM).prefix(id_num_prefix)]
         return res
 
+    def search_idnum_range(self, cache_type: str, id_num_from: str = None, id_num_to: str = None) -> List:
+        """
+        Alle Einträge eines Caches im Objektnummernbereich id_num_from bis einschließlich id_num_to (samt
+        untergeordneter Nummern)
+        :param cache_type: Cache-Typ, z.B. WowiPy.CACHE_USE_UNITS
+        :type cache_type: str
+        :param id_num_from: (Optional) Untergrenze
+        :type id_num_from: str
+        :param id_num_to: (Optional) Obergrenze
+        :type id_num_to: str
+        :return: Einträge, sortiert nach Objektnummer
+        :rtype: List
+        """
+        store = self._idnum_stores([cache_type])[0]
+        entries = store.entries
+        return [entries[position] for position in store.index(self.INDEX_IDNUM).range(id_num_from, id_num_to)]
+
+    def _idnum_stores(self, cache_types: List[str] = None) -> List[CacheStore]:
+        if cache_types is None:
+            return [self._cache[cache_type] for cache_type in self.IDNUM_CACHE_TYPES
+                    if self._cache[cache_type].built_at is not None]
+        stores = []
+        for cache_type in cache_types:
+            store = self._cache[cache_type]
+            if not store.has_index(self.INDEX_IDNUM):
+                raise WowiPyException(f"Cache {cache_type} has no id_num index")
+            stores.append(store)
+        return stores
+
     def search_building(self, search_address: str = None,
                         filter_idnum_above: int = 0,
                         max_results: int = 10,
                         search_mode: str = SEARCH_POS_CONTAINS) -> List:
+        """
+        Sucht Gebäude über die Objektadresse. Verglichen wird die normalisierte Adresse ohne Leerzeichen
+        (Abkürzungen wie "Str." ausgeschrieben, Umlaute aufgelöst).
+        :param search_address: (Teil-)Adresse, ohne Angabe werden alle Gebäude geliefert
+        :type search_address: str
+        :param filter_idnum_above: (Optional) Nur Gebäude mit Gebäudenummer bis einschließlich diesem Wert
+        :type filter_idnum_above: int
+        :param max_results: Maximale Anzahl Treffer
+        :type max_results: int
+        :param search_mode: WowiPy.SEARCH_POS_CONTAINS oder WowiPy.SEARCH_POS_LEFT
+        :type search_mode: str
+        :rtype: List[BuildingLand]
+        """
         res = []
-        entry: BuildingLand
-        search_address = search_address.replace(" ", "").strip()
-        for entry in self._cache.get(self.CACHE_BUILDING_LANDS):
-            if filter_idnum_above > 0:
-                entry_idnum = entry.id_num
-                if entry_idnum is not None:
-                    entry_idnum_parts = entry_idnum.split(".")
-                    building_idnum = entry_idnum_parts[-1]
-                    try:
-                        building_idnum_int = int(building_idnum)
-                        if building_idnum_int > filter_idnum_above:
-                            continue
-                    except ValueError:
-                        pass
-
+        store = self._cache[self.CACHE_BUILDING_LANDS]
+        idnum_index = store.index(self.INDEX_IDNUM)
+        if search_address is not None:
+            positions = sorted(store.index(self.INDEX_ADDRESS).candidates(search_address, search_mode))
+        else:
+            positions = range(len(store))
+        entries = store.entries
+        for position in positions:
             if len(res) >= max_results:
                 break
-
-            if search_address is not None:
-                address: Address
-                if entry.estate_address is not None:
-                    street = entry.estate_address.street_complete.replace(" ", "").strip()
-                    if self.search_string(street, search_address, search_mode):
-                        res.append(entry)
-                        continue
-                    elif self.search_string(street, search_address.replace("str.", "straße").replace("Str.", "Straße"),
-                                            search_mode):
-                        res.append(entry)
-                        continue
+            if filter_idnum_above > 0:
+                # Gebäudenummer = letztes Segment der Objektnummer, beim Aufbau des Index einmalig ermittelt
+                building_idnum = idnum_index.last_segment(position)
+                if building_idnum is not None and building_idnum > filter_idnum_above:
+                    continue
+            res.append(entries[position])
         return res
 
+    def resolve_address(self, address: str, zip_: str = None, cache_type: str = CACHE_BUILDING_LANDS) -> List:
+        """
+        Ordnet eine Adresse (z.B. aus einem Schreiben oder Ticket) Gebäuden bzw. Nutzungseinheiten zu.
+        Straße, Hausnummer und Zusatz werden normalisiert verglichen, "Hauptstr. 12 a" findet "Hauptstraße 12a".
+        :param address: Straße und Hausnummer
+        :type address: str
+        :param zip_: (Optional) Postleitzahl
+        :type zip_: str
+        :param cache_type: WowiPy.CACHE_BUILDING_LANDS oder WowiPy.CACHE_USE_UNITS
+        :type cache_type: str
+        :return: Einträge in Cache-Reihenfolge
+        :rtype: List
+        """
+        store = self._cache[cache_type]
+        index = store.index(self.INDEX_ADDRESS)
+        if index is None:
+            raise WowiPyException(f"Cache {cache_type} has no address index")
+        entries = store.entries
+        return [entries[position] for position in index.resolve(address, zip_)]
+
     def build_license_agreement_cache(self,
                                       economic_unit_idnum: str = None,
                                       use_unit_idnum: str = None,
@@ -294,6 +979,7 @@ class WowiPy:
         :return: Liste mit Nutzungsverträgen (auch bei nur einem Ergebnis!)
         :rtype: Liste[LicenseAgreement]
         """
+        progress = self._progress("build_license_agreement_cache")
         limit = 100
         offset = 0
         ret_list = self.get_license_agreements(economic_unit_idnum=economic_unit_idnum,
@@ -301,6 +987,7 @@ class WowiPy:
                                                license_agreement_active_on=license_agreement_active_on,
                                                add_args=add_args, limit=limit, offset=offset)
         response_len = len(ret_list)
+        progress.update(response_len)
 
         while response_len == limit:
             offset += limit
@@ -309,8 +996,9 @@ class WowiPy:
                                                  license_agreement_active_on=license_agreement_active_on,
                                                  add_args=add_args, limit=limit, offset=offset)
             response_len = len(t_resp)
-            ret_list = ret_list + t_resp
-            print(f"License Agreements {len(ret_list)}")
+            ret_list.extend(t_resp)
+            progress.update(response_len)
+        progress.finish()
 
         self._cache[self.CACHE_LICENSE_AGREEMENTS] = ret_list
 
@@ -335,12 +1023,14 @@ class WowiPy:
         :return: Liste mit Nutzungsverträgen (auch bei nur einem Ergebnis!)
         :rtype: Liste[LicenseAgreement]
         """
+        progress = self._progress("build_economic_unit_cache")
         limit = 100
         offset = 0
         ret_list = self.get_economic_units(management_idnum=management_idnum,
                                            owner_number=owner_number,
                                            add_args=add_args, limit=limit, offset=offset)
         response_len = len(ret_list)
+        progress.update(response_len)
 
         while response_len == limit:
             offset += limit
@@ -348,8 +1038,9 @@ class WowiPy:
                                              owner_number=owner_number,
                                              add_args=add_args, limit=limit, offset=offset)
             response_len = len(t_resp)
-            ret_list = ret_list + t_resp
-            print(f"Economic Units {len(ret_list)}")
+            ret_list.extend(t_resp)
+            progress.update(response_len)
+        progress.finish()
 
         self._cache[self.CACHE_ECONOMIC_UNITS] = ret_list
 
@@ -372,6 +1063,7 @@ class WowiPy:
         :return: Liste mit Nutzungsverträgen (auch bei nur einem Ergebnis!)
         :rtype: Liste[LicenseAgreement]
         """
+        progress = self._progress("build_building_land_cache")
         limit = 100
         offset = 0
         ret_list = self.get_building_lands(management_idnum=management_idnum,
@@ -379,6 +1071,7 @@ class WowiPy:
                                            economic_unit_idnum=economic_idnum,
                                            add_args=add_args, limit=limit, offset=offset)
         response_len = len(ret_list)
+        progress.update(response_len)
 
         while response_len == limit:
             offset += limit
@@ -387,8 +1080,9 @@ class WowiPy:
                                              economic_unit_idnum=economic_idnum,
                                              add_args=add_args, limit=limit, offset=offset)
             response_len = len(t_resp)
-            ret_list = ret_list + t_resp
-            print(f"Building lands {len(ret_list)}")
+            ret_list.extend(t_resp)
+            progress.update(response_len)
+        progress.finish()
 
         self._cache[self.CACHE_BUILDING_LANDS] = ret_list
 
@@ -414,6 +1108,7 @@ class WowiPy:
         :return: Liste mit Nutzungsverträgen (auch bei nur einem Ergebnis!)
         :rtype: Liste[LicenseAgreement]
         """
+        progress = self._progress("build_use_unit_cache")
         limit = 100
         offset = 0
         ret_list = self.get_use_units(management_idnum=management_idnum,
@@ -422,6 +1117,7 @@ class WowiPy:
                                       economic_unit_idnum=economic_unit_idnum,
                                       add_args=add_args, limit=limit, offset=offset)
         response_len = len(ret_list)
+        progress.update(response_len)
 
         while response_len == limit:
             offset += limit
@@ -431,8 +1127,9 @@ class WowiPy:
                                         economic_unit_idnum=economic_unit_idnum,
                                         add_args=add_args, limit=limit, offset=offset)
             response_len = len(t_resp)
-            ret_list = ret_list + t_resp
-            print(f"Use units {len(ret_list)}")
+            ret_list.extend(t_resp)
+            progress.update(response_len)
+        progress.finish()
 
         self._cache[self.CACHE_USE_UNITS] = ret_list
 
@@ -457,6 +1154,7 @@ class WowiPy:
         :return: Liste mit Nutzungsverträgen (auch bei nur einem Ergebnis!)
         :rtype: Liste[LicenseAgreement]
         """
+        progress = self._progress("build_contractor_cache")
         limit = 100
         offset = 0
         ret_list = self.get_contractors(license_agreement_id=license_agreement_id,
@@ -465,6 +1163,7 @@ class WowiPy:
                                         license_agreement_active_on=license_agreement_active_on,
                                         add_args=add_args, limit=limit, offset=offset)
         response_len = len(ret_list)
+        progress.update(response_len)
 
         while response_len == limit:
             offset += limit
@@ -474,8 +1173,9 @@ class WowiPy:
                                           license_agreement_active_on=license_agreement_active_on,
                                           add_args=add_args, limit=limit, offset=offset)
             response_len = len(t_resp)
-            ret_list = ret_list + t_resp
-            print(f"Contractors {len(ret_list)}")
+            ret_list.extend(t_resp)
+            progress.update(response_len)
+        progress.finish()
 
         self._cache[self.CACHE_CONTRACTORS] = ret_list
 
@@ -483,22 +1183,185 @@ class WowiPy:
                            person_id: int = None,
                            add_args: Dict = None) -> None:
 
+        progress = self._progress("build_person_cache")
         limit = 100
         offset = 0
         ret_list = self.get_persons(person_id=person_id,
                                     add_args=add_args, limit=limit, offset=offset)
         response_len = len(ret_list)
+        progress.update(response_len)
 
         while response_len == limit:
             offset += limit
             t_resp = self.get_persons(person_id=person_id,
                                       add_args=add_args, limit=limit, offset=offset)
             response_len = len(t_resp)
-            ret_list = ret_list + t_resp
-            print(f"Persons {len(ret_list)}")
+            ret_list.extend(t_resp)
+            progress.update(response_len)
+        progress.finish()
 
         self._cache[self.CACHE_PERSONS] = ret_list
 
+    def build_facility_cache(self, economic_unit_id: int = None, add_args: Dict = None) -> None:
+        """
+        Erstellt den Cache der Ausstattungen (Facilities)
+        :param economic_unit_id: (Optional) Nur Ausstattungen dieser Wirtschaftseinheit
+        :type economic_unit_id: int
+        :param add_args: Zusätzliche Parameter die per GET an die URL angehängt werden
+        :type add_args: Dict
+        """
+        self._cache[self.CACHE_FACILITIES] = self.get_facilities(economic_unit_id=economic_unit_id,
+                                                                 add_args=add_args, fetch_all=True)
+
+    def build_component_cache(self, economic_unit_id: int = None, add_args: Dict = None) -> None:
+        """
+        Erstellt den Cache der Komponenten (Components)
+        :param economic_unit_id: (Optional) Nur Komponenten dieser Wirtschaftseinheit
+        :type economic_unit_id: int
+        :param add_args: Zusätzliche Parameter die per GET an die URL angehängt werden
+        :type add_args: Dict
+        """
+        self._cache[self.CACHE_COMPONENTS] = self.get_components(economic_unit_id=economic_unit_id,
+                                                                 add_args=add_args, fetch_all=True)
+
+    def entity_graph(self) -> EntityGraph:
+        """
+        Beziehungsgraph über alle aufgebauten Caches (Nutzungsvertrag - Nutzungseinheit - Gebäude -
+        Wirtschaftseinheit, Vertragsnehmer - Person, Komponente - Ausstattung). Der Graph wird neu aufgebaut, sobald
+        sich ein Cache geändert hat.
+        :rtype: EntityGraph
+        """
+        versions = {cache_type: (store.version, store.built_at) for cache_type, store in self._cache.items()}
+        if self._graph is not None and versions == self._graph_versions:
+            return self._graph
+        graph = EntityGraph()
+        for store in self._cache.built():
+            if store.cache_type != self.CACHE_CONTRACT_POSITIONS:
+                graph.add_entries(store.cache_type, store.entries)
+        # In Nutzungsverträgen bzw. Vertragsnehmern enthaltene Objekte ergänzen, falls deren Cache fehlt
+        for agreement in self._cache[self.CACHE_LICENSE_AGREEMENTS]:
+            if agreement.contractors:
+                graph.add_entries(self.CACHE_CONTRACTORS, agreement.contractors)
+        graph.add_entries(self.CACHE_PERSONS, [contractor.person for contractor in graph.nodes(self.CACHE_CONTRACTORS)
+                                               if contractor.person is not None])
+        self._graph = graph
+        self._graph_versions = versions
+        return graph
+
+    def get_tenants(self, economic_unit_id: int = None, building_land_id: int = None, use_unit_id: int = None,
+                    active_on: datetime = None) -> List[Contractor]:
+        """
+        Vertragsnehmer einer Wirtschaftseinheit, eines Gebäudes oder einer Nutzungseinheit aus den Caches
+        (siehe entity_graph). Benötigt den Vertragsnehmer-Cache oder Nutzungsverträge mit Vertragsnehmern.
+        :param active_on: (Optional) Nur an diesem Tag laufende Verträge, z.B. datetime.now()
+        :type active_on: datetime
+        :rtype: List[Contractor]
+        """
+        if economic_unit_id is not None:
+            kind, id_ = self.CACHE_ECONOMIC_UNITS, economic_unit_id
+        elif building_land_id is not None:
+            kind, id_ = self.CACHE_BUILDING_LANDS, building_land_id
+        elif use_unit_id is not None:
+            kind, id_ = self.CACHE_USE_UNITS, use_unit_id
+        else:
+            raise WowiPyException("economic_unit_id, building_land_id or use_unit_id is required")
+        tenants = self.entity_graph().descendants(kind, id_, self.CACHE_CONTRACTORS)
+        if active_on is None:
+            return tenants
+        return [tenant for tenant in tenants if is_active_on(tenant.start_contract, tenant.end_of_contract, active_on)]
+
+    def get_active_on(self, cache_type: str, active_on: datetime, contractual_use: bool = False) -> List:
+        """
+        Alle Einträge eines Caches, die am Tag active_on laufen, ohne API-Aufruf. Entspricht den Filtern
+        license_agreement_active_on, contractual_use_active_on bzw. contract_positions_active_on der get_*-Methoden.
+        :param cache_type: WowiPy.CACHE_LICENSE_AGREEMENTS, WowiPy.CACHE_CONTRACTORS oder
+                           WowiPy.CACHE_CONTRACT_POSITIONS
+        :type cache_type: str
+        :param active_on: Stichtag
+        :type active_on: datetime
+        :param contractual_use: Bei Vertragsnehmern den Zeitraum der vertraglichen Nutzung statt der Vertragslaufzeit
+                                verwenden
+        :type contractual_use: bool
+        :return: Einträge in Cache-Reihenfolge
+        :rtype: List
+        """
+        store = self._cache[cache_type]
+        index = store.index(self.INDEX_CONTRACTUAL_USE_ACTIVE if contractual_use else self.INDEX_ACTIVE)
+        if index is None:
+            raise WowiPyException(f"Cache {cache_type} has no interval index")
+        entries = store.entries
+        return [entries[position] for position in index.active_on(active_on)]
+
+    def _decode_license_agreement(self, entry: Dict, add_contractors: bool = False) -> LicenseAgreement:
+        data = dict(humps.decamelize(entry))
+        data['id_'] = data.pop('id')
+        if add_contractors:
+            data['contractors'] = self.get_contractors(license_agreement_id=data.get("id_"))
+        return LicenseAgreement(**data)
+
+    @staticmethod
+    def _decode_economic_unit(entry: Dict) -> EconomicUnit:
+        data = dict(humps.decamelize(entry))
+        data['id_'] = data.pop('id')
+        return EconomicUnit(**data)
+
+    @staticmethod
+    def _decode_building_land(entry: Dict) -> BuildingLand:
+        data = dict(humps.decamelize(entry))
+        data['id_'] = data.pop('id')
+        data.get('estate_address')['zip_'] = data.get('estate_address').pop('zip')
+        return BuildingLand(**data)
+
+    @staticmethod
+    def _decode_use_unit(entry: Dict) -> UseUnit:
+        data = dict(humps.decamelize(entry))
+        data['id_'] = data.pop('id')
+        if data.get('estate_address') is not None:
+            data.get('estate_address')['zip_'] = data.get('estate_address').pop('zip')
+        if data.get('floor') is not None:
+            data.get('floor')['id_'] = data.get('floor').pop('id')
+        return UseUnit(**data)
+
+    @staticmethod
+    def _decode_contractor(entry: Dict) -> Contractor:
+        data = dict(humps.decamelize(entry))
+        data['id_'] = data.pop('id')
+        return Contractor(**data)
+
+    @staticmethod
+    def _decode_person(entry: Dict) -> Person:
+        data = dict(humps.decamelize(entry))
+        data['id_'] = data.pop('id')
+        data['shortname'] = data.pop('short_name')
+
+        # Der nächste Part ist notwendig, weil das Ergebnis der Route aktuell leicht von der Doku abweicht.
+        # Laut Doku gibt es das Feld IsNaturalPerson (bool), dieses wird aber nicht ausgegeben.
+        # Der Workaround ist nun das Auslesen von NaturalPerson[Gender]. Steht es auf id 3 (nicht angegeben),
+        # wird die Person als "nicht natürlich" angesehen.
+        workaround_is_nat_person = False
+        workaround_gender = data['natural_person'].get("gender")
+        if workaround_gender is not None:
+            workaround_gender_id = int(workaround_gender.get("id"))
+            if workaround_gender_id != 3:
+                workaround_is_nat_person = True
+        data['is_natural_person'] = workaround_is_nat_person
+        # Workaround für natürliche Person Ende
+        return Person(**data)
+
+    @staticmethod
+    def _decode_contract_position(entry: Dict) -> ContractPosition:
+        data = dict(humps.decamelize(entry))
+        data['id_'] = data.pop('id')
+        return ContractPosition(**data)
+
+    @staticmethod
+    def _decode_facility(entry: Dict) -> FacilityElement:
+        return FacilityElement(**dict(humps.decamelize(entry)))
+
+    @staticmethod
+    def _decode_component(entry: Dict) -> ComponentElement:
+        return ComponentElement(**dict(humps.decamelize(entry)))
+
     def get_license_agreements(self,
                                economic_unit_idnum: str = None,
                                use_unit_idnum: str = None,
@@ -535,27 +1398,11 @@ class WowiPy:
         if not fetch_all:
             result = self._rest_adapter.get(endpoint='RentAccounting/LicenseAgreements', ep_params=filter_params)
         else:
-            result = Result(0, "", [])
-            merge_schema = {"mergeStrategy": "append"}
-            merger = Merger(schema=merge_schema)
-            filter_params['offset'] = 0
-            filter_params['limit'] = 100
-            response_count = 100
-            while response_count == 100:
-                part_result = self._rest_adapter.get(endpoint='RentAccounting/LicenseAgreements',
-                                                     ep_params=filter_params)
-                result.data = merger.merge(result.data, part_result.data)
-                filter_params['offset'] += 100
-                response_count = len(part_result.data)
-                print(f"License-Agreement-Count: {len(result.data)}")
-
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            data['id_'] = data.pop('id')
-            if add_contractors:
-                data['contractors'] = self.get_contractors(license_agreement_id=data.get("id_"))
-            ret_la = LicenseAgreement(**data)
-            retlist.append(ret_la)
+            result = Result(0, "", self._fetch_all('RentAccounting/LicenseAgreements', filter_params))
+
+        with self._decode_scope('RentAccounting/LicenseAgreements', "LicenseAgreement", len(result.data)):
+            for entry in result.data:
+                retlist.append(self._decode_license_agreement(entry, add_contractors=add_contractors))
         return retlist
 
     def get_managements(self,
@@ -597,30 +1444,34 @@ class WowiPy:
 
         result = self._rest_adapter.get(endpoint='CommercialInventory/Managements', ep_params=filter_params)
         retlist = []
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            data['id_'] = data.pop('id')
-            ret_la = Management(**data)
-            retlist.append(ret_la)
+        with self._decode_scope('CommercialInventory/Managements', "Management", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                data['id_'] = data.pop('id')
+                ret_la = Management(**data)
+                retlist.append(ret_la)
         return retlist
 
     def get_online_repayment_plan(self, loan_id: int):
         result = self._rest_adapter.get(endpoint=f'Loans/Loan/{loan_id}/OnlineRepaymentPlan')
         retlist = []
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            ret_la = OnlineRepaymentPlanEntry(**data)
-            retlist.append(ret_la)
+        with self._decode_scope(f'Loans/Loan/{loan_id}/OnlineRepaymentPlan', "OnlineRepaymentPlanEntry",
+                                len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                ret_la = OnlineRepaymentPlanEntry(**data)
+                retlist.append(ret_la)
         return retlist
 
     def get_repayment_plan(self, loan_id: int):
         result = self._rest_adapter.get(endpoint=f'Loans/Loan/{loan_id}/RepaymentPlan')
         retlist = []
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            data["id_"] = data.pop("id")
-            ret_la = RepaymentPlanEntry(**data)
-            retlist.append(ret_la)
+        with self._decode_scope(f'Loans/Loan/{loan_id}/RepaymentPlan', "RepaymentPlanEntry", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                data["id_"] = data.pop("id")
+                ret_la = RepaymentPlanEntry(**data)
+                retlist.append(ret_la)
         return retlist
 
     def get_loans(self,
@@ -670,25 +1521,14 @@ class WowiPy:
         if not fetch_all:
             result = self._rest_adapter.get(endpoint='Loans/Loan', ep_params=filter_params)
         else:
-            result = Result(0, "", [])
-            merge_schema = {"mergeStrategy": "append"}
-            merger = Merger(schema=merge_schema)
-            filter_params['offset'] = 0
-            filter_params['limit'] = 100
-            response_count = 100
-            while response_count == 100:
-                part_result = self._rest_adapter.get(endpoint='Loans/Loan',
-                                                     ep_params=filter_params)
-                result.data = merger.merge(result.data, part_result.data)
-                filter_params['offset'] += 100
-                response_count = len(part_result.data)
-                print(f"Loan-Count: {len(result.data)}")
-
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            data['id_'] = data.pop('id')
-            ret_la = Loan(**data)
-            retlist.append(ret_la)
+            result = Result(0, "", self._fetch_all('Loans/Loan', filter_params))
+
+        with self._decode_scope('Loans/Loan', "Loan", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                data['id_'] = data.pop('id')
+                ret_la = Loan(**data)
+                retlist.append(ret_la)
         return retlist
 
     def get_economic_units(self,
@@ -723,25 +1563,11 @@ class WowiPy:
         if not fetch_all:
             result = self._rest_adapter.get(endpoint='CommercialInventory/EconomicUnits', ep_params=filter_params)
         else:
-            result = Result(0, "", [])
-            merge_schema = {"mergeStrategy": "append"}
-            merger = Merger(schema=merge_schema)
-            filter_params['offset'] = 0
-            filter_params['limit'] = 100
-            response_count = 100
-            while response_count == 100:
-                part_result = self._rest_adapter.get(endpoint='CommercialInventory/EconomicUnits',
-                                                     ep_params=filter_params)
-                result.data = merger.merge(result.data, part_result.data)
-                filter_params['offset'] += 100
-                response_count = len(part_result.data)
-                print(f"Economic-Unit-Count: {len(result.data)}")
-
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            data['id_'] = data.pop('id')
-            ret_la = EconomicUnit(**data)
-            retlist.append(ret_la)
+            result = Result(0, "", self._fetch_all('CommercialInventory/EconomicUnits', filter_params))
+
+        with self._decode_scope('CommercialInventory/EconomicUnits', "EconomicUnit", len(result.data)):
+            for entry in result.data:
+                retlist.append(self._decode_economic_unit(entry))
         return retlist
 
     def get_building_lands(self,
@@ -786,26 +1612,11 @@ class WowiPy:
             if not fetch_all:
                 result = self._rest_adapter.get(endpoint='CommercialInventory/BuildingLands', ep_params=filter_params)
             else:
-                result = Result(0, "", [])
-                merge_schema = {"mergeStrategy": "append"}
-                merger = Merger(schema=merge_schema)
-                filter_params['offset'] = 0
-                filter_params['limit'] = 100
-                response_count = 100
-                while response_count == 100:
-                    part_result = self._rest_adapter.get(endpoint='CommercialInventory/BuildingLands',
-                                                         ep_params=filter_params)
-                    result.data = merger.merge(result.data, part_result.data)
-                    filter_params['offset'] += 100
-                    response_count = len(part_result.data)
-                    print(f"Building-Count: {len(result.data)}")
+                result = Result(0, "", self._fetch_all('CommercialInventory/BuildingLands', filter_params))
 
-            for entry in result.data:
-                data = dict(humps.decamelize(entry))
-                data['id_'] = data.pop('id')
-                data.get('estate_address')['zip_'] = data.get('estate_address').pop('zip')
-                ret_la = BuildingLand(**data)
-                retlist.append(ret_la)
+            with self._decode_scope('CommercialInventory/BuildingLands', "BuildingLand", len(result.data)):
+                for entry in result.data:
+                    retlist.append(self._decode_building_land(entry))
         return retlist
 
     def get_owners(self,
@@ -846,13 +1657,14 @@ class WowiPy:
 
         result = self._rest_adapter.get(endpoint='CommercialInventory/Owners', ep_params=filter_params)
         retlist = []
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            data['id_'] = data.pop('id')
-            if data.get('estate_address') is not None:
-                data.get('estate_address')['zip_'] = data.get('estate_address').pop('zip')
-            ret_la = Owner(**data)
-            retlist.append(ret_la)
+        with self._decode_scope('CommercialInventory/Owners', "Owner", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                data['id_'] = data.pop('id')
+                if data.get('estate_address') is not None:
+                    data.get('estate_address')['zip_'] = data.get('estate_address').pop('zip')
+                ret_la = Owner(**data)
+                retlist.append(ret_la)
         return retlist
 
     def get_commissioning_invoice_receipts(self,
@@ -877,25 +1689,14 @@ class WowiPy:
             result = self._rest_adapter.get(endpoint='CommissioningRead/InvoiceReceipt/CommissionItems',
                                             ep_params=filter_params)
         else:
-            result = Result(0, "", [])
-            merge_schema = {"mergeStrategy": "append"}
-            merger = Merger(schema=merge_schema)
-            filter_params['offset'] = 0
-            filter_params['limit'] = 100
-            response_count = 100
-            while response_count == 100:
-                part_result = self._rest_adapter.get(endpoint='CommissioningRead/InvoiceReceipt/CommissionItems',
-                                                     ep_params=filter_params)
-                result.data = merger.merge(result.data, part_result.data)
-                filter_params['offset'] += 100
-                response_count = len(part_result.data)
-                print(f"Receipt-Count: {len(result.data)}")
-
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            data['id_'] = data.pop('id')
-            ret_la = InvoiceReceipt(**data)
-            retlist.append(ret_la)
+            result = Result(0, "", self._fetch_all('CommissioningRead/InvoiceReceipt/CommissionItems', filter_params))
+
+        with self._decode_scope('CommissioningRead/InvoiceReceipt/CommissionItems', "InvoiceReceipt", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                data['id_'] = data.pop('id')
+                ret_la = InvoiceReceipt(**data)
+                retlist.append(ret_la)
 
         return retlist
 
@@ -952,29 +1753,11 @@ class WowiPy:
             if not fetch_all:
                 result = self._rest_adapter.get(endpoint='CommercialInventory/UseUnits', ep_params=filter_params)
             else:
-                result = Result(0, "", [])
-                merge_schema = {"mergeStrategy": "append"}
-                merger = Merger(schema=merge_schema)
-                filter_params['offset'] = 0
-                filter_params['limit'] = 100
-                response_count = 100
-                while response_count == 100:
-                    part_result = self._rest_adapter.get(endpoint='CommercialInventory/UseUnits',
-                                                         ep_params=filter_params)
-                    result.data = merger.merge(result.data, part_result.data)
-                    filter_params['offset'] += 100
-                    response_count = len(part_result.data)
-                    print(f"UseUnit-Count: {len(result.data)}")
+                result = Result(0, "", self._fetch_all('CommercialInventory/UseUnits', filter_params))
 
-            for entry in result.data:
-                data = dict(humps.decamelize(entry))
-                data['id_'] = data.pop('id')
-                if data.get('estate_address') is not None:
-                    data.get('estate_address')['zip_'] = data.get('estate_address').pop('zip')
-                if data.get('floor') is not None:
-                    data.get('floor')['id_'] = data.get('floor').pop('id')
-                ret_la = UseUnit(**data)
-                retlist.append(ret_la)
+            with self._decode_scope('CommercialInventory/UseUnits', "UseUnit", len(result.data)):
+                for entry in result.data:
+                    retlist.append(self._decode_use_unit(entry))
         return retlist
 
     def get_contractors(self,
@@ -1024,25 +1807,11 @@ class WowiPy:
                 result = self._rest_adapter.get(endpoint='RentAccountingPersonDetails/Contractors',
                                                 ep_params=filter_params)
             else:
-                result = Result(0, "", [])
-                merge_schema = {"mergeStrategy": "append"}
-                merger = Merger(schema=merge_schema)
-                filter_params['offset'] = 0
-                filter_params['limit'] = 100
-                response_count = 100
-                while response_count == 100:
-                    part_result = self._rest_adapter.get(endpoint='RentAccountingPersonDetails/Contractors',
-                                                         ep_params=filter_params)
-                    result.data = merger.merge(result.data, part_result.data)
-                    filter_params['offset'] += 100
-                    response_count = len(part_result.data)
-                    print(f"Contractors-Count: {len(result.data)}")
+                result = Result(0, "", self._fetch_all('RentAccountingPersonDetails/Contractors', filter_params))
 
-            for entry in result.data:
-                data = dict(humps.decamelize(entry))
-                data['id_'] = data.pop('id')
-                ret_la = Contractor(**data)
-                retlist.append(ret_la)
+            with self._decode_scope('RentAccountingPersonDetails/Contractors', "Contractor", len(result.data)):
+                for entry in result.data:
+                    retlist.append(self._decode_contractor(entry))
         return retlist
 
     def get_persons(self,
@@ -1071,58 +1840,28 @@ class WowiPy:
 
         retlist = []
         if use_cache:
-            cache_entry: Person
-            for cache_entry in self._cache[self.CACHE_PERSONS]:
-                if person_id is not None and cache_entry.id_ == person_id:
-                    retlist.append(copy.deepcopy(cache_entry))
+            cache_entry = self._cache[self.CACHE_PERSONS].get(person_id)
+            if person_id is not None and cache_entry is not None:
+                retlist.append(copy.deepcopy(cache_entry))
         else:
             if not fetch_all:
                 result = self._rest_adapter.get(endpoint='PersonsRead/Persons', ep_params=filter_params)
             else:
-                result = Result(0, "", [])
-                merge_schema = {"mergeStrategy": "append"}
-                merger = Merger(schema=merge_schema)
-                filter_params['offset'] = 0
-                filter_params['limit'] = 100
-                response_count = 100
-                while response_count == 100:
-                    part_result = self._rest_adapter.get(endpoint='PersonsRead/Persons',
-                                                         ep_params=filter_params)
-                    result.data = merger.merge(result.data, part_result.data)
-                    filter_params['offset'] += 100
-                    response_count = len(part_result.data)
-                    print(f"Person-Count: {len(result.data)}")
+                result = Result(0, "", self._fetch_all('PersonsRead/Persons', filter_params))
 
-            for entry in result.data:
-                data = dict(humps.decamelize(entry))
-                data['id_'] = data.pop('id')
-                data['shortname'] = data.pop('short_name')
-
-                # Der nächste Part ist notwendig, weil das Ergebnis der Route aktuell leicht von der Doku abweicht.
-                # Laut Doku gibt es das Feld IsNaturalPerson (bool), dieses wird aber nicht ausgegeben.
-                # Der Workaround ist nun das Auslesen von NaturalPerson[Gender]. Steht es auf id 3 (nicht angegeben),
-                # wird die Person als "nicht natürlich" angesehen.
-                workaround_is_nat_person = False
-                workaround_gender = data['natural_person'].get("gender")
-                if workaround_gender is not None:
-                    workaround_gender_id = int(workaround_gender.get("id"))
-                    if workaround_gender_id != 3:
-                        workaround_is_nat_person = True
-                data['is_natural_person'] = workaround_is_nat_person
-                # Workaround für natürliche Person Ende
-                ret_per = Person(**data)
-                retlist.append(ret_per)
+            with self._decode_scope('PersonsRead/Persons', "Person", len(result.data)):
+                for entry in result.data:
+                    retlist.append(self._decode_person(entry))
         return retlist
 
     def get_all_contract_positions(self,
                                    contract_positions_active_on: datetime = None,
                                    use_cache: bool = False) -> List[ContractPosition]:
         if use_cache:
-            return self._cache[self.CACHE_CONTRACT_POSITIONS]
+            return self._cache[self.CACHE_CONTRACT_POSITIONS].entries
 
-        result = Result(0, "", [])
-        merge_schema = {"mergeStrategy": "append"}
-        merger = Merger(schema=merge_schema)
+        progress = self._progress("get_all_contract_positions")
+        ret_list = []
         offset = 0
         limit = 100
         response_count = 100
@@ -1130,22 +1869,24 @@ class WowiPy:
         while response_count == 100:
             part_result = self.get_contract_positions(contract_positions_active_on=contract_positions_active_on,
                                                       limit=limit, offset=offset)
-            result.data = merger.merge(result.data, part_result)
+            ret_list.extend(part_result)
             offset += 100
             response_count = len(part_result)
-            print(f"Contract Position Count: {len(result.data)}")
+            progress.update(response_count)
+        progress.finish()
 
-        return result.data
+        return ret_list
 
     def get_districts(self) -> List[District]:
         retlist = []
         result = self._rest_adapter.get(endpoint='CommercialInventoryCatalog/Districts')
 
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            data['id_'] = data.pop('id')
-            ret_la = District(**data)
-            retlist.append(ret_la)
+        with self._decode_scope('CommercialInventoryCatalog/Districts', "District", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                data['id_'] = data.pop('id')
+                ret_la = District(**data)
+                retlist.append(ret_la)
 
         return retlist
 
@@ -1153,11 +1894,12 @@ class WowiPy:
         retlist = []
         result = self._rest_adapter.get(endpoint='CommercialInventoryCatalog/BuildingTypes')
 
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            data['id_'] = data.pop('id')
-            ret_la = BuildingType(**data)
-            retlist.append(ret_la)
+        with self._decode_scope('CommercialInventoryCatalog/BuildingTypes', "BuildingType", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                data['id_'] = data.pop('id')
+                ret_la = BuildingType(**data)
+                retlist.append(ret_la)
 
         return retlist
 
@@ -1165,11 +1907,12 @@ class WowiPy:
         retlist = []
         result = self._rest_adapter.get(endpoint='CommercialInventoryCatalog/UseUnitType')
 
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            data['id_'] = data.pop('id')
-            ret_la = UseUnitTypeCatalogEntry(**data)
-            retlist.append(ret_la)
+        with self._decode_scope('CommercialInventoryCatalog/UseUnitType', "UseUnitTypeCatalogEntry", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                data['id_'] = data.pop('id')
+                ret_la = UseUnitTypeCatalogEntry(**data)
+                retlist.append(ret_la)
 
         return retlist
 
@@ -1201,11 +1944,9 @@ class WowiPy:
         retlist = []
         result = self._rest_adapter.get(endpoint='RentAccounting/ContractPositions', ep_params=filter_params)
 
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            data['id_'] = data.pop('id')
-            ret_la = ContractPosition(**data)
-            retlist.append(ret_la)
+        with self._decode_scope('RentAccounting/ContractPositions', "ContractPosition", len(result.data)):
+            for entry in result.data:
+                retlist.append(self._decode_contract_position(entry))
 
         return retlist
 
@@ -1227,13 +1968,14 @@ class WowiPy:
 
         result = self._rest_adapter.get(endpoint='CommercialInventory/Department', ep_params=filter_params,
                                         force_refresh=True)
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            data['id_'] = data.pop('id')
-            data['type_id'] = data['department_type'].pop('id')
-            data['type_name'] = data['department_type'].pop('name')
-            ret_la = Department(**data)
-            retlist.append(ret_la)
+        with self._decode_scope('CommercialInventory/Department', "Department", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                data['id_'] = data.pop('id')
+                data['type_id'] = data['department_type'].pop('id')
+                data['type_name'] = data['department_type'].pop('name')
+                ret_la = Department(**data)
+                retlist.append(ret_la)
 
         return retlist
 
@@ -1270,27 +2012,15 @@ class WowiPy:
                                             ep_params=filter_params,
                                             force_refresh=True)
         else:
-            result = Result(0, "", [])
-            merge_schema = {"mergeStrategy": "append"}
-            merger = Merger(schema=merge_schema)
-            filter_params['offset'] = 0
-            filter_params['limit'] = 100
-            response_count = 100
-            while response_count == 100:
-                part_result = self._rest_adapter.get(endpoint='RentAccountingPersonDetails/PaymentModes',
-                                                     ep_params=filter_params,
-                                                     force_refresh=True)
-                result.data = merger.merge(result.data, part_result.data)
-                filter_params['offset'] += 100
-                response_count = len(part_result.data)
-                print(f"Payment-Mode-Count: {len(result.data)}")
-
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            data['id_'] = data.pop('id')
-
-            ret_per = PaymentMode(**data)
-            retlist.append(ret_per)
+            result = Result(0, "", self._fetch_all('RentAccountingPersonDetails/PaymentModes', filter_params))
+
+        with self._decode_scope('RentAccountingPersonDetails/PaymentModes', "PaymentMode", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                data['id_'] = data.pop('id')
+
+                ret_per = PaymentMode(**data)
+                retlist.append(ret_per)
 
         return retlist
 
@@ -1337,24 +2067,13 @@ class WowiPy:
             result = self._rest_adapter.get(endpoint='CommunicationRead/Ticket', ep_params=filter_params,
                                             force_refresh=force_refresh)
         else:
-            result = Result(0, "", [])
-            merge_schema = {"mergeStrategy": "append"}
-            merger = Merger(schema=merge_schema)
-            filter_params['offset'] = 0
-            filter_params['limit'] = 100
-            response_count = 100
-            while response_count == 100:
-                part_result = self._rest_adapter.get(endpoint='CommunicationRead/Ticket', ep_params=filter_params,
-                                                     force_refresh=force_refresh)
-                result.data = merger.merge(result.data, part_result.data)
-                filter_params['offset'] += 100
-                response_count = len(part_result.data)
-                print(f"Ticket-Count: {len(result.data)}")
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            data['id_'] = data.pop('id')
-            ret_la = Ticket(**data)
-            retlist.append(ret_la)
+            result = Result(0, "", self._fetch_all('CommunicationRead/Ticket', filter_params))
+        with self._decode_scope('CommunicationRead/Ticket', "Ticket", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                data['id_'] = data.pop('id')
+                ret_la = Ticket(**data)
+                retlist.append(ret_la)
 
         return retlist
 
@@ -1371,7 +2090,9 @@ class WowiPy:
             cat_status
         ]
 
-        return CommunicationCatalog(cat_list)
+        with self._decode_scope('CommunicationCatalog', "CommunicationCatalog",
+                                sum(len(cat) for cat in cat_list)):
+            return CommunicationCatalog(cat_list)
 
     def create_ticket(self,
                       subject: str,
@@ -1458,37 +2179,26 @@ class WowiPy:
             result = self._rest_adapter.get(endpoint='CommercialInventory/ResponsibleOfficial',
                                             ep_params=filter_params)
         else:
-            result = Result(0, "", [])
-            merge_schema = {"mergeStrategy": "append"}
-            merger = Merger(schema=merge_schema)
-            filter_params['offset'] = 0
-            filter_params['limit'] = 100
-            response_count = 100
-            while response_count == 100:
-                part_result = self._rest_adapter.get(endpoint='CommercialInventory/ResponsibleOfficial',
-                                                     ep_params=filter_params)
-                result.data = merger.merge(result.data, part_result.data)
-                filter_params['offset'] += 100
-                response_count = len(part_result.data)
-                print(f"ResponsibleOfficial Count: {len(result.data)}")
-
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            if user_id is not None and data.get("user_id") != user_id:
-                continue
-            # Hier hängt normalerweise noch die Person dran. Die wollen wir aber nicht mitnehmen (jedenfalls
-            # aktuell nicht) um die Ausgabe an die der Jurisdictions anzugleichen
-            # Default Address wird auch entfernt
-            try:
-                data.pop("default_address", None)
-                tperson = data.get("person")
-                data["person_id"] = tperson.get("id", None)
-                data["person_name"] = tperson.get("name", None)
-                data["id_"] = data.pop("id")
-                ret_la = ResponsibleOfficial(**data)
-                retlist.append(ret_la)
-            except KeyError:
-                pass
+            result = Result(0, "", self._fetch_all('CommercialInventory/ResponsibleOfficial', filter_params))
+
+        with self._decode_scope('CommercialInventory/ResponsibleOfficial', "ResponsibleOfficial", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                if user_id is not None and data.get("user_id") != user_id:
+                    continue
+                # Hier hängt normalerweise noch die Person dran. Die wollen wir aber nicht mitnehmen (jedenfalls
+                # aktuell nicht) um die Ausgabe an die der Jurisdictions anzugleichen
+                # Default Address wird auch entfernt
+                try:
+                    data.pop("default_address", None)
+                    tperson = data.get("person")
+                    data["person_id"] = tperson.get("id", None)
+                    data["person_name"] = tperson.get("name", None)
+                    data["id_"] = data.pop("id")
+                    ret_la = ResponsibleOfficial(**data)
+                    retlist.append(ret_la)
+                except KeyError:
+                    pass
 
         return retlist
 
@@ -1520,24 +2230,14 @@ class WowiPy:
             result = self._rest_adapter.get(endpoint='CommercialInventory/EconomicUnit/Jurisdiction',
                                             ep_params=filter_params)
         else:
-            result = Result(0, "", [])
-            merge_schema = {"mergeStrategy": "append"}
-            merger = Merger(schema=merge_schema)
-            filter_params['offset'] = 0
-            filter_params['limit'] = 100
-            response_count = 100
-            while response_count == 100:
-                part_result = self._rest_adapter.get(endpoint='CommercialInventory/EconomicUnit/Jurisdiction',
-                                                     ep_params=filter_params)
-                result.data = merger.merge(result.data, part_result.data)
-                filter_params['offset'] += 100
-                response_count = len(part_result.data)
-                print(f"Eco-Jurisdiction-Count: {len(result.data)}")
-
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            ret_la = EconomicUnitJurisdiction(**data)
-            retlist.append(ret_la)
+            result = Result(0, "", self._fetch_all('CommercialInventory/EconomicUnit/Jurisdiction', filter_params))
+
+        with self._decode_scope('CommercialInventory/EconomicUnit/Jurisdiction', "EconomicUnitJurisdiction",
+                                len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                ret_la = EconomicUnitJurisdiction(**data)
+                retlist.append(ret_la)
 
         return retlist
 
@@ -1572,46 +2272,37 @@ class WowiPy:
             result = self._rest_adapter.get(endpoint='CommercialInventory/UseUnit/Jurisdiction',
                                             ep_params=filter_params)
         else:
-            result = Result(0, "", [])
-            merge_schema = {"mergeStrategy": "append"}
-            merger = Merger(schema=merge_schema)
-            filter_params['offset'] = 0
-            filter_params['limit'] = 100
-            response_count = 100
-            while response_count == 100:
-                part_result = self._rest_adapter.get(endpoint='CommercialInventory/UseUnit/Jurisdiction',
-                                                     ep_params=filter_params)
-                result.data = merger.merge(result.data, part_result.data)
-                filter_params['offset'] += 100
-                response_count = len(part_result.data)
-                print(f"UseUnit-Jurisdiction-Count: {len(result.data)}")
-
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            ret_la = UseUnitJurisdiction(**data)
-            retlist.append(ret_la)
+            result = Result(0, "", self._fetch_all('CommercialInventory/UseUnit/Jurisdiction', filter_params))
+
+        with self._decode_scope('CommercialInventory/UseUnit/Jurisdiction', "UseUnitJurisdiction", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                ret_la = UseUnitJurisdiction(**data)
+                retlist.append(ret_la)
 
         return retlist
 
     def get_file_type_catalog(self):
         retlist = []
         result = self._rest_adapter.get(endpoint='DocumentReadCatalog/FileType')
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            data['id_'] = data.pop('id')
-            ret_la = FileType(**data)
-            retlist.append(ret_la)
+        with self._decode_scope('DocumentReadCatalog/FileType', "FileType", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                data['id_'] = data.pop('id')
+                ret_la = FileType(**data)
+                retlist.append(ret_la)
 
         return retlist
 
     def get_picture_type_catalog(self):
         retlist = []
         result = self._rest_adapter.get(endpoint='MediaReadCatalog/EstatePictureType')
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            data['id_'] = data.pop('id')
-            ret_la = PictureType(**data)
-            retlist.append(ret_la)
+        with self._decode_scope('MediaReadCatalog/EstatePictureType', "PictureType", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                data['id_'] = data.pop('id')
+                ret_la = PictureType(**data)
+                retlist.append(ret_la)
 
         return retlist
 
@@ -1619,11 +2310,12 @@ class WowiPy:
         retlist = []
         result = self._rest_adapter.get(endpoint='DocumentReadCatalog/FileEntity')
 
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            data['id_'] = data.pop('id')
-            ret_la = FileEntity(**data)
-            retlist.append(ret_la)
+        with self._decode_scope('DocumentReadCatalog/FileEntity', "FileEntity", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                data['id_'] = data.pop('id')
+                ret_la = FileEntity(**data)
+                retlist.append(ret_la)
 
         return retlist
 
@@ -1631,11 +2323,12 @@ class WowiPy:
         retlist = []
         result = self._rest_adapter.get(endpoint='MediaReadCatalog/MediaEntity')
 
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            data['id_'] = data.pop('id')
-            ret_la = MediaEntity(**data)
-            retlist.append(ret_la)
+        with self._decode_scope('MediaReadCatalog/MediaEntity', "MediaEntity", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                data['id_'] = data.pop('id')
+                ret_la = MediaEntity(**data)
+                retlist.append(ret_la)
 
         return retlist
 
@@ -1767,24 +2460,13 @@ class WowiPy:
                                             ep_params=filter_params,
                                             force_refresh=force_refresh)
         else:
-            result = Result(0, "", [])
-            merge_schema = {"mergeStrategy": "append"}
-            merger = Merger(schema=merge_schema)
-            filter_params['offset'] = 0
-            filter_params['limit'] = 100
-            response_count = 100
-            while response_count == 100:
-                part_result = self._rest_adapter.get(endpoint='CooperativeManagement/CooperativeMemberships',
-                                                     ep_params=filter_params,
-                                                     force_refresh=force_refresh)
-                result.data = merger.merge(result.data, part_result.data)
-                filter_params['offset'] += 100
-                response_count = len(part_result.data)
-                print(f"Membership-Count: {len(result.data)}")
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            ret_la = CooperativeMembership(**data)
-            retlist.append(ret_la)
+            result = Result(0, "", self._fetch_all('CooperativeManagement/CooperativeMemberships', filter_params))
+        with self._decode_scope('CooperativeManagement/CooperativeMemberships', "CooperativeMembership",
+                                len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                ret_la = CooperativeMembership(**data)
+                retlist.append(ret_la)
 
         return retlist
 
@@ -1826,24 +2508,10 @@ class WowiPy:
                                             ep_params=filter_params,
                                             force_refresh=force_refresh)
         else:
-            result = Result(0, "", [])
-            merge_schema = {"mergeStrategy": "append"}
-            merger = Merger(schema=merge_schema)
-            filter_params['offset'] = 0
-            filter_params['limit'] = 100
-            response_count = 100
-            while response_count == 100:
-                part_result = self._rest_adapter.get(endpoint='CommercialInventory/Facility',
-                                                     ep_params=filter_params,
-                                                     force_refresh=force_refresh)
-                result.data = merger.merge(result.data, part_result.data)
-                filter_params['offset'] += 100
-                response_count = len(part_result.data)
-                print(f"Facility-Count: {len(result.data)}")
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            ret_la = FacilityElement(**data)
-            retlist.append(ret_la)
+            result = Result(0, "", self._fetch_all('CommercialInventory/Facility', filter_params))
+        with self._decode_scope('CommercialInventory/Facility', "Facility", len(result.data)):
+            for entry in result.data:
+                retlist.append(self._decode_facility(entry))
 
         return retlist
 
@@ -1891,24 +2559,10 @@ class WowiPy:
                                             ep_params=filter_params,
                                             force_refresh=force_refresh)
         else:
-            result = Result(0, "", [])
-            merge_schema = {"mergeStrategy": "append"}
-            merger = Merger(schema=merge_schema)
-            filter_params['offset'] = 0
-            filter_params['limit'] = 100
-            response_count = 100
-            while response_count == 100:
-                part_result = self._rest_adapter.get(endpoint='CommercialInventory/Component',
-                                                     ep_params=filter_params,
-                                                     force_refresh=force_refresh)
-                result.data = merger.merge(result.data, part_result.data)
-                filter_params['offset'] += 100
-                response_count = len(part_result.data)
-                print(f"Component-Count: {len(result.data)}")
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            ret_la = ComponentElement(**data)
-            retlist.append(ret_la)
+            result = Result(0, "", self._fetch_all('CommercialInventory/Component', filter_params))
+        with self._decode_scope('CommercialInventory/Component', "Component", len(result.data)):
+            for entry in result.data:
+                retlist.append(self._decode_component(entry))
 
         return retlist
 
@@ -1929,24 +2583,13 @@ class WowiPy:
             filter_params.update(add_args)
 
         retlist = []
-        result = Result(0, "", [])
-        merge_schema = {"mergeStrategy": "append"}
-        merger = Merger(schema=merge_schema)
-        filter_params['offset'] = 0
-        filter_params['limit'] = 100
-        response_count = 100
-        while response_count == 100:
-            part_result = self._rest_adapter.get(endpoint='CommercialInventoryCatalog/FacilityCatalog',
-                                                 ep_params=filter_params,
-                                                 force_refresh=True)
-            result.data = merger.merge(result.data, part_result.data)
-            filter_params['offset'] += 100
-            response_count = len(part_result.data)
-            print(f"Facility-Catalog-Count: {len(result.data)}")
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            ret_la = FacilityCatalogElement(**data)
-            retlist.append(ret_la)
+        result = Result(0, "", self._fetch_all('CommercialInventoryCatalog/FacilityCatalog', filter_params))
+        with self._decode_scope('CommercialInventoryCatalog/FacilityCatalog', "FacilityCatalogElement",
+                                len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                ret_la = FacilityCatalogElement(**data)
+                retlist.append(ret_la)
 
         return retlist
 
@@ -1967,24 +2610,13 @@ class WowiPy:
             filter_params.update(add_args)
 
         retlist = []
-        result = Result(0, "", [])
-        merge_schema = {"mergeStrategy": "append"}
-        merger = Merger(schema=merge_schema)
-        filter_params['offset'] = 0
-        filter_params['limit'] = 100
-        response_count = 100
-        while response_count == 100:
-            part_result = self._rest_adapter.get(endpoint='CommercialInventoryCatalog/ComponentCatalog',
-                                                 ep_params=filter_params,
-                                                 force_refresh=True)
-            result.data = merger.merge(result.data, part_result.data)
-            filter_params['offset'] += 100
-            response_count = len(part_result.data)
-            print(f"Component-Catalog-Count: {len(result.data)}")
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            ret_la = ComponentCatalogElement(**data)
-            retlist.append(ret_la)
+        result = Result(0, "", self._fetch_all('CommercialInventoryCatalog/ComponentCatalog', filter_params))
+        with self._decode_scope('CommercialInventoryCatalog/ComponentCatalog', "ComponentCatalogElement",
+                                len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                ret_la = ComponentCatalogElement(**data)
+                retlist.append(ret_la)
 
         return retlist
 
@@ -2005,24 +2637,13 @@ class WowiPy:
             filter_params.update(add_args)
 
         retlist = []
-        result = Result(0, "", [])
-        merge_schema = {"mergeStrategy": "append"}
-        merger = Merger(schema=merge_schema)
-        filter_params['offset'] = 0
-        filter_params['limit'] = 100
-        response_count = 100
-        while response_count == 100:
-            part_result = self._rest_adapter.get(endpoint='CommercialInventoryCatalog/UnderComponent',
-                                                 ep_params=filter_params,
-                                                 force_refresh=True)
-            result.data = merger.merge(result.data, part_result.data)
-            filter_params['offset'] += 100
-            response_count = len(part_result.data)
-            print(f"Under-Component-Catalog-Count: {len(result.data)}")
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            ret_la = UnderComponentCatalogElement(**data)
-            retlist.append(ret_la)
+        result = Result(0, "", self._fetch_all('CommercialInventoryCatalog/UnderComponent', filter_params))
+        with self._decode_scope('CommercialInventoryCatalog/UnderComponent', "UnderComponentCatalogElement",
+                                len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                ret_la = UnderComponentCatalogElement(**data)
+                retlist.append(ret_la)
 
         return retlist
 
@@ -2035,11 +2656,11 @@ class WowiPy:
         result = self._rest_adapter.get(endpoint='MediaReadCatalog/EstatePictureType',
                                         ep_params=filter_params,
                                         force_refresh=True)
-        print(f"EstatePictureType-Count: {len(result.data)}")
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            ret_la = EstatePictureType(**data)
-            retlist.append(ret_la)
+        with self._decode_scope('MediaReadCatalog/EstatePictureType', "EstatePictureType", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                ret_la = EstatePictureType(**data)
+                retlist.append(ret_la)
         return retlist
 
     def get_media_entities(self, add_args: Dict = None) -> List[MediaEntity]:
@@ -2051,23 +2672,17 @@ class WowiPy:
         result = self._rest_adapter.get(endpoint='MediaReadCatalog/MediaEntity',
                                         ep_params=filter_params,
                                         force_refresh=True)
-        print(f"MediaEntity-Count: {len(result.data)}")
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            ret_la = MediaEntity(**data)
-            retlist.append(ret_la)
+        with self._decode_scope('MediaReadCatalog/MediaEntity', "MediaEntity", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                ret_la = MediaEntity(**data)
+                retlist.append(ret_la)
         return retlist
 
-    def create_facility(self,
-                        name: str,
-                        count: int,
-                        facility_catalog_id: int,
-                        facility_status_id: int = 3,
-                        building_id: int = None,
-                        economic_unit_id: int = None,
-                        use_unit_id: int = None,
-                        property_id: int = None,
-                        inactive: bool = False):
+    @staticmethod
+    def _facility_data(name: str, count: int, facility_catalog_id: int, facility_status_id: int = 3,
+                       building_id: int = None, economic_unit_id: int = None, use_unit_id: int = None,
+                       property_id: int = None, inactive: bool = False) -> Dict:
         data_dict = {
             "Name": name,
             "Count": count,
@@ -2084,6 +2699,20 @@ class WowiPy:
             data_dict["PropertyId"] = property_id
         if inactive is not None:
             data_dict["Inactive"] = inactive
+        return data_dict
+
+    def create_facility(self,
+                        name: str,
+                        count: int,
+                        facility_catalog_id: int,
+                        facility_status_id: int = 3,
+                        building_id: int = None,
+                        economic_unit_id: int = None,
+                        use_unit_id: int = None,
+                        property_id: int = None,
+                        inactive: bool = False):
+        data_dict = self._facility_data(name, count, facility_catalog_id, facility_status_id, building_id,
+                                        economic_unit_id, use_unit_id, property_id, inactive)
         result = self._rest_adapter.post(endpoint='ManageFacilityAndComponents/Facility', data=data_dict)
         return result
 
@@ -2098,44 +2727,29 @@ class WowiPy:
                       use_unit_id: int = None,
                       property_id: int = None,
                       inactive: bool = False):
-        data_dict = {
-            "Name": name,
-            "Count": count,
-            "FacilityCatalogId": facility_catalog_id,
-            "FacilityStatusId": facility_status_id
-        }
-        if building_id:
-            data_dict["BuildingId"] = building_id
-        if economic_unit_id:
-            data_dict["EconomicUnitId"] = economic_unit_id
-        if use_unit_id:
-            data_dict["UseUnitId"] = use_unit_id
-        if property_id:
-            data_dict["PropertyId"] = property_id
-        if inactive is not None:
-            data_dict["Inactive"] = inactive
+        data_dict = self._facility_data(name, count, facility_catalog_id, facility_status_id, building_id,
+                                        economic_unit_id, use_unit_id, property_id, inactive)
         result = self._rest_adapter.put(endpoint=f'ManageFacilityAndComponents/Facility/{str(facility_id)}',
                                         data=data_dict)
         return result
 
-    def create_component(self,
-                         name: str,
-                         count: int,
-                         component_status_id: int,
-                         component_catalog_id: int,
-                         facility_id: int,
-                         repair_relevance: bool = None,
-                         lease_relevance: bool = None,
-                         comment: str = None,
-                         acquisition_date: str = None,
-                         warranty_period: str = None,
-                         warranty_end: str = None,
-                         warranty_conditions: str = None,
-                         position: str = None,
-                         valid_from: str = None,
-                         valid_to: str = None,
-                         under_component_ids: list[int] = None
-                         ):
+    @staticmethod
+    def _component_data(name: str,
+                        count: int,
+                        component_status_id: int,
+                        component_catalog_id: int,
+                        repair_relevance: bool = None,
+                        lease_relevance: bool = None,
+                        comment: str = None,
+                        acquisition_date: str = None,
+                        warranty_period: str = None,
+                        warranty_end: str = None,
+                        warranty_conditions: str = None,
+                        position: str = None,
+                        valid_from: str = None,
+                        valid_to: str = None,
+                        under_component_ids: list[int] = None
+                        ) -> Dict:
         data_dict = {
             "Name": name,
             "Count": count,
@@ -2166,6 +2780,29 @@ class WowiPy:
             data_dict["ValidTo"] = valid_to
         if under_component_ids is not None and len(under_component_ids) > 0:
             data_dict["UnderComponentIds"] = under_component_ids
+        return data_dict
+
+    def create_component(self,
+                         name: str,
+                         count: int,
+                         component_status_id: int,
+                         component_catalog_id: int,
+                         facility_id: int,
+                         repair_relevance: bool = None,
+                         lease_relevance: bool = None,
+                         comment: str = None,
+                         acquisition_date: str = None,
+                         warranty_period: str = None,
+                         warranty_end: str = None,
+                         warranty_conditions: str = None,
+                         position: str = None,
+                         valid_from: str = None,
+                         valid_to: str = None,
+                         under_component_ids: list[int] = None
+                         ):
+        data_dict = self._component_data(name, count, component_status_id, component_catalog_id, repair_relevance,
+                                         lease_relevance, comment, acquisition_date, warranty_period, warranty_end,
+                                         warranty_conditions, position, valid_from, valid_to, under_component_ids)
         result = self._rest_adapter.post(endpoint=f'ManageFacilityAndComponents/Facility/{str(facility_id)}/Component',
                                          data=data_dict)
         return result
@@ -2189,36 +2826,9 @@ class WowiPy:
                        valid_to: str = None,
                        under_component_ids: list[int] = None
                        ):
-        data_dict = {
-            "Name": name,
-            "Count": count,
-            "ComponentStatusId": component_status_id,
-            "ComponentCatalogId": component_catalog_id,
-        }
-        if repair_relevance is not None:
-            data_dict["RepairRelevance"] = repair_relevance
-        if lease_relevance is not None:
-            data_dict["LeaseRelevance"] = lease_relevance
-        if comment:
-            data_dict["Comment"] = comment
-        if acquisition_date is not None:
-            data_dict["AcquisitionDate"] = acquisition_date
-        if warranty_period is not None:
-            data_dict["WarrantyPeriod"] = warranty_period
-        if warranty_end is not None:
-            data_dict["WarrantyEnd"] = warranty_end
-        if warranty_conditions is not None:
-            data_dict["WarrantyConditions"] = warranty_conditions
-        if position is not None:
-            data_dict["Position"] = position
-        if valid_from:
-            data_dict["ValidFrom"] = valid_from
-        else:
-            data_dict["ValidFrom"] = datetime.now().strftime("%Y-%m-%d")
-        if valid_to:
-            data_dict["ValidTo"] = valid_to
-        if under_component_ids is not None and len(under_component_ids) > 0:
-            data_dict["UnderComponentIds"] = under_component_ids
+        data_dict = self._component_data(name, count, component_status_id, component_catalog_id, repair_relevance,
+                                         lease_relevance, comment, acquisition_date, warranty_period, warranty_end,
+                                         warranty_conditions, position, valid_from, valid_to, under_component_ids)
         result = self._rest_adapter.put(
             endpoint=f'ManageFacilityAndComponents/Facility/{str(facility_id)}/Component/{str(component_id)}',
             data=data_dict)
@@ -2231,6 +2841,138 @@ class WowiPy:
             data=data_dict)
         return result
 
+    @staticmethod
+    def _catalog_id(catalog: Union[int, str], elements: Dict[str, List], kind: str,
+                    facility_catalog_id: int = None) -> int:
+        # Katalogeinträge werden über die Id oder den Namen angegeben. Gleichnamige Komponenten verschiedener
+        # Ausstattungsarten werden über die Ausstattungsart unterschieden.
+        if not isinstance(catalog, str):
+            return catalog
+        candidates = elements.get(catalog.strip().lower(), [])
+        if facility_catalog_id is not None and len(candidates) > 1:
+            candidates = [entry for entry in candidates if entry.facility_catalog_id == facility_catalog_id]
+        if not candidates:
+            raise WowiPyException(f"Unbekannter Eintrag im {kind}: {catalog}")
+        if len(candidates) > 1:
+            raise WowiPyException(f"Mehrdeutiger Eintrag im {kind}: {catalog} "
+                                  f"({', '.join(str(entry.id_) for entry in candidates)})")
+        return candidates[0].id_
+
+    def _component_operation(self, operation: ComponentOperation, facility_id, component_catalog: Dict[str, List],
+                             facility_catalog_id: int = None, group=None,
+                             parent: BulkOperation = None) -> BulkOperation:
+        endpoint = f'ManageFacilityAndComponents/Facility/{str(facility_id)}/Component'
+        if operation.action != ComponentOperation.CREATE:
+            endpoint += f'/{str(operation.component_id)}'
+        if operation.action == ComponentOperation.DELETE:
+            return BulkOperation('DELETE', endpoint, {}, source=operation, group=group, parent=parent)
+        component_catalog_id = self._catalog_id(operation.component_catalog, component_catalog, "Komponentenkatalog",
+                                                facility_catalog_id)
+        data_dict = self._component_data(operation.name, operation.count, operation.component_status_id,
+                                         component_catalog_id, operation.repair_relevance, operation.lease_relevance,
+                                         operation.comment, operation.acquisition_date, operation.warranty_period,
+                                         operation.warranty_end, operation.warranty_conditions, operation.position,
+                                         operation.valid_from, operation.valid_to, operation.under_component_ids)
+        method = 'POST' if operation.action == ComponentOperation.CREATE else 'PUT'
+        return BulkOperation(method, endpoint, data_dict, source=operation, group=group, parent=parent)
+
+    def bulk_facilities(self, operations: List[Union[FacilityOperation, ComponentOperation]], max_workers: int = 8,
+                        max_retries: int = 3, rate_limit: float = None, timeout: float = 60.0) -> List[BulkResult]:
+        """
+        Legt Ausstattungen und Komponenten in großer Zahl an, ändert oder löscht sie. Die Operationen werden je
+        Ausstattung gruppiert: innerhalb einer Ausstattung nacheinander (neue Ausstattung vor ihren Komponenten),
+        verschiedene Ausstattungen parallel. Katalogeinträge können über den Namen angegeben werden, die Kataloge
+        werden dafür je Aufruf einmal abgerufen. Einzelne Fehler brechen den Lauf nicht ab, sondern stehen im
+        jeweiligen Ergebnis, Komponenten einer nicht angelegten Ausstattung werden nicht gesendet.
+        :param operations: FacilityOperation (mit components) und ComponentOperation
+        :type operations: List[Union[FacilityOperation, ComponentOperation]]
+        :param max_workers: Anzahl gleichzeitiger Anfragen
+        :type max_workers: int
+        :param max_retries: Wiederholungen je Operation bei vorübergehenden Fehlern
+        :type max_retries: int
+        :param rate_limit: (Optional) Höchstens so viele Anfragen je Sekunde
+        :type rate_limit: float
+        :param timeout: Timeout je Anfrage in Sekunden
+        :type timeout: float
+        :returns: Ein BulkResult je Operation in der Reihenfolge der Eingabe, die Komponenten einer
+                  FacilityOperation direkt nach dieser. Die Operation steht in BulkResult.source, die neue Id in
+                  BulkResult.data["id"].
+        :rtype: List[BulkResult]
+        """
+        facility_catalog = {}
+        component_catalog = {}
+        if any(isinstance(operation, FacilityOperation) and isinstance(operation.facility_catalog, str)
+               for operation in operations):
+            for entry in self.get_facility_catalog():
+                facility_catalog.setdefault(entry.name.strip().lower(), []).append(entry)
+        if any(isinstance(component.component_catalog, str) for operation in operations
+               for component in (operation.components if isinstance(operation, FacilityOperation) else [operation])):
+            for entry in self.get_component_catalog():
+                component_catalog.setdefault(entry.name.strip().lower(), []).append(entry)
+
+        bulk_operations = []
+        failed = {}
+
+        def failed_operation(source, error: WowiPyException) -> BulkOperation:
+            bulk_operation = BulkOperation('', '', source=source)
+            failed[id(bulk_operation)] = error
+            return bulk_operation
+
+        for operation in operations:
+            if isinstance(operation, ComponentOperation):
+                try:
+                    if operation.facility_id is None:
+                        raise WowiPyException(f"facility_id fehlt für {operation!r}")
+                    bulk_operations.append(self._component_operation(operation, operation.facility_id,
+                                                                     component_catalog,
+                                                                     group=("facility", operation.facility_id)))
+                except WowiPyException as e:
+                    bulk_operations.append(failed_operation(operation, e))
+                continue
+
+            if operation.action == FacilityOperation.CREATE:
+                group = ("new", id(operation))
+                endpoint = 'ManageFacilityAndComponents/Facility'
+                facility_id = "{parent_id}"
+            else:
+                group = ("facility", operation.facility_id)
+                endpoint = f'ManageFacilityAndComponents/Facility/{str(operation.facility_id)}'
+                facility_id = operation.facility_id
+            try:
+                facility_catalog_id = self._catalog_id(operation.facility_catalog, facility_catalog,
+                                                       "Ausstattungskatalog")
+                facility = BulkOperation(
+                    'POST' if operation.action == FacilityOperation.CREATE else 'PUT', endpoint,
+                    self._facility_data(operation.name, operation.count, facility_catalog_id,
+                                        operation.facility_status_id, operation.building_id,
+                                        operation.economic_unit_id, operation.use_unit_id, operation.property_id,
+                                        operation.inactive), source=operation, group=group)
+            except WowiPyException as e:
+                facility_catalog_id = None
+                facility = failed_operation(operation, e)
+            bulk_operations.append(facility)
+
+            # Komponenten einer neuen Ausstattung brauchen deren Id und laufen erst danach
+            parent = facility if operation.action == FacilityOperation.CREATE else None
+            for component in operation.components:
+                if parent is not None and id(parent) in failed:
+                    bulk_operations.append(failed_operation(component, WowiPyException(
+                        f"Nicht ausgeführt, {operation!r} fehlgeschlagen")))
+                    continue
+                try:
+                    bulk_operations.append(self._component_operation(component, facility_id, component_catalog,
+                                                                     facility_catalog_id, group, parent))
+                except WowiPyException as e:
+                    bulk_operations.append(failed_operation(component, e))
+
+        executor = BulkExecutor(self._rest_adapter, max_workers=max_workers, max_retries=max_retries,
+                                rate_limit=rate_limit, timeout=timeout)
+        to_send = [bulk_operation for bulk_operation in bulk_operations if id(bulk_operation) not in failed]
+        progress = ProgressTracker("bulk_facilities", self._progress_observers, len(to_send))
+        sent = iter(executor.run(to_send, progress))
+        return [BulkResult(bulk_operation, False, error=failed[id(bulk_operation)], attempts=0)
+                if id(bulk_operation) in failed else next(sent) for bulk_operation in bulk_operations]
+
     def upload_media(self, media_data: MediaData, file_path: str) -> Result:
         if not media_data.picture_type_id:
             if not media_data.picture_type_name:
@@ -2311,33 +3053,21 @@ class WowiPy:
                                             ep_params=filter_params,
                                             force_refresh=True)
         else:
-            result = Result(0, "", [])
-            merge_schema = {"mergeStrategy": "append"}
-            merger = Merger(schema=merge_schema)
-            filter_params['offset'] = 0
-            filter_params['limit'] = 100
-            response_count = 100
-            while response_count == 100:
-                part_result = self._rest_adapter.get(endpoint=f'MediaRead/{entity_name}/MediaData',
-                                                     ep_params=filter_params,
-                                                     force_refresh=True)
-                result.data = merger.merge(result.data, part_result.data)
-                filter_params['offset'] += 100
-                response_count = len(part_result.data)
-                print(f"Media-Count: {len(result.data)}")
-        for entry in result.data:
-            data = dict(humps.decamelize(entry))
-            file_name = data['file']['file_name']
-            entity_type_name = data['entity_name']
-            creation_date_str = data['file']['creation_date']
-            file_guid = data['file']['file_guid']
-            thumb_guid = data['thumbnail']['file_guid']
-            thumb_name = data['thumbnail']['file_name']
-            data["id_"] = data.pop("id")
-            ret_la = MediaData(**data, file_name=file_name, entity_type_name=entity_type_name,
-                               creation_date_str=creation_date_str, file_guid=file_guid,
-                               thumb_guid=thumb_guid, thumb_name=thumb_name)
-            retlist.append(ret_la)
+            result = Result(0, "", self._fetch_all(f'MediaRead/{entity_name}/MediaData', filter_params))
+        with self._decode_scope(f'MediaRead/{entity_name}/MediaData', "MediaData", len(result.data)):
+            for entry in result.data:
+                data = dict(humps.decamelize(entry))
+                file_name = data['file']['file_name']
+                entity_type_name = data['entity_name']
+                creation_date_str = data['file']['creation_date']
+                file_guid = data['file']['file_guid']
+                thumb_guid = data['thumbnail']['file_guid']
+                thumb_name = data['thumbnail']['file_name']
+                data["id_"] = data.pop("id")
+                ret_la = MediaData(**data, file_name=file_name, entity_type_name=entity_type_name,
+                                   creation_date_str=creation_date_str, file_guid=file_guid,
+                                   thumb_guid=thumb_guid, thumb_name=thumb_name)
+                retlist.append(ret_la)
 
         return retlist
 
@@ -2361,13 +3091,9 @@ class WowiPy:
             f.write(binary_data)
         return True
 
-    def create_communication(self,
-                             person_id: int,
-                             communication_type_id: int = None,
-                             related_address_id: int = None,
-                             content: str = None,
-                             explanation: str = None,
-                             ):
+    @staticmethod
+    def _communication_data(communication_type_id: int = None, related_address_id: int = None, content: str = None,
+                            explanation: str = None) -> Dict:
         data_dict = {
         }
         if communication_type_id is not None:
@@ -2378,7 +3104,16 @@ class WowiPy:
             data_dict["Content"] = content
         if explanation is not None:
             data_dict["Explanation"] = explanation
+        return data_dict
 
+    def create_communication(self,
+                             person_id: int,
+                             communication_type_id: int = None,
+                             related_address_id: int = None,
+                             content: str = None,
+                             explanation: str = None,
+                             ):
+        data_dict = self._communication_data(communication_type_id, related_address_id, content, explanation)
         result = self._rest_adapter.post(
             endpoint=f'PersonsWrite/Person/{str(person_id)}/Communications',
             data=data_dict)
@@ -2392,17 +3127,7 @@ class WowiPy:
                            content: str = None,
                            explanation: str = None,
                            ):
-        data_dict = {
-        }
-        if communication_type_id is not None:
-            data_dict["CommunicationTypeId"] = communication_type_id
-        if related_address_id is not None:
-            data_dict["RelatedAddressId"] = related_address_id
-        if content is not None:
-            data_dict["Content"] = content
-        if explanation is not None:
-            data_dict["Explanation"] = explanation
-
+        data_dict = self._communication_data(communication_type_id, related_address_id, content, explanation)
         result = self._rest_adapter.put(
             endpoint=f'PersonsWrite/Person/{str(person_id)}/Communications/{str(communication_id)}',
             data=data_dict)
@@ -2414,3 +3139,44 @@ class WowiPy:
             endpoint=f'PersonsWrite/Person/{str(person_id)}/Communications/{str(communication_id)}',
             data=data_dict)
         return result
+
+    def _communication_operation(self, operation: CommunicationOperation) -> BulkOperation:
+        endpoint = f'PersonsWrite/Person/{str(operation.person_id)}/Communications'
+        if operation.action == CommunicationOperation.CREATE:
+            return BulkOperation('POST', endpoint, self._communication_data(
+                operation.communication_type_id, operation.related_address_id, operation.content,
+                operation.explanation), source=operation)
+        endpoint += f'/{str(operation.communication_id)}'
+        if operation.action == CommunicationOperation.EDIT:
+            return BulkOperation('PUT', endpoint, self._communication_data(
+                operation.communication_type_id, operation.related_address_id, operation.content,
+                operation.explanation), source=operation)
+        return BulkOperation('DELETE', endpoint, {}, source=operation)
+
+    def bulk_communications(self, operations: List[CommunicationOperation], max_workers: int = 8,
+                            max_retries: int = 3, rate_limit: float = None,
+                            timeout: float = 60.0) -> List[BulkResult]:
+        """
+        Legt Kommunikationen an, ändert oder löscht sie in großer Zahl. Die Anfragen laufen parallel über eine
+        gemeinsame Verbindung, vorübergehende Fehler (429, 5xx, Verbindungsabbrüche) werden wiederholt. Anlagen werden
+        nur wiederholt, wenn sie nachweislich nicht verarbeitet wurden (429, 503, kein Verbindungsaufbau), damit keine
+        doppelten Kommunikationen entstehen. Einzelne Fehler brechen den Lauf nicht ab, sondern stehen im jeweiligen
+        Ergebnis.
+        :param operations: Operationen, z.B. CommunicationOperation(CommunicationOperation.EDIT, person_id=1,
+                           communication_id=2, content="neu@example.org")
+        :type operations: List[CommunicationOperation]
+        :param max_workers: Anzahl gleichzeitiger Anfragen
+        :type max_workers: int
+        :param max_retries: Wiederholungen je Operation bei vorübergehenden Fehlern
+        :type max_retries: int
+        :param rate_limit: (Optional) Höchstens so viele Anfragen je Sekunde
+        :type rate_limit: float
+        :param timeout: Timeout je Anfrage in Sekunden
+        :type timeout: float
+        :returns: Ein BulkResult je Operation in derselben Reihenfolge, die Operation steht in BulkResult.source
+        :rtype: List[BulkResult]
+        """
+        executor = BulkExecutor(self._rest_adapter, max_workers=max_workers, max_retries=max_retries,
+                                rate_limit=rate_limit, timeout=timeout)
+        progress = ProgressTracker("bulk_communications", self._progress_observers, len(operations))
+        return executor.run([self._communication_operation(operation) for operation in operations], progress)